@@ -9,15 +9,177 @@ description:
   - This plugin enables communication with a Sophos Firewall (SFOS)
 version_added: "2.0.0"
 author: "Matt Mullen (@mamullen13316)"
+options:
+  trace:
+    type: boolean
+    default: false
+    description:
+      - Record the XML requests sent to the firewall and the responses received, with passwords and other
+        secrets redacted, and return them in the C(trace) key of the module result.
+      - Modules also request a trace when run with verbosity C(-vvv) or higher.
+    vars:
+      - name: ansible_sfos_trace
+    env:
+      - name: ANSIBLE_SFOS_TRACE
+  capability_cache_ttl:
+    type: int
+    default: 3600
+    description:
+      - Number of seconds the API version discovered for a firewall is cached on the controller, so it is not
+        discovered again by each persistent connection.
+      - Use C(0) to only keep it for the life of the persistent connection, for example while upgrading firmware.
+    vars:
+      - name: ansible_sfos_capability_cache_ttl
+    env:
+      - name: ANSIBLE_SFOS_CAPABILITY_CACHE_TTL
+  capability_cache_dir:
+    type: path
+    default: ~/.ansible/cache/sfos
+    description:
+      - Directory on the controller holding the cached API versions, one file per firewall.
+    vars:
+      - name: ansible_sfos_capability_cache_dir
+    env:
+      - name: ANSIBLE_SFOS_CAPABILITY_CACHE_DIR
 """
 
 from ansible_collections.ansible.netcommon.plugins.plugin_utils.httpapi_base import HttpApiBase
 from sophosfirewall_python.firewallapi import SophosFirewall, SophosFirewallAuthFailure, SophosFirewallAPIError, SophosFirewallZeroRecords
 from requests.exceptions import RequestException
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment, FileSystemLoader
+import hashlib
+import json
+import os
+import re
+import requests
 import sys
+import tempfile
+import time
+import xmltodict
 
 # sys.stderr.write("SophosFirewall HTTPAPI Plugin is being loaded...\n")
 
+# Maximum number of requests sent to the firewall at the same time by get_tags()
+MAX_PARALLEL_REQUESTS = 8
+
+# XML payload templates used by the modules, see submit_template()
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Created on first use and kept for the life of the persistent connection process,
+# so each template is only loaded and compiled once.
+_template_env = None
+
+
+# Size of the chunks written to disk by download_template()
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Content-Range header of a partial response, for example "bytes 1048576-2097151/4194304"
+CONTENT_RANGE = re.compile(r"^bytes (?P<start>\d+)-\d+/(?P<total>\d+|\*)$")
+
+# HTTP session used for file uploads and downloads, created on first use so the connection to the
+# firewall is kept open and reused by the transfers sent through the persistent connection.
+_http_session = None
+
+
+def template_environment():
+    """Return the Jinja2 environment used to render the XML payload templates."""
+    global _template_env
+    if _template_env is None:
+        _template_env = Environment(
+            trim_blocks=True,
+            lstrip_blocks=True,
+            autoescape=True,
+            auto_reload=False,
+            loader=FileSystemLoader(TEMPLATE_DIR),
+        )
+    return _template_env
+
+
+def http_session():
+    """Return the HTTP session used to upload files to and download files from the firewall."""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        _http_session.headers.update({"Accept": "application/xml"})
+    return _http_session
+
+
+def check_response_status(resp_dict):
+    """Raise an error if an entity in the response has a non-2xx status code, the same as the SDK submit_xml().
+
+    Args:
+        resp_dict (dict): Parsed contents of the Response element
+    """
+    for key, entity in resp_dict.items():
+        if isinstance(entity, dict) and isinstance(entity.get("Status"), dict):
+            if not re.search("2[0-9][0-9]", entity["Status"].get("@code", "")):
+                raise SophosFirewallAPIError(entity)
+
+
+# Text elements whose contents are replaced before a request or response is added to a trace
+SECRET_ELEMENT = re.compile(
+    r"<(?P<tag>[\w-]*(?:Password|Secret|PresharedKey|Passphrase)[\w-]*)(?P<attrs>\s[^>]*)?>[^<]*</(?P=tag)>",
+    re.IGNORECASE,
+)
+
+
+def redact(xml):
+    """Replace the contents of password and secret elements in an XML document.
+
+    Args:
+        xml (str): XML request or response
+
+    Returns:
+        str: XML with secrets replaced by asterisks
+    """
+    return SECRET_ELEMENT.sub(
+        lambda match: "<{0}{1}>********</{0}>".format(match.group("tag"), match.group("attrs") or ""), xml
+    )
+
+
+class RequestTrace:
+    """Record the requests sent by an SDK client, with secrets redacted.
+
+    The client is only wrapped while tracing is enabled, so no payload is copied or
+    formatted when it is off.
+    """
+
+    def __init__(self, client):
+        self.entries = []
+        self._post = client.client._post
+        client.client._post = self.post
+
+    def post(self, xmldata, timeout=30):
+        """Send the request with the wrapped client and record it."""
+        return self.record(xmldata, lambda: self._post(xmldata=xmldata, timeout=timeout))
+
+    def record(self, xmldata, send, stream=False):
+        """Send a request and record it.
+
+        Args:
+            xmldata (str): XML request
+            send (function): Function sending the request and returning the requests.Response
+            stream (bool): The response is streamed, so only its headers are recorded
+        """
+        entry = {"request": redact(xmldata)}
+        self.entries.append(entry)
+        start = time.monotonic()
+        try:
+            resp = send()
+        except Exception as error:
+            entry["error"] = str(error)
+            raise
+        finally:
+            entry["elapsed"] = round(time.monotonic() - start, 3)
+        entry["status_code"] = resp.status_code
+        if stream:
+            entry["headers"] = dict(resp.headers)
+        else:
+            entry["response"] = redact(resp.content.decode())
+        return resp
+
+
 class HttpApi(HttpApiBase):
     """Ansible HTTPAPI plugin for Sophos Firewall"""
 
@@ -26,25 +188,33 @@ class HttpApi(HttpApiBase):
         raise NotImplementedError("send_request() is not yet implemented.")
     #TODO: Implement interaction with REST API (SFOS v22 and later)
 
-    def invoke_sdk(self, method_name, module_args=None):
-        """Send request to the firewall using sophosfirewall-python SDK.
+    def _client(self):
+        """Create a SophosFirewall SDK client using the connection options."""
+        return SophosFirewall(self.connection.get_option('remote_user'),
+                              self.connection.get_option('password'),
+                              self.connection.get_option('host'),
+                              self.connection.get_option('port'),
+                              self.connection.get_option('validate_certs'))
+
+    def _call(self, client, method_name, module_args=None):
+        """Call an SDK method, converting SDK exceptions into a result dictionary.
 
         Args:
-            method_name (function): The SDK method to call.
+            client (SophosFirewall): SDK client
+            method_name (str): The SDK method to call.
             module_args (dict): Arguments to pass to the SophosFirewall object method.
         """
-        client = SophosFirewall(self.connection.get_option('remote_user'),
-                                self.connection.get_option('password'),
-                                self.connection.get_option('host'),
-                                self.connection.get_option('port'),
-                                self.connection.get_option('validate_certs'))
-        method = getattr(client, method_name)
+        return self._guard(getattr(client, method_name), module_args or {})
+
+    def _guard(self, method, kwargs):
+        """Run a request, converting SDK exceptions into a result dictionary.
 
+        Args:
+            method (function): Function sending the request
+            kwargs (dict): Keyword arguments for the function
+        """
         try:
-            if module_args:
-                resp = method(**module_args)
-            else:
-                resp = method()
+            resp = method(**kwargs)
         except SophosFirewallZeroRecords as error:
             return {"success": True, "exists": False, "response": str(error)}
         except SophosFirewallAuthFailure as error:
@@ -53,6 +223,394 @@ class HttpApi(HttpApiBase):
             return {"success": False, "response": str(error)}
         except RequestException as error:
             return {"success": False, "response": str(error)}
-        
+
         return {"success": True, "exists": True, "response": resp}
-    
+
+    def _tracer(self, client, trace):
+        """Start tracing the requests of a client if requested by the module or the trace option."""
+        if not trace:
+            trace = self._option("trace", False)
+        return RequestTrace(client) if trace else None
+
+    @staticmethod
+    def _with_trace(result, tracer):
+        """Add the recorded requests to a result dictionary."""
+        if tracer is not None:
+            result["trace"] = tracer.entries
+        return result
+
+    def invoke_sdk(self, method_name, module_args=None, trace=False):
+        """Send request to the firewall using sophosfirewall-python SDK.
+
+        Args:
+            method_name (function): The SDK method to call.
+            module_args (dict): Arguments to pass to the SophosFirewall object method.
+            trace (bool): Return the requests and responses, with secrets redacted, in the trace key of the result.
+        """
+        client = self._client()
+        tracer = self._tracer(client, trace)
+        return self._with_trace(self._call(client, method_name, module_args), tracer)
+
+    def _option(self, name, default):
+        """Return a plugin option, or the default if the option is not available."""
+        try:
+            value = self.get_option(name)
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def _capability_cache_file(self):
+        """Return the path of the file caching the capabilities of the firewall."""
+        host = "{0}_{1}".format(self.connection.get_option("host"), self.connection.get_option("port"))
+        cache_dir = os.path.expanduser(self._option("capability_cache_dir", "~/.ansible/cache/sfos"))
+        return os.path.join(cache_dir, re.sub(r"[^\w.-]", "_", host) + ".json")
+
+    def _read_capabilities(self):
+        """Read the cached capabilities of the firewall, if they have not expired."""
+        ttl = self._option("capability_cache_ttl", 3600)
+        if ttl <= 0:
+            return None
+        try:
+            with open(self._capability_cache_file(), "r") as cache_file:
+                capabilities = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - capabilities.get("discovered", 0) > ttl:
+            return None
+        return capabilities
+
+    def _write_capabilities(self, capabilities):
+        """Cache the capabilities of the firewall on the controller. Errors are ignored, as the cache is optional."""
+        if self._option("capability_cache_ttl", 3600) <= 0:
+            return
+        cache_file = self._capability_cache_file()
+        try:
+            os.makedirs(os.path.dirname(cache_file), 0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(capabilities, tmp_file)
+            os.replace(tmp_path, cache_file)
+        except (IOError, OSError):
+            pass
+
+    def get_capabilities(self, refresh=False):
+        """Return the API version of the firewall.
+
+        The version is discovered once and kept for the life of the persistent connection, and
+        cached on the controller for the number of seconds set by the capability_cache_ttl option,
+        so version checks do not cost a request to the firewall.
+
+        Args:
+            refresh (bool): Discover the version again instead of using the cache.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk(), the response holding the api_version
+        """
+        capabilities = None if refresh else getattr(self, "_capabilities", None) or self._read_capabilities()
+        if capabilities is None:
+            resp = self.invoke_sdk("login")
+            if not resp["success"]:
+                return resp
+            capabilities = {
+                "api_version": resp["response"]["Response"].get("@APIVersion", ""),
+                "discovered": time.time(),
+            }
+            self._write_capabilities(capabilities)
+        self._capabilities = capabilities
+
+        return {"success": True, "exists": True, "response": {"api_version": capabilities["api_version"]}}
+
+    def get_tags(self, xml_tags, trace=False):
+        """Retrieve several XML tags from the firewall, sending the requests in parallel.
+
+        Args:
+            xml_tags (list): XML tags to retrieve.
+            trace (bool): Return the request and response for each tag in the trace key of its result.
+
+        Returns:
+            dict: Result of each lookup keyed by XML tag, in the same format as invoke_sdk().
+        """
+        if not xml_tags:
+            return {}
+
+        def fetch(xml_tag):
+            client = self._client()
+            tracer = self._tracer(client, trace)
+            return self._with_trace(self._call(client, "get_tag", {"xml_tag": xml_tag}), tracer)
+
+        with ThreadPoolExecutor(max_workers=min(len(xml_tags), MAX_PARALLEL_REQUESTS)) as executor:
+            return dict(zip(xml_tags, executor.map(fetch, xml_tags)))
+
+    @staticmethod
+    def _render(client, template_name, template_vars, set_operation):
+        """Render a packaged XML template into a request."""
+        context = dict(template_vars or {})
+        context["username"] = client.username
+        context["password"] = client.password
+        context["set_operation"] = set_operation
+        context["body_template"] = template_name + ".xml.j2"
+        return template_environment().get_template("request.xml.j2").render(**context)
+
+    def _render_and_post(self, client, template_name, template_vars, set_operation, timeout):
+        """Render a packaged XML template into a request and send it to the firewall."""
+        payload = self._render(client, template_name, template_vars, set_operation)
+        resp = client.client._post(xmldata=payload, timeout=timeout)
+        resp_dict = xmltodict.parse(resp.content.decode())
+        check_response_status(resp_dict["Response"])
+        return resp_dict
+
+    def _render_and_upload(self, client, template_name, template_vars, set_operation, files, timeout, tracer):
+        """Render a packaged XML template into a request and send it to the firewall with files attached."""
+        payload = self._render(client, template_name, template_vars, set_operation)
+        handles = []
+        try:
+            parts = {"reqxml": (None, payload, "application/xml")}
+            for part_name, path, content_type in files:
+                handles.append(open(path, "rb"))
+                parts[part_name] = (os.path.basename(path), handles[-1], content_type)
+
+            def send():
+                return http_session().post(client.client.url, files=parts, verify=client.client.verify, timeout=timeout)
+
+            resp = tracer.record(payload, send) if tracer is not None else send()
+        finally:
+            for handle in handles:
+                handle.close()
+
+        resp_dict = xmltodict.parse(resp.content.decode())
+        status = resp_dict["Response"].get("Status")
+        if isinstance(status, dict) and not re.search("2[0-9][0-9]", status.get("@code", "")):
+            # Login failure or IP address not allowed in the API access list
+            raise SophosFirewallAPIError(status.get("#text", status))
+        check_response_status(resp_dict["Response"])
+        return resp_dict
+
+    def _render_and_download(self, client, template_name, template_vars, dest, checksum, retries, timeout, tracer):
+        """Render a packaged XML template into a request and stream the file returned by the firewall to disk.
+
+        The request must fetch a file which already exists on the firewall, such as a backup by its
+        name, so that sending it again returns the same file. The file is written in chunks to a
+        temporary file next to dest and hashed as it is written. When the transfer is interrupted,
+        the same request is sent again with a Range header. The rest of the file is only appended when
+        the firewall answers with exactly that range, otherwise the file is downloaded from the start.
+        The temporary file is removed unless the download completes and matches checksum, so no
+        partial file is left for a later run.
+        """
+        payload = self._render(client, template_name, template_vars, None)
+        dest_dir = os.path.dirname(os.path.abspath(dest))
+        handle, part_file = tempfile.mkstemp(prefix="." + os.path.basename(dest) + ".", suffix=".part", dir=dest_dir)
+        os.close(handle)
+        digest = hashlib.sha256()
+        offset = 0
+        total = None
+        resumed = 0
+        attempt = 0
+
+        try:
+            while True:
+                headers = {"Range": "bytes={0}-".format(offset)} if offset else {}
+
+                def send():
+                    return http_session().post(client.client.url, data={"reqxml": payload}, headers=headers,
+                                               stream=True, verify=client.client.verify, timeout=timeout)
+
+                try:
+                    resp = tracer.record(payload, send, stream=True) if tracer is not None else send()
+                    with resp:
+                        if resp.status_code not in (200, 206) or "xml" in resp.headers.get("Content-Type", ""):
+                            # The firewall answers with an XML response when the request is rejected
+                            resp_dict = xmltodict.parse(resp.content.decode())
+                            check_response_status(resp_dict["Response"])
+                            raise SophosFirewallAPIError(resp_dict["Response"].get("Status", resp_dict["Response"]))
+
+                        content_range = CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+                        if resp.status_code == 206 and content_range and int(content_range.group("start")) == offset:
+                            if offset:
+                                resumed += 1
+                            if content_range.group("total") != "*":
+                                total = int(content_range.group("total"))
+                        else:
+                            # Any other answer holds the whole file, so start over
+                            digest = hashlib.sha256()
+                            offset = 0
+                            total = int(resp.headers["Content-Length"]) if "Content-Length" in resp.headers else None
+
+                        with open(part_file, "ab" if offset else "wb") as part:
+                            for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                                part.write(chunk)
+                                digest.update(chunk)
+                                offset += len(chunk)
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                    attempt += 1
+                    if attempt > retries:
+                        raise
+                    continue
+
+                if total is None or offset == total:
+                    break
+                attempt += 1
+                if attempt > retries:
+                    raise SophosFirewallAPIError("Download incomplete: received {0} of {1} bytes".format(offset, total))
+
+            if checksum and digest.hexdigest().lower() != checksum.lower():
+                raise SophosFirewallAPIError("SHA-256 checksum {0} of the downloaded file does not match {1}".format(
+                    digest.hexdigest(), checksum))
+
+            os.replace(part_file, dest)
+        finally:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+
+        return {"dest": dest, "size": offset, "checksum": digest.hexdigest(), "resumed": resumed}
+
+    def submit_template(self, template_name, template_vars=None, set_operation="add", timeout=30, trace=False):
+        """Send an XML payload built from one of the packaged templates.
+
+        The templates are compiled once per persistent connection and reused for every
+        request, instead of being parsed and compiled for each call to the SDK submit_xml().
+
+        Args:
+            template_name (str): Name of the template in the templates directory, without the .xml.j2 extension.
+            template_vars (dict): Variables to render into the template.
+            set_operation (str): Set operation, add or update. Specify None to exclude the Set block.
+            timeout (int): Request timeout in seconds.
+            trace (bool): Return the request and response, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk()
+        """
+        client = self._client()
+        tracer = self._tracer(client, trace)
+        return self._with_trace(self._guard(self._render_and_post, {
+            "client": client,
+            "template_name": template_name,
+            "template_vars": template_vars,
+            "set_operation": set_operation,
+            "timeout": timeout,
+        }), tracer)
+
+    def upload_template(self, template_name, template_vars=None, files=None, set_operation="add", timeout=30,
+                        trace=False):
+        """Send an XML payload built from one of the packaged templates, with files attached.
+
+        The files are sent in a multipart request over an HTTP session kept open by the
+        persistent connection, instead of a new connection and login for each upload.
+
+        Args:
+            template_name (str): Name of the template in the templates directory, without the .xml.j2 extension.
+            template_vars (dict): Variables to render into the template.
+            files (list): Files to attach, as [part name, path, content type] lists.
+            set_operation (str): Set operation, add or update. Specify None to exclude the Set block.
+            timeout (int): Request timeout in seconds.
+            trace (bool): Return the request and response, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk()
+        """
+        client = self._client()
+        tracer = self._tracer(client, trace)
+        return self._with_trace(self._guard(self._render_and_upload, {
+            "client": client,
+            "template_name": template_name,
+            "template_vars": template_vars,
+            "set_operation": set_operation,
+            "files": files or [],
+            "timeout": timeout,
+            "tracer": tracer,
+        }), tracer)
+
+    def download_template(self, template_name, template_vars=None, dest=None, checksum=None, retries=3, timeout=300,
+                          trace=False):
+        """Send an XML payload built from one of the packaged templates and save the file returned to disk.
+
+        The response is streamed over the HTTP session kept by the persistent connection and written
+        in chunks, so the memory used does not depend on the size of the file. The template must fetch
+        a file which already exists on the firewall, as the request is sent again to resume an
+        interrupted transfer.
+
+        Args:
+            template_name (str): Name of the template in the templates directory, without the .xml.j2 extension.
+            template_vars (dict): Variables to render into the template.
+            dest (str): Path the file is saved to.
+            checksum (str): Expected SHA-256 checksum of the file, as hex. The file is not saved if it differs.
+            retries (int): Number of times an interrupted transfer is resumed.
+            timeout (int): Timeout in seconds for each read from the firewall.
+            trace (bool): Return the request and response headers, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk(), the response holding the path, size and
+                SHA-256 checksum of the file, and the number of times the transfer was resumed
+        """
+        client = self._client()
+        tracer = self._tracer(client, trace)
+        return self._with_trace(self._guard(self._render_and_download, {
+            "client": client,
+            "template_name": template_name,
+            "template_vars": template_vars,
+            "dest": dest,
+            "checksum": checksum,
+            "retries": retries,
+            "timeout": timeout,
+            "tracer": tracer,
+        }), tracer)
+
+    def submit_entities(self, entities, set_operation="update", timeout=30, trace=False):
+        """Send several configuration entities in a single Set request.
+
+        Each entity is a dictionary holding one XML tag, for example
+        ``{"User": {"Username": "jdoe", ...}}``, in the format returned by the get methods.
+        The Response element holds a status for each entity, in the order they were sent.
+
+        Args:
+            entities (list): Entities to send, converted to XML with xmltodict.
+            set_operation (str): Set operation, add or update.
+            timeout (int): Request timeout in seconds.
+            trace (bool): Return the request and response, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk()
+        """
+        entities_xml = "".join(xmltodict.unparse(entity, full_document=False) for entity in entities)
+        return self.submit_template("entities", {"entities_xml": entities_xml},
+                                    set_operation=set_operation, timeout=timeout, trace=trace)
+
+    def submit_changes(self, xml_tag, add=None, update=None, remove=None, remove_key="Name", timeout=30, trace=False):
+        """Add, update and remove configuration entities of one type in a single request.
+
+        The Response element holds a status for each entity, with the added entities first,
+        then the updated entities, then the removed entities.
+
+        Args:
+            xml_tag (str): XML tag of the entities, for example SyslogServers.
+            add (list): Entities to add, in the format accepted by submit_entities().
+            update (list): Entities to update, in the format accepted by submit_entities().
+            remove (list): Names of the entities to remove.
+            remove_key (str): XML key holding the name of the entities to remove, for example RuleName.
+            timeout (int): Request timeout in seconds.
+            trace (bool): Return the request and response, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk()
+        """
+        return self.submit_template("changes", {
+            "xml_tag": xml_tag,
+            "add_xml": "".join(xmltodict.unparse(entity, full_document=False) for entity in add or []),
+            "update_xml": "".join(xmltodict.unparse(entity, full_document=False) for entity in update or []),
+            "remove_names": remove or [],
+            "remove_key": remove_key,
+        }, set_operation=None, timeout=timeout, trace=trace)
+
+    def remove_entities(self, xml_tag, names, timeout=30, trace=False):
+        """Remove several configuration entities of one type in a single request.
+
+        Args:
+            xml_tag (str): XML tag of the entities, for example FQDNHost.
+            names (list): Names of the entities to remove.
+            timeout (int): Request timeout in seconds.
+            trace (bool): Return the request and response, with secrets redacted, in the trace key of the result.
+
+        Returns:
+            dict: Result in the same format as invoke_sdk()
+        """
+        return self.submit_template("remove_entities", {"xml_tag": xml_tag, "names": names},
+                                    set_operation=None, timeout=timeout, trace=trace)
@@ -0,0 +1,242 @@
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+name: sfos_object
+short_description: Look up objects on Sophos Firewall
+version_added: "2.6.0"
+description:
+    - Retrieves all objects for an XML tag (for example C(IPHost), C(Services), C(Zone)) from Sophos Firewall
+      and returns the objects matching a name or filter.
+    - The full object list for each tag is fetched once per firewall and memoized. It is also stored in an on-disk cache,
+      so later tasks and later runs are answered without contacting the firewall until I(ttl) expires.
+author:
+    - Matt Mullen (@mamullen13316)
+requirements:
+    - sophosfirewall-python
+options:
+    _terms:
+        description: XML tags of the objects to look up.
+        required: true
+    name:
+        description: Return only the object with this name.
+        type: str
+    filter:
+        description:
+            - Return only objects where each key has the given value.
+            - Nested keys are separated by a dot, for example C(NetworkPolicy.Action).
+        type: dict
+    ttl:
+        description: Number of seconds a cached object list remains valid. Use C(0) to always fetch from the firewall.
+        type: int
+        default: 300
+    refresh:
+        description: Ignore any cached object list and fetch it from the firewall.
+        type: bool
+        default: false
+    cache_dir:
+        description: Directory for the on-disk cache.
+        type: path
+        default: ~/.ansible/tmp/sfos_object_cache
+    host:
+        description: Hostname or IP address of the firewall.
+        type: str
+        vars:
+            - name: ansible_host
+    port:
+        description: Port of the firewall API.
+        type: int
+        default: 4444
+        vars:
+            - name: ansible_httpapi_port
+    username:
+        description: Username for the firewall API.
+        type: str
+        vars:
+            - name: ansible_user
+    password:
+        description: Password for the firewall API.
+        type: str
+        vars:
+            - name: ansible_password
+            - name: ansible_httpapi_password
+    validate_certs:
+        description: Validate the certificate of the firewall.
+        type: bool
+        default: true
+        vars:
+            - name: ansible_httpapi_validate_certs
+"""
+
+EXAMPLES = r"""
+- name: Create the host only if it does not exist yet
+  sophos.sophos_firewall.sfos_ip_host:
+    name: TESTHOST
+    ip_address: 10.10.10.10
+    state: present
+  when: not query('sophos.sophos_firewall.sfos_object', 'IPHost', name='TESTHOST')
+
+- name: List the names of all LAN zones
+  ansible.builtin.debug:
+    msg: "{{ query('sophos.sophos_firewall.sfos_object', 'Zone', filter={'Type': 'LAN'}) | map(attribute='Name') }}"
+
+- name: Look up several services, reusing the cached service list for each
+  ansible.builtin.debug:
+    msg: "{{ query('sophos.sophos_firewall.sfos_object', 'Services', name=item) }}"
+  loop:
+    - HTTP
+    - HTTPS
+"""
+
+RETURN = r"""
+_raw:
+    description: Objects matching the name or filter, as returned by the API.
+    type: list
+    elements: dict
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+
+# Object lists fetched by this process, keyed by (host, port, xml_tag)
+_MEMO = {}
+
+
+def ensure_list(source):
+    """Convert a provided dict to a list containing the dict if not already a list."""
+    if source is None:
+        return []
+    if isinstance(source, list):
+        return source
+    return [source]
+
+
+def get_path(entity, key):
+    """Return the value of a dotted key in an object returned by the API."""
+    value = entity
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class LookupModule(LookupBase):
+    """Lookup plugin for objects on Sophos Firewall"""
+
+    def _cache_file(self, host, port, xml_tag):
+        """Path of the on-disk cache file for an object list."""
+        key = re.sub(r"[^A-Za-z0-9_.-]", "_", "{0}_{1}_{2}".format(host, port, xml_tag))
+        return os.path.join(os.path.expanduser(self.get_option("cache_dir")), key + ".json")
+
+    def _read_cache(self, path, ttl):
+        """Return the cached object list if it has not expired, otherwise None."""
+        try:
+            with open(path, "r") as cache_file:
+                cached = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - cached.get("fetched", 0) > ttl:
+            return None
+        return cached
+
+    def _write_cache(self, path, cached):
+        """Store an object list in the on-disk cache, readable only by the current user."""
+        directory = os.path.dirname(path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(cached, cache_file)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as error:
+            self._display.warning("Unable to write sfos_object cache {0}: {1}".format(path, error))
+
+    def _fetch(self, xml_tag):
+        """Retrieve all objects for an XML tag from the firewall."""
+        client = SophosFirewall(
+            self.get_option("username"),
+            self.get_option("password"),
+            self.get_option("host"),
+            self.get_option("port"),
+            self.get_option("validate_certs"),
+        )
+        try:
+            resp = client.get_tag(xml_tag=xml_tag)
+        except SophosFirewallZeroRecords:
+            return []
+        except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
+            raise AnsibleLookupError("Unable to retrieve {0}: {1}".format(xml_tag, error))
+
+        entries = ensure_list(resp["Response"].get(xml_tag))
+        return [entity for entity in entries if isinstance(entity, dict) and "Status" not in entity]
+
+    def get_objects(self, xml_tag):
+        """Return all objects for an XML tag, using the memoized or cached list when valid."""
+        host = self.get_option("host")
+        port = self.get_option("port")
+        ttl = self.get_option("ttl")
+        refresh = self.get_option("refresh")
+        memo_key = (host, port, xml_tag)
+
+        memo = _MEMO.get(memo_key)
+        if memo and not refresh and time.time() - memo["fetched"] <= ttl:
+            return memo["objects"]
+
+        path = self._cache_file(host, port, xml_tag)
+        cached = None if refresh or not ttl else self._read_cache(path, ttl)
+        if cached is None:
+            cached = {"fetched": time.time(), "objects": self._fetch(xml_tag)}
+            if ttl:
+                self._write_cache(path, cached)
+
+        _MEMO[memo_key] = cached
+        return cached["objects"]
+
+    def run(self, terms, variables=None, **kwargs):
+        if not PREREQ_MET["result"]:
+            raise AnsibleLookupError("The sfos_object lookup requires {0}".format(PREREQ_MET["missing_module"]))
+
+        self.set_options(var_options=variables, direct=kwargs)
+
+        if not self.get_option("host"):
+            raise AnsibleLookupError("The sfos_object lookup requires the host option or the ansible_host variable")
+
+        name = self.get_option("name")
+        filters = self.get_option("filter") or {}
+
+        ret = []
+        for xml_tag in terms:
+            for entity in self.get_objects(xml_tag):
+                if name is not None and entity.get("Name") != name:
+                    continue
+                if any(str(get_path(entity, key)) != str(value) for key, value in filters.items()):
+                    continue
+                ret.append(entity)
+        return ret
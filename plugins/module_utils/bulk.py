@@ -0,0 +1,179 @@
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Fetch, batch and report helpers shared by the bulk reconciliation modules.
+
+A bulk module retrieves every object of its XML tags with get_existing(), compares them with the
+desired objects itself, and passes the resulting changes to apply_changes(). Changes are tuples of
+XML tag, operation (add, update or remove) and the list of (name, entity) pairs, in the order they
+should be sent. report_changes() then fills in the module result.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+
+OUTCOMES = {"add": "created", "update": "updated", "remove": "removed"}
+
+
+def ensure_list(source):
+    """Convert a provided dict to a list containing the dict if not already a list.
+
+    Args:
+        source (dict or list): Source dictionary or list.
+
+    Returns:
+        list: Returns the dictionary inside a list, or just returns the original list.
+    """
+    if source is None:
+        return []
+    if isinstance(source, list):
+        return source
+    return [source]
+
+
+def get_existing(connection, module, result, xml_tags):
+    """Retrieve all objects of the given XML tags, with one request for each XML tag.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        xml_tags (list): XML tags to retrieve
+
+    Returns:
+        dict: Objects keyed by name, for each XML tag
+    """
+    try:
+        responses = connection.get_tags(xml_tags, trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    existing = {}
+    for xml_tag in xml_tags:
+        resp = responses[xml_tag]
+        record_trace(result, resp)
+        if not resp["success"]:
+            module.fail_json(msg="Unable to retrieve {0}: {1}".format(xml_tag, resp["response"]), **result)
+        entities = ensure_list(resp["response"]["Response"].get(xml_tag)) if resp["exists"] else []
+        existing[xml_tag] = dict((entity["Name"], entity) for entity in entities
+                                 if isinstance(entity, dict) and "Name" in entity)
+    return existing
+
+
+def failed_objects(response, xml_tag, names):
+    """Return the objects which the firewall did not accept in a response holding one status per object.
+
+    Args:
+        response (dict): API response
+        xml_tag (str): Response element holding the status of each object
+        names (list): Names of the objects, in the order they were sent
+
+    Returns:
+        list: Name and message of each object which failed
+    """
+    statuses = ensure_list(response["Response"].get(xml_tag))
+    return [{"name": name, "msg": status["Status"].get("#text")}
+            for name, status in zip(names, statuses)
+            if isinstance(status, dict) and isinstance(status.get("Status"), dict)
+            and not str(status["Status"].get("@code", "")).startswith("2")]
+
+
+def send_batch(connection, module, result, xml_tag, operation, batch, summary, status_tag=None):
+    """Send a batch of objects in a single request and record the outcome of each object.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        xml_tag (str): XML tag of the objects
+        operation (str): add, update or remove
+        batch (list): Tuples of name and entity
+        summary (dict): Names of the objects created, updated, removed and failed
+        status_tag (str): Response element holding the status of each object, when it is not xml_tag.
+            Use False when the response does not hold one status per object, in which case an error
+            anywhere in the response fails the whole batch.
+    """
+    if module.check_mode:
+        statuses = [None] * len(batch)
+    else:
+        try:
+            if operation == "remove":
+                resp = connection.remove_entities(xml_tag, [name for name, entity in batch],
+                                                  trace=module._verbosity >= 3)
+            else:
+                resp = connection.submit_entities([entity for name, entity in batch], set_operation=operation,
+                                                  trace=module._verbosity >= 3)
+        except Exception as error:
+            module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+        record_trace(result, resp)
+
+        if not resp["success"]:
+            statuses = [{"@code": "", "#text": resp["response"]}] * len(batch)
+        elif status_tag is False:
+            errors = [entry["Status"] for tag, entries in resp["response"]["Response"].items()
+                      if not tag.startswith("@") and tag != "Login" for entry in ensure_list(entries)
+                      if isinstance(entry, dict) and isinstance(entry.get("Status"), dict)
+                      and not str(entry["Status"].get("@code", "")).startswith("2")]
+            statuses = [{"@code": "", "#text": str(errors)} if errors else None] * len(batch)
+        else:
+            statuses = [status.get("Status") if isinstance(status, dict) else None
+                        for status in ensure_list(resp["response"]["Response"].get(status_tag or xml_tag))]
+            statuses += [None] * (len(batch) - len(statuses))
+
+    for (name, entity), status in zip(batch, statuses):
+        if isinstance(status, dict) and not str(status.get("@code", "")).startswith("2"):
+            summary["failed"].append({"xml_tag": xml_tag, "name": name, "operation": operation,
+                                      "msg": status.get("#text") or str(status)})
+        else:
+            summary[OUTCOMES[operation]][xml_tag].append(name)
+
+
+def apply_changes(connection, module, result, xml_tags, changes, batch_size):
+    """Send the planned changes in batches of at most batch_size objects.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        xml_tags (list): XML tags managed by the module
+        changes (list): Tuples of XML tag, operation and the list of (name, entity) pairs
+        batch_size (int): Maximum number of objects sent in a single request
+
+    Returns:
+        dict: Names of the objects created, updated and removed keyed by XML tag, and the objects which failed
+    """
+    summary = {"failed": []}
+    for outcome in OUTCOMES.values():
+        summary[outcome] = dict((xml_tag, []) for xml_tag in xml_tags)
+
+    for xml_tag, operation, items in changes:
+        for start in range(0, len(items), batch_size):
+            send_batch(connection, module, result, xml_tag, operation, items[start:start + batch_size], summary)
+    return summary
+
+
+def report_changes(module, result, xml_tags, summary, unchanged, outcomes=("created", "updated", "removed")):
+    """Add the outcome of apply_changes() to the module result, failing the module if any object failed.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        xml_tags (list): XML tags managed by the module
+        summary (dict): Return value of apply_changes()
+        unchanged (dict): Number of desired objects left unchanged, keyed by XML tag
+        outcomes (tuple): Outcomes reported by the module
+    """
+    result["api_response"] = {}
+    for outcome in outcomes:
+        result[outcome] = summary[outcome]
+        result["api_response"][outcome] = dict((xml_tag, len(summary[outcome][xml_tag])) for xml_tag in xml_tags)
+    result["api_response"]["unchanged"] = unchanged
+    result["api_response"]["failed"] = len(summary["failed"])
+    result["changed"] = any(names for outcome in outcomes for names in summary[outcome].values())
+
+    if summary["failed"]:
+        result["failed_objects"] = summary["failed"]
+        module.fail_json(msg="{0} object(s) could not be applied".format(len(summary["failed"])), **result)
@@ -0,0 +1,32 @@
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Helpers shared by the certificate and certificate authority modules."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+# Element of the Certificate and CertificateAuthority entities returned by the firewall
+# holding the fingerprint of the installed certificate
+FINGERPRINT_ELEMENT = "Fingerprint"
+
+
+def installed_fingerprint(entity):
+    """Return the SHA-256 fingerprint reported for an installed certificate or certificate authority.
+
+    Args:
+        entity (dict): Certificate or CertificateAuthority returned by the firewall
+
+    Returns:
+        str: Fingerprint as upper case hex without separators, or None if no SHA-256 fingerprint is reported
+    """
+    value = entity.get(FINGERPRINT_ELEMENT)
+    if not isinstance(value, str):
+        return None
+    fingerprint = re.sub(r"[^0-9A-Fa-f]", "", value).upper()
+    if len(fingerprint) != 64:
+        return None
+    return fingerprint
@@ -0,0 +1,91 @@
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Controller side state file recording salted hashes of the secrets written by a module.
+
+Secrets stored on the firewall are encrypted, so the bulk modules cannot compare them with the
+desired secrets. Instead they record a PBKDF2 hash of each secret they write in a JSON file on the
+controller, under a section named after the objects it holds, and compare new secrets with it.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+
+# Iterations used to hash the secrets recorded in the state file
+SECRET_HASH_ITERATIONS = 10000
+
+
+def secret_hash(secret, salt):
+    """Hash a secret for the state file.
+
+    Args:
+        secret (str): Password or preshared key
+        salt (bytes): Salt
+
+    Returns:
+        str: Salt and hash, base64 encoded and separated by a dollar sign
+    """
+    digest = hashlib.pbkdf2_hmac("sha256", secret.encode("utf-8"), salt, SECRET_HASH_ITERATIONS)
+    return "{0}${1}".format(base64.b64encode(salt).decode(), base64.b64encode(digest).decode())
+
+
+def secret_matches(secret, recorded):
+    """Check a secret against a hash from the state file."""
+    try:
+        salt = base64.b64decode(recorded.split("$", 1)[0])
+    except (binascii.Error, AttributeError):
+        return False
+    return hmac.compare_digest(secret_hash(secret, salt), recorded)
+
+
+def load_state(module, option, section):
+    """Read the state recorded by earlier runs.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        option (str): Module option holding the path of the state file
+        section (str): Key of the file holding the state of the module, for example users
+
+    Returns:
+        dict: Recorded state keyed by object name
+    """
+    path = module.params.get(option)
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as state_file:
+            return json.load(state_file).get(section, {})
+    except (IOError, OSError, ValueError) as error:
+        module.fail_json(msg="Unable to read {0} {1}: {2}".format(option, path, error))
+
+
+def save_state(module, option, section, state):
+    """Write the state, readable by the current user only.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        option (str): Module option holding the path of the state file
+        section (str): Key of the file holding the state of the module, for example users
+        state (dict): State keyed by object name
+    """
+    path = module.params.get(option)
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w") as state_file:
+            json.dump({section: state}, state_file)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as error:
+        module.warn("Unable to write {0} {1}: {2}".format(option, path, error))
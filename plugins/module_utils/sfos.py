@@ -0,0 +1,44 @@
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Helpers shared by the Sophos Firewall modules."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+def record_trace(result, resp):
+    """Add the requests traced by the connection, if tracing is enabled, to the module result."""
+    if resp.get("trace"):
+        result.setdefault("trace", []).extend(resp["trace"])
+
+
+def get_api_version(connection, module, result, api_response=None):
+    """Get the API version of the Sophos Firewall.
+
+    The version is read from the @APIVersion attribute of a response already received. The httpapi
+    plugin is only asked for it when there is no such response, for example when the object
+    retrieved does not exist.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        api_response (dict): API response received from the firewall, if any
+
+    Returns:
+        str: API version, for example 2200.1
+    """
+    if isinstance(api_response, dict) and api_response.get("Response", {}).get("@APIVersion"):
+        return api_response["Response"]["@APIVersion"]
+
+    try:
+        resp = connection.get_capabilities()
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    return resp["response"]["api_version"]
@@ -192,11 +192,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -214,6 +209,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_admin_settings(connection, module, result):
@@ -241,230 +237,146 @@ def get_admin_settings(connection, module, result):
     return {"exists": True, "api_response": resp["response"]}
 
 
-def update_admin_settings(connection, module, result):
-    """Update admin settings on Sophos Firewall
+# Settings as (option, suboption, XML path under AdminSettings), in the order of the AdminSettings element.
+# Options which are not dictionaries use None as the suboption.
+ADMIN_SETTINGS = (
+    ("hostname_settings", "hostname", ("HostnameSettings", "HostName")),
+    ("hostname_settings", "description", ("HostnameSettings", "HostNameDesc")),
+    ("webadmin_settings", "certificate", ("WebAdminSettings", "Certificate")),
+    ("webadmin_settings", "https_port", ("WebAdminSettings", "HTTPSport")),
+    ("webadmin_settings", "userportal_https_port", ("WebAdminSettings", "UserPortalHTTPSPort")),
+    ("webadmin_settings", "vpnportal_https_port", ("WebAdminSettings", "VPNPortalHTTPSPort")),
+    ("webadmin_settings", "portal_redirect_mode", ("WebAdminSettings", "PortalRedirectMode")),
+    ("webadmin_settings", "portal_custom_hostname", ("WebAdminSettings", "PortalCustomHostname")),
+    ("login_security", "logout_session", ("LoginSecurity", "LogoutSession")),
+    ("login_security", "block_login", ("LoginSecurity", "BlockLogin")),
+    ("login_security", "unsuccessful_attempt", ("LoginSecurity", "BlockLoginSettings", "UnsucccessfulAttempt")),
+    ("login_security", "duration", ("LoginSecurity", "BlockLoginSettings", "Duration")),
+    ("login_security", "minutes", ("LoginSecurity", "BlockLoginSettings", "ForMinutes")),
+    ("password_complexity", "complexity_check", ("PasswordComplexitySettings", "PasswordComplexityCheck")),
+    ("password_complexity", "enforce_min_length", ("PasswordComplexitySettings", "PasswordComplexity", "MinimumPasswordLength")),
+    ("password_complexity", "include_alpha", ("PasswordComplexitySettings", "PasswordComplexity", "IncludeAlphabeticCharacters")),
+    ("password_complexity", "include_numeric", ("PasswordComplexitySettings", "PasswordComplexity", "IncludeNumericCharacter")),
+    ("password_complexity", "include_special", ("PasswordComplexitySettings", "PasswordComplexity", "IncludeSpecialCharacter")),
+    ("password_complexity", "min_length", ("PasswordComplexitySettings", "PasswordComplexity", "MinimumPasswordLengthValue")),
+    ("login_disclaimer", None, ("LoginDisclaimer",)),
+)
+
+# Values used by the firewall when block login is enabled without the block login settings
+BLOCK_LOGIN_DEFAULTS = {"UnsucccessfulAttempt": "5", "Duration": "5", "ForMinutes": "60"}
+
+
+def lookup(source, path):
+    """Return the value at a path of keys in nested dictionaries.
 
     Args:
-        connection (Connection): Ansible Connection object
-        module (AnsibleModule): AnsibleModule object
-        result (dict): Result output to be sent to the console
+        source (dict): Nested dictionaries
+        path (tuple): Keys to follow
 
     Returns:
-        dict: API response
+        Value at the path, or None if any key is missing
     """
-    resp_list = []
-
-    hostname_settings = module.params.get("hostname_settings", {})
-    if hostname_settings:
-        resp_list.append(
-            update_request(
-                module, result, connection, "update_hostname_settings", **hostname_settings
-            )
-        )
-
-    webadmin_settings = module.params.get("webadmin_settings", {})
-    if webadmin_settings:
-        resp_list.append(
-            update_request(
-                module, result, connection, "update_webadmin_settings", **webadmin_settings
-            )
-        )
-
-    login_security = module.params.get("login_security", {})
-    if login_security:
-        resp_list.append(
-            update_request(
-                module, result, connection, "update_loginsecurity_settings", **login_security
-            )
-        )
-
-    password_complexity = module.params.get("password_complexity", {})
-    if password_complexity:
-        resp_list.append(
-            update_request(
-                module,
-                result,
-                connection,
-                "update_passwordcomplexity_settings",
-                **password_complexity
-            )
-        )
-
-    login_disclaimer_setting = module.params.get("login_disclaimer")
-    if login_disclaimer_setting:
-        login_disclaimer = (
-            {"enabled": True}
-            if login_disclaimer_setting == "Enable"
-            else {"enabled": False}
-        )
-        resp_list.append(
-            update_request(
-                module, result, connection, "update_login_disclaimer", **login_disclaimer
-            )
-        )
-
-    return resp_list
-
-
-def update_request(module, result, connection, method, **args):
-    """Generate the update request using the SDK.
+    for key in path:
+        if not isinstance(source, dict):
+            return None
+        source = source.get(key)
+    return source
+
+
+def requested_value(params, option, suboption):
+    """Return the value given to the module for a setting.
 
     Args:
-        module (AnsibleModule): AnsibleModule object
-        result (dict): Result output to be sent to the console
-        connection (Connection): Ansible Connection object
-        method (method): SophosFirewall object method to be used for the request
+        params (dict): Module arguments
+        option (str): Option name
+        suboption (str): Suboption name, or None
 
     Returns:
-        list: List of API responses
+        str: Requested value, or None if the setting was not given
     """
-    try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk(method, module_args=args)
-    except Exception as error:
-        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+    value = params.get(option)
+    if suboption is not None:
+        value = (value or {}).get(suboption)
+    return value
 
-    if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
-    return resp["response"]
+def changed_sections(params, exist_settings):
+    """Work out which AdminSettings sections have a setting that differs from the existing settings.
+
+    Args:
+        params (dict): Module arguments
+        exist_settings (dict): Existing AdminSettings
+
+    Returns:
+        list: Names of the changed sections, in the order of the AdminSettings element
+    """
+    sections = []
+    for option, suboption, xml_path in ADMIN_SETTINGS:
+        value = requested_value(params, option, suboption)
+        if value is not None and value != lookup(exist_settings, xml_path) and xml_path[0] not in sections:
+            sections.append(xml_path[0])
+    return sections
+
+
+def admin_settings_entity(params, exist_settings, sections):
+    """Build one AdminSettings entity holding the changed sections.
+
+    Each changed section is sent in full, with the settings which were not given keeping their
+    existing values. Unchanged sections are left out.
 
+    Args:
+        params (dict): Module arguments
+        exist_settings (dict): Existing AdminSettings
+        sections (list): Sections returned by changed_sections()
 
-def eval_changed(module, exist_settings):
-    """Evaluate the provided arguments against existing settings.
+    Returns:
+        dict: AdminSettings entity
+    """
+    entity = {}
+    for option, suboption, xml_path in ADMIN_SETTINGS:
+        if xml_path[0] not in sections:
+            continue
+        value = requested_value(params, option, suboption)
+        if value is None:
+            value = lookup(exist_settings, xml_path)
+        if value is None and xml_path[-2:-1] == ("BlockLoginSettings",):
+            value = BLOCK_LOGIN_DEFAULTS[xml_path[-1]]
+        parent = entity
+        for element in xml_path[:-1]:
+            parent = parent.setdefault(element, {})
+        parent[xml_path[-1]] = value
+
+    login_security = entity.get("LoginSecurity")
+    if login_security and login_security.get("BlockLogin") != "Enable":
+        del login_security["BlockLoginSettings"]
+
+    return {"AdminSettings": entity}
+
+
+def update_admin_settings(connection, module, result, exist_settings):
+    """Update admin settings on Sophos Firewall with a single request.
 
     Args:
+        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
-        exist_settings (dict): Response from the call to get_admin_settings()
+        result (dict): Result output to be sent to the console
+        exist_settings (dict): Existing AdminSettings
 
     Returns:
-        bool: Return true if any settings are different, otherwise return false
+        dict: API response
     """
-    exist_settings = exist_settings["api_response"]["Response"]["AdminSettings"]
-
-    hostname_settings = module.params.get("hostname_settings", {})
-    if hostname_settings:
-        hostname = module.params["hostname_settings"].get("hostname")
-        description = module.params["hostname_settings"].get("description")
-        if (
-            hostname
-            and not hostname == exist_settings["HostnameSettings"]["HostName"]
-            or description
-            and not description == exist_settings["HostnameSettings"]["HostNameDesc"]
-        ):
-            return True
-
-    webadmin_settings = module.params.get("webadmin_settings", {})
-    if webadmin_settings:
-        certificate = module.params["webadmin_settings"].get("certificate")
-        https_port = module.params["webadmin_settings"].get("https_port")
-        userportal_https_port = module.params["webadmin_settings"].get(
-            "userportal_https_port"
-        )
-        vpnportal_https_port = module.params["webadmin_settings"].get(
-            "vpnportal_https_port"
-        )
-        portal_redirect_mode = module.params["webadmin_settings"].get(
-            "portal_redirect_mode"
-        )
-        portal_custom_hostname = module.params["webadmin_settings"].get(
-            "portal_custom_hostname"
-        )
-        if (
-            certificate
-            and not certificate == exist_settings["WebAdminSettings"]["Certificate"]
-            or https_port
-            and not https_port == exist_settings["WebAdminSettings"]["HTTPSport"]
-            or userportal_https_port
-            and not userportal_https_port
-            == exist_settings["WebAdminSettings"]["UserPortalHTTPSPort"]
-            or vpnportal_https_port
-            and not vpnportal_https_port
-            == exist_settings["WebAdminSettings"]["VPNPortalHTTPSPort"]
-            or portal_redirect_mode
-            and not portal_redirect_mode
-            == exist_settings["WebAdminSettings"]["PortalRedirectMode"]
-            or portal_custom_hostname
-            and not portal_custom_hostname
-            == exist_settings["WebAdminSettings"]["PortalCustomHostname"]
-        ):
-            return True
-
-    login_security = module.params.get("login_security", {})
-    if login_security:
-        logout_session = module.params["login_security"].get("logout_session")
-        block_login = module.params["login_security"].get("block_login")
-        unsuccessful_attempt = module.params["login_security"].get(
-            "unsuccessful_attempt"
-        )
-        duration = module.params["login_security"].get("duration")
-        minutes = module.params["login_security"].get("minutes")
-        if (
-            logout_session
-            and not logout_session == exist_settings["LoginSecurity"]["LogoutSession"]
-            or block_login
-            and not block_login == exist_settings["LoginSecurity"]["BlockLogin"]
-            or unsuccessful_attempt
-            and not unsuccessful_attempt
-            == exist_settings["LoginSecurity"]["BlockLoginSettings"][
-                "UnsucccessfulAttempt"
-            ]
-            or duration
-            and not duration
-            == exist_settings["LoginSecurity"]["BlockLoginSettings"]["Duration"]
-            or minutes
-            and not minutes
-            == exist_settings["LoginSecurity"]["BlockLoginSettings"]["ForMinutes"]
-        ):
-            return True
-
-    password_complexity = module.params.get("password_complexity", {})
-    if password_complexity:
-        complexity_check = module.params["password_complexity"].get("complexity_check")
-        enforce_min_length = module.params["password_complexity"].get(
-            "enforce_min_length"
-        )
-        include_alpha = module.params["password_complexity"].get("include_alpha")
-        include_numeric = module.params["password_complexity"].get("include_numeric")
-        include_special = module.params["password_complexity"].get("include_special")
-        min_length = module.params["password_complexity"].get("min_length")
-        if (
-            complexity_check
-            and not complexity_check
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexityCheck"]
-            or enforce_min_length
-            and not enforce_min_length
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexity"][
-                "MinimumPasswordLength"
-            ]
-            or include_alpha
-            and not include_alpha
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexity"][
-                "IncludeAlphabeticCharacters"
-            ]
-            or include_numeric
-            and not include_numeric
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexity"][
-                "IncludeNumericCharacter"
-            ]
-            or include_special
-            and not include_special
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexity"][
-                "IncludeSpecialCharacter"
-            ]
-            or min_length
-            and not min_length
-            == exist_settings["PasswordComplexitySettings"]["PasswordComplexity"][
-                "MinimumPasswordLengthValue"
-            ]
-        ):
-            return True
-
-    login_disclaimer = module.params.get("login_disclaimer")
-    if login_disclaimer and not login_disclaimer == exist_settings["LoginDisclaimer"]:
-        return True
-
-    return False
+    entity = admin_settings_entity(module.params, exist_settings, changed_sections(module.params, exist_settings))
+    try:
+        resp = connection.submit_entities([entity], set_operation="update", trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+
+    return resp["response"]
 
 
 def main():
@@ -554,26 +466,25 @@ def main():
         module.exit_json(**result)
 
     elif state == "updated":
-        if eval_changed(module, exist_settings):
-            api_response = update_admin_settings(connection, module, result)
-
-            result["api_response"] = []
-            if api_response:
-                for response in api_response:
-                    for xml_tag in [
-                        "LoginDisclaimer",
-                        "HostnameSettings",
-                        "WebAdminSettings",
-                        "LoginSecurity",
-                        "PasswordComplexitySettings",
-                    ]:
-                        if xml_tag in response["Response"]:
-                            if (
-                                response["Response"][xml_tag]["Status"]["#text"]
-                                == "Configuration applied successfully."
-                            ):
-                                result["changed"] = True
-                            result["api_response"].append(response)
+        exist_admin_settings = exist_settings["api_response"]["Response"]["AdminSettings"]
+        if changed_sections(module.params, exist_admin_settings):
+            api_response = update_admin_settings(connection, module, result, exist_admin_settings)
+
+            result["api_response"] = [api_response]
+            for xml_tag in [
+                "AdminSettings",
+                "LoginDisclaimer",
+                "HostnameSettings",
+                "WebAdminSettings",
+                "LoginSecurity",
+                "PasswordComplexitySettings",
+            ]:
+                if xml_tag in api_response["Response"]:
+                    if (
+                        api_response["Response"][xml_tag]["Status"]["#text"]
+                        == "Configuration applied successfully."
+                    ):
+                        result["changed"] = True
 
     module.exit_json(**result)
 
@@ -113,9 +113,6 @@ api_response:
     returned: always
 
 '''
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -133,6 +130,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_ad_settings(connection, module, result):
@@ -171,29 +169,6 @@ def create_ad(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <ActiveDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ ad_port }}</Port>
-		  <NetBIOSDomain>{{ netbiosdomain }}</NetBIOSDomain>
-          <ADSUsername>{{ ad_username }}</ADSUsername>
-          <Password>{{ ad_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-          <ValidCertReq>{{ validcertreq }}</ValidCertReq>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-		  <DomainName>{{ domainname }}</DomainName>
-          <SearchQueries>
-          {% for item in searchqueries %}
-           <Query>{{ item }}</Query>
-        {% endfor %}
-          </SearchQueries>
-	      </ActiveDirectory>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -210,16 +185,14 @@ def create_ad(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_ad_server",
+                                          template_vars=template_vars,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -236,29 +209,6 @@ def update_ad_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <ActiveDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ ad_port }}</Port>
-		  <NetBIOSDomain>{{ netbiosdomain }}</NetBIOSDomain>
-          <ADSUsername>{{ ad_username }}</ADSUsername>
-          <Password>{{ ad_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-          <ValidCertReq>{{ validcertreq }}</ValidCertReq>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-		  <DomainName>{{ domainname }}</DomainName>
-          <SearchQueries>
-          {% for item in searchqueries %}
-           <Query>{{ item }}</Query>
-        {% endfor %}
-          </SearchQueries>
-	      </ActiveDirectory>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -275,17 +225,15 @@ def update_ad_add(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_ad_server",
+                                          template_vars=template_vars,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -303,29 +251,6 @@ def update_ad_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <ActiveDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ ad_port }}</Port>
-		  <NetBIOSDomain>{{ netbiosdomain }}</NetBIOSDomain>
-          <ADSUsername>{{ ad_username }}</ADSUsername>
-          <Password>{{ ad_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-          <ValidCertReq>{{ validcertreq }}</ValidCertReq>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-		  <DomainName>{{ domainname }}</DomainName>
-          <SearchQueries>
-          {% for item in searchqueries %}
-           <Query>{{ item }}</Query>
-        {% endfor %}
-          </SearchQueries>
-	      </ActiveDirectory>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -342,17 +267,15 @@ def update_ad_update(connection, module, result):
     }
   
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_ad_server",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -521,31 +444,20 @@ def remove_ad(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AuthenticationServer>
-            <ActiveDirectory>
-		    <ServerName>{{ name }}</ServerName>
-            </ActiveDirectory>
-            </AuthenticationServer>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_ad_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
     
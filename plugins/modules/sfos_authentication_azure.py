@@ -122,9 +122,6 @@ api_response:
     returned: always
 
 '''
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -142,6 +139,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_azure_settings(connection, module, result):
@@ -180,33 +178,6 @@ def create_azure(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AzureADSSO>
-          <ServerName>{{ name }}</ServerName>
-          <ApplicationID>{{ applicationid }}</ApplicationID>
-          <TenantID>{{ tenantid }}</TenantID>
-          <ClientSecret>{{ clientsecret }}</ClientSecret>
-          <RedirectURI>{{ redirecturi }}</RedirectURI>
-          <DisplayName>{{ displayname }}</DisplayName>
-          <EmailAddress>{{ emailaddress }}</EmailAddress>
-          <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-          <UserType>{{ usertype }}</UserType>
-          <RoleMapping>
-          <IdentifierTypeAndProfile>
-          {% for item in identifiertype %}
-           <identifiertype>{{ item }}</identifiertype>
-          {% endfor %}
-          {% for item in identifiervalue %}
-           <identifiervalue>{{ item }}</identifiervalue>
-          {% endfor %}
-          {% for item in profileid %}
-           <profileid>{{ item }}</profileid>
-          {% endfor %}
-          </IdentifierTypeAndProfile>
-          </RoleMapping>
-        </AzureADSSO>
-    
-    """
     template_vars = {
         "name": module.params.get("servername", {}),
         "applicationid": module.params.get("applicationid", {}),
@@ -224,16 +195,14 @@ def create_azure(connection, module, result):
 
     try:
         
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_server",
+                                          template_vars=template_vars,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -250,20 +219,6 @@ def create_azure_user(connection, module, result):
         Returns:
             dict: API response
         """
-        payload2 = """
-            <AzureADSSO>
-            <ServerName>{{ name }}</ServerName>
-            <ApplicationID>{{ applicationid }}</ApplicationID>
-            <TenantID>{{ tenantid }}</TenantID>
-            <ClientSecret>{{ clientsecret }}</ClientSecret>
-            <RedirectURI>{{ redirecturi }}</RedirectURI>
-            <DisplayName>{{ displayname }}</DisplayName>
-            <EmailAddress>{{ emailaddress }}</EmailAddress>
-            <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-            <UserType>{{ usertype }}</UserType>
-            </AzureADSSO>
-        
-        """
         template_vars2 = {
             "name": module.params.get("servername", {}),
             "applicationid": module.params.get("applicationid", {}),
@@ -277,16 +232,14 @@ def create_azure_user(connection, module, result):
         }
         try:
             
-            with contextlib.redirect_stdout(output_buffer):
-                resp = connection.invoke_sdk("submit_xml", module_args={
-                    "template_data": payload2,
-                    "template_vars": template_vars2,
-                    "debug": True
-                    }
-                )
+            resp = connection.submit_template("authentication_azure_user",
+                                              template_vars=template_vars2,
+                                              trace=module._verbosity >= 3)
         except Exception as error:
             module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+        record_trace(result, resp)
+
         if not resp["success"]:
             module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -303,33 +256,6 @@ def update_azure_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AzureADSSO>
-          <ServerName>{{ name }}</ServerName>
-          <ApplicationID>{{ applicationid }}</ApplicationID>
-          <TenantID>{{ tenantid }}</TenantID>
-          <ClientSecret>{{ clientsecret }}</ClientSecret>
-          <RedirectURI>{{ redirecturi }}</RedirectURI>
-          <DisplayName>{{ displayname }}</DisplayName>
-          <EmailAddress>{{ emailaddress }}</EmailAddress>
-          <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-          <UserType>{{ usertype }}</UserType>
-          <RoleMapping>
-          <IdentifierTypeAndProfile>
-          {% for item in identifiertype %}
-           <identifiertype>{{ item }}</identifiertype>
-          {% endfor %}
-          {% for item in identifiervalue %}
-           <identifiervalue>{{ item }}</identifiervalue>
-          {% endfor %}
-          {% for item in profileid %}
-           <profileid>{{ item }}</profileid>
-          {% endfor %}
-          </IdentifierTypeAndProfile>
-          </RoleMapping>
-        </AzureADSSO>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "applicationid": module.params.get("applicationid"),
@@ -346,17 +272,15 @@ def update_azure_add(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_server",
+                                          template_vars=template_vars,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -373,20 +297,6 @@ def update_azure_add_user(connection, module, result):
     Returns:
         dict: API response
     """
-    payload2 = """
-            <AzureADSSO>
-            <ServerName>{{ name }}</ServerName>
-            <ApplicationID>{{ applicationid }}</ApplicationID>
-            <TenantID>{{ tenantid }}</TenantID>
-            <ClientSecret>{{ clientsecret }}</ClientSecret>
-            <RedirectURI>{{ redirecturi }}</RedirectURI>
-            <DisplayName>{{ displayname }}</DisplayName>
-            <EmailAddress>{{ emailaddress }}</EmailAddress>
-            <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-            <UserType>{{ usertype }}</UserType>
-            </AzureADSSO>
-        
-        """
     template_vars2 = {
             "name": module.params.get("servername", {}),
             "applicationid": module.params.get("applicationid", {}),
@@ -400,17 +310,15 @@ def update_azure_add_user(connection, module, result):
         }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload2,
-                "template_vars": template_vars2,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_user",
+                                          template_vars=template_vars2,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -427,33 +335,6 @@ def update_azure_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AzureADSSO>
-          <ServerName>{{ name }}</ServerName>
-          <ApplicationID>{{ applicationid }}</ApplicationID>
-          <TenantID>{{ tenantid }}</TenantID>
-          <ClientSecret>{{ clientsecret }}</ClientSecret>
-          <RedirectURI>{{ redirecturi }}</RedirectURI>
-          <DisplayName>{{ displayname }}</DisplayName>
-          <EmailAddress>{{ emailaddress }}</EmailAddress>
-          <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-          <UserType>{{ usertype }}</UserType>
-          <RoleMapping>
-          <IdentifierTypeAndProfile>
-          {% for item in identifiertype %}
-           <identifiertype>{{ item }}</identifiertype>
-          {% endfor %}
-          {% for item in identifiervalue %}
-           <identifiervalue>{{ item }}</identifiervalue>
-          {% endfor %}
-          {% for item in profileid %}
-           <profileid>{{ item }}</profileid>
-          {% endfor %}
-          </IdentifierTypeAndProfile>
-          </RoleMapping>
-        </AzureADSSO>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "applicationid": module.params.get("applicationid"),
@@ -470,17 +351,15 @@ def update_azure_update(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_server",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -497,20 +376,6 @@ def update_azure_update_user(connection, module, result):
     Returns:
         dict: API response
     """
-    payload2 = """
-            <AzureADSSO>
-            <ServerName>{{ name }}</ServerName>
-            <ApplicationID>{{ applicationid }}</ApplicationID>
-            <TenantID>{{ tenantid }}</TenantID>
-            <ClientSecret>{{ clientsecret }}</ClientSecret>
-            <RedirectURI>{{ redirecturi }}</RedirectURI>
-            <DisplayName>{{ displayname }}</DisplayName>
-            <EmailAddress>{{ emailaddress }}</EmailAddress>
-            <FallbackUserGroup>{{ fallbackusergroup }}</FallbackUserGroup>
-            <UserType>{{ usertype }}</UserType>
-            </AzureADSSO>
-        
-        """
     template_vars2 = {
             "name": module.params.get("servername", {}),
             "applicationid": module.params.get("applicationid", {}),
@@ -524,17 +389,15 @@ def update_azure_update_user(connection, module, result):
         }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload2,
-                "template_vars": template_vars2,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_user",
+                                          template_vars=template_vars2,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -757,34 +620,26 @@ def remove_azure(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AzureADSSO>
-		    <ServerName>{{ name }}</ServerName>
-            </AzureADSSO>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_azure_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
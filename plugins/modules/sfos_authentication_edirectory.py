@@ -94,9 +94,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -114,6 +111,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_edirectory_settings(connection, module, result):
@@ -151,22 +149,6 @@ def create_edirectory(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <EDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerIpDomain>{{ serveripdomain }}</ServerIpDomain>
-		  <Port>{{ port_edir }}</Port>
-		  <Username>{{ binddn }}</Username>
-          <Password>{{ dn_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ basedn }}</BaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </EDirectory>
-        </AuthenticationServer>
-    
-    """
 
     template_vars = {
         "name": module.params.get("servername"),
@@ -181,16 +163,14 @@ def create_edirectory(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_edirectory_server",
+                                          template_vars=template_vars,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
@@ -207,22 +187,6 @@ def update_edirectory_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <EDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerIpDomain>{{ serveripdomain }}</ServerIpDomain>
-		  <Port>{{ port_edir }}</Port>
-		  <Username>{{ binddn }}</Username>
-          <Password>{{ dn_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ basedn }}</BaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </EDirectory>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "serveripdomain": module.params.get("serveripdomain"),
@@ -236,17 +200,15 @@ def update_edirectory_add(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_edirectory_server",
+                                          template_vars=template_vars,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -263,22 +225,6 @@ def update_edirectory_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <EDirectory>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerIpDomain>{{ serveripdomain }}</ServerIpDomain>
-		  <Port>{{ port_edir }}</Port>
-		  <Username>{{ binddn }}</Username>
-          <Password>{{ dn_password }}</Password>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ basedn }}</BaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </EDirectory>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "serveripdomain": module.params.get("serveripdomain"),
@@ -292,17 +238,15 @@ def update_edirectory_update(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_edirectory_server",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -453,31 +397,20 @@ def remove_edirectory(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AuthenticationServer>
-            <EDirectory>
-		    <ServerName>{{ name }}</ServerName>
-            </EDirectory>
-            </AuthenticationServer>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_edirectory_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
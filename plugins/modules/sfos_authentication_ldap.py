@@ -133,9 +133,6 @@ api_response:
     returned: always
 
 '''
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -153,6 +150,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_ldap_settings(connection, module, result):
@@ -191,52 +189,7 @@ def create_ldap(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
     
-    """
-    
-    payload2 = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <Administrator>{{ bindDN }}</Administrator>
-          <Password>{{ ldap_password }}</Password>
-          <AppendBaseDN>{{ appendbaseDN }}</AppendBaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -261,16 +214,14 @@ def create_ldap(connection, module, result):
     anonymous = module.params.get("anonymouslogin")
     if anonymous == "Enable":
         try:
-            with contextlib.redirect_stdout(output_buffer):
-                resp = connection.invoke_sdk("submit_xml", module_args={
-                    "template_data": payload,
-                    "template_vars": template_vars,
-                    "debug": True
-                    }
-                )
+            resp = connection.submit_template("authentication_ldap_server_anonymous",
+                                              template_vars=template_vars,
+                                              trace=module._verbosity >= 3)
         except Exception as error:
             module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+        record_trace(result, resp)
+
         if not resp["success"]:
             module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -278,16 +229,14 @@ def create_ldap(connection, module, result):
     else:
         if anonymous == "Disable":
             try:
-                with contextlib.redirect_stdout(output_buffer):
-                    resp = connection.invoke_sdk("submit_xml", module_args={
-                        "template_data": payload2,
-                        "template_vars": template_vars,
-                        "debug": True
-                        }
-                    )
+                resp = connection.submit_template("authentication_ldap_server",
+                                                  template_vars=template_vars,
+                                                  trace=module._verbosity >= 3)
             except Exception as error:
                 module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+            record_trace(result, resp)
+
             if not resp["success"]:
                 module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -304,52 +253,7 @@ def update_ldap_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
-    
-    """
     
-    payload2 = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <Administrator>{{ bindDN }}</Administrator>
-          <Password>{{ ldap_password }}</Password>
-          <AppendBaseDN>{{ appendbaseDN }}</AppendBaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
-    
-    """
     
     
     template_vars = {
@@ -377,17 +281,15 @@ def update_ldap_add(connection, module, result):
     if anonymous == "Enable":
   
         try:
-            with contextlib.redirect_stdout(output_buffer):
-                resp = connection.invoke_sdk("submit_xml", module_args={
-                    "template_data": payload,
-                    "template_vars": template_vars,
-                    "set_operation": "add",
-                    "debug": True
-                    }
-                )
+            resp = connection.submit_template("authentication_ldap_server_anonymous",
+                                              template_vars=template_vars,
+                                              set_operation="add",
+                                              trace=module._verbosity >= 3)
         except Exception as error:
             module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+        record_trace(result, resp)
+
         if not resp["success"]:
             module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -395,17 +297,15 @@ def update_ldap_add(connection, module, result):
     else:
         if anonymous == "Disable":
             try:
-                with contextlib.redirect_stdout(output_buffer):
-                    resp = connection.invoke_sdk("submit_xml", module_args={
-                        "template_data": payload2,
-                        "template_vars": template_vars,
-                        "set_operation": "add",
-                        "debug": True
-                        }
-                    )
+                resp = connection.submit_template("authentication_ldap_server",
+                                                  template_vars=template_vars,
+                                                  set_operation="add",
+                                                  trace=module._verbosity >= 3)
             except Exception as error:
                 module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+            record_trace(result, resp)
+
             if not resp["success"]:
                 module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -422,52 +322,7 @@ def update_ldap_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
-    
-    """
-    
-    payload2 = """
-        <AuthenticationServer>
-          <LDAPServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_ldap }}</Port>
-		  <Version>{{ version }}</Version>
-          <AnonymousLogin>{{ anonymouslogin }}</AnonymousLogin>
-          <ConnectionSecurity>{{ connectionsecurity }}</ConnectionSecurity>
-		  <BaseDN>{{ baseDN }}</BaseDN>
-          <AuthenticationAttribute>{{ authenticationattribute }}</AuthenticationAttribute>
-          <DisplayNameAttribute>{{ displaynameattribute }}</DisplayNameAttribute>
-          <EmailAddressAttribute>{{ emailaddressattribute }}</EmailAddressAttribute>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <ExpiryDateAttribute>{{ expirydateattribute }}</ExpiryDateAttribute>
-          <Administrator>{{ bindDN }}</Administrator>
-          <Password>{{ ldap_password }}</Password>
-          <AppendBaseDN>{{ appendbaseDN }}</AppendBaseDN>
-          <ValidateServerCertificate>{{ validateservercertificate }}</ValidateServerCertificate>
-          <ClientCertificate>{{ clientcertificate }}</ClientCertificate>
-	      </LDAPServer>
-        </AuthenticationServer>
     
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -493,17 +348,15 @@ def update_ldap_update(connection, module, result):
     anonymous = module.params.get("anonymouslogin")
     if anonymous == "Enable":
         try:
-            with contextlib.redirect_stdout(output_buffer):
-                resp = connection.invoke_sdk("submit_xml", module_args={
-                    "template_data": payload,
-                    "template_vars": template_vars,
-                    "set_operation": "update",
-                    "debug": True
-                    }
-                )
+            resp = connection.submit_template("authentication_ldap_server_anonymous",
+                                              template_vars=template_vars,
+                                              set_operation="update",
+                                              trace=module._verbosity >= 3)
         except Exception as error:
             module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+        record_trace(result, resp)
+
         if not resp["success"]:
             module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -511,17 +364,15 @@ def update_ldap_update(connection, module, result):
     else:
         if anonymous == "Disable":
             try:
-                with contextlib.redirect_stdout(output_buffer):
-                    resp = connection.invoke_sdk("submit_xml", module_args={
-                        "template_data": payload2,
-                        "template_vars": template_vars,
-                        "set_operation": "update",
-                        "debug": True
-                        }
-                    )
+                resp = connection.submit_template("authentication_ldap_server",
+                                                  template_vars=template_vars,
+                                                  set_operation="update",
+                                                  trace=module._verbosity >= 3)
             except Exception as error:
                 module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+            record_trace(result, resp)
+
             if not resp["success"]:
                 module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -791,31 +642,20 @@ def remove_ldap(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AuthenticationServer>
-            <LDAPServer>
-		    <ServerName>{{ name }}</ServerName>
-            </LDAPServer>
-            </AuthenticationServer>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
    
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_ldap_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -109,9 +109,6 @@ api_response:
     returned: always
 
 '''
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -129,6 +126,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_radius_settings(connection, module, result):
@@ -167,26 +165,6 @@ def create_radius(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <RADIUSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_radius }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <Timeout>{{ timeout }}</Timeout>
-		  <DomainName>{{ domainname }}</DomainName>
-          <EnableAccounting>{{ enableaccounting }}</EnableAccounting>
-		  <Attributes>
-            <NAS-Identifier>{{ nas_identifier }}</NAS-Identifier>
-            <NAS-Port-Type>{{ nas_port_type }}</NAS-Port-Type>
-          </Attributes>
-          <AccountingPort>{{ accountingport }}</AccountingPort>
-	      </RADIUSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -202,16 +180,14 @@ def create_radius(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_radius_server",
+                                          template_vars=template_vars,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -228,26 +204,6 @@ def update_radius_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <RADIUSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_radius }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <Timeout>{{ timeout }}</Timeout>
-		  <DomainName>{{ domainname }}</DomainName>
-          <EnableAccounting>{{ enableaccounting }}</EnableAccounting>
-		  <Attributes>
-            <NAS-Identifier>{{ nas_identifier }}</NAS-Identifier>
-            <NAS-Port-Type>{{ nas_port_type }}</NAS-Port-Type>
-          </Attributes>
-          <AccountingPort>{{ accountingport }}</AccountingPort>
-	      </RADIUSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -264,17 +220,15 @@ def update_radius_add(connection, module, result):
     }
   
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_radius_server",
+                                          template_vars=template_vars,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -291,26 +245,6 @@ def update_radius_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <RADIUSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ port_radius }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-          <GroupNameAttribute>{{ groupnameattribute }}</GroupNameAttribute>
-          <Timeout>{{ timeout }}</Timeout>
-		  <DomainName>{{ domainname }}</DomainName>
-          <EnableAccounting>{{ enableaccounting }}</EnableAccounting>
-		  <Attributes>
-            <NAS-Identifier>{{ nas_identifier }}</NAS-Identifier>
-            <NAS-Port-Type>{{ nas_port_type }}</NAS-Port-Type>
-          </Attributes>
-          <AccountingPort>{{ accountingport }}</AccountingPort>
-	      </RADIUSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -327,17 +261,15 @@ def update_radius_update(connection, module, result):
     }
    
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_radius_server",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -498,36 +430,26 @@ def remove_radius(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AuthenticationServer>
-            <RADIUSServer>
-		    <ServerName>{{ name }}</ServerName>
-            </RADIUSServer>
-            </AuthenticationServer>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_radius_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
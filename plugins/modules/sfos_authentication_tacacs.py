@@ -68,9 +68,6 @@ api_response:
     returned: always
 
 '''
-import io
-import contextlib
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -88,6 +85,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_tacacs_settings(connection, module, result):
@@ -126,17 +124,6 @@ def create_tacacs(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <TACACSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ tac_port }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-	      </TACACSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -145,16 +132,14 @@ def create_tacacs(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_tacacs_server",
+                                          template_vars=template_vars,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -172,17 +157,6 @@ def update_tacacs_add(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <TACACSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ tac_port }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-	      </TACACSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -191,17 +165,15 @@ def update_tacacs_add(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "add",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_tacacs_server",
+                                          template_vars=template_vars,
+                                          set_operation="add",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -218,17 +190,6 @@ def update_tacacs_update(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <AuthenticationServer>
-          <TACACSServer>
-		  <ServerName>{{ name }}</ServerName>
-		  <ServerAddress>{{ ipaddress }}</ServerAddress>
-		  <Port>{{ tac_port }}</Port>
-		  <SharedSecret>{{ sharedsecret }}</SharedSecret>
-	      </TACACSServer>
-        </AuthenticationServer>
-    
-    """
     template_vars = {
         "name": module.params.get("servername"),
         "ipaddress": module.params.get("serveraddress"),
@@ -237,17 +198,15 @@ def update_tacacs_update(connection, module, result):
     }
   
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_tacacs_server",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -366,36 +325,26 @@ def remove_tacacs(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-            <Remove>
-            <AuthenticationServer>
-            <TACACSServer>
-		    <ServerName>{{ name }}</ServerName>
-            </TACACSServer>
-            </AuthenticationServer>
-            </Remove>
-    """
     template_vars = {
         "name": module.params.get("servername")
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": None,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("authentication_tacacs_remove",
+                                          template_vars=template_vars,
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
@@ -12,11 +12,14 @@ DOCUMENTATION = r"""
 ---
 module: sfos_backup
 
-short_description: Manage Backup settings (System > Backup & firmware)
+short_description: Manage Backup settings and download backups (System > Backup & firmware)
 
 version_added: "1.0.0"
 
-description: Manage Backup settings (System > Backup & firmware) on Sophos Firewall
+description:
+    - Manage Backup settings (System > Backup & firmware) on Sophos Firewall
+    - Take a backup on demand and download it to the Ansible controller. The backup is taken once, then fetched
+      by its name and written to disk in chunks as it is received.
 
 extends_documentation_fragment:
   - sophos.sophos_firewall.fragments.base
@@ -88,12 +91,48 @@ options:
     encryption_password:
         description:
             - "Encryption password for the backup file. If this argument is specified, module will always return changed."
+            - With I(state=downloaded), the password used to encrypt the backup taken on demand.
         type: str
         required: false
+    dest:
+        description:
+            - Path on the Ansible controller where the backup is saved. Required when I(state=downloaded).
+            - The backup is written to a temporary file in the same directory and only moved to I(dest) once it is
+              complete and matches I(checksum). The temporary file is removed if the download fails.
+        type: path
+        required: false
+        version_added: "2.6.0"
+    checksum:
+        description:
+            - Expected SHA-256 checksum of the backup. The backup is not saved if the checksum of the file downloaded differs.
+            - When I(dest) already exists with this checksum, no backup is taken.
+        type: str
+        required: false
+        version_added: "2.6.0"
+    force:
+        description:
+            - Take and download a backup even if I(dest) already exists.
+        type: bool
+        default: false
+        version_added: "2.6.0"
+    retries:
+        description:
+            - Number of times an interrupted download is resumed before the module fails.
+            - The same backup is fetched again with a range request, so no new backup is taken.
+        type: int
+        default: 3
+        version_added: "2.6.0"
+    timeout:
+        description:
+            - Timeout in seconds for each read from the firewall while the backup is downloaded.
+        type: int
+        default: 300
+        version_added: "2.6.0"
     state:
         description:
             - Use C(query) to retrieve or C(updated) to modify
-        choices: [updated, query]
+            - Use C(downloaded) to take a backup and download it to I(dest)
+        choices: [updated, query, downloaded]
         type: str
         required: true
 
@@ -116,6 +155,12 @@ EXAMPLES = r"""
     minute: 30
     encryption_password: backupencryptionpassword
     state: updated
+
+- name: Download a backup to the controller
+  sophos.sophos_firewall.sfos_backup:
+    dest: "/srv/backups/{{ inventory_hostname }}/{{ '%Y-%m-%d' | strftime }}.bak"
+    encryption_password: backupencryptionpassword
+    state: downloaded
 """
 
 RETURN = r"""
@@ -123,13 +168,12 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
-
+backup:
+    description: Name, path, size in bytes and SHA-256 checksum of the backup, and the number of times the download was resumed.
+    type: dict
+    returned: when state is downloaded
+    version_added: "2.6.0"
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -147,6 +191,9 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+import hashlib
+import os
 
 
 def get_backup(connection, module, result):
@@ -221,14 +268,15 @@ def update_backup(connection, module, result):
         backup_params["EncryptionPassword"] = module.params.get("encryption_password")
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update_backup", module_args={
-                "backup_params": backup_params, "debug": module.params.get("debug", False)
-                }
-            )
+        resp = connection.invoke_sdk("update_backup", module_args={
+            "backup_params": backup_params
+            }, trace=module.params.get("debug") or module._verbosity >= 3
+        )
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if resp["success"] and not resp["exists"]:
         return {"exists": False, "api_response": resp["response"]}
 
@@ -238,6 +286,85 @@ def update_backup(connection, module, result):
     return resp["response"]
 
 
+def file_checksum(path):
+    """Calculate the SHA-256 checksum of a file, reading it in chunks.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Checksum as lower case hex
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as backup_file:
+        for chunk in iter(lambda: backup_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_backup(connection, module, result):
+    """Take a backup on Sophos Firewall
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        str: Name of the backup file on the firewall
+    """
+    try:
+        resp = connection.submit_template("backup_generate", {
+            "encryption_password": module.params.get("encryption_password"),
+            }, set_operation=None, timeout=module.params.get("timeout"),
+            trace=module.params.get("debug") or module._verbosity >= 3
+        )
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"] = resp["response"]
+    backup_file = (resp["response"]["Response"].get("BackupRestore") or {}).get("BackupFile")
+    if not backup_file:
+        module.fail_json(msg="The firewall did not return the name of the backup taken", **result)
+
+    return backup_file
+
+
+def download_backup(connection, module, result, backup_file):
+    """Download a backup from Sophos Firewall to the controller
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        backup_file (str): Name of the backup file returned by generate_backup()
+
+    Returns:
+        dict: Path, size and checksum of the backup
+    """
+    try:
+        resp = connection.download_template("backup_fetch", {
+            "backup_file": backup_file,
+            }, dest=module.params.get("dest"), checksum=module.params.get("checksum"),
+            retries=module.params.get("retries"), timeout=module.params.get("timeout"),
+            trace=module.params.get("debug") or module._verbosity >= 3
+        )
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    return dict(resp["response"], name=backup_file)
+
+
 def eval_changed(module, exist_settings):
     """Evaluate the provided arguments against existing settings.
 
@@ -305,7 +432,12 @@ def main():
         "hour": {"type": "int", "required": False},
         "minute": {"type": "int", "required": False},
         "encryption_password": {"type": "str", "required": False, "no_log": True},
-        "state": {"type": "str", "required": True, "choices": ["updated", "query"]},
+        "dest": {"type": "path", "required": False},
+        "checksum": {"type": "str", "required": False},
+        "force": {"type": "bool", "default": False},
+        "retries": {"type": "int", "default": 3},
+        "timeout": {"type": "int", "default": 300},
+        "state": {"type": "str", "required": True, "choices": ["updated", "query", "downloaded"]},
         "debug": {"type": "bool", "required": False},
     }
 
@@ -320,6 +452,7 @@ def main():
         ("frequency", "Daily", ["hour", "minute"], False),
         ("frequency", "Weekly", ["day", "hour", "minute"], False),
         ("frequency", "Monthly", ["date", "hour", "minute"], False),
+        ("state", "downloaded", ["dest"], False),
     ]
 
     mutually_exclusive = [["day", "date"]]
@@ -357,6 +490,24 @@ def main():
 
     state = module.params.get("state")
 
+    if state == "downloaded":
+        dest = module.params.get("dest")
+        if not os.path.isdir(os.path.dirname(os.path.abspath(dest))):
+            module.fail_json(msg="Destination directory does not exist: {0}".format(os.path.dirname(dest)), **result)
+        if os.path.exists(dest) and not module.params.get("force"):
+            checksum = file_checksum(dest)
+            if not module.params.get("checksum") or module.params.get("checksum").lower() == checksum:
+                result["backup"] = {"dest": dest, "size": os.path.getsize(dest), "checksum": checksum, "resumed": 0}
+                module.exit_json(**result)
+        if module.check_mode:
+            result["check_mode"] = True
+            result["changed"] = True
+            module.exit_json(**result)
+        backup_file = generate_backup(connection, module, result)
+        result["backup"] = download_backup(connection, module, result, backup_file)
+        result["changed"] = True
+        module.exit_json(**result)
+
     exist_settings = get_backup(connection, module, result)
     result["api_response"] = exist_settings["api_response"]
 
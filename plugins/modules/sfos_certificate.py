@@ -15,7 +15,10 @@ short_description: Manage Certificates (System > Certificates)
 
 version_added: "2.4.0"
 
-description: Creates certificates on Sophos Firewall, including uploaded certificates, self-signed certificates, certificate signing requests, and Let's Encrypt certificates
+description:
+    - Creates certificates on Sophos Firewall, including uploaded certificates, self-signed certificates, certificate signing requests, and Let's Encrypt certificates
+    - When uploading a certificate in PEM, DER or CER format, the upload is skipped if the SHA-256 fingerprint of the
+      certificate file matches the certificate already installed with the same name.
 
 extends_documentation_fragment:
   - sophos.sophos_firewall.fragments.base
@@ -218,29 +221,34 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
+fingerprint:
+    description: SHA-256 fingerprint of the uploaded certificate file.
+    type: str
+    returned: when action is UploadCertificate and the certificate is in PEM, DER or CER format
+    version_added: "2.6.0"
 """
 
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAPIError,
     )
     from requests.exceptions import RequestException
-    import requests
 
     PREREQ_MET = {"result": True}
 except ImportError as errMsg:
     PREREQ_MET = {"result": False, "missing_module": errMsg.name}
 
+import base64
+import binascii
+import hashlib
 import re
 import os
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.certificate import installed_fingerprint
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
 
 try:
     from jinja2 import Template, TemplateError
@@ -250,6 +258,10 @@ except ImportError:
     TemplateError = Exception
 
 
+# First certificate in a PEM file
+PEM_CERTIFICATE = re.compile(rb"-----BEGIN CERTIFICATE-----(.+?)-----END CERTIFICATE-----", re.DOTALL)
+
+
 def validate_inputs(module, result):
     """Validate module inputs based on action type
 
@@ -275,6 +287,11 @@ def validate_inputs(module, result):
     if action == "UploadCertificate":
         if not module.params.get("certificate_file"):
             module.fail_json(msg="certificate_file is required for UploadCertificate action", **result)
+        if not os.path.isfile(module.params.get("certificate_file")):
+            module.fail_json(msg="Certificate file not found: {0}".format(module.params.get("certificate_file")), **result)
+        key_file_path = module.params.get("private_key_file")
+        if key_file_path and not os.path.isfile(key_file_path):
+            module.fail_json(msg="Private key file not found: {0}".format(key_file_path), **result)
     
     elif action == "GenerateSelfSignedCertificate":
         required_fields = ["common_name", "valid_from", "valid_upto"]
@@ -295,8 +312,68 @@ def validate_inputs(module, result):
                 module.fail_json(msg="{0} is required for {1} action".format(field, action), **result)
 
 
+def certificate_fingerprint(cert_file_path, cert_format):
+    """Calculate the SHA-256 fingerprint of a certificate file.
+
+    Args:
+        cert_file_path (str): Path to the certificate file
+        cert_format (str): Format of the certificate file
+
+    Returns:
+        str: Fingerprint as upper case hex, or None if it cannot be calculated for the format
+    """
+    if cert_format not in ("pem", "der", "cer"):
+        return None
+    with open(cert_file_path, "rb") as cert_file:
+        contents = cert_file.read()
+
+    match = PEM_CERTIFICATE.search(contents)
+    if match:
+        try:
+            contents = base64.b64decode(b"".join(match.group(1).split()))
+        except (binascii.Error, ValueError):
+            return None
+    elif cert_format == "pem":
+        return None
+    return hashlib.sha256(contents).hexdigest().upper()
+
+
+def get_certificate(connection, module, result):
+    """Get the installed Certificate with the specified name
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Certificate, or None if it does not exist
+    """
+    try:
+        resp = connection.invoke_sdk("get_tag_with_filter", module_args={"xml_tag": "Certificate",
+                                                                         "key": "Name",
+                                                                         "value": module.params.get("name"),
+                                                                         "operator": "="},
+                                     trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    if not resp["exists"]:
+        return None
+
+    for entity in ensure_list(resp["response"]["Response"].get("Certificate")):
+        if isinstance(entity, dict) and entity.get("Name") == module.params.get("name"):
+            return entity
+    return None
+
+
 def upload_certificate(connection, module, result):
-    """Upload a Certificate to Sophos Firewall using direct API call with file uploads
+    """Upload a Certificate to Sophos Firewall, attaching the certificate and key files to the request
 
     Args:
         connection (Connection): Ansible Connection object
@@ -306,119 +383,33 @@ def upload_certificate(connection, module, result):
     Returns:
         dict: API response
     """
-    # Get connection details
-    try:
-        hostname = connection.get_option("host")
-        username = connection.get_option("remote_user")
-        password = connection.get_option("password")
-        port = connection.get_option("port") or 4444
-    except (AttributeError, KeyError, TypeError) as error:
-        module.fail_json(msg="Failed to get connection details: {0}".format(error), **result)
-    
-    # Build the API URL
-    url = "https://{0}:{1}/webconsole/APIController".format(hostname, port)
-    
-    # Get certificate parameters
-    cert_name = module.params.get("name")
     cert_file_path = module.params.get("certificate_file")
     key_file_path = module.params.get("private_key_file")
-    cert_format = module.params.get("certificate_format", "pem")
-    
-    # Validate file paths exist
-    if not os.path.isfile(cert_file_path):
-        module.fail_json(msg="Certificate file not found: {0}".format(cert_file_path), **result)
-    
-    if key_file_path and not os.path.isfile(key_file_path):
-        module.fail_json(msg="Private key file not found: {0}".format(key_file_path), **result)
-    
-    # Build XML request body
-    xml_body = '''<Request>
-<Login>
-  <Username>{0}</Username>
-  <Password>{1}</Password>
-</Login>
-<Set>
-  <Certificate transactionid="10">
-    <Name>{2}</Name>
-    <Action>UploadCertificate</Action>
-    <CertificateFormat>{3}</CertificateFormat>
-    <CertificateFile>{4}</CertificateFile>'''.format(
-        username, password, cert_name, cert_format, os.path.basename(cert_file_path)
-    )
-    
-    # Add private key file if provided
+
+    files = [["Certificate", cert_file_path, "application/x-x509-ca-cert"]]
     if key_file_path:
-        xml_body += '''
-    <PrivateKeyFile>{0}</PrivateKeyFile>'''.format(os.path.basename(key_file_path))
-    
-    # Add password if provided
-    if module.params.get("password"):
-        xml_body += '''
-    <Password>{0}</Password>'''.format(module.params.get("password"))
-    
-    xml_body += '''
-  </Certificate>
-</Set>
-</Request>'''
-    
+        files.append(["Private Key", key_file_path, "application/x-pem-file"])
+
+    template_vars = {
+        "name": module.params.get("name"),
+        "certificate_format": module.params.get("certificate_format") or "pem",
+        "certificate_file": os.path.basename(cert_file_path),
+        "private_key_file": os.path.basename(key_file_path) if key_file_path else None,
+        "certificate_password": module.params.get("password"),
+    }
+
     try:
-        # Prepare files for upload
-        with open(cert_file_path, "rb") as cert_file:
-            files = {
-                # XML must be called "reqxml"
-                "reqxml": (None, xml_body, "application/xml"),
-                # Certificate part must be named exactly "Certificate"
-                "Certificate": (os.path.basename(cert_file_path), cert_file, "application/x-x509-ca-cert"),
-            }
-            
-            # Add private key if provided
-            if key_file_path:
-                with open(key_file_path, "rb") as key_file:
-                    files["Private Key"] = (os.path.basename(key_file_path), key_file, "application/x-pem-file")
-                    
-                    # Make the request
-                    response = requests.post(url, files=files, verify=False, timeout=30)
-            else:
-                # Make the request without private key
-                response = requests.post(url, files=files, verify=False, timeout=30)
-        
-        # Check response
-        response.raise_for_status()
-        
-        # Parse XML response (simplified - you may need more robust XML parsing)
-        response_text = response.text
-        
-        # Try to extract status from XML response
-        status_text = "Configuration applied successfully."
-        if "failed" in response_text.lower() or "error" in response_text.lower():
-            # Extract error message if possible
-            if "<Status>" in response_text and "</Status>" in response_text:
-                start = response_text.find("<Status>") + 8
-                end = response_text.find("</Status>", start)
-                if start > 7 and end > start:
-                    status_text = response_text[start:end].strip()
-            else:
-                status_text = "Upload failed: {0}".format(response_text[:200])
-        
-        # Create a mock response structure similar to SDK responses
-        api_response = {
-            "Response": {
-                "Certificate": {
-                    "Status": {
-                        "#text": status_text
-                    }
-                }
-            }
-        }
-        
-        return api_response
-        
-    except requests.exceptions.RequestException as error:
-        module.fail_json(msg="HTTP request failed: {0}".format(error), **result)
-    except IOError as error:
-        module.fail_json(msg="File I/O error: {0}".format(error), **result)
-    except (ValueError, TypeError) as error:
-        module.fail_json(msg="Unexpected error during certificate upload: {0}".format(error), **result)
+        resp = connection.upload_template("certificate_upload", template_vars, files=files, set_operation=None,
+                                          trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    return resp["response"]
 
 
 def create_certificate(connection, module, result):
@@ -561,13 +552,11 @@ def create_certificate(connection, module, result):
         rendered_payload = "Jinja2 not available for template rendering"
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("submit_xml", module_args={
+            "template_data": payload,
+            "template_vars": template_vars,
+            }, trace=module._verbosity >= 3
+        )
     except (SophosFirewallAPIError, RequestException) as error:
         module.fail_json(
             msg="An unexpected error occurred: {0}".format(error),
@@ -575,6 +564,8 @@ def create_certificate(connection, module, result):
             template_vars=template_vars,
             **result
         )
+
+    record_trace(result, resp)
     
     if not resp["success"]:
         module.fail_json(
@@ -708,6 +699,23 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if state == "present" and module.params.get("action") == "UploadCertificate":
+        # Skip the upload when the same certificate is already installed
+        try:
+            fingerprint = certificate_fingerprint(module.params.get("certificate_file"),
+                                                  module.params.get("certificate_format") or "pem")
+        except IOError as error:
+            module.fail_json(msg="File I/O error: {0}".format(error), **result)
+        if fingerprint:
+            result["fingerprint"] = fingerprint
+            exist_cert = get_certificate(connection, module, result)
+            if exist_cert and installed_fingerprint(exist_cert) == fingerprint:
+                result["check_mode"] = module.check_mode
+                result["api_response"] = exist_cert
+                module.exit_json(**result)
+            if module.check_mode:
+                result["changed"] = True
+
     if module.check_mode:
         result["check_mode"] = True
         module.exit_json(**result)
@@ -15,15 +15,21 @@ short_description: Manage Certificate Authorities (System > Certificates > Certi
 
 version_added: "2.5.0"
 
-description: Creates, updates, and removes certificate authorities on Sophos Firewall
+description:
+    - Creates, updates, and removes certificate authorities on Sophos Firewall
+    - With I(bundle_file), synchronizes the certificate authorities in a PEM bundle. The installed certificate
+      authorities are retrieved with a single request, and only the certificate authorities which are missing or
+      have a different fingerprint are uploaded.
 
 extends_documentation_fragment:
   - sophos.sophos_firewall.fragments.base
 
 options:
     name:
-        description: Name of the certificate authority
-        required: true
+        description:
+            - Name of the certificate authority
+            - Required unless I(bundle_file) is specified.
+        required: false
         type: str
     format:
         description: Format of the root certificate you uploaded
@@ -42,6 +48,35 @@ options:
         description: Specify the password to access the private key
         type: str
         required: false
+    bundle_file:
+        description:
+            - Path to a PEM file containing several certificate authorities, for example an internal PKI bundle.
+            - Each certificate authority is named after the common name, or else the organization, in its subject,
+              with the characters not allowed by the firewall replaced by underscores.
+            - Certificate authorities already installed under another name, for example the default ones, are skipped.
+            - Can only be used with I(state=present).
+        type: path
+        required: false
+        version_added: "2.6.0"
+    name_prefix:
+        description:
+            - Prefix added to the names of the certificate authorities in I(bundle_file).
+        type: str
+        default: ""
+        required: false
+        version_added: "2.6.0"
+    purge:
+        description:
+            - Remove the installed certificate authorities whose name starts with I(name_prefix)
+              and which are not in I(bundle_file).
+            - Requires I(name_prefix), so only the certificate authorities managed with the bundle are removed.
+            - A certificate authority whose fingerprint is in I(bundle_file) is kept, even when the bundle names it
+              differently, for example after a renewed certificate authority with the same common name is added.
+            - Nothing is removed when a certificate authority in the bundle could not be uploaded.
+        type: bool
+        default: false
+        required: false
+        version_added: "2.6.0"
     state:
         description:
             - Use C(present) to create or update certificate authority
@@ -76,26 +111,47 @@ EXAMPLES = r"""
   sophos.sophos_firewall.sfos_certificate_authority:
     name: MY_CA
     state: absent
+
+- name: Synchronize the internal PKI bundle
+  sophos.sophos_firewall.sfos_certificate_authority:
+    bundle_file: /path/to/internal_ca_bundle.pem
+    name_prefix: PKI_
+    purge: true
+    state: present
 """
 
 RETURN = r"""
 api_response:
-    description: Serialized object containing the API response.
+    description:
+        - Serialized object containing the API response.
+        - With I(bundle_file), the number of certificate authorities created, updated, removed, unchanged and failed.
     type: dict
     returned: always
+created:
+    description: Certificate authorities uploaded from I(bundle_file).
+    type: list
+    elements: str
+    returned: when I(bundle_file) is specified
+    version_added: "2.6.0"
+updated:
+    description: Certificate authorities replaced with the version in I(bundle_file).
+    type: list
+    elements: str
+    returned: when I(bundle_file) is specified
+    version_added: "2.6.0"
+removed:
+    description: Certificate authorities removed because they are not in I(bundle_file).
+    type: list
+    elements: str
+    returned: when I(bundle_file) is specified
+    version_added: "2.6.0"
 """
 
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAPIError,
     )
     from requests.exceptions import RequestException
-    import requests
 
     PREREQ_MET = {"result": True}
 except ImportError as errMsg:
@@ -105,9 +161,16 @@ import re
 import os
 import base64
 import binascii
+import collections
+import hashlib
+import shutil
+import tempfile
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.certificate import installed_fingerprint
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
 
 try:
     from jinja2 import Template, TemplateError
@@ -117,6 +180,22 @@ except ImportError:
     TemplateError = Exception
 
 
+# Certificates in a PEM file
+PEM_CERTIFICATE = re.compile(rb"-----BEGIN CERTIFICATE-----(.+?)-----END CERTIFICATE-----", re.DOTALL)
+
+# Subject attribute type OIDs, DER encoded
+SUBJECT_CN = b"\x55\x04\x03"
+SUBJECT_O = b"\x55\x04\x0a"
+SUBJECT_LABELS = {
+    SUBJECT_CN: "CN",
+    SUBJECT_O: "O",
+    b"\x55\x04\x0b": "OU",
+    b"\x55\x04\x06": "C",
+    b"\x55\x04\x07": "L",
+    b"\x55\x04\x08": "ST",
+}
+
+
 def validate_certificate_format(file_path, expected_format=None):
     """Validate that a file contains a valid PEM or DER encoded certificate
 
@@ -313,132 +392,44 @@ def validate_inputs(module, result):
                 module.fail_json(msg="Invalid private key file: {0}".format(error_msg), **result)
 
 
-def upload_certificate_authority(connection, module, result):
-    """Upload a Certificate Authority to Sophos Firewall using direct API call with file uploads
+def upload_certificate_authority(connection, module, result, name=None, ca_cert_file=None, ca_format=None):
+    """Upload a Certificate Authority to Sophos Firewall, attaching the certificate and key files to the request
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        name (str): Name of the certificate authority, defaults to the name option
+        ca_cert_file (str): Path to the certificate, defaults to the ca_cert_file option
+        ca_format (str): Format of the certificate, defaults to the format option
 
     Returns:
-        dict: API response
+        dict: Result in the same format as invoke_sdk()
     """
-    # Get connection details
-    try:
-        hostname = connection.get_option("host")
-        username = connection.get_option("remote_user")
-        password = connection.get_option("password")
-        port = connection.get_option("port") or 4444
-    except (AttributeError, KeyError, TypeError) as error:
-        module.fail_json(msg="Failed to get connection details: {0}".format(error), **result)
-    
-    # Build the API URL
-    url = "https://{0}:{1}/webconsole/APIController".format(hostname, port)
-    
-    # Get certificate authority parameters
-    ca_name = module.params.get("name")
-    ca_cert_file_path = module.params.get("ca_cert_file")
-    ca_key_file_path = module.params.get("ca_private_key_file")
-    ca_format = module.params.get("format", "PEM")
-    ca_password = module.params.get("password")
-    
-    # Validate file paths exist
-    if not os.path.isfile(ca_cert_file_path):
-        module.fail_json(msg="CA certificate file not found: {0}".format(ca_cert_file_path), **result)
-    
-    if ca_key_file_path and not os.path.isfile(ca_key_file_path):
-        module.fail_json(msg="CA private key file not found: {0}".format(ca_key_file_path), **result)
-    
-    # Build XML request body
-    xml_body = '''<Request>
-<Login>
-  <Username>{0}</Username>
-  <Password>{1}</Password>
-</Login>
-<Set>
-  <CertificateAuthority transactionid="10">
-    <Name>{2}</Name>
-    <Format>{3}</Format>
-    <CACertFile>{4}</CACertFile>'''.format(
-        username, password, ca_name, ca_format, os.path.basename(ca_cert_file_path)
-    )
-    
-    # Add private key file if provided
+    ca_cert_file_path = ca_cert_file or module.params.get("ca_cert_file")
+    # The private key and password only apply to a single certificate authority
+    ca_key_file_path = None if ca_cert_file else module.params.get("ca_private_key_file")
+
+    files = [["CertificateAuthority", ca_cert_file_path, "application/x-x509-ca-cert"]]
     if ca_key_file_path:
-        xml_body += '''
-    <CAPrivateKeyFile>{0}</CAPrivateKeyFile>'''.format(os.path.basename(ca_key_file_path))
-    
-    # Add password if provided
-    if ca_password:
-        xml_body += '''
-    <Password>{0}</Password>'''.format(ca_password)
-    
-    # Add type - assuming "Uploaded" for uploaded certificates
-    xml_body += '''
-    <Type>Uploaded</Type>
-  </CertificateAuthority>
-</Set>
-</Request>'''
-    
+        files.append(["CA Private Key", ca_key_file_path, "application/x-pem-file"])
+
+    template_vars = {
+        "name": name or module.params.get("name"),
+        "format": ca_format or module.params.get("format") or "PEM",
+        "ca_cert_file": os.path.basename(ca_cert_file_path),
+        "ca_private_key_file": os.path.basename(ca_key_file_path) if ca_key_file_path else None,
+        "ca_password": None if ca_cert_file else module.params.get("password"),
+    }
+
     try:
-        # Prepare files for upload
-        with open(ca_cert_file_path, "rb") as cert_file:
-            files = {
-                # XML must be called "reqxml"
-                "reqxml": (None, xml_body, "application/xml"),
-                # Certificate part must be named exactly "CertificateAuthority"
-                "CertificateAuthority": (os.path.basename(ca_cert_file_path), cert_file, "application/x-x509-ca-cert"),
-            }
-            
-            # Add private key if provided
-            if ca_key_file_path:
-                with open(ca_key_file_path, "rb") as key_file:
-                    files["CA Private Key"] = (os.path.basename(ca_key_file_path), key_file, "application/x-pem-file")
-                    
-                    # Make the request
-                    response = requests.post(url, files=files, verify=False, timeout=30)
-            else:
-                # Make the request without private key
-                response = requests.post(url, files=files, verify=False, timeout=30)
-        
-        # Check response
-        response.raise_for_status()
-        
-        # Parse XML response (simplified - you may need more robust XML parsing)
-        response_text = response.text
-        
-        # Try to extract status from XML response
-        status_text = "Configuration applied successfully."
-        if "failed" in response_text.lower() or "error" in response_text.lower():
-            # Extract error message if possible
-            if "<Status>" in response_text and "</Status>" in response_text:
-                start = response_text.find("<Status>") + 8
-                end = response_text.find("</Status>", start)
-                if start > 7 and end > start:
-                    status_text = response_text[start:end].strip()
-            else:
-                status_text = "Upload failed: {0}".format(response_text[:200])
-        
-        # Create a mock response structure similar to SDK responses
-        api_response = {
-            "Response": {
-                "CertificateAuthority": {
-                    "Status": {
-                        "#text": status_text
-                    }
-                }
-            }
-        }
-        
-        return api_response
-        
-    except requests.exceptions.RequestException as error:
-        module.fail_json(msg="HTTP request failed: {0}".format(error), **result)
-    except IOError as error:
-        module.fail_json(msg="File I/O error: {0}".format(error), **result)
-    except (ValueError, TypeError) as error:
-        module.fail_json(msg="Unexpected error during certificate authority upload: {0}".format(error), **result)
+        resp = connection.upload_template("certificate_authority_upload", template_vars, files=files,
+                                          set_operation=None, trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+    return resp
 
 
 def create_certificate_authority(connection, module, result):
@@ -503,13 +494,11 @@ def create_certificate_authority(connection, module, result):
         rendered_payload = "Jinja2 not available for template rendering"
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("submit_xml", module_args={
+            "template_data": payload,
+            "template_vars": template_vars,
+            }, trace=module._verbosity >= 3
+        )
     except (SophosFirewallAPIError, RequestException) as error:
         module.fail_json(
             msg="An unexpected error occurred: {0}".format(error),
@@ -517,6 +506,8 @@ def create_certificate_authority(connection, module, result):
             template_vars=template_vars,
             **result
         )
+
+    record_trace(result, resp)
     
     if not resp["success"]:
         module.fail_json(
@@ -551,10 +542,249 @@ def remove_certificate_authority(connection, module, result):
     return resp["response"]
 
 
+def der_element(data, offset):
+    """Read the header of a DER encoded element.
+
+    Args:
+        data (bytes): DER encoded data
+        offset (int): Offset of the element
+
+    Returns:
+        tuple: Tag, offset of the contents and offset of the end of the element
+    """
+    tag = data[offset]
+    length = data[offset + 1]
+    start = offset + 2
+    if length & 0x80:
+        octets = length & 0x7F
+        length = int.from_bytes(data[start:start + octets], "big")
+        start += octets
+    end = start + length
+    if end > len(data):
+        raise ValueError("element exceeds the certificate data")
+    return tag, start, end
+
+
+def der_children(data, start, end):
+    """Return the elements contained in a DER encoded SEQUENCE or SET as (tag, start, end) tuples."""
+    children = []
+    while start < end:
+        children.append(der_element(data, start))
+        start = children[-1][2]
+    return children
+
+
+def certificate_subject(der):
+    """Extract the subject of a DER encoded certificate.
+
+    Args:
+        der (bytes): DER encoded certificate
+
+    Returns:
+        list: Tuples of attribute type OID, as bytes, and value
+    """
+    tag, start, end = der_element(der, 0)
+    tag, start, end = der_element(der, start)
+    fields = der_children(der, start, end)
+    # Skip the optional version, then serial number, signature algorithm, issuer and validity
+    if fields[0][0] == 0xA0:
+        fields = fields[1:]
+    tag, start, end = fields[4]
+
+    subject = []
+    for rdn_tag, rdn_start, rdn_end in der_children(der, start, end):
+        for attr_tag, attr_start, attr_end in der_children(der, rdn_start, rdn_end):
+            (oid_tag, oid_start, oid_end), (value_tag, value_start, value_end) = der_children(der, attr_start, attr_end)[:2]
+            subject.append((der[oid_start:oid_end], der[value_start:value_end].decode("utf-8", errors="replace")))
+    return subject
+
+
+def ca_name(prefix, subject, fingerprint):
+    """Name a certificate authority after the common name or organization in its subject.
+
+    Args:
+        prefix (str): Prefix for the name
+        subject (list): Subject returned by certificate_subject()
+        fingerprint (str): SHA-256 fingerprint of the certificate
+
+    Returns:
+        str: Name using only the characters allowed by the firewall
+    """
+    attributes = dict(subject)
+    label = attributes.get(SUBJECT_CN) or attributes.get(SUBJECT_O) or fingerprint[:16]
+    return (prefix + re.sub(r"[^A-Za-z0-9_@\-\.]+", "_", label).strip("_"))[:255]
+
+
+def parse_bundle(module, result):
+    """Read the certificate authorities in a PEM bundle.
+
+    The file is read once and each certificate is indexed by its SHA-256 fingerprint. Certificates
+    with the same common name are told apart by adding the start of their fingerprint to the name.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Certificate authorities keyed by fingerprint, each with its name, subject and PEM block
+    """
+    bundle_file = module.params.get("bundle_file")
+    try:
+        with open(bundle_file, "rb") as pem_file:
+            contents = pem_file.read()
+    except IOError as error:
+        module.fail_json(msg="Cannot read bundle file: {0}".format(error), **result)
+
+    cas = {}
+    for index, match in enumerate(PEM_CERTIFICATE.finditer(contents)):
+        try:
+            der = base64.b64decode(b"".join(match.group(1).split()), validate=True)
+            subject = certificate_subject(der)
+        except (binascii.Error, ValueError, IndexError) as error:
+            module.fail_json(msg="Invalid certificate {0} in bundle file: {1}".format(index + 1, error), **result)
+        fingerprint = hashlib.sha256(der).hexdigest().upper()
+        cas[fingerprint] = {
+            "name": ca_name(module.params.get("name_prefix"), subject, fingerprint),
+            "subject": ", ".join("{0}={1}".format(SUBJECT_LABELS.get(oid, oid.hex()), value) for oid, value in subject),
+            "pem": match.group(0),
+        }
+
+    if not cas:
+        module.fail_json(msg="No certificates found in bundle file {0}".format(bundle_file), **result)
+
+    names = collections.Counter(ca["name"] for ca in cas.values())
+    for fingerprint, ca in cas.items():
+        if names[ca["name"]] > 1:
+            ca["name"] = "{0}_{1}".format(ca["name"][:246], fingerprint[:8])
+    return cas
+
+
+def get_certificate_authorities(connection, module, result):
+    """Retrieve all installed certificate authorities with a single request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: CertificateAuthority keyed by name
+    """
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "CertificateAuthority"},
+                                     trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+    if not resp["exists"]:
+        return {}
+
+    return dict((entity["Name"], entity) for entity in ensure_list(resp["response"]["Response"].get("CertificateAuthority"))
+                if isinstance(entity, dict) and "Name" in entity)
+
+
+def sync_bundle(connection, module, result):
+    """Synchronize the installed certificate authorities with a PEM bundle.
+
+    Certificate authorities are uploaded when no certificate authority with their name is installed,
+    or when the firewall reports a different fingerprint for it. Certificate authorities already
+    installed under another name, for example the default ones, are skipped.
+
+    With purge, certificate authorities named with the prefix are removed when they are not in the
+    bundle, neither by name nor by fingerprint. Nothing is removed when an upload failed, so a
+    certificate authority is never removed before the one replacing it is installed.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    result["check_mode"] = module.check_mode
+    prefix = module.params.get("name_prefix")
+    if module.params.get("purge") and not prefix:
+        module.fail_json(msg="name_prefix is required when purge is enabled", **result)
+    if prefix and not re.match(r"^[A-Za-z0-9_@\-\.]+$", prefix):
+        module.fail_json(msg="name_prefix contains invalid characters. Allowed: A-Za-z0-9_@\\-\\.", **result)
+
+    cas = parse_bundle(module, result)
+    installed = get_certificate_authorities(connection, module, result)
+    installed_by_fingerprint = {}
+    for name, entity in installed.items():
+        if installed_fingerprint(entity):
+            installed_by_fingerprint[installed_fingerprint(entity)] = name
+
+    created, updated, failed = [], [], []
+    uploads = []
+    for fingerprint, ca in cas.items():
+        exist = installed.get(ca["name"])
+        if exist is None:
+            if fingerprint not in installed_by_fingerprint:
+                uploads.append((ca, created))
+        elif installed_fingerprint(exist) not in (None, fingerprint):
+            uploads.append((ca, updated))
+
+    bundle_names = set(ca["name"] for ca in cas.values())
+    removed = sorted(name for name, entity in installed.items() if module.params.get("purge")
+                     and name.startswith(prefix) and name not in bundle_names
+                     and installed_fingerprint(entity) not in cas)
+
+    if module.check_mode:
+        for ca, applied in uploads:
+            applied.append(ca["name"])
+    elif uploads:
+        # Each certificate authority is uploaded from its own file, in a temporary directory removed afterwards
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for ca, applied in uploads:
+                ca_file = os.path.join(tmp_dir, ca["name"] + ".pem")
+                with open(ca_file, "wb") as pem_file:
+                    pem_file.write(ca["pem"] + b"\n")
+                resp = upload_certificate_authority(connection, module, result, name=ca["name"],
+                                                    ca_cert_file=ca_file, ca_format="PEM")
+                if resp["success"]:
+                    applied.append(ca["name"])
+                else:
+                    failed.append({"name": ca["name"], "subject": ca["subject"], "msg": resp["response"]})
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if removed and failed:
+        removed = []
+    elif removed and not module.check_mode:
+        try:
+            resp = connection.remove_entities("CertificateAuthority", removed, trace=module._verbosity >= 3)
+        except Exception as error:
+            module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+        record_trace(result, resp)
+        if not resp["success"]:
+            failed.extend({"name": name, "msg": resp["response"]} for name in removed)
+            removed = []
+
+    result["created"] = created
+    result["updated"] = updated
+    result["removed"] = removed
+    result["api_response"] = {
+        "created": len(created),
+        "updated": len(updated),
+        "removed": len(removed),
+        "unchanged": len(cas) - len(uploads),
+        "failed": len(failed),
+    }
+    result["changed"] = bool(created or updated or removed)
+
+    if failed:
+        result["failed_cas"] = failed
+        module.fail_json(msg="{0} certificate authorities could not be synchronized".format(len(failed)), **result)
+
+
 def main():
     """Code executed at run time."""
     argument_spec = {
-        "name": {"required": True, "type": "str"},
+        "name": {"type": "str"},
         "format": {
             "type": "str",
             "choices": ["PEM", "DER"]
@@ -562,6 +792,9 @@ def main():
         "ca_cert_file": {"type": "str"},
         "ca_private_key_file": {"type": "str"},
         "password": {"type": "str", "no_log": True},
+        "bundle_file": {"type": "path"},
+        "name_prefix": {"type": "str", "default": ""},
+        "purge": {"type": "bool", "default": False},
         "state": {
             "required": True,
             "choices": ["present", "update", "absent"],
@@ -570,13 +803,17 @@ def main():
 
     # Define conditional requirements based on state
     required_if = [
-        ("state", "present", ["ca_cert_file"], True),
+        ("state", "present", ["ca_cert_file", "bundle_file"], True),
         ("state", "update", ["ca_cert_file"], True),
+        ("purge", True, ["bundle_file"]),
     ]
 
     module = AnsibleModule(
         argument_spec=argument_spec,
         required_if=required_if,
+        required_one_of=[("name", "bundle_file")],
+        mutually_exclusive=[("name", "bundle_file"), ("ca_cert_file", "bundle_file")],
+        required_by={"ca_cert_file": "name"},
         supports_check_mode=True,
     )
 
@@ -588,7 +825,10 @@ def main():
     state = module.params.get("state")
     
     # Validate inputs
-    if state in ["present", "update"]:
+    if module.params.get("bundle_file"):
+        if state != "present":
+            module.fail_json(msg="bundle_file can only be used with state present", **result)
+    elif state in ["present", "update"]:
         validate_inputs(module, result)
 
     try:
@@ -599,22 +839,22 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("bundle_file"):
+        sync_bundle(connection, module, result)
+        module.exit_json(**result)
+
     if module.check_mode:
         result["check_mode"] = True
         module.exit_json(**result)
 
     if state in ["present", "update"]:
         # Use file upload method for certificate authority operations
-        api_response = upload_certificate_authority(connection, module, result)
-        
-        # Check if the certificate authority was created/updated successfully
-        if api_response.get("Response", {}).get("CertificateAuthority", {}).get("Status", {}).get("#text") == "Configuration applied successfully.":
-            result["changed"] = True
-        else:
-            # If no specific success message, assume success if no error occurred
-            result["changed"] = True
-            
-        result["api_response"] = api_response
+        resp = upload_certificate_authority(connection, module, result)
+        if not resp["success"]:
+            module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+        result["changed"] = True
+        result["api_response"] = resp["response"]
 
     elif state == "absent":
         api_response = remove_certificate_authority(connection, module, result)
@@ -22,8 +22,10 @@ extends_documentation_fragment:
 
 options:
     name:
-        description: Name of the profile.
-        required: true
+        description:
+          - Name of the profile.
+          - One of I(name) or I(profiles) is required.
+        required: false
         type: str
     default_permission:
         description: Default permission to use for unspecified arguments when creating profile.
@@ -210,8 +212,13 @@ options:
                 type: str
                 required: false
                 choices: ["Read-Write", "Read-Only", "None"]
-            guest_user_management:
-                description: Guest user management permissions.
+            guest_users_management:
+                description: Guest users management permissions.
+                type: str
+                required: false
+                choices: ["Read-Write", "Read-Only", "None"]
+            other_guest_user_settings:
+                description: Other guest user settings permissions.
                 type: str
                 required: false
                 choices: ["Read-Write", "Read-Only", "None"]
@@ -290,6 +297,19 @@ options:
                 type: str
                 choices: ["Read-Write", "Read-Only", "None"]
                 required: false
+    profiles:
+        description:
+            - Manage several profiles with a single task, instead of the profile given by I(name).
+            - Each item accepts I(name), I(default_permission) and the same permission options as the module.
+            - All profiles are retrieved with one request, and the profiles to create, update or remove are sent
+              in one request. Only the profiles which differ are sent.
+            - With I(state=present), missing profiles are created and existing profiles are updated.
+              With I(state=updated), every profile must already exist. With I(state=absent), the listed profiles are removed.
+            - I(state=query) is not supported with I(profiles).
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
     state:
         description:
             - Use C(query) to retrieve or C(updated) to modify
@@ -339,6 +359,19 @@ EXAMPLES = r"""
   sophos.sophos_firewall.sfos_device_access_profile:
     name: ExampleProfile
     state: absent
+
+- name: ROLL OUT SEVERAL PROFILES
+  sophos.sophos_firewall.sfos_device_access_profile:
+    profiles:
+      - name: HelpdeskProfile
+        default_permission: Read-Only
+        identity:
+          guest_users_management: Read-Write
+      - name: NetworkAdmin
+        default_permission: Read-Only
+        network: Read-Write
+        firewall: Read-Write
+    state: present
 """
 
 RETURN = r"""
@@ -346,13 +379,22 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
-
+created:
+    description: Names of the profiles created.
+    type: list
+    elements: str
+    returned: when I(profiles) is specified
+updated:
+    description: Names of the profiles updated.
+    type: list
+    elements: str
+    returned: when I(profiles) is specified
+removed:
+    description: Names of the profiles removed.
+    type: list
+    elements: str
+    returned: when I(profiles) is specified
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -370,6 +412,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list, failed_objects
 
 
 def get_profile(connection, module, result):
@@ -397,52 +441,226 @@ def get_profile(connection, module, result):
     return {"exists": True, "api_response": resp["response"]}
 
 
-def flatten_args(module):
-    """Convert all provided module arguments to a flattened dictionary.
+# Permission options as (option group, option, XML path), in the order of the AdministrationProfile XML
+PROFILE_PERMISSIONS = (
+    (None, "dashboard", ("Dashboard",)),
+    (None, "wizard", ("Wizard",)),
+    ("system", "profile", ("System", "Profile")),
+    ("system", "system_password", ("System", "Password")),
+    ("system", "central_management", ("System", "CentralManagement")),
+    ("system", "backup", ("System", "Backup")),
+    ("system", "restore", ("System", "Restore")),
+    ("system", "firmware", ("System", "Firmware")),
+    ("system", "licensing", ("System", "Licensing")),
+    ("system", "services", ("System", "Services")),
+    ("system", "updates", ("System", "Updates")),
+    ("system", "reboot_shutdown", ("System", "RebootShutdown")),
+    ("system", "ha", ("System", "HA")),
+    ("system", "download_certificates", ("System", "DownloadCertificates")),
+    ("system", "other_certificate_configuration", ("System", "OtherCertificateConfiguration")),
+    ("system", "diagnostics", ("System", "Diagnostics")),
+    ("system", "other_system_configuration", ("System", "OtherSystemConfiguration")),
+    ("wireless_protection", "wireless_protection_overview", ("WirelessProtection", "WirelessProtectionOverview")),
+    ("wireless_protection", "wireless_protection_settings", ("WirelessProtection", "WirelessProtectionSettings")),
+    ("wireless_protection", "wireless_protection_network", ("WirelessProtection", "WirelessProtectionNetworkNetwork")),
+    ("wireless_protection", "wireless_protection_access_point", ("WirelessProtection", "WirelessProtectionAccessPoint")),
+    ("wireless_protection", "wireless_protection_mesh", ("WirelessProtection", "WirelessProtectionMesh")),
+    (None, "objects", ("Objects",)),
+    (None, "network", ("Network",)),
+    ("identity", "authentication", ("Identity", "Authentication")),
+    ("identity", "groups", ("Identity", "Groups")),
+    ("identity", "guest_users_management", ("Identity", "GuestUsersManagement")),
+    ("identity", "other_guest_user_settings", ("Identity", "OtherGuestUserSettings")),
+    ("identity", "policy", ("Identity", "Policy")),
+    ("identity", "test_external_server_connectivity", ("Identity", "TestExternalServerConnectivity")),
+    ("identity", "disconnect_live_user", ("Identity", "DisconnectLiveUser")),
+    (None, "firewall", ("Firewall",)),
+    ("vpn", "connect_tunnel", ("VPN", "ConnectTunnel")),
+    ("vpn", "other_vpn_configurations", ("VPN", "OtherVPNConfigurations")),
+    (None, "ips", ("IPS",)),
+    (None, "web_filter", ("WebFilter",)),
+    (None, "cloud_application_dashboard", ("CloudApplicationDashboard",)),
+    (None, "zero_day_protection", ("ZeroDayProtection",)),
+    (None, "application_filter", ("ApplicationFilter",)),
+    ("waf", "alerts", ("WAF", "Alerts")),
+    ("waf", "other_waf_configuration", ("WAF", "OtherWAFConfiguration")),
+    (None, "qos", ("QoS",)),
+    (None, "email_protection", ("EmailProtection",)),
+    (None, "traffic_discovery", ("TrafficDiscovery",)),
+    ("logs_reports", "configuration", ("LogsReports", "Configuration")),
+    ("logs_reports", "log_viewer", ("LogsReports", "LogViewer")),
+    ("logs_reports", "reports_access", ("LogsReports", "ReportsAccess")),
+    ("logs_reports", "four_eye_authentication_settings", ("LogsReports", "Four-EyeAuthenticationSettings")),
+    ("logs_reports", "de_anonymization", ("LogsReports", "De-Anonymization")),
+)
+
+# Module option (group, option) to XML path, and XML path back to module option
+PERMISSION_XML = {(group, option): xml_path for group, option, xml_path in PROFILE_PERMISSIONS}
+PERMISSION_OPTION = {xml_path: (group, option) for group, option, xml_path in PROFILE_PERMISSIONS}
+
+# Element at the start of each permission group which sets the whole group when a profile is created
+GROUP_SET_ELEMENTS = {
+    "System": "SetSystemProfile",
+    "WirelessProtection": "SetWirelessProtection",
+    "Identity": "SetIdentityProfile",
+    "VPN": "SetVPNProfile",
+    "WAF": "SetWAFProfile",
+    "LogsReports": "SetLogsReportsProfile",
+}
+
+
+def api_major_version(api_version):
+    """Return the major version from the API version reported by the firewall.
 
     Args:
-        module (AnsibleModule): AnsibleModule object
+        api_version (str): API version, for example 2100.1
+
+    Returns:
+        int: Major version, for example 21
+    """
+    return int(str(api_version)[:2])
+
+
+def requested_permissions(params):
+    """Return the permissions given in the module arguments.
+
+    Args:
+        params (dict): Module arguments, or one item of the profiles argument
+
+    Returns:
+        dict: Requested permission keyed by (option group, option)
+    """
+    requested = {}
+    for group, option in PERMISSION_XML:
+        source = params if group is None else params.get(group) or {}
+        if source.get(option):
+            requested[(group, option)] = source[option]
+    return requested
+
+
+def exist_permissions(exist_profile, prefix=()):
+    """Return the permissions of an existing profile, keyed by module option.
+
+    Args:
+        exist_profile (dict): AdministrationProfile returned by the firewall
+        prefix (tuple): XML path of exist_profile within the profile, used when recursing
+
+    Returns:
+        dict: Existing permission keyed by (option group, option)
+    """
+    permissions = {}
+    for xml_key, value in exist_profile.items():
+        xml_path = prefix + (xml_key,)
+        if isinstance(value, dict):
+            permissions.update(exist_permissions(value, xml_path))
+        elif xml_path in PERMISSION_OPTION:
+            permissions[PERMISSION_OPTION[xml_path]] = value
+    return permissions
+
+
+def permission_delta(requested, existing, api_major):
+    """Return the requested permissions which differ from the existing profile.
+
+    Args:
+        requested (dict): Output of requested_permissions()
+        existing (dict): Output of exist_permissions()
+        api_major (int): Major version of the firewall API
+
+    Returns:
+        dict: Changed permission keyed by (option group, option)
+    """
+    delta = {}
+    for key, value in requested.items():
+        # In v22, the disconnect_live_user argument is no longer valid so we ignore it here
+        if key[1] == "disconnect_live_user" and api_major >= 22:
+            continue
+        if existing.get(key) != value:
+            delta[key] = value
+    return delta
+
+
+def profile_entity(name, permissions, default_permission=None, create=False):
+    """Build an AdministrationProfile entity with every permission.
+
+    Args:
+        name (str): Profile name
+        permissions (dict): Permission keyed by (option group, option)
+        default_permission (str): Permission for the group elements, used when creating the profile
+        create (bool): Include the group elements which are only sent when creating the profile
+
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    entity = {"Name": name}
+    for key, xml_path in PERMISSION_XML.items():
+        target = entity
+        for xml_key in xml_path[:-1]:
+            if xml_key not in target:
+                target[xml_key] = {GROUP_SET_ELEMENTS[xml_key]: default_permission} if create else {}
+            target = target[xml_key]
+        target[xml_path[-1]] = permissions.get(key)
+    return {"AdministrationProfile": entity}
+
+
+def create_entity(params):
+    """Build the entity to create a profile, using default_permission for any permission not given.
+
+    Args:
+        params (dict): Module arguments, or one item of the profiles argument
 
     Returns:
-        dict: Flattened dict will all provided module arguments
+        dict: Entity in the format accepted by submit_entities()
     """
-    params = {}
-    for k, v in module.params.items():
-        if isinstance(module.params[k], str):
-            params[k] = v
-        if isinstance(module.params[k], dict):
-            for subkey, subval in module.params.get(k).items():
-                if subval:
-                    params[subkey] = subval
-    return params
+    default_permission = params.get("default_permission")
+    requested = requested_permissions(params)
+    permissions = {key: requested.get(key, default_permission) for key in PERMISSION_XML}
+    return profile_entity(params["name"], permissions, default_permission, create=True)
 
 
-def create_profile(connection, module, result):
-    """Create a Device Access Profile on Sophos Firewall.
+def update_entity(name, exist_profile, delta):
+    """Build the entity to update a profile, keeping the existing value of every unchanged permission.
+
+    Args:
+        name (str): Profile name
+        exist_profile (dict): AdministrationProfile returned by the firewall
+        delta (dict): Output of permission_delta()
+
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    permissions = exist_permissions(exist_profile)
+    permissions.update(delta)
+    return profile_entity(name, permissions)
+
+
+def submit_profiles(connection, module, result, entities, set_operation):
+    """Create or update Device Access Profiles on Sophos Firewall.
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entities (list): AdministrationProfile entities to send
+        set_operation (str): Set operation, add or update
 
     Returns:
         dict: API response
     """
-    create_params = flatten_args(module)
-
     try:
-        resp = connection.invoke_sdk("create_admin_profile", module_args=create_params)
+        resp = connection.submit_entities(entities, set_operation=set_operation, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
     return resp["response"]
 
 
-def update_profile(connection, module, result):
-    """Update admin settings on Sophos Firewall
+def get_all_profiles(connection, module, result):
+    """Get all Device Access Profiles from Sophos Firewall with a single request.
 
     Args:
         connection (Connection): Ansible Connection object
@@ -450,99 +668,91 @@ def update_profile(connection, module, result):
         result (dict): Result output to be sent to the console
 
     Returns:
-        dict: API response
+        tuple: Existing profiles keyed by name, and the major version of the firewall API
     """
-    update_params = flatten_args(module)
-
     try:
-        resp = connection.invoke_sdk("update_admin_profile", module_args=update_params)
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "AdministrationProfile"},
+                                     trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
-    if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+    record_trace(result, resp)
 
-    return resp["response"]
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
+    if not resp["exists"]:
+        return {}, 0
 
-def arg_to_xml(arg):
-    """Handle the XML keys that don't convert to the correct XML key with .title()
+    response = resp["response"]["Response"]
+    profiles = {profile["Name"]: profile for profile in ensure_list(response.get("AdministrationProfile"))
+                if isinstance(profile, dict) and "Name" in profile}
+    return profiles, api_major_version(response["@APIVersion"])
 
-    Args:
-        arg (str): Ansible module argument
 
-    Returns:
-        str: Module argument converted to the appropriate XML key
-    """
-    all_upper = ["ips", "ha", "vpn", "waf"]
-    if arg in all_upper:
-        return arg.upper()
-    if arg == "qos":
-        return "QoS"
-    if "vpn" in arg:
-        return arg.title().replace("_", "").replace("Vpn", "VPN")
-    if "waf" in arg:
-        return arg.title().replace("_", "").replace("Waf", "WAF")
-    if arg == "system_password":
-        return "Password"
-    if arg == "four_eye_authentication_settings":
-        return "Four-EyeAuthenticationSettings"
-    if arg == "de_anonymization":
-        return "De-Anonymization"
-    if arg == "wireless_protection_network":
-        return "WirelessProtectionNetworkNetwork"
-    return arg.title().replace("_", "")
-
-
-def eval_changed(module, exist_settings):
-    """Evaluate the provided arguments against existing settings.
+def manage_profiles(connection, module, result):
+    """Create, update and remove the profiles given in the profiles argument with one request.
 
     Args:
+        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
-        exist_settings (dict): Response from the call to get_admin_settings()
-
-    Returns:
-        bool: Return true if any settings are different, otherwise return false
+        result (dict): Result output to be sent to the console
     """
-    api_version = exist_settings["api_response"]["Response"]["@APIVersion"]
-    exist_settings = exist_settings["api_response"]["Response"]["AdministrationProfile"]
-
-    # Iterate through the provided arguments. If the argument has no suboptions, then it will be
-    # a string and we can compare the converted argument name using .title() with the existing
-    # setting. If the argument has suboptions, then it will be a dict and we must iterate again
-    # over the suboptions and compare in the same manner. This strategy working relies on the arguments
-    # converting with .title() to be the same as the XML key we are comparing against. The arg_to_xml
-    # function handles situations where .title() doesn't convert to the correct XML key
-
-    ignored_arguments = ["hostname", "username", "password", "port", "verify", "state"]
-    ignored_sub_params = []
-
-    # In v22, the disconnect_live_user argument is no longer valid so we ignore it here
-    if int(api_version[:2]) >= 22:
-        ignored_sub_params.append("disconnect_live_user")
-
-    arguments = {
-        k: v
-        for k, v in module.params.items()
-        if module.params.get(k) and not k in ignored_arguments
-    }
+    state = module.params.get("state")
+    exist_profiles, api_major = get_all_profiles(connection, module, result)
+
+    declared = set()
+    creates, updates, removes = [], [], []
+    for params in module.params.get("profiles"):
+        name = params["name"]
+        if name in declared:
+            module.fail_json(msg="Profile {0} is listed more than once".format(name), **result)
+        declared.add(name)
+        exist_profile = exist_profiles.get(name)
+
+        if state == "absent":
+            if exist_profile is not None:
+                removes.append(name)
+        elif exist_profile is None and state == "present":
+            creates.append((name, create_entity(params)))
+        elif exist_profile is None:
+            module.fail_json(msg="Attempting to update non-existing resource: {0}".format(name), **result)
+        else:
+            delta = permission_delta(requested_permissions(params), exist_permissions(exist_profile), api_major)
+            if delta:
+                updates.append((name, update_entity(name, exist_profile, delta)))
+
+    result["created"] = [name for name, entity in creates]
+    result["updated"] = [name for name, entity in updates]
+    result["removed"] = removes
+    result["changed"] = bool(creates or updates or removes)
 
-    for param, value in arguments.items():
-        if isinstance(arguments.get(param), str):
-            if not value == exist_settings[arg_to_xml(param)]:
-                return True
-        elif isinstance(arguments.get(param), dict):
-            for subparam, subval in arguments.get(param).items():
-                if subparam in ignored_sub_params:
-                    continue
-                if (
-                    subval
-                    and not subval
-                    == exist_settings[arg_to_xml(param)][arg_to_xml(subparam)]
-                ):
-                    return True
+    if module.check_mode:
+        result["check_mode"] = True
+        return
 
-    return False
+    if not result["changed"]:
+        return
+
+    try:
+        resp = connection.submit_changes("AdministrationProfile",
+                                         add=[entity for name, entity in creates],
+                                         update=[entity for name, entity in updates],
+                                         remove=removes,
+                                         trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"] = resp["response"]
+    failed = failed_objects(resp["response"], "AdministrationProfile",
+                            result["created"] + result["updated"] + result["removed"])
+    if failed:
+        module.fail_json(msg="An error occurred: {0}".format(failed), **result)
 
 
 def remove_profile(connection, module, result):
@@ -570,10 +780,14 @@ def remove_profile(connection, module, result):
     return resp["response"]
 
 
-def main():
-    """Code executed at run time."""
-    argument_spec = {
-        "name": {"type": "str", "required": True},
+def profile_spec():
+    """Return the argument spec of one profile, shared by the module arguments and the profiles argument.
+
+    Returns:
+        dict: Argument spec
+    """
+    return {
+        "name": {"type": "str", "required": False},
         "default_permission": {
             "type": "str",
             "required": False,
@@ -664,12 +878,21 @@ def main():
                 "de_anonymization": {"type": "str", "required": False},
             },
         },
+    }
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = profile_spec()
+    argument_spec.update({
+        "profiles": {"type": "list", "elements": "dict", "required": False,
+                     "options": dict(profile_spec(), name={"type": "str", "required": True})},
         "state": {
             "type": "str",
             "required": True,
             "choices": ["present", "absent", "updated", "query"],
         },
-    }
+    })
 
     # required_if = [
     #     ('state', 'present', ['user_password', 'user_type', 'group', 'email'], False),
@@ -685,6 +908,8 @@ def main():
         argument_spec=argument_spec,
         #    required_if=required_if,
         #    required_together=required_together,
+        required_one_of=[("name", "profiles")],
+        mutually_exclusive=[("name", "profiles")],
         supports_check_mode=True,
     )
 
@@ -703,6 +928,12 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("profiles") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with profiles", **result)
+        manage_profiles(connection, module, result)
+        module.exit_json(**result)
+
     exist_check = get_profile(connection, module, result)
     result["api_response"] = exist_check["api_response"]
 
@@ -714,7 +945,7 @@ def main():
         module.exit_json(**result)
 
     if state == "present" and not exist_check["exists"]:
-        api_response = create_profile(connection, module, result)
+        api_response = submit_profiles(connection, module, result, [create_entity(module.params)], "add")
         if (
             api_response["Response"]["AdministrationProfile"]["Status"]["#text"]
             == "Configuration applied successfully."
@@ -738,8 +969,12 @@ def main():
         result["changed"] = False
 
     elif state == "updated" and exist_check["exists"]:
-        if eval_changed(module, exist_check):
-            api_response = update_profile(connection, module, result)
+        exist_profile = exist_check["api_response"]["Response"]["AdministrationProfile"]
+        api_major = api_major_version(exist_check["api_response"]["Response"]["@APIVersion"])
+        delta = permission_delta(requested_permissions(module.params), exist_permissions(exist_profile), api_major)
+        if delta:
+            api_response = submit_profiles(connection, module, result,
+                                           [update_entity(module.params.get("name"), exist_profile, delta)], "update")
 
             if api_response:
                 if (
@@ -104,11 +104,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
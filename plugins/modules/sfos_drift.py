@@ -0,0 +1,532 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_drift
+
+short_description: Detect configuration drift against a stored firewall snapshot
+
+version_added: "2.6.0"
+
+description:
+    - Compares desired state, expressed as the arguments of other modules in this collection, against a locally stored
+      snapshot of the firewall configuration.
+    - The snapshot is indexed once by XML tag and object name, so thousands of objects can be evaluated in a single task.
+    - This module does not connect to the firewall and never makes changes. Run it against C(localhost) or with C(delegate_to).
+
+options:
+    snapshot:
+        description:
+            - Path to a JSON or YAML file containing the firewall snapshot.
+            - The file must contain a mapping of XML tag (for example C(IPHost), C(FirewallRule)) to the objects returned
+              for that tag, either as the C(api_response) of a query or as the list of objects found under
+              C(api_response.Response.<tag>).
+            - Mutually exclusive with I(snapshot_data).
+        type: path
+        required: false
+    snapshot_data:
+        description:
+            - The firewall snapshot passed in directly, in the same format as the contents of I(snapshot).
+            - Mutually exclusive with I(snapshot).
+        type: dict
+        required: false
+    desired:
+        description:
+            - List of desired objects to evaluate.
+        type: list
+        elements: dict
+        required: true
+        suboptions:
+            module:
+                description:
+                    - Name of the module whose arguments are given in I(args), for example C(sfos_ip_host) or
+                      C(sophos.sophos_firewall.sfos_ip_host).
+                type: str
+                required: true
+            args:
+                description:
+                    - The module arguments, as they would be passed to the module in a playbook.
+                    - Objects with C(state=absent) are expected to be missing from the snapshot.
+                      Objects with C(state=query) are skipped.
+                type: dict
+                required: true
+    report_in_sync:
+        description:
+            - Include objects which match the snapshot in the I(drift) output.
+        type: bool
+        required: false
+        default: false
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Save a snapshot of IP hosts and firewall rules
+  sophos.sophos_firewall.sfos_xmlapi:
+    xml_tag: "{{ item }}"
+    state: query
+  loop:
+    - IPHost
+    - FirewallRule
+  register: snapshot_query
+
+- name: Write snapshot to disk
+  ansible.builtin.copy:
+    content: "{{ dict(snapshot_query.results | map(attribute='item') | zip(snapshot_query.results | map(attribute='api_response'))) | to_json }}"
+    dest: "snapshots/{{ inventory_hostname }}.json"
+  delegate_to: localhost
+
+- name: Detect drift
+  sophos.sophos_firewall.sfos_drift:
+    snapshot: "snapshots/{{ inventory_hostname }}.json"
+    desired:
+      - module: sfos_ip_host
+        args:
+          name: TESTHOST
+          ip_address: 10.10.10.10
+          state: present
+      - module: sfos_firewall_rule
+        args:
+          name: TEST_RULE
+          action: accept
+          src_zones:
+            - LAN
+          dst_zones:
+            - WAN
+          service_list:
+            - HTTPS
+          state: present
+  delegate_to: localhost
+  register: drift
+"""
+
+RETURN = r"""
+drift:
+    description: Per-object drift report. Objects in sync are only included when I(report_in_sync=true).
+    type: list
+    elements: dict
+    returned: always
+    contains:
+        module:
+            description: Module the desired object was declared for.
+            type: str
+        xml_tag:
+            description: XML tag of the object.
+            type: str
+        name:
+            description: Object name.
+            type: str
+        status:
+            description: One of C(in_sync), C(changed), C(missing), C(unexpected) or C(unsupported).
+            type: str
+        differences:
+            description: Mapping of module argument to the desired and actual value, for objects with status C(changed).
+            type: dict
+summary:
+    description: Count of objects by drift status.
+    type: dict
+    returned: always
+"""
+
+import json
+
+try:
+    import yaml
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
+
+
+def get_path(entity, path):
+    """Walk a sequence of XML keys in an object returned by the API.
+
+    Args:
+        entity (dict): Object from the snapshot
+        path (tuple): Sequence of XML keys
+
+    Returns:
+        Value at the end of the path, or None if any key along the path is missing.
+    """
+    value = entity
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def norm_str(value):
+    """Normalize a scalar for comparison."""
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def norm_title(value):
+    """Normalize values which the modules capitalize before sending (ex. accept -> Accept)."""
+    return norm_str(value).capitalize()
+
+
+def norm_set(value):
+    """Normalize a list of names for order-insensitive comparison. "Any" is represented by an empty set."""
+    items = {norm_str(item) for item in ensure_list(value)}
+    items.discard("")
+    if "any" in {item.lower() for item in items}:
+        return frozenset()
+    return frozenset(items)
+
+
+def norm_port(value):
+    """Normalize a port specification so that 80 and 80:80 compare equal."""
+    value = norm_str(value)
+    if ":" in value:
+        start, end = value.split(":", 1)
+        if start == end:
+            return start
+    return value
+
+
+def service_details(value):
+    """Normalize service definitions from either module args or the API to a set of tuples."""
+    details = set()
+    for item in ensure_list(value):
+        if "DestinationPort" in item or "dst_port" in item:
+            details.add((
+                norm_str(item.get("Protocol", item.get("protocol"))).upper(),
+                norm_port(item.get("SourcePort", item.get("src_port", "1:65535"))),
+                norm_port(item.get("DestinationPort", item.get("dst_port"))),
+            ))
+        elif "ICMPType" in item or "ICMPv6Type" in item or "icmp_type" in item:
+            details.add((
+                norm_str(item.get("ICMPType", item.get("ICMPv6Type", item.get("icmp_type")))),
+                norm_str(item.get("ICMPCode", item.get("ICMPv6Code", item.get("icmp_code")))),
+            ))
+        else:
+            details.add((norm_str(item.get("ProtocolName", item.get("protocol"))).upper(),))
+    return frozenset(details)
+
+
+def rule_policy(entity):
+    """Return the policy section of a firewall rule, which is keyed by policy type."""
+    return entity.get("NetworkPolicy") or entity.get("UserPolicy") or {}
+
+
+# Each comparator maps the arguments of a module to the location of the value in the
+# object returned by the API. A field is (argument, root, path, normalizer), where root
+# optionally selects a sub-section of the object before walking the path. The optional
+# actions map a list argument to the argument selecting how the module applies it
+# (add, remove or replace) and the default of that argument in the module.
+COMPARATORS = {
+    "sfos_ip_host": {
+        "xml_tag": "IPHost",
+        "fields": [
+            ("host_type", None, ("HostType",), lambda v: {"ip": "IP", "network": "Network", "range": "IPRange"}.get(v, v)),
+            ("ip_address", None, ("IPAddress",), norm_str),
+            ("network", None, ("IPAddress",), norm_str),
+            ("mask", None, ("Subnet",), norm_str),
+            ("start_ip", None, ("StartIPAddress",), norm_str),
+            ("end_ip", None, ("EndIPAddress",), norm_str),
+        ],
+    },
+    "sfos_ip_hostgroup": {
+        "xml_tag": "IPHostGroup",
+        "fields": [
+            ("description", None, ("Description",), norm_str),
+            ("host_list", None, ("HostList", "Host"), norm_set),
+        ],
+        "actions": {"host_list": ("action", None)},
+    },
+    "sfos_fqdn_host": {
+        "xml_tag": "FQDNHost",
+        "fields": [
+            ("description", None, ("Description",), norm_str),
+            ("fqdn", None, ("FQDN",), norm_str),
+            ("fqdn_group_list", None, ("FQDNHostGroupList", "FQDNHostGroup"), norm_set),
+        ],
+    },
+    "sfos_fqdn_hostgroup": {
+        "xml_tag": "FQDNHostGroup",
+        "fields": [
+            ("description", None, ("Description",), norm_str),
+            ("fqdn_host_list", None, ("FQDNHostList", "FQDNHost"), norm_set),
+        ],
+        "actions": {"fqdn_host_list": ("action", None)},
+    },
+    "sfos_service": {
+        "xml_tag": "Services",
+        "fields": [
+            ("type", None, ("Type",), lambda v: norm_str(v).lower()),
+            ("service_list", None, ("ServiceDetails", "ServiceDetail"), service_details),
+        ],
+    },
+    "sfos_servicegroup": {
+        "xml_tag": "ServiceGroup",
+        "fields": [
+            ("description", None, ("Description",), norm_str),
+            ("service_list", None, ("ServiceList", "Service"), norm_set),
+        ],
+        "actions": {"service_list": ("action", None)},
+    },
+    "sfos_urlgroup": {
+        "xml_tag": "WebFilterURLGroup",
+        "fields": [
+            ("domain_list", None, ("URLlist", "URL"), norm_set),
+        ],
+    },
+    "sfos_firewall_rulegroup": {
+        "xml_tag": "FirewallRuleGroup",
+        "fields": [
+            ("description", None, ("Description",), norm_str),
+            ("policy_list", None, ("SecurityPolicyList", "SecurityPolicy"), norm_set),
+            ("source_zones", None, ("SourceZones", "Zone"), norm_set),
+            ("dest_zones", None, ("DestinationZones", "Zone"), norm_set),
+            ("policy_type", None, ("Policytype",), norm_str),
+        ],
+        "actions": {
+            "policy_list": ("policy_action", "add"),
+            "source_zones": ("source_zone_action", "add"),
+            "dest_zones": ("dest_zone_action", "add"),
+        },
+    },
+    "sfos_firewall_rule": {
+        "xml_tag": "FirewallRule",
+        "fields": [
+            ("status", None, ("Status",), norm_title),
+            ("description", None, ("Description",), norm_str),
+            ("action", rule_policy, ("Action",), norm_title),
+            ("log", rule_policy, ("LogTraffic",), norm_title),
+            ("src_zones", rule_policy, ("SourceZones", "Zone"), norm_set),
+            ("dst_zones", rule_policy, ("DestinationZones", "Zone"), norm_set),
+            ("src_networks", rule_policy, ("SourceNetworks", "Network"), norm_set),
+            ("dst_networks", rule_policy, ("DestinationNetworks", "Network"), norm_set),
+            ("service_list", rule_policy, ("Services", "Service"), norm_set),
+            ("web_filter", rule_policy, ("WebFilter",), norm_str),
+            ("web_category_traffic_shaping", rule_policy, ("WebCategoryBaseQoSPolicy",), norm_str),
+            ("block_quic", rule_policy, ("BlockQuickQuic",), norm_str),
+            ("scan_virus", rule_policy, ("ScanVirus",), norm_str),
+            ("proxy_mode", rule_policy, ("ProxyMode",), norm_str),
+            ("decrypt_https", rule_policy, ("DecryptHTTPS",), norm_str),
+            ("source_security_heartbeat", rule_policy, ("SourceSecurityHeartbeat",), norm_str),
+            ("minimum_source_hb_permitted", rule_policy, ("MinimumSourceHBPermitted",), norm_str),
+            ("dest_security_heartbeat", rule_policy, ("DestSecurityHeartbeat",), norm_str),
+            ("minimum_dest_hb_permitted", rule_policy, ("MinimumDestHBPermitted",), norm_str),
+            ("application_control", rule_policy, ("ApplicationControl",), norm_str),
+            ("application_base_qos_policy", rule_policy, ("ApplicationBaseQoSPolicy",), norm_str),
+            ("intrusion_prevention", rule_policy, ("IntrusionPrevention",), norm_str),
+            ("qos_policy", rule_policy, ("TrafficShappingPolicy",), norm_str),
+            ("dscp_marking", rule_policy, ("DSCPMarking",), norm_str),
+            ("scan_smtp", rule_policy, ("ScanSMTP",), norm_str),
+            ("scan_smtps", rule_policy, ("ScanSMTPS",), norm_str),
+            ("scan_imap", rule_policy, ("ScanIMAP",), norm_str),
+            ("scan_imaps", rule_policy, ("ScanIMAPS",), norm_str),
+            ("scan_pop3", rule_policy, ("ScanPOP3",), norm_str),
+            ("scan_pop3s", rule_policy, ("ScanPOP3S",), norm_str),
+        ],
+    },
+}
+
+
+def load_snapshot(module):
+    """Load the snapshot from file or from the module arguments.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+
+    Returns:
+        dict: Snapshot data keyed by XML tag
+    """
+    if module.params.get("snapshot_data") is not None:
+        return module.params.get("snapshot_data")
+
+    path = module.params.get("snapshot")
+    try:
+        with open(path, "r") as snapshot_file:
+            content = snapshot_file.read()
+    except (IOError, OSError) as error:
+        module.fail_json(msg="Unable to read snapshot {0}: {1}".format(path, error))
+
+    try:
+        return json.loads(content)
+    except ValueError:
+        pass
+
+    try:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        return yaml.load(content, Loader=loader)
+    except yaml.YAMLError as error:
+        module.fail_json(msg="Unable to parse snapshot {0}: {1}".format(path, error))
+
+
+def index_snapshot(snapshot):
+    """Build a lookup table of snapshot objects by XML tag and name.
+
+    Args:
+        snapshot (dict): Snapshot data keyed by XML tag
+
+    Returns:
+        dict: Mapping of XML tag to a mapping of object name to object
+    """
+    if isinstance(snapshot, dict) and "Response" in snapshot:
+        snapshot = snapshot["Response"]
+
+    index = {}
+    for xml_tag, entries in (snapshot or {}).items():
+        if xml_tag.startswith("@"):
+            continue
+        if isinstance(entries, dict) and "Response" in entries:
+            entries = entries["Response"].get(xml_tag)
+        by_name = {}
+        for entity in ensure_list(entries):
+            if isinstance(entity, dict) and "Name" in entity:
+                by_name[entity["Name"]] = entity
+        index[xml_tag] = by_name
+    return index
+
+
+def members_differ(desired, actual, action):
+    """Evaluate a normalized list argument against the list in the snapshot.
+
+    Args:
+        desired (frozenset): Members given in the module arguments
+        actual (frozenset): Members in the snapshot
+        action (str): add, remove or replace, or None to require the same members
+
+    Returns:
+        bool: True if the module would change the list
+    """
+    if action == "add":
+        return not desired <= actual
+    if action == "remove":
+        return not desired.isdisjoint(actual)
+    return desired != actual
+
+
+def compare_object(comparator, args, entity):
+    """Compare the module arguments for one object against the object in the snapshot.
+
+    Only arguments which were supplied are compared, consistent with the behavior of the
+    modules when updating an object. List arguments with an action are compared the way the
+    module applies them, so listing part of the members with the add action is not drift.
+
+    Args:
+        comparator (dict): Entry from COMPARATORS
+        args (dict): Module arguments
+        entity (dict): Object from the snapshot
+
+    Returns:
+        dict: Differences keyed by argument name
+    """
+    differences = {}
+    for arg, root, path, normalize in comparator["fields"]:
+        desired = args.get(arg)
+        if desired is None:
+            continue
+        section = root(entity) if root else entity
+        actual = get_path(section, path)
+        if arg in comparator.get("actions", {}):
+            action_arg, default = comparator["actions"][arg]
+            changed = members_differ(normalize(desired), normalize(actual), args.get(action_arg) or default)
+        else:
+            changed = normalize(desired) != normalize(actual)
+        if changed:
+            differences[arg] = {"desired": desired, "actual": actual}
+    return differences
+
+
+def evaluate(desired, index, report_in_sync):
+    """Evaluate all desired objects against the snapshot index.
+
+    Args:
+        desired (list): List of desired objects
+        index (dict): Snapshot index from index_snapshot()
+        report_in_sync (bool): Include objects which are in sync in the report
+
+    Returns:
+        tuple: Drift report and summary
+    """
+    drift = []
+    summary = {"total": 0, "in_sync": 0, "changed": 0, "missing": 0, "unexpected": 0, "unsupported": 0}
+
+    for item in desired:
+        module_name = item["module"].split(".")[-1]
+        args = item.get("args") or {}
+        state = args.get("state", "present")
+        if state == "query":
+            continue
+
+        summary["total"] += 1
+        report = {"module": module_name, "name": args.get("name")}
+        comparator = COMPARATORS.get(module_name)
+
+        if not comparator:
+            report["status"] = "unsupported"
+        else:
+            report["xml_tag"] = comparator["xml_tag"]
+            entity = index.get(comparator["xml_tag"], {}).get(args.get("name"))
+            if state == "absent":
+                report["status"] = "unexpected" if entity else "in_sync"
+            elif entity is None:
+                report["status"] = "missing"
+            else:
+                differences = compare_object(comparator, args, entity)
+                if differences:
+                    report["status"] = "changed"
+                    report["differences"] = differences
+                else:
+                    report["status"] = "in_sync"
+
+        summary[report["status"]] += 1
+        if report["status"] != "in_sync" or report_in_sync:
+            drift.append(report)
+
+    return drift, summary
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "snapshot": {"type": "path"},
+        "snapshot_data": {"type": "dict"},
+        "desired": {"type": "list", "elements": "dict", "required": True, "options": {
+            "module": {"type": "str", "required": True},
+            "args": {"type": "dict", "required": True},
+            }
+        },
+        "report_in_sync": {"type": "bool", "default": False},
+    }
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[("snapshot", "snapshot_data")],
+        required_one_of=[("snapshot", "snapshot_data")],
+        supports_check_mode=True,
+    )
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    index = index_snapshot(load_snapshot(module))
+    result["drift"], result["summary"] = evaluate(
+        module.params.get("desired"), index, module.params.get("report_in_sync")
+    )
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_facts
+
+short_description: Gather facts from Sophos Firewall
+
+version_added: "2.6.0"
+
+description:
+    - Retrieves configuration from Sophos Firewall and returns it as normalized facts.
+    - The XML tags in the selected subsets are requested in parallel over the httpapi connection.
+    - Facts are returned in C(ansible_facts), so they can be stored by a fact cache plugin and reused
+      by later plays without contacting the firewall.
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    gather_subset:
+        description:
+            - Restrict the facts collected to the given subsets.
+            - Possible values are C(all), C(objects), C(rules), C(auth_servers), C(logging) and C(system).
+            - Prefix a subset with C(!) to exclude it, for example C(!rules).
+        type: list
+        elements: str
+        required: false
+        default: [all]
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Gather all facts
+  sophos.sophos_firewall.sfos_facts:
+
+- name: Gather only network object facts
+  sophos.sophos_firewall.sfos_facts:
+    gather_subset:
+      - objects
+
+- name: Gather everything except firewall rules
+  sophos.sophos_firewall.sfos_facts:
+    gather_subset:
+      - all
+      - "!rules"
+
+- name: Create the host only if it does not exist yet
+  sophos.sophos_firewall.sfos_ip_host:
+    name: TESTHOST
+    ip_address: 10.10.10.10
+    state: present
+  when: "'TESTHOST' not in sfos_ip_host_names"
+"""
+
+RETURN = r"""
+ansible_facts:
+    description:
+        - Facts gathered from the firewall. Each object type is returned as a list of objects named
+          C(sfos_<type>), for example C(sfos_ip_hosts), along with a list of object names named C(sfos_<object>_names),
+          for example C(sfos_ip_host_names). Settings are returned as dictionaries.
+    returned: always
+    type: dict
+    contains:
+        sfos_api_version:
+            description: XML API version reported by the firewall.
+            type: str
+        sfos_gathered_subset:
+            description: The subsets that were gathered.
+            type: list
+            elements: str
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
+
+# XML tags retrieved for each subset, and the fact name each tag is stored under.
+# Tags holding a list of named objects are returned as lists, the others as dictionaries.
+SUBSETS = {
+    "objects": {
+        "IPHost": "ip_hosts",
+        "IPHostGroup": "ip_hostgroups",
+        "FQDNHost": "fqdn_hosts",
+        "FQDNHostGroup": "fqdn_hostgroups",
+        "Services": "services",
+        "ServiceGroup": "servicegroups",
+        "Zone": "zones",
+        "WebFilterURLGroup": "urlgroups",
+    },
+    "rules": {
+        "FirewallRule": "firewall_rules",
+        "FirewallRuleGroup": "firewall_rulegroups",
+    },
+    "auth_servers": {
+        "AuthenticationServer": "auth_servers",
+    },
+    "logging": {
+        "SyslogServers": "syslog_servers",
+        "NetFlowConfiguration": "netflow",
+    },
+    "system": {
+        "AdminSettings": "admin_settings",
+        "DNS": "dns",
+        "Time": "time",
+    },
+}
+
+# Tags holding a list of named objects, and the fact name the object names are stored under.
+LIST_TAGS = {
+    "IPHost": "ip_host_names",
+    "IPHostGroup": "ip_hostgroup_names",
+    "FQDNHost": "fqdn_host_names",
+    "FQDNHostGroup": "fqdn_hostgroup_names",
+    "Services": "service_names",
+    "ServiceGroup": "servicegroup_names",
+    "Zone": "zone_names",
+    "WebFilterURLGroup": "urlgroup_names",
+    "FirewallRule": "firewall_rule_names",
+    "FirewallRuleGroup": "firewall_rulegroup_names",
+    "SyslogServers": "syslog_server_names",
+}
+
+
+def strip_attributes(entity):
+    """Remove XML attributes (ex. transactionid) which are not part of the configuration."""
+    if isinstance(entity, dict):
+        return {key: strip_attributes(val) for key, val in entity.items() if not key.startswith("@")}
+    if isinstance(entity, list):
+        return [strip_attributes(item) for item in entity]
+    return entity
+
+
+def resolve_subsets(module):
+    """Resolve the gather_subset argument into the list of subsets to collect.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+
+    Returns:
+        list: Subset names
+    """
+    include = set()
+    exclude = set()
+    for subset in module.params.get("gather_subset"):
+        negate = subset.startswith("!")
+        name = subset[1:] if negate else subset
+        if name != "all" and name not in SUBSETS:
+            module.fail_json(msg="Invalid gather_subset: {0}. Valid subsets are all, {1}".format(
+                subset, ", ".join(sorted(SUBSETS))))
+        names = set(SUBSETS) if name == "all" else {name}
+        if negate:
+            exclude.update(names)
+        else:
+            include.update(names)
+
+    if not include:
+        include = set(SUBSETS)
+
+    return sorted(include - exclude)
+
+
+def normalize(xml_tag, response):
+    """Convert the API response for a tag into a fact value.
+
+    Args:
+        xml_tag (str): XML tag that was retrieved
+        response (dict): API response
+
+    Returns:
+        list or dict: Normalized fact value
+    """
+    entries = strip_attributes(response["Response"].get(xml_tag))
+
+    if xml_tag in LIST_TAGS:
+        return ensure_list(entries)
+
+    if xml_tag == "AuthenticationServer":
+        # Authentication servers are grouped by server type, each holding one or more servers
+        return {server_type: ensure_list(servers) for server_type, servers in (entries or {}).items()}
+
+    return entries or {}
+
+
+def gather_facts(connection, module, result):
+    """Retrieve the XML tags for the selected subsets and build the facts.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Facts
+    """
+    subsets = resolve_subsets(module)
+    tag_names = {}
+    for subset in subsets:
+        tag_names.update(SUBSETS[subset])
+
+    try:
+        responses = connection.get_tags(list(tag_names))
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    facts = {"sfos_gathered_subset": subsets}
+    for xml_tag, fact_name in tag_names.items():
+        resp = responses[xml_tag]
+        empty = [] if xml_tag in LIST_TAGS else {}
+
+        if resp["success"] and not resp["exists"]:
+            facts["sfos_" + fact_name] = empty
+        elif not resp["success"]:
+            module.warn("Unable to retrieve {0}: {1}".format(xml_tag, resp["response"]))
+            facts["sfos_" + fact_name] = empty
+        else:
+            facts.setdefault("sfos_api_version", resp["response"]["Response"].get("@APIVersion"))
+            facts["sfos_" + fact_name] = normalize(xml_tag, resp["response"])
+
+        if xml_tag in LIST_TAGS:
+            facts["sfos_" + LIST_TAGS[xml_tag]] = [
+                entity.get("Name") for entity in facts["sfos_" + fact_name] if isinstance(entity, dict)
+            ]
+
+    return facts
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "gather_subset": {"type": "list", "elements": "str", "default": ["all"]},
+    }
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError as e:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    result["ansible_facts"] = gather_facts(connection, module, result)
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,8 +22,10 @@ extends_documentation_fragment:
 
 options:
     name:
-        description: Name of the firewall rule group to create, update, or delete
-        required: true
+        description:
+            - Name of the firewall rule group to create, update, or delete
+            - Required unless I(rulegroups) is used.
+        required: false
         type: str
     description:
         description: Rule group description
@@ -34,6 +36,14 @@ options:
         type: list
         elements: str
         required: false
+    policy_action:
+        description:
+            - Indicate whether adding to, removing from, or replacing the list of firewall rules. Default is add.
+        choices: ["add", "remove", "replace"]
+        required: false
+        type: str
+        default: add
+        version_added: "2.6.0"
     source_zones:
         description:
             - Source zones for the rule group
@@ -67,9 +77,22 @@ options:
         required: false
         type: str
         default: add
+    rulegroups:
+        description:
+            - Manage several rule groups in one task, instead of the single rule group given by I(name).
+            - Each entry accepts the same options as the module, except I(state), which applies to all the entries.
+            - All rule groups are retrieved with one request, and the groups which need to be created or updated are
+              sent together in a single request. Groups whose settings and membership already match are skipped.
+            - C(query) is not supported with this option.
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(absent) to remove, or C(updated) to modify
+            - Updates are only sent when the description, policy type, rules or zones differ from the existing
+              rule group. Rules and zones are compared regardless of their order.
         choices: [present, updated, query]
         type: str
         required: true
@@ -93,6 +116,19 @@ EXAMPLES = r"""
       - WAN
     state: present
   delegate_to: localhost
+
+- name: Move rules between rule groups
+  sophos.sophos_firewall.sfos_firewall_rulegroup:
+    rulegroups:
+      - name: TEST RULEGROUP
+        policy_list:
+          - TEST RULE 1
+        policy_action: replace
+      - name: TEST RULEGROUP 2
+        policy_list:
+          - TEST RULE 2
+    state: updated
+  delegate_to: localhost
 """
 
 RETURN = r"""
@@ -100,6 +136,16 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
+created:
+    description: Rule groups created when using I(rulegroups).
+    type: list
+    elements: str
+    returned: when I(rulegroups) is used
+updated:
+    description: Rule groups updated when using I(rulegroups).
+    type: list
+    elements: str
+    returned: when I(rulegroups) is used
 
 """
 
@@ -120,6 +166,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
 
 
 def get_firewallrulegroup(connection, module, result):
@@ -147,80 +195,245 @@ def get_firewallrulegroup(connection, module, result):
     return {"exists": True, "api_response": resp["response"]}
 
 
-def create_firewallrulegroup(connection, module, result):
-    """Create a firewall rule group on Sophos Firewall.
+def apply_action(existing, requested, action):
+    """Apply an add, remove or replace action to a membership list.
+
+    Added members are placed before the existing members, the same as the SDK update_rulegroup().
+    A zone list containing Any is treated as an empty list, which means any zone.
+
+    Args:
+        existing (list): Existing members
+        requested (list): Members given to the module, or None to keep the existing members
+        action (str): add, remove or replace
+
+    Returns:
+        list: Resulting members
+    """
+    if requested is None:
+        return list(existing)
+    if action == "remove":
+        return [member for member in existing if member not in requested]
+    if "Any" in requested:
+        return []
+    new_members = []
+    for member in requested:
+        if member not in new_members and (action == "replace" or member not in existing):
+            new_members.append(member)
+    return new_members if action == "replace" else new_members + list(existing)
+
+
+def desired_rulegroup(params, exist_group):
+    """Work out the settings of a rule group after applying the module arguments.
+
+    Args:
+        params (dict): Module arguments for the rule group
+        exist_group (dict): Existing FirewallRuleGroup, or None when it is being created
+
+    Returns:
+        dict: Description, policy type, rules, source zones and destination zones
+    """
+    exist_group = exist_group or {}
+    return {
+        "description": params.get("description") or exist_group.get("Description") or "",
+        "policy_type": params.get("policy_type") or exist_group.get("Policytype") or "Any",
+        "policies": apply_action(ensure_list((exist_group.get("SecurityPolicyList") or {}).get("SecurityPolicy")),
+                                 params.get("policy_list"), params.get("policy_action") or "add"),
+        "source_zones": apply_action(ensure_list((exist_group.get("SourceZones") or {}).get("Zone")),
+                                     params.get("source_zones"), params.get("source_zone_action") or "add"),
+        "dest_zones": apply_action(ensure_list((exist_group.get("DestinationZones") or {}).get("Zone")),
+                                   params.get("dest_zones"), params.get("dest_zone_action") or "add"),
+    }
+
+
+def eval_changed(params, exist_group):
+    """Evaluate the module arguments for a rule group against the existing rule group.
+
+    Args:
+        params (dict): Module arguments for the rule group
+        exist_group (dict): Existing FirewallRuleGroup
+
+    Returns:
+        bool: Return true if the rule group would be changed, otherwise return false
+    """
+    desired = desired_rulegroup(params, exist_group)
+    current = desired_rulegroup({}, exist_group)
+    if desired["description"] != current["description"] or desired["policy_type"] != current["policy_type"]:
+        return True
+    for key in ("policies", "source_zones", "dest_zones"):
+        if set(desired[key]) != set(current[key]):
+            return True
+    return False
+
+
+def rulegroup_entity(name, desired):
+    """Build a FirewallRuleGroup entity.
+
+    Args:
+        name (str): Rule group name
+        desired (dict): Settings returned by desired_rulegroup()
+
+    Returns:
+        dict: FirewallRuleGroup entity
+    """
+    entity = {
+        "Name": name,
+        "Description": desired["description"],
+        "SecurityPolicyList": {"SecurityPolicy": desired["policies"]} if desired["policies"] else None,
+    }
+    if desired["source_zones"]:
+        entity["SourceZones"] = {"Zone": desired["source_zones"]}
+    if desired["dest_zones"]:
+        entity["DestinationZones"] = {"Zone": desired["dest_zones"]}
+    entity["Policytype"] = desired["policy_type"]
+    return {"FirewallRuleGroup": entity}
+
+
+def submit_rulegroups(connection, module, result, entities, set_operation):
+    """Send one or more rule groups to Sophos Firewall in a single request.
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entities (list): FirewallRuleGroup entities
+        set_operation (str): add or update
 
     Returns:
         dict: API response
     """
-    params = dict(
-        name=module.params.get("name"),
-        description=module.params.get("description"),
-        policy_list=module.params.get("policy_list"),
-        source_zones=module.params.get("source_zones"),
-        dest_zones=module.params.get("dest_zones"),
-        policy_type=module.params.get("policy_type")
-    )
     try:
-        resp = connection.invoke_sdk("create_rulegroup", module_args=params)
+        resp = connection.submit_entities(entities, set_operation=set_operation, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
     return resp["response"]
 
 
-def update_firewallrulegroup(connection, module, result):
+def create_firewallrulegroup(connection, module, result):
+    """Create a firewall rule group on Sophos Firewall.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: API response
+    """
+    desired = desired_rulegroup(module.params, None)
+    return submit_rulegroups(connection, module, result, [rulegroup_entity(module.params.get("name"), desired)], "add")
+
+
+def update_firewallrulegroup(connection, module, result, exist_group):
     """Update an existing firewall rule group on Sophos Firewall
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        exist_group (dict): Existing FirewallRuleGroup
 
     Returns:
         dict: API response
     """
-    params = dict(
-        name=module.params.get("name"),
-        description=module.params.get("description"),
-        policy_list=module.params.get("policy_list"),
-        source_zones=module.params.get("source_zones"),
-        dest_zones=module.params.get("dest_zones"),
-        policy_type=module.params.get("policy_type"),
-        source_zone_action=module.params.get("source_zone_action"),
-        dest_zone_action=module.params.get("dest_zone_action")
-    )
+    desired = desired_rulegroup(module.params, exist_group)
+    return submit_rulegroups(connection, module, result, [rulegroup_entity(module.params.get("name"), desired)], "update")
+
+
+def manage_rulegroups(connection, module, result):
+    """Create or update the rule groups given in the rulegroups argument.
 
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    state = module.params.get("state")
     try:
-        resp = connection.invoke_sdk("update_rulegroup", module_args=params)
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "FirewallRuleGroup"},
+                                     trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    exist_groups = {}
+    if resp["exists"]:
+        for group in ensure_list(resp["response"]["Response"].get("FirewallRuleGroup")):
+            if isinstance(group, dict) and "Name" in group:
+                exist_groups[group["Name"]] = group
+
+    result["created"] = []
+    result["updated"] = []
+    creates, updates = [], []
+    for params in module.params.get("rulegroups"):
+        name = params["name"]
+        exist_group = exist_groups.get(name)
+        if exist_group is None and state == "present":
+            creates.append(rulegroup_entity(name, desired_rulegroup(params, None)))
+            result["created"].append(name)
+        elif exist_group is None:
+            module.fail_json(msg="Firewall rule group {0} does not exist".format(name), **result)
+        elif state == "updated" and eval_changed(params, exist_group):
+            updates.append(rulegroup_entity(name, desired_rulegroup(params, exist_group)))
+            result["updated"].append(name)
+
+    result["changed"] = bool(creates or updates)
+    if module.check_mode:
+        result["check_mode"] = True
+        return
 
-    return resp["response"]
+    try:
+        resp = connection.submit_changes("FirewallRuleGroup", add=creates, update=updates,
+                                         trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
+    result["api_response"] = resp["response"]
+    for status in ensure_list(resp["response"]["Response"].get("FirewallRuleGroup")):
+        if isinstance(status, dict) and not str(status.get("Status", {}).get("@code", "")).startswith("2"):
+            module.fail_json(msg="An error occurred: {0}".format(status["Status"]), **result)
 
 def main():
     """Code executed at run time."""
     argument_spec = {
-        "name": {"type": "str", "required": True},
+        "name": {"type": "str"},
         "description": {"type": "str"},
         "policy_list": {"type": "list", "elements": "str"},
+        "policy_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
         "source_zones": {"type": "list", "elements": "str"},
         "dest_zones": {"type": "list", "elements": "str"},
         "policy_type": {"type": "str", "choices": ["User/network rule", "Network rule", "User rule", "WAF rule", "Any"]},
         "source_zone_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
         "dest_zone_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
+        "rulegroups": {
+            "type": "list",
+            "elements": "dict",
+            "options": {
+                "name": {"type": "str", "required": True},
+                "description": {"type": "str"},
+                "policy_list": {"type": "list", "elements": "str"},
+                "policy_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
+                "source_zones": {"type": "list", "elements": "str"},
+                "dest_zones": {"type": "list", "elements": "str"},
+                "policy_type": {"type": "str", "choices": ["User/network rule", "Network rule", "User rule", "WAF rule", "Any"]},
+                "source_zone_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
+                "dest_zone_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
+            },
+        },
         "state": {
             "required": True,
             "choices": ["present", "updated", "query"],
@@ -228,13 +441,15 @@ def main():
     }
 
     required_if = [
-        ("state", "present", ("policy_list", "source_zones", "dest_zones",), True),
+        ("state", "present", ("policy_list", "source_zones", "dest_zones", "rulegroups",), True),
     ]
 
 
     module = AnsibleModule(
         argument_spec=argument_spec,
         required_if=required_if,
+        required_one_of=[("name", "rulegroups")],
+        mutually_exclusive=[("name", "rulegroups")],
         supports_check_mode=True,
     )
 
@@ -253,6 +468,12 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("rulegroups") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with rulegroups", **result)
+        manage_rulegroups(connection, module, result)
+        module.exit_json(**result)
+
     exist_check = get_firewallrulegroup(connection, module, result)
     result["api_response"] = exist_check["api_response"]
 
@@ -276,9 +497,9 @@ def main():
         result["changed"] = False
 
     elif state == "updated" and exist_check["exists"]:
-        api_response = update_firewallrulegroup(connection, module, result)
-
-        if api_response:
+        exist_group = exist_check["api_response"]["Response"]["FirewallRuleGroup"]
+        if eval_changed(module.params, exist_group):
+            api_response = update_firewallrulegroup(connection, module, result, exist_group)
             if (
                 api_response["Response"]["FirewallRuleGroup"]["Status"]["#text"]
                 == "Configuration applied successfully."
@@ -0,0 +1,343 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_fqdn_host_bulk
+
+short_description: Reconcile FQDN hosts and FQDN host groups in bulk (System > Hosts & services)
+
+version_added: "2.6.0"
+
+description:
+    - Creates, updates and optionally removes FQDN hosts and FQDN host groups on Sophos Firewall to match a desired set,
+      such as a list of SaaS domains published by a vendor.
+    - Existing FQDN hosts and FQDN host groups are retrieved with one request each. Only the objects which are
+      missing or differ are sent, several objects per request.
+    - FQDN host groups are created before the FQDN hosts which are placed in them.
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    hosts:
+        description:
+            - Desired FQDN hosts.
+        type: list
+        elements: dict
+        required: true
+        suboptions:
+            name:
+                description: Name of the FQDN host.
+                type: str
+                required: true
+            fqdn:
+                description: The FQDN string.
+                type: str
+                required: true
+            description:
+                description: Description of the FQDN host. The existing description is kept when omitted.
+                type: str
+            fqdn_group_list:
+                description:
+                    - FQDN host groups the FQDN host is a member of, replacing its existing memberships.
+                    - The existing memberships are kept when omitted.
+                    - Groups which do not exist are created.
+                type: list
+                elements: str
+    groups:
+        description:
+            - Desired FQDN host groups. Use to set the description of groups, or with I(purge) to keep empty groups.
+            - Group membership is set with I(fqdn_group_list) on the hosts.
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+            name:
+                description: Name of the FQDN host group.
+                type: str
+                required: true
+            description:
+                description: Description of the FQDN host group. The existing description is kept when omitted.
+                type: str
+    purge:
+        description:
+            - Remove the FQDN hosts, and the FQDN host groups, which exist on the firewall but are not in the desired set.
+            - Groups are in the desired set when listed in I(groups) or referenced in I(fqdn_group_list).
+        type: bool
+        default: false
+    batch_size:
+        description:
+            - Maximum number of objects sent in a single request.
+        type: int
+        default: 100
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Sync FQDN hosts for a SaaS application
+  sophos.sophos_firewall.sfos_fqdn_host_bulk:
+    hosts:
+      - name: SAAS_LOGIN
+        fqdn: login.example.com
+        fqdn_group_list:
+          - SAAS_APP
+      - name: SAAS_API
+        fqdn: "*.api.example.com"
+        fqdn_group_list:
+          - SAAS_APP
+    groups:
+      - name: SAAS_APP
+        description: Managed by Ansible
+
+- name: Sync FQDN hosts from a vendor feed, removing the ones which were dropped
+  sophos.sophos_firewall.sfos_fqdn_host_bulk:
+    hosts: "{{ vendor_feed | map('combine', {'fqdn_group_list': ['VENDOR_SAAS']}) | list }}"
+    purge: true
+"""
+
+RETURN = r"""
+api_response:
+    description: Number of FQDN hosts and FQDN host groups created, updated, removed, unchanged and failed.
+    returned: always
+    type: dict
+created:
+    description: Names of the objects created, keyed by XML tag.
+    returned: always
+    type: dict
+updated:
+    description: Names of the objects updated, keyed by XML tag.
+    returned: always
+    type: dict
+removed:
+    description: Names of the objects removed, keyed by XML tag.
+    returned: always
+    type: dict
+failed_objects:
+    description: Objects which could not be created, updated or removed, with the reason.
+    returned: when an object could not be created, updated or removed
+    type: list
+    elements: dict
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import (
+    apply_changes,
+    ensure_list,
+    get_existing,
+    report_changes,
+)
+from collections import Counter
+
+XML_TAGS = ["FQDNHostGroup", "FQDNHost"]
+
+
+def member_names(entity, list_tag, member_tag):
+    """Return the names in a membership list of an existing object as a set."""
+    return set(ensure_list((entity.get(list_tag) or {}).get(member_tag)))
+
+
+def group_entity(name, description, exist_group):
+    """Build an FQDNHostGroup entity, keeping the existing members.
+
+    Args:
+        name (str): Group name
+        description (str): Group description, None to keep the existing description
+        exist_group (dict): Existing group, or None
+
+    Returns:
+        dict: FQDNHostGroup entity
+    """
+    exist_group = exist_group or {}
+    if description is None:
+        description = exist_group.get("Description")
+    entity = {"Name": name, "Description": description or ""}
+    members = sorted(member_names(exist_group, "FQDNHostList", "FQDNHost"))
+    if members:
+        entity["FQDNHostList"] = {"FQDNHost": members}
+    return {"FQDNHostGroup": entity}
+
+
+def host_entity(host, exist_host):
+    """Build an FQDNHost entity from the desired host, keeping the existing values of omitted options.
+
+    Args:
+        host (dict): Desired host
+        exist_host (dict): Existing host, or None
+
+    Returns:
+        dict: FQDNHost entity
+    """
+    exist_host = exist_host or {}
+    description = host.get("description")
+    if description is None:
+        description = exist_host.get("Description")
+    groups = host.get("fqdn_group_list")
+    if groups is None:
+        groups = member_names(exist_host, "FQDNHostGroupList", "FQDNHostGroup")
+
+    entity = {"Name": host["name"], "Description": description or "", "FQDN": host["fqdn"]}
+    entity["FQDNHostGroupList"] = {"FQDNHostGroup": sorted(groups)} if groups else None
+    return {"FQDNHost": entity}
+
+
+def host_changed(host, exist_host):
+    """Check whether an existing FQDN host differs from the desired host.
+
+    Args:
+        host (dict): Desired host
+        exist_host (dict): Existing host
+
+    Returns:
+        bool: True if the host should be updated
+    """
+    if host["fqdn"] != exist_host.get("FQDN"):
+        return True
+    if host.get("description") is not None and host["description"] != (exist_host.get("Description") or ""):
+        return True
+    if host.get("fqdn_group_list") is not None:
+        return set(host["fqdn_group_list"]) != member_names(exist_host, "FQDNHostGroupList", "FQDNHostGroup")
+    return False
+
+
+def plan_changes(module, existing):
+    """Compare the desired objects with the existing objects.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        existing (dict): Existing objects keyed by name, for each XML tag
+
+    Returns:
+        list: Tuples of XML tag, operation and the list of (name, entity) pairs, in the order they should be sent
+    """
+    exist_groups = existing["FQDNHostGroup"]
+    exist_hosts = existing["FQDNHost"]
+
+    desired_groups = {}
+    for group in module.params.get("groups"):
+        desired_groups[group["name"]] = group.get("description")
+    for host in module.params.get("hosts"):
+        for group_name in host.get("fqdn_group_list") or []:
+            desired_groups.setdefault(group_name, None)
+
+    group_add, group_update = [], []
+    for name, description in desired_groups.items():
+        exist_group = exist_groups.get(name)
+        if exist_group is None:
+            group_add.append((name, group_entity(name, description, None)))
+        elif description is not None and description != (exist_group.get("Description") or ""):
+            group_update.append((name, group_entity(name, description, exist_group)))
+
+    host_add, host_update = [], []
+    for host in module.params.get("hosts"):
+        exist_host = exist_hosts.get(host["name"])
+        if exist_host is None:
+            host_add.append((host["name"], host_entity(host, None)))
+        elif host_changed(host, exist_host):
+            host_update.append((host["name"], host_entity(host, exist_host)))
+
+    changes = [
+        ("FQDNHostGroup", "add", group_add),
+        ("FQDNHostGroup", "update", group_update),
+        ("FQDNHost", "add", host_add),
+        ("FQDNHost", "update", host_update),
+    ]
+
+    if module.params.get("purge"):
+        desired_hosts = set(host["name"] for host in module.params.get("hosts"))
+        # Groups hold references to hosts, so they are removed first
+        changes.append(("FQDNHostGroup", "remove",
+                        [(name, None) for name in sorted(exist_groups) if name not in desired_groups]))
+        changes.append(("FQDNHost", "remove",
+                        [(name, None) for name in sorted(exist_hosts) if name not in desired_hosts]))
+
+    return changes
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "hosts": {
+            "type": "list",
+            "elements": "dict",
+            "required": True,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "fqdn": {"type": "str", "required": True},
+                "description": {"type": "str"},
+                "fqdn_group_list": {"type": "list", "elements": "str"},
+            },
+        },
+        "groups": {
+            "type": "list",
+            "elements": "dict",
+            "default": [],
+            "options": {
+                "name": {"type": "str", "required": True},
+                "description": {"type": "str"},
+            },
+        },
+        "purge": {"type": "bool", "default": False},
+        "batch_size": {"type": "int", "default": 100},
+    }
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    batch_size = module.params.get("batch_size")
+    if batch_size < 1:
+        module.fail_json(msg="batch_size must be at least 1", **result)
+
+    name_count = Counter(host["name"] for host in module.params.get("hosts"))
+    duplicates = sorted(name for name, count in name_count.items() if count > 1)
+    if duplicates:
+        module.fail_json(msg="Duplicate FQDN hosts: {0}".format(", ".join(duplicates)), **result)
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError as e:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    existing = get_existing(connection, module, result, XML_TAGS)
+    changes = plan_changes(module, existing)
+    summary = apply_changes(connection, module, result, XML_TAGS, changes, batch_size)
+
+    unchanged = len(module.params.get("hosts")) - sum(
+        len(items) for xml_tag, operation, items in changes if xml_tag == "FQDNHost" and operation != "remove")
+    report_changes(module, result, XML_TAGS, summary, {"FQDNHost": unchanged})
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -54,11 +54,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -76,6 +71,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_ips(connection, module, result):
@@ -120,14 +116,14 @@ def update_ips(connection, module, result):
         update_params["Status"] = "Disable"
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={"xml_tag": "IPSSwitch",
-                                        "update_params": update_params,
-                                        "debug": True
-                                    })
+        resp = connection.invoke_sdk("update", module_args={"xml_tag": "IPSSwitch",
+                                    "update_params": update_params,
+                                }, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
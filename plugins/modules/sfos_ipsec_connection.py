@@ -234,12 +234,8 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
 import ast
 
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -258,6 +254,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_with_default(d, key, default):
@@ -276,29 +273,17 @@ def get_ipsec_connection(connection, module, result):
     Returns:
         dict: Results of lookup
     """
-    payload = """
-    <Get>
-        <VPNIPSecConnection>
-           <Configuration>
-           <Filter>
-                <key name="Name" 
-                criteria="=">{{ name }}</key>
-            </Filter>
-          </Configuration>
-        </VPNIPSecConnection>
-    </Get>
-"""
     try:
-        resp = connection.invoke_sdk("submit_xml", module_args={
-            "template_data": payload,
-            "set_operation":None,
-            "template_vars": {"name": module.params.get("name")},
-            }
-        )
+        resp = connection.submit_template("ipsec_connection_get",
+                                          template_vars={"name": module.params.get("name")},
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
 
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if resp["success"] and not resp["exists"]:
         return {"exists": False, "api_response": resp["response"]}
     
@@ -326,105 +311,16 @@ def create_ipsec_connection(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-    <VPNIPSecConnection>
-		<Configuration>
-			<Name>{{ name }}</Name>
-			<Description>{{ description }}</Description>
-			<ConnectionType>{{ connection_type }}</ConnectionType>
-			<Policy>{{ profile }}</Policy>
-			<ActionOnVPNRestart>{{ gateway_type }}</ActionOnVPNRestart>
-			<AuthenticationType>{{ authentication_type }}</AuthenticationType>
-			{% if authentication_type == 'PresharedKey' %}
-			<PresharedKey>{{ preshared_key }}</PresharedKey>
-            {% elif authentication_type == 'DigitalCertificate' %}
-			<LocalCertificate>{{ local_certificate }}</LocalCertificate>
-			<RemoteCertificate>{{ remote_certificate }}</RemoteCertificate>
-            {% elif authentication_type == 'RSAKey' %}
-			<RemoteRSAKey>{{ remote_rsa_key }}</RemoteRSAKey>
-            {% endif %}
-			<SubnetFamily>{{ ip_version }}</SubnetFamily>
-			<EndpointFamily>{{ ip_version }}</EndpointFamily>
-			<LocalWANPort>{{ listening_interface }}</LocalWANPort>
-			<AliasLocalWANPort>{{ listening_interface }}</AliasLocalWANPort>
-			<RemoteHost>{{ gateway_address }}</RemoteHost>
-            {% if local_subnet %}
-            {% for subnet in local_subnet %}
-			<LocalSubnet>{{ subnet }}</LocalSubnet>
-            {% endfor %}
-            {% elif connection_type == 'TunnelInterface' %}
-            <LocalSubnet>Any</LocalSubnet>
-            {% endif %}
-			<NATedLAN>{{ nat_lan }}</NATedLAN>
-            {% if local_id_type %}
-			<LocalIDType>{{ local_id_type }}</LocalIDType>
-			<LocalID>{{ local_id }}</LocalID>
-            {% else %}
-            <LocalIDType/>
-            <LocalID/>
-            {% endif %}
-            {% if allow_nat_traversal %}
-			<AllowNATTraversal>{{ allow_nat_traversal }}</AllowNATTraversal>
-            {% else %}
-            <AllowNATTraversal/>
-            {% endif %}
-            {% if remote_subnet %}
-			<RemoteNetwork>
-                {% for subnet in remote_subnet %}
-				<Network>{{ subnet }}</Network>
-                {% endfor %}
-			</RemoteNetwork>
-            {% endif %}
-            {% if connection_type == 'TunnelInterface' %}
-            <RemoteNetwork>
-              <Network>Any</Network>
-            </RemoteNetwork>
-            {% endif %}
-            {% if remote_id_type %}
-			<RemoteIDType>{{ remote_id_type }}</RemoteIDType>
-			<RemoteID>{{ remote_id }}</RemoteID>
-            {% else %}
-            <RemoteIDType/>
-            <RemoteID/>
-            {% endif %}
-            {% if user_authentication_mode %}
-			<UserAuthenticationMode>{{ user_authentication_mode }}</UserAuthenticationMode>
-			{% if user_authentication_mode == 'AsClient' %}
-			<Username>{{ as_client_username }}</Username>
-			<Password>{{ as_client_password }}</Password>
-            {% endif %}
-			{% if user_authentication_mode == 'AsServer' %}
-			<AllowedUser>
-				<User>{{ as_server_username }}</User>
-			</AllowedUser>
-            {% endif %}
-            {% else %}
-            <UserAuthenticationMode>Disable</UserAuthenticationMode>
-            {% endif %}
-            {% if protocol %}
-			<Protocol>{{ protocol }}</Protocol>
-            {% endif %}
-			<LocalPort>{{ local_port }}</LocalPort>
-			<RemotePort>{{ remote_port }}</RemotePort>
-            {% if disconnect_on_idle_interval %}
-			<DisconnectOnIdleInterval>{{ disconnect_on_idle_interval }}</DisconnectOnIdleInterval>
-            {% endif %}
-		</Configuration>
-    </VPNIPSecConnection>
-    """
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload, 
-                "template_vars": module.params,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("ipsec_connection_create",
+                                          template_vars=module.params,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
     
     if not resp["success"]:
-        output = output_buffer.getvalue() if module._verbosity >= 2 else ""
         if "Entity having same parameter details" in resp["response"]:
             module.fail_json(
                 msg=f"ERROR: {resp['response']},  INFO: Possible causes: 1. Gateway address already in use on another VPN connection 2. One or more specified local or remote subnets does not exist on the firewall.",
@@ -458,7 +354,7 @@ def create_ipsec_connection(connection, module, result):
                 )
             else:
                 module.fail_json(
-                    msg=f"ERROR: {resp['response']}, INFO: This error may indicate invalid values for arguments passed to the module. INVALID_ARGS: {error_dict.get('InvalidParams').get('Params')} {output}",
+                    msg=f"ERROR: {resp['response']}, INFO: This error may indicate invalid values for arguments passed to the module. INVALID_ARGS: {error_dict.get('InvalidParams').get('Params')}",
                     **result,
                 )
 
@@ -527,22 +423,6 @@ def update_ipsec_connection(connection, exist_settings, module, result):
         .lstrip()
     )
 
-    payload = """
-    <VPNIPSecConnection>
-          {{ configuration | safe }}
-          {% if active == True %}
-          <Active><Name>{{ name }}</Name></Active>
-          {% elif active == False %}
-          <DeActive><Name>{{ name }}</Name></DeActive>
-          {% endif %}
-          {% if connection == True %}
-          <Connection><Name>{{ name }}</Name></Connection>
-          {% elif connection == False %}
-          <DisConnection><Name>{{ name }}</Name></DisConnection>
-          {% endif %}
-    </VPNIPSecConnection>
-    """
-
     template_vars = dict(
         name=module.params.get("name"),
         configuration=configuration,
@@ -551,19 +431,16 @@ def update_ipsec_connection(connection, exist_settings, module, result):
     )
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "set_operation": "update",
-                "template_vars": template_vars,
-                "debug":True,
-                }
-            )
+        resp = connection.submit_template("ipsec_connection_update",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
     
     if not resp["success"]:
-        output = output_buffer.getvalue() if module._verbosity >= 2 else ""
         if "Entity having same parameter details" in resp["response"]:
             module.fail_json(
                 msg=f"ERROR: {resp['response']},  INFO: Possible causes: 1. Gateway address already in use on another VPN connection 2. One or more specified local or remote subnets does not exist on the firewall.",
@@ -597,7 +474,7 @@ def update_ipsec_connection(connection, exist_settings, module, result):
                 )
             else:
                 module.fail_json(
-                    msg=f"ERROR: {resp['response']}, INFO: This error may indicate invalid values for arguments passed to the module. INVALID_ARGS: {error_dict.get('InvalidParams').get('Params')} {output}",
+                    msg=f"ERROR: {resp['response']}, INFO: This error may indicate invalid values for arguments passed to the module. INVALID_ARGS: {error_dict.get('InvalidParams').get('Params')}",
                     **result,
                 )
 
@@ -709,25 +586,16 @@ def remove_ipsec_connection(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-    <Remove>
-      <VPNIPSecConnection>
-        <Configuration>
-            <Name>{{ name }}</Name>
-        </Configuration>
-      </VPNIPSecConnection>
-    </Remove>
-    """
     try:
-        resp = connection.invoke_sdk("submit_xml", module_args={
-            "template_data": payload,
-            "set_operation": None,
-            "template_vars": {"name": module.params.get("name")},
-            }
-        )
+        resp = connection.submit_template("ipsec_connection_remove",
+                                          template_vars={"name": module.params.get("name")},
+                                          set_operation=None,
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -0,0 +1,629 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_ipsec_connection_bulk
+
+short_description: Provision IPSec Connections in bulk (Configure > Site-to-site VPN > IPSec)
+
+version_added: "2.6.0"
+
+description:
+    - Creates or updates many IPSec Connections on Sophos Firewall in one task, for example all the spoke tunnels on a hub.
+    - All existing connections are retrieved with a single request. Only the connections which are missing or differ
+      are sent, several connections per request.
+    - Preshared keys and passwords cannot be read back from the firewall. A salted hash of each secret written is
+      recorded in I(secret_state), and a connection is only updated because of a secret when the hash no longer matches.
+    - The activation and connection state requested with I(active) and I(connection) are recorded in I(secret_state) too,
+      so they are only sent when they change.
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    tunnels:
+        description:
+            - IPSec Connections to create or update.
+            - Each entry accepts the options of M(sophos.sophos_firewall.sfos_ipsec_connection), except I(state).
+        type: list
+        elements: dict
+        required: true
+        suboptions: &tunnel_options
+            name:
+                description: VPN Connection name. Required for each entry of I(tunnels).
+                type: str
+            description:
+                description: VPN Connection description
+                type: str
+            ip_version:
+                description: IP address family of local and remote subnets. C(IPv4) for new connections when not set.
+                type: str
+                choices: ["IPv4", "IPv6"]
+            connection_type:
+                description: Type of VPN connection
+                type: str
+                choices: ["RemoteAccess", "SiteToSite", "HostToHost", "TunnelInterface"]
+            gateway_type:
+                description: Action to be taken when VPN Services restarts. C(RespondOnly) for new connections when not set.
+                type: str
+                choices: ["Disable", "RespondOnly", "Initiate"]
+            profile:
+                description: IPSec Profile to be used for connection
+                type: str
+                choices: ["Default Profile", "Microsof Azure (IKEv2)", "IKEv2", "DefaultRemoteAccess", "DefaultL2TP", "DefaultHeadOffice", "DefaultBranchOffice", "Branch Office (IKEv2)", "Head office (IKEv2)"]
+            authentication_type:
+                description: Authentication type based on the Connection type
+                type: str
+                choices: ["PresharedKey", "DigitalCertificate", "RSAKey"]
+            preshared_key:
+                description: Preshared key
+                type: str
+            local_certificate:
+                description: Name of local certificate to be used when C(authentication_type)=DigitalCertificate
+                type: str
+            remote_certificate:
+                description: Name of remote certificate to be used when C(authentication_type)=DigitalCertificate
+                type: str
+            remote_rsa_key:
+                description: RSA key of remote peer
+                type: str
+            listening_interface:
+                description: A WAN interface on the local firewall
+                type: str
+            gateway_address:
+                description: Remote host
+                type: str
+            local_subnet:
+                description: Local subnet
+                type: list
+                elements: str
+            nat_lan:
+                description: Host for NAT (Hide) mode
+                type: str
+            local_id_type:
+                description: Local ID type
+                type: str
+                choices: ["DNS", "IP Address", "Email", "DER ASN1 DN (X.509)"]
+            local_id:
+                description: Local ID
+                type: str
+            allow_nat_traversal:
+                description: Enable or Disable NAT traversal
+                type: str
+                choices: ["Enable", "Disable"]
+            remote_subnet:
+                description: Remote network for RemoteAccess or HostToHost connection type
+                type: list
+                elements: str
+            remote_id_type:
+                description: Remote ID type to be used with RemoteAccess or HostToHost connection type
+                type: str
+                choices: ["DNS", "IP Address", "Email", "DER ASN1 DN (X.509)"]
+            remote_id:
+                description: Remote ID to be used with RemoteAccess or HostToHost connection type
+                type: str
+            user_authentication_mode:
+                description: User authentication mode for RemoteAccess or HostToHost connection type. C(Disable) for new connections when not set.
+                type: str
+                choices: ["Disable", "AsServer", "AsClient"]
+            as_client_username:
+                description: Username for user authentication in AsClient authentication mode
+                type: str
+            as_client_password:
+                description: Password for user authentication in AsClient authentication mode
+                type: str
+            as_server_user:
+                description: User for user authentication in AsServer authentication mode
+                type: str
+            protocol:
+                description: Protocol
+                type: str
+                choices: ["ALL", "UDP", "TCP", "ICMP"]
+            local_port:
+                description: Local port
+                type: str
+            remote_port:
+                description: Remote port
+                type: str
+            disconnect_on_idle_interval:
+                description: Disconnect on idle interval in seconds
+                type: str
+            active:
+                description: Activate the connection
+                type: bool
+            connection:
+                description: Establish a connection
+                type: bool
+    defaults:
+        description:
+            - Values used for the connections which do not set them, for example the I(listening_interface),
+              I(local_subnet) and I(profile) shared by all the spokes of a hub.
+            - Accepts the same options as the entries of I(tunnels).
+        type: dict
+        default: {}
+        suboptions: *tunnel_options
+    secret_state:
+        description:
+            - Path to a file on the Ansible controller recording a salted hash of the secrets written to each connection,
+              and the activation and connection state last requested.
+            - When omitted, secrets are only sent when a connection is created or its other settings change,
+              and I(active) and I(connection) are only applied to new connections.
+            - Connections without a recorded hash have their secret written once.
+        type: path
+        required: false
+    batch_size:
+        description:
+            - Maximum number of connections sent in a single request.
+        type: int
+        default: 50
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Provision spoke tunnels on the hub
+  sophos.sophos_firewall.sfos_ipsec_connection_bulk:
+    defaults:
+      connection_type: SiteToSite
+      gateway_type: RespondOnly
+      profile: Head office (IKEv2)
+      authentication_type: PresharedKey
+      listening_interface: PortB
+      local_id_type: IP Address
+      local_id: 203.0.113.1
+      remote_id_type: IP Address
+      local_subnet:
+        - HQ_NETWORKS
+      active: true
+    tunnels: "{{ spokes | map('combine', {'preshared_key': spoke_psk}) | list }}"
+    secret_state: "{{ playbook_dir }}/state/hub_tunnels.json"
+"""
+
+RETURN = r"""
+api_response:
+    description: Number of connections created, updated, activated, unchanged and failed.
+    returned: always
+    type: dict
+created:
+    description: Connections created.
+    returned: always
+    type: list
+    elements: str
+updated:
+    description: Connections updated.
+    returned: always
+    type: list
+    elements: str
+state_changed:
+    description: Connections which were activated, deactivated, connected or disconnected.
+    returned: always
+    type: list
+    elements: str
+failed_tunnels:
+    description: Connections which could not be created or updated, with the reason.
+    returned: when a connection could not be created or updated
+    type: list
+    elements: dict
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import (
+    OUTCOMES,
+    ensure_list,
+    send_batch,
+)
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.secret_state import (
+    load_state,
+    save_state,
+    secret_hash,
+    secret_matches,
+)
+import os
+
+# Module options and the Configuration element each one is sent as, in the order of the
+# elements in the Configuration, the same as sfos_ipsec_connection.
+PARAM_MAP = [
+    ("name", "Name"),
+    ("description", "Description"),
+    ("connection_type", "ConnectionType"),
+    ("profile", "Policy"),
+    ("gateway_type", "ActionOnVPNRestart"),
+    ("authentication_type", "AuthenticationType"),
+    ("preshared_key", "PresharedKey"),
+    ("local_certificate", "LocalCertificate"),
+    ("remote_certificate", "RemoteCertificate"),
+    ("remote_rsa_key", "RemoteRSAKey"),
+    ("ip_version", "SubnetFamily"),
+    ("ip_version", "EndpointFamily"),
+    ("listening_interface", "LocalWANPort"),
+    ("listening_interface", "AliasLocalWANPort"),
+    ("gateway_address", "RemoteHost"),
+    ("local_subnet", "LocalSubnet"),
+    ("nat_lan", "NATedLAN"),
+    ("local_id_type", "LocalIDType"),
+    ("local_id", "LocalID"),
+    ("allow_nat_traversal", "AllowNATTraversal"),
+    ("remote_subnet", "RemoteNetwork"),
+    ("remote_id_type", "RemoteIDType"),
+    ("remote_id", "RemoteID"),
+    ("user_authentication_mode", "UserAuthenticationMode"),
+    ("as_client_username", "Username"),
+    ("as_client_password", "Password"),
+    ("as_server_user", "AllowedUser"),
+    ("protocol", "Protocol"),
+    ("local_port", "LocalPort"),
+    ("remote_port", "RemotePort"),
+    ("disconnect_on_idle_interval", "DisconnectOnIdleInterval"),
+]
+# Options which cannot be compared with the configuration returned by the firewall
+SECRET_OPTIONS = ["preshared_key", "as_client_password"]
+
+# Argument spec of the tunnels and defaults options. No defaults are set here, so that the options
+# left unset in a tunnel can be told apart and taken from the defaults option instead.
+TUNNEL_SPEC = {
+    "name": {"type": "str"},
+    "description": {"type": "str"},
+    "ip_version": {"type": "str", "choices": ["IPv4", "IPv6"]},
+    "connection_type": {"type": "str", "choices": ["RemoteAccess", "SiteToSite", "HostToHost", "TunnelInterface"]},
+    "gateway_type": {"type": "str", "choices": ["Disable", "RespondOnly", "Initiate"]},
+    "profile": {
+        "type": "str",
+        "choices": [
+            "Default Profile",
+            "Microsof Azure (IKEv2)",
+            "IKEv2",
+            "DefaultRemoteAccess",
+            "DefaultL2TP",
+            "DefaultHeadOffice",
+            "DefaultBranchOffice",
+            "Branch Office (IKEv2)",
+            "Head office (IKEv2)",
+        ],
+    },
+    "authentication_type": {"type": "str", "choices": ["PresharedKey", "DigitalCertificate", "RSAKey"]},
+    "preshared_key": {"type": "str", "no_log": True},
+    "local_certificate": {"type": "str"},
+    "remote_certificate": {"type": "str"},
+    "remote_rsa_key": {"type": "str", "no_log": True},
+    "listening_interface": {"type": "str"},
+    "gateway_address": {"type": "str"},
+    "local_subnet": {"type": "list", "elements": "str"},
+    "nat_lan": {"type": "str"},
+    "local_id_type": {"type": "str", "choices": ["DNS", "IP Address", "Email", "DER ASN1 DN (X.509)"]},
+    "local_id": {"type": "str"},
+    "allow_nat_traversal": {"type": "str", "choices": ["Enable", "Disable"]},
+    "remote_subnet": {"type": "list", "elements": "str"},
+    "remote_id_type": {"type": "str", "choices": ["DNS", "IP Address", "Email", "DER ASN1 DN (X.509)"]},
+    "remote_id": {"type": "str"},
+    "user_authentication_mode": {"type": "str", "choices": ["Disable", "AsServer", "AsClient"]},
+    "as_client_username": {"type": "str"},
+    "as_client_password": {"type": "str", "no_log": True},
+    "as_server_user": {"type": "str"},
+    "protocol": {"type": "str", "choices": ["ALL", "UDP", "TCP", "ICMP"]},
+    "local_port": {"type": "str"},
+    "remote_port": {"type": "str"},
+    "disconnect_on_idle_interval": {"type": "str"},
+    "active": {"type": "bool"},
+    "connection": {"type": "bool"},
+}
+
+# Values used for new connections when neither the tunnel nor the defaults set them,
+# the same as the defaults of the sfos_ipsec_connection module.
+CREATE_DEFAULTS = {"ip_version": "IPv4", "gateway_type": "RespondOnly", "user_authentication_mode": "Disable"}
+CREATE_REQUIRED = ["name", "connection_type", "profile", "authentication_type", "listening_interface"]
+
+
+def get_connections(connection, module, result):
+    """Retrieve all IPSec connections with a single request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Connection Configuration keyed by name
+    """
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "VPNIPSecConnection"},
+                                     trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="Unable to retrieve IPSec connections: {0}".format(resp["response"]), **result)
+    if not resp["exists"]:
+        return {}
+
+    configurations = {}
+    for entity in ensure_list(resp["response"]["Response"].get("VPNIPSecConnection")):
+        if not isinstance(entity, dict):
+            continue
+        for config in ensure_list(entity.get("Configuration")):
+            if isinstance(config, dict) and "Name" in config:
+                configurations[config["Name"]] = config
+    return configurations
+
+
+def config_value(param, value):
+    """Convert the value of a module option to the value of its Configuration element."""
+    if param == "remote_subnet":
+        return {"Network": value}
+    if param == "as_server_user":
+        return {"User": value}
+    return value
+
+
+def differs(param, value, exist_config):
+    """Check whether the value of an option differs from the existing Configuration.
+
+    Subnet lists are compared regardless of their order. Elements which the firewall does not return
+    for the connection are not compared, as in sfos_ipsec_connection.
+    """
+    if param == "remote_subnet":
+        return set(value) != set(ensure_list((exist_config.get("RemoteNetwork") or {}).get("Network")))
+    if param == "local_subnet":
+        return set(value) != set(ensure_list(exist_config.get("LocalSubnet")))
+    if param == "as_server_user":
+        return value not in ensure_list((exist_config.get("AllowedUser") or {}).get("User"))
+    for option, key in PARAM_MAP:
+        if option == param and exist_config.get(key) is not None and str(value) != str(exist_config[key]):
+            return True
+    return False
+
+
+def new_configuration(params):
+    """Build the Configuration of a new connection, with the elements in the order of the create template.
+
+    Args:
+        params (dict): Connection options
+
+    Returns:
+        dict: Configuration
+    """
+    values = dict(CREATE_DEFAULTS)
+    values.update(params)
+    auth_options = {
+        "PresharedKey": ["preshared_key"],
+        "DigitalCertificate": ["local_certificate", "remote_certificate"],
+        "RSAKey": ["remote_rsa_key"],
+    }
+    excluded = set(option for options in auth_options.values() for option in options)
+    excluded -= set(auth_options.get(values.get("authentication_type"), []))
+    if values.get("connection_type") == "TunnelInterface":
+        values["local_subnet"] = ["Any"]
+        values["remote_subnet"] = ["Any"]
+
+    config = {}
+    for param, key in PARAM_MAP:
+        if param in excluded or values.get(param) is None:
+            continue
+        config[key] = config_value(param, values[param])
+    return config
+
+
+def updated_configuration(exist_config, params):
+    """Merge the options of a connection into its existing Configuration.
+
+    Args:
+        exist_config (dict): Existing Configuration
+        params (dict): Connection options
+
+    Returns:
+        dict: Configuration
+    """
+    merged = dict((key, value) for key, value in exist_config.items() if not key.startswith("@"))
+    for param, key in PARAM_MAP:
+        if params.get(param) is not None:
+            merged[key] = config_value(param, params[param])
+
+    # Keep the elements in the order of the create template, followed by any others returned by the firewall
+    config = {}
+    for param, key in PARAM_MAP:
+        if key in merged:
+            config[key] = merged.pop(key)
+    config.update(merged)
+    return config
+
+
+def state_actions(params, recorded):
+    """Return the activation and connection elements to send for a connection.
+
+    Args:
+        params (dict): Connection options
+        recorded (dict): State recorded for the connection, or None when it is being created
+
+    Returns:
+        dict: Active, DeActive, Connection or DisConnection elements
+    """
+    actions = {}
+    for option, on_tag, off_tag in (("active", "Active", "DeActive"), ("connection", "Connection", "DisConnection")):
+        value = params.get(option)
+        if value is None:
+            continue
+        if recorded is not None and recorded.get(option) == value:
+            continue
+        actions[on_tag if value else off_tag] = {"Name": params["name"]}
+    return actions
+
+
+def plan_tunnels(module, result, existing, state, track_state):
+    """Compare the desired connections with the existing connections.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        existing (dict): Existing Configuration keyed by name
+        state (dict): Recorded state keyed by connection name
+        track_state (bool): Whether a secret_state file is used
+
+    Returns:
+        dict: Lists of (name, entity) pairs to add, update and activate, and failures
+    """
+    defaults = module.params.get("defaults") or {}
+    plan = {"add": [], "update": [], "actions": [], "unchanged": 0, "failed": []}
+    seen = set()
+
+    for tunnel in module.params.get("tunnels"):
+        params = dict(defaults)
+        params.update(dict((key, value) for key, value in tunnel.items() if value is not None))
+        name = params.get("name")
+        if not name or name in seen or " " in name:
+            reason = "Duplicate connection" if name in seen else "Missing or invalid name"
+            plan["failed"].append({"name": name, "msg": reason})
+            continue
+        seen.add(name)
+
+        exist_config = existing.get(name)
+        if exist_config is None:
+            missing = [option for option in CREATE_REQUIRED if not params.get(option)]
+            if missing:
+                plan["failed"].append({"name": name, "msg": "Missing values for new connection: {0}".format(
+                    ", ".join(missing))})
+                continue
+            plan["add"].append((name, {"VPNIPSecConnection": {"Configuration": new_configuration(params)}}))
+            actions = state_actions(params, None)
+            if actions:
+                plan["actions"].append((name, {"VPNIPSecConnection": actions}))
+            continue
+
+        recorded = state.get(name, {}) if track_state else None
+        changed = [param for param, key in PARAM_MAP
+                   if param not in SECRET_OPTIONS and param != "name" and params.get(param) is not None
+                   and differs(param, params[param], exist_config)]
+        if track_state:
+            changed += [param for param in SECRET_OPTIONS if params.get(param) is not None
+                        and not secret_matches(params[param], recorded.get(param))]
+
+        if changed:
+            plan["update"].append((name, {"VPNIPSecConnection": {
+                "Configuration": updated_configuration(exist_config, params)}}))
+
+        actions = state_actions(params, recorded) if track_state else {}
+        if actions:
+            plan["actions"].append((name, {"VPNIPSecConnection": actions}))
+
+        if not changed and not actions:
+            plan["unchanged"] += 1
+
+    return plan
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "tunnels": {"type": "list", "elements": "dict", "required": True, "options": TUNNEL_SPEC},
+        "defaults": {"type": "dict", "default": {}, "options": TUNNEL_SPEC},
+        "secret_state": {"type": "path", "required": False, "no_log": False},
+        "batch_size": {"type": "int", "default": 50},
+    }
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    batch_size = module.params.get("batch_size")
+    if batch_size < 1:
+        module.fail_json(msg="batch_size must be at least 1", **result)
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError as e:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    track_state = bool(module.params.get("secret_state"))
+    state = load_state(module, "secret_state", "tunnels")
+    existing = get_connections(connection, module, result)
+    plan = plan_tunnels(module, result, existing, state, track_state)
+
+    summary = {"failed": plan["failed"]}
+    for outcome in OUTCOMES.values():
+        summary[outcome] = {"VPNIPSecConnection": []}
+    # Activations are sent as updates, but reported separately
+    action_summary = {"failed": summary["failed"], "updated": {"VPNIPSecConnection": []}}
+    for step, status_tag, step_summary in (("add", "Configuration", summary),
+                                           ("update", "Configuration", summary),
+                                           ("actions", False, action_summary)):
+        items = plan[step]
+        if step == "actions":
+            # Connections which could not be created or updated are not activated
+            failed_names = set(failure["name"] for failure in summary["failed"])
+            items = [item for item in items if item[0] not in failed_names]
+        operation = "update" if step == "actions" else step
+        for start in range(0, len(items), batch_size):
+            send_batch(connection, module, result, "VPNIPSecConnection", operation, items[start:start + batch_size],
+                       step_summary, status_tag=status_tag)
+
+    applied = {"add": summary["created"]["VPNIPSecConnection"], "update": summary["updated"]["VPNIPSecConnection"],
+               "actions": action_summary["updated"]["VPNIPSecConnection"]}
+    failed = summary["failed"]
+
+    if track_state and not module.check_mode:
+        tunnels = dict((tunnel.get("name"), dict(module.params.get("defaults") or {}, **dict(
+            (key, value) for key, value in tunnel.items() if value is not None)))
+            for tunnel in module.params.get("tunnels"))
+        for name in set(applied["add"] + applied["update"]):
+            record = state.setdefault(name, {})
+            for option in SECRET_OPTIONS:
+                if tunnels[name].get(option) is not None and not secret_matches(tunnels[name][option], record.get(option)):
+                    record[option] = secret_hash(tunnels[name][option], os.urandom(16))
+        for name in set(applied["actions"]) | set(applied["add"]):
+            record = state.setdefault(name, {})
+            for option in ("active", "connection"):
+                if tunnels[name].get(option) is not None:
+                    record[option] = tunnels[name][option]
+        if applied["add"] or applied["update"] or applied["actions"]:
+            save_state(module, "secret_state", "tunnels", state)
+
+    result["created"] = applied["add"]
+    result["updated"] = applied["update"]
+    result["state_changed"] = applied["actions"]
+    result["api_response"] = {
+        "created": len(applied["add"]),
+        "updated": len(applied["update"]),
+        "state_changed": len(applied["actions"]),
+        "unchanged": plan["unchanged"],
+        "failed": len(failed),
+    }
+    result["changed"] = bool(applied["add"] or applied["update"] or applied["actions"])
+
+    if failed:
+        result["failed_tunnels"] = failed
+        module.fail_json(msg="{0} connection(s) could not be provisioned".format(len(failed)), **result)
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
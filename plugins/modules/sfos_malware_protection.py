@@ -55,11 +55,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -77,6 +72,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_malware_protection(connection, module, result):
@@ -116,18 +112,18 @@ def update_malware_protection(connection, module, result):
         dict: API response
     """
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={
-                "xml_tag":"MalwareProtection",
-                "update_params":{
-                    "PrimaryAntiVirusEngine": module.params.get("antivirus_engine")
-                    },
-                "debug": True,
-                }
-            )
+        resp = connection.invoke_sdk("update", module_args={
+            "xml_tag":"MalwareProtection",
+            "update_params":{
+                "PrimaryAntiVirusEngine": module.params.get("antivirus_engine")
+                },
+            }, trace=module._verbosity >= 3
+        )
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
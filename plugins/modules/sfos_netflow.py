@@ -98,10 +98,6 @@ netflow_servers:
       NetflowServerPort: "2055"
 """
 
-import io
-import contextlib
-
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -120,6 +116,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_netflow_collector(connection, module, result):
@@ -133,17 +130,13 @@ def get_netflow_collector(connection, module, result):
     Returns:
         dict: Results of lookup
     """
-    template = """<Get> 
-        <NetFlowConfiguration>
-        </NetFlowConfiguration>
-        </Get>"""
     try:
-        resp = connection.invoke_sdk("submit_xml", module_args={"template_data": template,
-                                                                "set_operation": "",
-                                                                "debug": True})
+        resp = connection.submit_template("netflow_get", set_operation=None, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if resp["success"] and not 'NetFlowConfiguration' in resp["response"]["Response"]:
         return {"exists": False, "api_response": resp["response"]}
     
@@ -187,33 +180,21 @@ def create_netflow_collector(connection, exist_settings, module, result):
                 "NetflowServer": exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["NetflowServer"][index],
                 "NetflowServerPort": exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["NetflowServerPort"][index]})
         
-    payload = """
-  <NetFlowConfiguration>
-    {% for server in server_list %}
-    <Server>
-      <ServerName>{{ server.ServerName }}</ServerName>
-      <NetflowServer>{{ server.NetflowServer }}</NetflowServer>
-      <NetflowServerPort>{{ server.NetflowServerPort }}</NetflowServerPort>
-    </Server>
-    {% endfor %}
-  </NetFlowConfiguration>
-    """
     template_vars = {
         "server_list": server_list
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",  # Netflow API doesn't support add, so we must use update
-                "debug": True
-                }
-            )
+        # Netflow API doesn't support add, so we must use update
+        resp = connection.submit_template("netflow_servers",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -257,34 +238,22 @@ def update_netflow_collector(connection, exist_settings, module, result):
                 "NetflowServer": exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["NetflowServer"][index],
                 "NetflowServerPort": exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["NetflowServerPort"][index]})
         
-    payload = """
-  <NetFlowConfiguration>
-    {% for server in server_list %}
-    <Server>
-      <ServerName>{{ server.ServerName }}</ServerName>
-      <NetflowServer>{{ server.NetflowServer }}</NetflowServer>
-      <NetflowServerPort>{{ server.NetflowServerPort }}</NetflowServerPort>
-    </Server>
-    {% endfor %}
-  </NetFlowConfiguration>
-    """
 
     template_vars = {
         "server_list": server_list
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",  # Netflow API doesn't support add, so we must use update
-                "debug": True
-                }
-            )
+        # Netflow API doesn't support add, so we must use update
+        resp = connection.submit_template("netflow_servers",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -330,10 +299,8 @@ def remove_netflow_collector(connection, exist_settings, module, result):
         dict: API response
     """
     server_list = []
-    if isinstance(exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["ServerName"], str):
-        if exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["ServerName"] == module.params.get("server_name"):
-            payload = """<NetFlowConfiguration></NetFlowConfiguration>"""
-    elif isinstance(exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["ServerName"], list):
+    # When only one server is configured it is the one being removed, so an empty server list is sent
+    if isinstance(exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["ServerName"], list):
         for index, server in enumerate(exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["ServerName"]):
             if server == module.params.get("server_name"):
                 continue
@@ -343,38 +310,27 @@ def remove_netflow_collector(connection, exist_settings, module, result):
                 "NetflowServerPort": exist_settings["api_response"]["Response"]["NetFlowConfiguration"]["Server"]["NetflowServerPort"][index]
             })
 
-        payload = """
-            <NetFlowConfiguration>
-                {% for server in server_list %}
-                <Server>
-                <ServerName>{{ server.ServerName }}</ServerName>
-                <NetflowServer>{{ server.NetflowServer }}</NetflowServer>
-                <NetflowServerPort>{{ server.NetflowServerPort }}</NetflowServerPort>
-                </Server>
-                {% endfor %}
-            </NetFlowConfiguration>
-            """
     template_vars = {
         "server_list": server_list
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",  # Netflow API doesn't support add, so we must use update
-                "debug": True
-                }
-            )
+        # Netflow API doesn't support add, so we must use update
+        resp = connection.submit_template("netflow_servers",
+                                          template_vars=template_vars,
+                                          set_operation="update",
+                                          trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
@@ -135,11 +135,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -157,6 +152,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_notification_settings(connection, module, result):
@@ -242,16 +238,16 @@ def update_notification_settings(connection, module, result):
         update_params["IPFamily"] = module.params.get("ip_family")
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={
-                "xml_tag": "Notification", 
-                "update_params": update_params,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("update", module_args={
+            "xml_tag": "Notification", 
+            "update_params": update_params,
+            }, trace=module._verbosity >= 3
+        )
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
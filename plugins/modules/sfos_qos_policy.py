@@ -22,9 +22,11 @@ extends_documentation_fragment:
 
 options:
     name:
-        description: Specify a name for the QoS Policy.
+        description:
+          - Specify a name for the QoS Policy.
+          - One of I(name) or I(policies) is required.
         type: str
-        required: true
+        required: false
     policy_type:
         description: Select the type of Policy.
         type: str
@@ -36,10 +38,10 @@ options:
         choices: ["Total", "Individual"]
         required: false
     priority:
-        description: Set the Bandwidth priority.
+        description: Set the Bandwidth priority. Required when creating a policy.
         type: str
         choices: ["RealTime", "BusinessCritical", "Normal2", "Normal3", "Normal4", "Normal5", "BulkyFTP", "BestEffort"]
-        required: true
+        required: false
     policy_based_on:
         description: Select an option for whom the policy is created.
         type: str
@@ -145,6 +147,149 @@ options:
                 description: Schedule name for this rule.
                 type: str
                 required: true
+    policies:
+        description:
+            - Manage a catalogue of QoS Policies with a single task, instead of the policy given by I(name).
+            - All policies are retrieved with one request. Bandwidth values are compared as the firewall reports them,
+              and schedule-based rules are compared by I(detail_id), so only the policies which differ are sent.
+            - The policies to create, update or remove are sent in batches of I(batch_size).
+            - With I(state=present), missing policies are created and existing policies are updated.
+              With I(state=updated), every policy must already exist. With I(state=absent), the listed policies are removed.
+            - I(state=query) is not supported with I(policies).
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
+        suboptions:
+            name:
+                description: Name of the QoS Policy.
+                type: str
+                required: true
+            policy_type:
+                description: Select the type of Policy.
+                type: str
+                choices: ["Strict", "Committed"]
+                required: false
+            implementation_on:
+                description: Specify implementation strategy of Policy.
+                type: str
+                choices: ["Total", "Individual"]
+                required: false
+            priority:
+                description: Set the Bandwidth priority. Required when creating a policy.
+                type: str
+                choices: ["RealTime", "BusinessCritical", "Normal2", "Normal3", "Normal4", "Normal5", "BulkyFTP", "BestEffort"]
+                required: false
+            policy_based_on:
+                description: Select an option for whom the policy is created.
+                type: str
+                choices: ["User", "Firewall", "Application", "WebCategory"]
+                required: false
+            bandwidth_usage_type:
+                description: Select the type of Bandwidth usage.
+                type: str
+                choices: ["Individual", "Shared"]
+                required: false
+            total_bandwidth:
+                description: Specify allowed total bandwidth for 'Strict' policy type and 'Total' implementation strategy (KB).
+                type: int
+                required: false
+            guaranteed_bandwidth:
+                description: Specify guaranteed bandwidth (minimum) for 'Committed' type and 'Total' strategy (KB).
+                type: int
+                required: false
+            burstable_bandwidth:
+                description: Specify burstable bandwidth (maximum) for 'Committed' type and 'Total' strategy (KB).
+                type: int
+                required: false
+            upload_bandwidth:
+                description: Specify upload bandwidth for 'Individual' strategy and 'Strict' type (KB).
+                type: int
+                required: false
+            download_bandwidth:
+                description: Specify download bandwidth for 'Individual' strategy and 'Strict' type (KB).
+                type: int
+                required: false
+            guaranteed_upload_bandwidth:
+                description: Specify guaranteed upload bandwidth (minimum) for 'Committed' type and 'Individual' strategy (KB).
+                type: int
+                required: false
+            burstable_upload_bandwidth:
+                description: Specify burstable (maximum) upload bandwidth for 'Committed' type and 'Individual' strategy (KB).
+                type: int
+                required: false
+            guaranteed_download_bandwidth:
+                description: Specify guaranteed download bandwidth (minimum) for 'Committed' type and 'Individual' strategy (KB).
+                type: int
+                required: false
+            burstable_download_bandwidth:
+                description: Specify burstable (maximum) download bandwidth for 'Committed' type and 'Individual' strategy (KB).
+                type: int
+                required: false
+            description:
+                description: Specify policy description.
+                type: str
+                required: false
+            schedule_based_rules:
+                description: Specify schedule-wise QoS policy details.
+                type: list
+                elements: dict
+                required: false
+                suboptions:
+                    detail_id:
+                        description: Detail ID for the schedule rule.
+                        type: str
+                        required: true
+                    policy_type:
+                        description: Policy type for this schedule rule.
+                        type: str
+                        choices: ["Strict", "Committed"]
+                        required: false
+                    total_bandwidth:
+                        description: Total bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    guaranteed_bandwidth:
+                        description: Guaranteed bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    burstable_bandwidth:
+                        description: Burstable bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    upload_bandwidth:
+                        description: Upload bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    download_bandwidth:
+                        description: Download bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    guaranteed_upload_bandwidth:
+                        description: Guaranteed upload bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    burstable_upload_bandwidth:
+                        description: Burstable upload bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    guaranteed_download_bandwidth:
+                        description: Guaranteed download bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    burstable_download_bandwidth:
+                        description: Burstable download bandwidth for this schedule rule (KB).
+                        type: int
+                        required: false
+                    schedule:
+                        description: Schedule name for this rule.
+                        type: str
+                        required: true
+    batch_size:
+        description: Maximum number of policies sent in a single request when I(policies) is specified.
+        type: int
+        default: 100
+        version_added: "2.6.0"
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(updated) to modify, or C(absent) to remove
@@ -222,20 +367,55 @@ EXAMPLES = r"""
   sophos.sophos_firewall.sfos_qos_policy:
     name: "Strict Total Policy"
     state: absent
+
+- name: Sync a catalogue of QoS Policies
+  sophos.sophos_firewall.sfos_qos_policy:
+    policies:
+      - name: "Tier Gold"
+        policy_type: "Strict"
+        implementation_on: "Total"
+        priority: "BusinessCritical"
+        policy_based_on: "User"
+        bandwidth_usage_type: "Shared"
+        total_bandwidth: 10000
+      - name: "Tier Silver"
+        policy_type: "Strict"
+        implementation_on: "Total"
+        priority: "Normal2"
+        policy_based_on: "User"
+        bandwidth_usage_type: "Shared"
+        total_bandwidth: 5000
+        schedule_based_rules:
+          - detail_id: "OffHours"
+            policy_type: "Strict"
+            total_bandwidth: 8000
+            schedule: "Off Hours"
+    state: present
 """
 
 RETURN = r"""
 api_response:
-    description: Serialized object containing the API response.
-    type: dict
+    description:
+        - Serialized object containing the API response.
+        - When I(policies) is specified, a list with the response to each batch sent.
+    type: raw
     returned: always
-
+created:
+    description: Names of the policies created.
+    type: list
+    elements: str
+    returned: when I(policies) is specified
+updated:
+    description: Names of the policies updated.
+    type: list
+    elements: str
+    returned: when I(policies) is specified
+removed:
+    description: Names of the policies removed.
+    type: list
+    elements: str
+    returned: when I(policies) is specified
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAuthFailure,
@@ -251,6 +431,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list, failed_objects
 
 
 def get_qos_policy(connection, module, result):
@@ -292,94 +474,6 @@ def create_qos_policy(connection, module, result):
     Returns:
         dict: API response
     """
-    payload = """
-        <QoSPolicy>
-            <Name>{{ name }}</Name>
-            {% if policy_based_on %}
-            <PolicyBasedOn>{{ policy_based_on }}</PolicyBasedOn>
-            {% endif %}
-            {% if policy_type %}
-            <PolicyType>{{ policy_type }}</PolicyType>
-            {% endif %}
-            {% if implementation_on %}
-            <ImplementationOn>{{ implementation_on }}</ImplementationOn>
-            {% endif %}
-            <Priority>{{ priority }}</Priority>
-            {% if bandwidth_usage_type %}
-            <BandwidthUsageType>{{ bandwidth_usage_type }}</BandwidthUsageType>
-            {% endif %}
-            {% if total_bandwidth %}
-            <TotalBandwidth>{{ total_bandwidth }}</TotalBandwidth>
-            {% endif %}
-            {% if guaranteed_bandwidth %}
-            <GuaranteedBandwidth>{{ guaranteed_bandwidth }}</GuaranteedBandwidth>
-            {% endif %}
-            {% if burstable_bandwidth %}
-            <BurstableBandwidth>{{ burstable_bandwidth }}</BurstableBandwidth>
-            {% endif %}
-            {% if upload_bandwidth %}
-            <UploadBandwidth>{{ upload_bandwidth }}</UploadBandwidth>
-            {% endif %}
-            {% if download_bandwidth %}
-            <DownloadBandwidth>{{ download_bandwidth }}</DownloadBandwidth>
-            {% endif %}
-            {% if guaranteed_upload_bandwidth %}
-            <GuaranteedUploadBandwidth>{{ guaranteed_upload_bandwidth }}</GuaranteedUploadBandwidth>
-            {% endif %}
-            {% if burstable_upload_bandwidth %}
-            <BurstableUploadBandwidth>{{ burstable_upload_bandwidth }}</BurstableUploadBandwidth>
-            {% endif %}
-            {% if guaranteed_download_bandwidth %}
-            <GuaranteedDownloadBandwidth>{{ guaranteed_download_bandwidth }}</GuaranteedDownloadBandwidth>
-            {% endif %}
-            {% if burstable_download_bandwidth %}
-            <BurstableDownloadBandwidth>{{ burstable_download_bandwidth }}</BurstableDownloadBandwidth>
-            {% endif %}
-            {% if description %}
-            <Description>{{ description }}</Description>
-            {% endif %}
-            {% if schedule_based_rules %}
-            <SchedulebasedPolicyRuleList>
-                {% for rule in schedule_based_rules %}
-                <Rule>
-                    <DetailId>{{ rule.detail_id }}</DetailId>
-                    {% if rule.policy_type %}
-                    <PolicyType>{{ rule.policy_type }}</PolicyType>
-                    {% endif %}
-                    {% if rule.total_bandwidth %}
-                    <TotalBandwidth>{{ rule.total_bandwidth }}</TotalBandwidth>
-                    {% endif %}
-                    {% if rule.guaranteed_bandwidth %}
-                    <GuaranteedBandwidth>{{ rule.guaranteed_bandwidth }}</GuaranteedBandwidth>
-                    {% endif %}
-                    {% if rule.burstable_bandwidth %}
-                    <BurstableBandwidth>{{ rule.burstable_bandwidth }}</BurstableBandwidth>
-                    {% endif %}
-                    {% if rule.upload_bandwidth %}
-                    <UploadBandwidth>{{ rule.upload_bandwidth }}</UploadBandwidth>
-                    {% endif %}
-                    {% if rule.download_bandwidth %}
-                    <DownloadBandwidth>{{ rule.download_bandwidth }}</DownloadBandwidth>
-                    {% endif %}
-                    {% if rule.guaranteed_upload_bandwidth %}
-                    <GuaranteedUploadBandwidth>{{ rule.guaranteed_upload_bandwidth }}</GuaranteedUploadBandwidth>
-                    {% endif %}
-                    {% if rule.burstable_upload_bandwidth %}
-                    <BurstableUploadBandwidth>{{ rule.burstable_upload_bandwidth }}</BurstableUploadBandwidth>
-                    {% endif %}
-                    {% if rule.guaranteed_download_bandwidth %}
-                    <GuaranteedDownloadBandwidth>{{ rule.guaranteed_download_bandwidth }}</GuaranteedDownloadBandwidth>
-                    {% endif %}
-                    {% if rule.burstable_download_bandwidth %}
-                    <BurstableDownloadBandwidth>{{ rule.burstable_download_bandwidth }}</BurstableDownloadBandwidth>
-                    {% endif %}
-                    <Schedule>{{ rule.schedule }}</Schedule>
-                </Rule>
-                {% endfor %}
-            </SchedulebasedPolicyRuleList>
-            {% endif %}
-        </QoSPolicy>
-    """
     
     template_vars = {
         "name": module.params.get("name"),
@@ -402,17 +496,15 @@ def create_qos_policy(connection, module, result):
     }
     
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "timeout": 90,
-                "debug": True
-                }
-            )
+        resp = connection.submit_template("qos_policy",
+                                          template_vars=template_vars,
+                                          timeout=90,
+                                          trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -544,18 +636,18 @@ def update_qos_policy(connection, exist_settings, module, result):
         update_params["SchedulebasedPolicyRuleList"] = existing_policy.get("SchedulebasedPolicyRuleList")
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={
-                "xml_tag": "QoSPolicy",
-                "update_params": update_params,
-                "name": module.params.get("name"),
-                "lookup_key": "Name",
-                "timeout": 90,
-                "debug": True
-            })
+        resp = connection.invoke_sdk("update", module_args={
+            "xml_tag": "QoSPolicy",
+            "update_params": update_params,
+            "name": module.params.get("name"),
+            "lookup_key": "Name",
+            "timeout": 90,
+        }, trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -594,72 +686,284 @@ def eval_changed(module, exist_settings):
     Returns:
         bool: Return true if the two do not match
     """
-    exist_policy = exist_settings["api_response"]["Response"]["QoSPolicy"]
-    
-    # Check basic parameters
-    if module.params.get("policy_type") and module.params.get("policy_type") != exist_policy.get("PolicyType"):
-        return True
-    
-    if module.params.get("implementation_on") and module.params.get("implementation_on") != exist_policy.get("ImplementationOn"):
-        return True
-    
-    if module.params.get("priority") and module.params.get("priority") != exist_policy.get("Priority"):
-        return True
-    
-    if module.params.get("policy_based_on") and module.params.get("policy_based_on") != exist_policy.get("PolicyBasedOn"):
-        return True
-    
-    if module.params.get("bandwidth_usage_type") and module.params.get("bandwidth_usage_type") != exist_policy.get("BandwidthUsageType"):
-        return True
-    
-    if module.params.get("description") and module.params.get("description") != exist_policy.get("Description"):
-        return True
+    return policy_changed(module.params, exist_settings["api_response"]["Response"]["QoSPolicy"])
+
+
+# Bandwidth arguments and their XML elements, shared by policies and schedule-based rules
+BANDWIDTH_FIELDS = (
+    ("total_bandwidth", "TotalBandwidth"),
+    ("guaranteed_bandwidth", "GuaranteedBandwidth"),
+    ("burstable_bandwidth", "BurstableBandwidth"),
+    ("upload_bandwidth", "UploadBandwidth"),
+    ("download_bandwidth", "DownloadBandwidth"),
+    ("guaranteed_upload_bandwidth", "GuaranteedUploadBandwidth"),
+    ("burstable_upload_bandwidth", "BurstableUploadBandwidth"),
+    ("guaranteed_download_bandwidth", "GuaranteedDownloadBandwidth"),
+    ("burstable_download_bandwidth", "BurstableDownloadBandwidth"),
+)
+
+# Policy arguments and their XML elements, in the order of the QoSPolicy element
+POLICY_FIELDS = (
+    ("policy_based_on", "PolicyBasedOn"),
+    ("policy_type", "PolicyType"),
+    ("implementation_on", "ImplementationOn"),
+    ("priority", "Priority"),
+    ("bandwidth_usage_type", "BandwidthUsageType"),
+) + BANDWIDTH_FIELDS + (
+    ("description", "Description"),
+)
+
+# Schedule-based rule arguments and their XML elements, in the order of the Rule element
+RULE_FIELDS = (
+    ("detail_id", "DetailId"),
+    ("policy_type", "PolicyType"),
+) + BANDWIDTH_FIELDS + (
+    ("schedule", "Schedule"),
+)
+
+
+def canonical(value):
+    """Return a value in the form reported by the firewall, so that 1000 and "1000" compare equal.
 
-    # Check bandwidth parameters
-    bandwidth_params = [
-        ("total_bandwidth", "TotalBandwidth"),
-        ("guaranteed_bandwidth", "GuaranteedBandwidth"),
-        ("burstable_bandwidth", "BurstableBandwidth"),
-        ("upload_bandwidth", "UploadBandwidth"),
-        ("download_bandwidth", "DownloadBandwidth"),
-        ("guaranteed_upload_bandwidth", "GuaranteedUploadBandwidth"),
-        ("burstable_upload_bandwidth", "BurstableUploadBandwidth"),
-        ("guaranteed_download_bandwidth", "GuaranteedDownloadBandwidth"),
-        ("burstable_download_bandwidth", "BurstableDownloadBandwidth")
-    ]
-    
-    for param_name, api_key in bandwidth_params:
-        if (module.params.get(param_name) is not None and 
-            module.params.get(param_name) != exist_policy.get(api_key)):
+    Args:
+        value: Module argument or XML value
+
+    Returns:
+        str: Value as a string, or None when the value is not set
+    """
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def rule_values(rule, from_xml=False):
+    """Return the canonical values of a schedule-based rule, keyed by XML element.
+
+    Args:
+        rule (dict): Item of the schedule_based_rules argument, or Rule returned by the firewall
+        from_xml (bool): True when the rule was returned by the firewall
+
+    Returns:
+        dict: Values which are set, in the order of the Rule element
+    """
+    values = {}
+    for option, element in RULE_FIELDS:
+        value = canonical(rule.get(element if from_xml else option))
+        if value is not None:
+            values[element] = value
+    return values
+
+
+def exist_rules(exist_policy):
+    """Return the schedule-based rules of an existing policy.
+
+    Args:
+        exist_policy (dict): QoSPolicy returned by the firewall
+
+    Returns:
+        list: Canonical values of each rule
+    """
+    container = exist_policy.get("SchedulebasedPolicyRuleList")
+    if not isinstance(container, dict):
+        return []
+    return [rule_values(rule, from_xml=True) for rule in ensure_list(container.get("Rule")) if isinstance(rule, dict)]
+
+
+def policy_changed(params, exist_policy):
+    """Evaluate the provided arguments against an existing policy.
+
+    Schedule-based rules are matched by DetailId, so listing the same rules in another order is not a change,
+    and only the values set for a rule are compared with the existing rule.
+
+    Args:
+        params (dict): Module arguments, or one item of the policies argument
+        exist_policy (dict): QoSPolicy returned by the firewall
+
+    Returns:
+        bool: Return true if any settings are different, otherwise return false
+    """
+    for option, element in POLICY_FIELDS:
+        value = canonical(params.get(option))
+        if value is not None and value != canonical(exist_policy.get(element)):
             return True
-    
-    # Check schedule-based rules if provided
-    if module.params.get("schedule_based_rules") is not None:
-        # For simplicity, consider rules changed if they are provided
-        return True
+
+    if params.get("schedule_based_rules") is not None:
+        requested = dict((rule["DetailId"], rule) for rule in
+                         (rule_values(rule) for rule in params["schedule_based_rules"]))
+        existing = dict((rule.get("DetailId"), rule) for rule in exist_rules(exist_policy))
+        if set(requested) != set(existing):
+            return True
+        return any(existing[detail_id].get(element) != value
+                   for detail_id, rule in requested.items() for element, value in rule.items())
 
     return False
 
 
-def validate_parameters(module, result):
+def policy_entity(params, exist_policy=None):
+    """Build a QoSPolicy entity from the module arguments, keeping the existing values of omitted arguments.
+
+    Args:
+        params (dict): Module arguments, or one item of the policies argument
+        exist_policy (dict): QoSPolicy returned by the firewall, or None when creating the policy
+
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    exist_policy = exist_policy or {}
+    entity = {"Name": params["name"]}
+    for option, element in POLICY_FIELDS:
+        value = canonical(params.get(option))
+        if value is None:
+            value = canonical(exist_policy.get(element))
+        if value is not None:
+            entity[element] = value
+
+    if params.get("schedule_based_rules") is not None:
+        rules = [rule_values(rule) for rule in params["schedule_based_rules"]]
+        entity["SchedulebasedPolicyRuleList"] = {"Rule": rules} if rules else None
+    else:
+        rules = exist_rules(exist_policy)
+        if rules:
+            entity["SchedulebasedPolicyRuleList"] = {"Rule": rules}
+    return {"QoSPolicy": entity}
+
+
+def get_all_policies(connection, module, result):
+    """Get all QoS Policies from Sophos Firewall with a single request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Existing policies keyed by name
+    """
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "QoSPolicy"},
+                                     trace=module._verbosity >= 3)
+    except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    if not resp["exists"]:
+        return {}
+
+    return dict((policy["Name"], policy) for policy in ensure_list(resp["response"]["Response"].get("QoSPolicy"))
+                if isinstance(policy, dict) and "Name" in policy)
+
+
+def submit_policies(connection, module, result, batch):
+    """Send a batch of policy changes in a single request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        batch (list): Tuples of operation, name and entity
+
+    Returns:
+        list: Names and messages of the policies the firewall did not accept
+    """
+    adds = [(name, entity) for operation, name, entity in batch if operation == "add"]
+    updates = [(name, entity) for operation, name, entity in batch if operation == "update"]
+    removes = [name for operation, name, entity in batch if operation == "remove"]
+
+    try:
+        resp = connection.submit_changes("QoSPolicy", add=[entity for name, entity in adds],
+                                         update=[entity for name, entity in updates], remove=removes,
+                                         timeout=90, trace=module._verbosity >= 3)
+    except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"].append(resp["response"])
+    return failed_objects(resp["response"], "QoSPolicy", [name for name, entity in adds + updates] + removes)
+
+
+def manage_policies(connection, module, result):
+    """Create, update and remove the policies given in the policies argument, sending only the changed policies.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    state = module.params.get("state")
+    batch_size = module.params.get("batch_size")
+    if batch_size < 1:
+        module.fail_json(msg="batch_size must be at least 1", **result)
+
+    exist_policies = get_all_policies(connection, module, result)
+
+    declared = set()
+    changes = []
+    for params in module.params.get("policies"):
+        name = params["name"]
+        if name in declared:
+            module.fail_json(msg="QoS Policy {0} is listed more than once".format(name), **result)
+        declared.add(name)
+        exist_policy = exist_policies.get(name)
+
+        if state == "absent":
+            if exist_policy is not None:
+                changes.append(("remove", name, None))
+            continue
+
+        validate_parameters(module, params, result)
+        if exist_policy is None and state == "updated":
+            module.fail_json(msg="Attempting to update non-existing resource: {0}".format(name), **result)
+        if exist_policy is None:
+            if params.get("priority") is None:
+                module.fail_json(msg="priority is required to create QoS Policy {0}".format(name), **result)
+            changes.append(("add", name, policy_entity(params)))
+        elif policy_changed(params, exist_policy):
+            changes.append(("update", name, policy_entity(params, exist_policy)))
+
+    for outcome, operation in (("created", "add"), ("updated", "update"), ("removed", "remove")):
+        result[outcome] = [name for change_operation, name, entity in changes if change_operation == operation]
+    result["changed"] = bool(changes)
+    result["api_response"] = []
+
+    if module.check_mode:
+        result["check_mode"] = True
+        return
+
+    failed = []
+    for start in range(0, len(changes), batch_size):
+        failed.extend(submit_policies(connection, module, result, changes[start:start + batch_size]))
+    if failed:
+        module.fail_json(msg="An error occurred: {0}".format(failed), **result)
+
+
+def validate_parameters(module, params, result):
     """Validate module parameters.
     
     Args:
         module (AnsibleModule): AnsibleModule object
+        params (dict): Module arguments, or one item of the policies argument
         result (dict): Result output to be sent to the console
         
     Returns:
         bool: True if validation passes, False otherwise
     """
     # Validate name length
-    if len(module.params.get("name")) > 50:
+    if len(params.get("name")) > 50:
         module.fail_json(
             msg="Name must be 50 characters or less",
             **result
         )
     
     # Validate description length if provided
-    if module.params.get("description") and len(module.params.get("description")) > 255:
+    if params.get("description") and len(params.get("description")) > 255:
         module.fail_json(
             msg="Description must be 255 characters or less",
             **result
@@ -674,7 +978,7 @@ def validate_parameters(module, result):
     ]
     
     for param in bandwidth_params:
-        value = module.params.get(param)
+        value = params.get(param)
         if value is not None and not (2 <= value <= 10240000):
             module.fail_json(
                 msg=f"{param} must be between 2 and 10240000 KB",
@@ -682,39 +986,39 @@ def validate_parameters(module, result):
             )
     
     # Validate that burstable bandwidth is greater than guaranteed bandwidth
-    if (module.params.get("guaranteed_bandwidth") is not None and 
-        module.params.get("burstable_bandwidth") is not None):
-        if module.params.get("burstable_bandwidth") <= module.params.get("guaranteed_bandwidth"):
+    if (params.get("guaranteed_bandwidth") is not None and 
+        params.get("burstable_bandwidth") is not None):
+        if params.get("burstable_bandwidth") <= params.get("guaranteed_bandwidth"):
             module.fail_json(
                 msg="Burstable bandwidth must be greater than guaranteed bandwidth",
                 **result
             )
     
-    if (module.params.get("guaranteed_upload_bandwidth") is not None and 
-        module.params.get("burstable_upload_bandwidth") is not None):
-        if module.params.get("burstable_upload_bandwidth") <= module.params.get("guaranteed_upload_bandwidth"):
+    if (params.get("guaranteed_upload_bandwidth") is not None and 
+        params.get("burstable_upload_bandwidth") is not None):
+        if params.get("burstable_upload_bandwidth") <= params.get("guaranteed_upload_bandwidth"):
             module.fail_json(
                 msg="Burstable upload bandwidth must be greater than guaranteed upload bandwidth",
                 **result
             )
     
-    if (module.params.get("guaranteed_download_bandwidth") is not None and 
-        module.params.get("burstable_download_bandwidth") is not None):
-        if module.params.get("burstable_download_bandwidth") <= module.params.get("guaranteed_download_bandwidth"):
+    if (params.get("guaranteed_download_bandwidth") is not None and 
+        params.get("burstable_download_bandwidth") is not None):
+        if params.get("burstable_download_bandwidth") <= params.get("guaranteed_download_bandwidth"):
             module.fail_json(
                 msg="Burstable download bandwidth must be greater than guaranteed download bandwidth",
                 **result
             )
     
     # Policy-specific parameter requirements
-    policy_type = module.params.get("policy_type")
-    implementation_on = module.params.get("implementation_on")
+    policy_type = params.get("policy_type")
+    implementation_on = params.get("implementation_on")
     
     # Only validate these requirements for 'present' state
     if module.params.get("state") == "present":
         # Strict + Total: total_bandwidth is required
         if policy_type == "Strict" and implementation_on == "Total":
-            if module.params.get("total_bandwidth") is None:
+            if params.get("total_bandwidth") is None:
                 module.fail_json(
                     msg="total_bandwidth is required when policy_type=Strict and implementation_on=Total",
                     **result
@@ -722,12 +1026,12 @@ def validate_parameters(module, result):
         
         # Strict + Individual: upload_bandwidth and download_bandwidth are required
         if policy_type == "Strict" and implementation_on == "Individual":
-            if module.params.get("upload_bandwidth") is None:
+            if params.get("upload_bandwidth") is None:
                 module.fail_json(
                     msg="upload_bandwidth is required when policy_type=Strict and implementation_on=Individual",
                     **result
                 )
-            if module.params.get("download_bandwidth") is None:
+            if params.get("download_bandwidth") is None:
                 module.fail_json(
                     msg="download_bandwidth is required when policy_type=Strict and implementation_on=Individual",
                     **result
@@ -735,12 +1039,12 @@ def validate_parameters(module, result):
         
         # Committed + Total: guaranteed_bandwidth and burstable_bandwidth are required
         if policy_type == "Committed" and implementation_on == "Total":
-            if module.params.get("guaranteed_bandwidth") is None:
+            if params.get("guaranteed_bandwidth") is None:
                 module.fail_json(
                     msg="guaranteed_bandwidth is required when policy_type=Committed and implementation_on=Total",
                     **result
                 )
-            if module.params.get("burstable_bandwidth") is None:
+            if params.get("burstable_bandwidth") is None:
                 module.fail_json(
                     msg="burstable_bandwidth is required when policy_type=Committed and implementation_on=Total",
                     **result
@@ -756,15 +1060,15 @@ def validate_parameters(module, result):
             ]
             
             for param_name, error_msg in required_params:
-                if module.params.get(param_name) is None:
+                if params.get(param_name) is None:
                     module.fail_json(msg=error_msg, **result)
     
     return True
 
 
-def main():
-    """Code executed at run time."""
-    argument_spec = {
+def policy_spec():
+    """Return the argument spec of a QoS Policy, shared by the module arguments and the policies argument."""
+    return {
         "name": {"type": "str", "required": True},
         "policy_type": {"type": "str", "choices": ["Strict", "Committed"], "required": False},
         "implementation_on": {"type": "str", "choices": ["Total", "Individual"], "required": False},
@@ -800,39 +1104,24 @@ def main():
                 "schedule": {"type": "str", "required": True}
             }
         },
-        "state": {"type": "str", "required": True, "choices": ["present", "updated", "query", "absent"]},
     }
 
-    required_if = [
-        (
-            "state",
-            "present",
-            [
-                "name",
-                "priority"
-            ],
-            False,
-        ),
-        (
-            "state",
-            "updated",
-            [
-                "name"
-            ],
-            False,
-        ),
-        (
-            "state",
-            "query",
-            [
-                "name"
-            ],
-            False,
-        )
-    ]
+
+def main():
+    """Code executed at run time."""
+    argument_spec = policy_spec()
+    argument_spec["name"]["required"] = False
+    argument_spec.update({
+        "policies": {"type": "list", "elements": "dict", "required": False, "options": policy_spec()},
+        "batch_size": {"type": "int", "default": 100},
+        "state": {"type": "str", "required": True, "choices": ["present", "updated", "query", "absent"]},
+    })
 
     module = AnsibleModule(
-        argument_spec=argument_spec, required_if=required_if, supports_check_mode=True
+        argument_spec=argument_spec,
+        required_one_of=[("name", "policies")],
+        mutually_exclusive=[("name", "policies")],
+        supports_check_mode=True,
     )
 
     if not PREREQ_MET["result"]:
@@ -840,10 +1129,6 @@ def main():
 
     result = {"changed": False, "check_mode": False}
     
-    # Validate parameters
-    if module.params.get("state") in ["present", "updated"]:
-        validate_parameters(module, result)
-
     state = module.params.get("state")
 
     try:
@@ -855,6 +1140,18 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("policies") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with policies", **result)
+        manage_policies(connection, module, result)
+        module.exit_json(**result)
+
+    if state == "present" and module.params.get("priority") is None:
+        module.fail_json(msg="state is present but all of the following are missing: priority", **result)
+
+    if state in ["present", "updated"]:
+        validate_parameters(module, module.params, result)
+
     exist_settings = get_qos_policy(connection, module, result)
     result["api_response"] = exist_settings["api_response"]
 
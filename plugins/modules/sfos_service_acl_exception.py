@@ -22,8 +22,10 @@ extends_documentation_fragment:
 
 options:
     name:
-        description: Name of the Local service ACL exception rule to create, update, or delete
-        required: true
+        description:
+          - Name of the Local service ACL exception rule to create, update, or delete
+          - One of I(name) or I(rules) is required.
+        required: false
         type: str
     description:
         description: Description of the Local service ACL exception rule.
@@ -71,6 +73,56 @@ options:
         choices: [add, remove, replace]
         default: add
         required: false
+    rules:
+        description:
+            - Manage several Local service ACL exception rules with a single task, instead of the rule given by I(name).
+            - All rules are retrieved with one request, and the rules to create, update, move or remove are sent
+              in one request. Only the rules which differ are sent.
+            - With I(state=present), missing rules are created and existing rules are updated.
+              With I(state=updated), every rule must already exist. With I(state=absent), the listed rules are removed.
+            - I(state=query) is not supported with I(rules).
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
+        suboptions:
+            name:
+                description: Name of the rule.
+                type: str
+                required: true
+            description:
+                description: Description of the rule.
+                type: str
+            position:
+                description:
+                    - Place the rule at the top or bottom of the rule list. Rules with the same position keep the order they are listed in.
+                    - Existing rules are only moved when they are not already in place. New rules without a position are added at the bottom.
+                type: str
+                choices: [top, bottom]
+            source_zone:
+                description: Source zone of the rule.
+                type: str
+            source_list:
+                description: Source Network(s) or Host(s).
+                type: list
+                elements: str
+            dest_list:
+                description: Destination Host(s).
+                type: list
+                elements: str
+            service_list:
+                description: Service(s).
+                type: list
+                elements: str
+            action:
+                description: Accept or Drop.
+                type: str
+                choices: [accept, drop]
+            update_action:
+                description: Indicate whether entries specified for source_list, dest_list, or service_list should be added or removed from, or replaced when updating.
+                type: str
+                choices: [add, remove, replace]
+                default: add
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(absent) to remove, or C(updated) to modify
@@ -104,6 +156,29 @@ EXAMPLES = r"""
       - HTTPS
     action: drop
     state: present
+
+- name: Reconcile several Local service ACL exception rules
+  sophos.sophos_firewall.sfos_service_acl_exception:
+    rules:
+      - name: ALLOW_MGMT_HOSTS
+        position: top
+        source_zone: LAN
+        source_list:
+          - MGMTHOST1
+          - MGMTHOST2
+        service_list:
+          - HTTPS
+          - SSH
+        action: accept
+        update_action: replace
+      - name: DROP_WAN_SSH
+        source_zone: WAN
+        source_list:
+          - BLOCKEDNET
+        service_list:
+          - SSH
+        action: drop
+    state: present
 """
 
 RETURN = r"""
@@ -111,7 +186,26 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
-
+created:
+    description: Names of the rules created.
+    type: list
+    elements: str
+    returned: when I(rules) is specified
+updated:
+    description: Names of the rules updated, including the rules moved.
+    type: list
+    elements: str
+    returned: when I(rules) is specified
+moved:
+    description: Names of the existing rules moved to the top or bottom.
+    type: list
+    elements: str
+    returned: when I(rules) is specified
+removed:
+    description: Names of the rules removed.
+    type: list
+    elements: str
+    returned: when I(rules) is specified
 """
 
 try:
@@ -131,6 +225,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list, failed_objects
 
 
 def get_acl_rule(connection, module, result):
@@ -158,8 +254,8 @@ def get_acl_rule(connection, module, result):
     return {"exists": True, "api_response": resp["response"]}
 
 
-def create_acl_rule(connection, module, result):
-    """Create an Local service ACL exception rule on Sophos Firewall
+def remove_acl_rule(connection, module, result):
+    """Remove an Local service ACL exception rule from Sophos Firewall
 
     Args:
         connection (Connection): Ansible Connection object
@@ -170,15 +266,8 @@ def create_acl_rule(connection, module, result):
         dict: API response
     """
     try:
-        resp = connection.invoke_sdk("create_acl_rule", module_args={
-            "name": module.params.get("name"),
-            "description": module.params.get("description"),
-            "position": module.params.get("position"),
-            "source_zone": module.params.get("source_zone"),
-            "source_list": module.params.get("source_list"),
-            "dest_list": module.params.get("dest_list"),
-            "service_list": module.params.get("service_list"),
-            "action": module.params.get("action"),
+        resp = connection.invoke_sdk("remove", module_args={
+            "xml_tag": "LocalServiceACL", "name": module.params.get("name"), "key": "RuleName"
             }
         )
     except Exception as error:
@@ -190,33 +279,149 @@ def create_acl_rule(connection, module, result):
     return resp["response"]
 
 
-def remove_acl_rule(connection, module, result):
-    """Remove an Local service ACL exception rule from Sophos Firewall
+# List arguments and the XML path of their members
+ACL_LISTS = (
+    ("source_list", ("Hosts", "Host")),
+    ("dest_list", ("Hosts", "DstHost")),
+    ("service_list", ("Services", "Service")),
+)
+
+
+def exist_members(exist_rule):
+    """Return the sources, destinations and services of an existing rule.
+
+    Args:
+        exist_rule (dict): LocalServiceACL returned by the firewall
+
+    Returns:
+        dict: Members keyed by list argument
+    """
+    members = {}
+    for option, (group, element) in ACL_LISTS:
+        container = exist_rule.get(group)
+        members[option] = ensure_list(container.get(element)) if isinstance(container, dict) else []
+    return members
+
+
+def merge_members(existing, requested, update_action):
+    """Apply the update_action to the members of one list.
+
+    Args:
+        existing (list): Existing members
+        requested (list): Members given in the module arguments
+        update_action (str): add, remove or replace
+
+    Returns:
+        list: Members after the update, in the existing order followed by any added members
+    """
+    if update_action == "remove":
+        removed = set(requested)
+        return [member for member in existing if member not in removed]
+    if update_action == "replace":
+        return list(requested) if requested else list(existing)
+    merged = list(existing)
+    seen = set(existing)
+    for member in requested:
+        if member not in seen:
+            seen.add(member)
+            merged.append(member)
+    return merged
+
+
+def eval_changed(params, exist_rule):
+    """Evaluate the provided arguments against an existing rule.
+
+    Args:
+        params (dict): Module arguments, or one item of the rules argument
+        exist_rule (dict): LocalServiceACL returned by the firewall
+
+    Returns:
+        bool: Return true if any settings are different, otherwise return false
+    """
+    for option, element in (("description", "Description"), ("source_zone", "SourceZone"), ("action", "Action")):
+        if params.get(option) and params[option] != exist_rule.get(element):
+            return True
+
+    members = exist_members(exist_rule)
+    update_action = params.get("update_action") or "add"
+    for option, xml_path in ACL_LISTS:
+        merged = merge_members(members[option], params.get(option) or [], update_action)
+        if set(merged) != set(members[option]):
+            return True
+    return False
+
+
+def acl_entity(params, exist_rule=None, position=None):
+    """Build a LocalServiceACL entity from the module arguments.
+
+    Args:
+        params (dict): Module arguments, or one item of the rules argument
+        exist_rule (dict): LocalServiceACL returned by the firewall, or None when creating the rule
+        position (str): Position to send, top or bottom, or None to leave the position unchanged
+
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    if exist_rule is None:
+        exist_rule = {}
+        members = {option: params.get(option) or [] for option, xml_path in ACL_LISTS}
+    else:
+        update_action = params.get("update_action") or "add"
+        members = {option: merge_members(existing, params.get(option) or [], update_action)
+                   for option, existing in exist_members(exist_rule).items()}
+
+    entity = {
+        "RuleName": params["name"],
+        "Description": params.get("description") or exist_rule.get("Description"),
+    }
+    if position:
+        entity["Position"] = position
+    entity["IPFamily"] = exist_rule.get("IPFamily") or "IPv4"
+
+    source_zone = params.get("source_zone") or exist_rule.get("SourceZone")
+    if source_zone:
+        entity["SourceZone"] = source_zone
+    if members["source_list"]:
+        entity["Hosts"] = {"Host": members["source_list"]}
+        if members["dest_list"]:
+            entity["Hosts"]["DstHost"] = members["dest_list"]
+    if members["service_list"]:
+        entity["Services"] = {"Service": members["service_list"]}
+
+    action = params.get("action") or exist_rule.get("Action")
+    if action:
+        entity["Action"] = action.lower()
+    return {"LocalServiceACL": entity}
+
+
+def submit_acl_rule(connection, module, result, entity, set_operation):
+    """Create or update a Local service ACL exception rule on Sophos Firewall
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entity (dict): LocalServiceACL entity to send
+        set_operation (str): Set operation, add or update
 
     Returns:
         dict: API response
     """
     try:
-        resp = connection.invoke_sdk("remove", module_args={
-            "xml_tag": "LocalServiceACL", "name": module.params.get("name"), "key": "RuleName"
-            }
-        )
+        resp = connection.submit_entities([entity], set_operation=set_operation, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
 
-def update_acl_rule(connection, module, result):
-    """Update an existing Local service ACL exception rule on Sophos Firewall
+def get_all_acl_rules(connection, module, result):
+    """Get all Local service ACL exception rules from Sophos Firewall with a single request.
 
     Args:
         connection (Connection): Ansible Connection object
@@ -224,52 +429,152 @@ def update_acl_rule(connection, module, result):
         result (dict): Result output to be sent to the console
 
     Returns:
-        dict: API response
+        dict: Existing rules keyed by name, in the order of the rules on the firewall
     """
     try:
-        resp = connection.invoke_sdk("update_acl_rule", module_args={
-            "name": module.params.get("name"),
-            "description": module.params.get("description"),
-            "source_zone": module.params.get("source_zone"),
-            "source_list": module.params.get("source_list"),
-            "dest_list": module.params.get("dest_list"),
-            "service_list": module.params.get("service_list"),
-            "action": module.params.get("action"),
-            "update_action": module.params.get("update_action"),
-            }
-        )
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "LocalServiceACL"},
+                                     trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
-    return resp["response"]
+    if not resp["exists"]:
+        return {}
 
+    return {rule["RuleName"]: rule for rule in ensure_list(resp["response"]["Response"].get("LocalServiceACL"))
+            if isinstance(rule, dict) and "RuleName" in rule}
 
-def eval_list(list1, list2, condition):
-    """Evaluate whether contents of list1 exist in list2, or contents of list1 do not exist in list2.
+
+def plan_moves(order, top, bottom):
+    """Find the fewest rules to move so the top rules lead and the bottom rules end the rule order.
+
+    Moving a rule to the top places it before every other rule, and moving it to the bottom
+    places it after every other rule. The rules are kept in the order they are listed.
 
     Args:
-        list1 (list): List of strings
-        list2 (list): List of strings
-        condition (str): If set to 'positive', will return true if any elements in list1 are in list2.
-        If set to 'negative', will return true if any elements in list1 are NOT in list2.
+        order (list): Rule names in their current order
+        top (list): Rules to place at the top, in order
+        bottom (list): Rules to place at the bottom, in order
+
+    Returns:
+        tuple: Rules to move to the top, and rules to move to the bottom
     """
-    for item in list1:
-        if condition == "positive":
-            if item in list2:
-                return True
-        if condition == "negative":
-            if item not in list2:
-                return True
-    return False
+    for count in range(len(top) + 1):
+        moved = set(top[:count])
+        rest = [name for name in order if name not in moved]
+        if rest[:len(top) - count] == top[count:]:
+            move_top = top[:count]
+            order = move_top + rest
+            break
+
+    for count in range(len(bottom) + 1):
+        kept = len(bottom) - count
+        moved = set(bottom[kept:])
+        rest = [name for name in order if name not in moved]
+        if kept == 0 or rest[-kept:] == bottom[:kept]:
+            move_bottom = bottom[kept:]
+            break
+
+    return move_top, move_bottom
+
+
+def manage_rules(connection, module, result):
+    """Create, update, move and remove the rules given in the rules argument with one request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    state = module.params.get("state")
+    exist_rules = get_all_acl_rules(connection, module, result)
+
+    declared = {}
+    creates, removes = [], []
+    for params in module.params.get("rules"):
+        name = params["name"]
+        if name in declared:
+            module.fail_json(msg="Rule {0} is listed more than once".format(name), **result)
+        declared[name] = params
+
+        if state == "absent":
+            if name in exist_rules:
+                removes.append(name)
+        elif name not in exist_rules and state == "present":
+            creates.append(name)
+        elif name not in exist_rules:
+            module.fail_json(msg="Attempting to update non-existing resource: {0}".format(name), **result)
+
+    top, bottom = [], []
+    if state != "absent":
+        for name, params in declared.items():
+            if params.get("position") == "top":
+                top.append(name)
+            elif params.get("position") == "bottom":
+                bottom.append(name)
+
+    # New rules are added at the bottom in the order they are listed. The adds are sent before the
+    # updates, so new rules which need to be placed elsewhere are moved along with the existing rules.
+    order = list(exist_rules) + creates
+    move_top, move_bottom = plan_moves(order, top, bottom)
+    moves = dict((name, "top") for name in move_top)
+    moves.update((name, "bottom") for name in move_bottom)
+
+    adds = [acl_entity(declared[name], position="bottom") for name in creates]
+
+    updates, updated = [], []
+    for name in list(reversed(move_top)) + move_bottom + [name for name in declared if name not in moves]:
+        if state == "absent":
+            continue
+        position = moves.get(name)
+        if name in creates:
+            if position:
+                updates.append(acl_entity(declared[name], position=position))
+            continue
+        if position or eval_changed(declared[name], exist_rules[name]):
+            updates.append(acl_entity(declared[name], exist_rules[name], position))
+            updated.append(name)
+
+    result["created"] = creates
+    result["updated"] = [name for name in declared if name in updated]
+    result["moved"] = [name for name in declared if name in moves and name not in creates]
+    result["removed"] = removes
+    result["changed"] = bool(adds or updates or removes)
+
+    if module.check_mode:
+        result["check_mode"] = True
+        return
+
+    if not result["changed"]:
+        return
+
+    try:
+        resp = connection.submit_changes("LocalServiceACL", add=adds, update=updates,
+                                         remove=removes, remove_key="RuleName",
+                                         trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"] = resp["response"]
+    names = [entity["LocalServiceACL"]["RuleName"] for entity in adds + updates] + removes
+    failed = failed_objects(resp["response"], "LocalServiceACL", names)
+    if failed:
+        module.fail_json(msg="An error occurred: {0}".format(failed), **result)
 
 
 def main():
     """Code executed at run time."""
     argument_spec = {
-        "name": {"required": True},
+        "name": {"required": False},
         "description": {"type": "str", "default": None},
         "position": {"type": "str", "default": "bottom"},
         "source_zone": {"type": "str"},
@@ -282,6 +587,22 @@ def main():
             "choices": ["add", "remove", "replace"],
             "default": "add",
         },
+        "rules": {
+            "type": "list",
+            "elements": "dict",
+            "required": False,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "description": {"type": "str"},
+                "position": {"type": "str", "choices": ["top", "bottom"]},
+                "source_zone": {"type": "str"},
+                "source_list": {"type": "list", "elements": "str"},
+                "dest_list": {"type": "list", "elements": "str"},
+                "service_list": {"type": "list", "elements": "str"},
+                "action": {"type": "str", "choices": ["accept", "drop"]},
+                "update_action": {"type": "str", "choices": ["add", "remove", "replace"], "default": "add"},
+            },
+        },
         "state": {
             "required": True,
             "choices": ["present", "absent", "updated", "query"],
@@ -290,7 +611,11 @@ def main():
     required_if = [("state", "updated", ("update_action",), True)]
 
     module = AnsibleModule(
-        argument_spec=argument_spec, required_if=required_if, supports_check_mode=True
+        argument_spec=argument_spec,
+        required_if=required_if,
+        required_one_of=[("name", "rules")],
+        mutually_exclusive=[("name", "rules")],
+        supports_check_mode=True,
     )
 
     if not PREREQ_MET["result"]:
@@ -308,6 +633,12 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("rules") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with rules", **result)
+        manage_rules(connection, module, result)
+        module.exit_json(**result)
+
     exist_check = get_acl_rule(connection, module, result)
     result["api_response"] = exist_check["api_response"]
 
@@ -319,7 +650,8 @@ def main():
         module.exit_json(**result)
 
     if state == "present" and not exist_check["exists"]:
-        api_response = create_acl_rule(connection, module, result)
+        api_response = submit_acl_rule(connection, module, result,
+                                       acl_entity(module.params, position=module.params.get("position")), "add")
         if (
             api_response["Response"]["LocalServiceACL"]["Status"]["#text"]
             == "Configuration applied successfully."
@@ -343,110 +675,9 @@ def main():
         result["changed"] = False
 
     elif state == "updated" and exist_check["exists"]:
-        new_source_list = sorted(module.params.get("source_list"))
-        if new_source_list:
-            new_source_list = sorted(new_source_list)
-        exist_source_list = exist_check["api_response"]["Response"]["LocalServiceACL"][
-            "Hosts"
-        ]["Host"]
-        if isinstance(exist_source_list, str):
-            exist_source_list = [exist_source_list]
-        else:
-            exist_source_list = sorted(exist_source_list)
-
-        new_dest_list = sorted(module.params.get("dest_list"))
-        if new_dest_list:
-            new_dest_list = sorted(new_dest_list)
-        if "DstHost" in exist_check["api_response"]["Response"]["LocalServiceACL"]["Hosts"]:
-            exist_dest_list = exist_check["api_response"]["Response"]["LocalServiceACL"]["Hosts"]["DstHost"]
-        else:
-            exist_dest_list = []
-        if isinstance(exist_dest_list, str):
-            exist_dest_list = [exist_dest_list]
-        else:
-            exist_dest_list = sorted(exist_dest_list)
-
-        new_service_list = module.params.get("service_list")
-        if new_service_list:
-            new_service_list = sorted(new_service_list)
-        exist_service_list = exist_check["api_response"]["Response"]["LocalServiceACL"][
-            "Services"
-        ]["Service"]
-        if isinstance(exist_service_list, str):
-            exist_service_list = [exist_service_list]
-        else:
-            exist_service_list = sorted(exist_service_list)
-
-        exist_description = exist_check["api_response"]["Response"]["LocalServiceACL"][
-            "Description"
-        ]
-        exist_source_zone = exist_check["api_response"]["Response"]["LocalServiceACL"][
-            "SourceZone"
-        ]
-        exist_action = exist_check["api_response"]["Response"]["LocalServiceACL"][
-            "Action"
-        ]
-
-        if (
-            (
-                module.params.get("description")
-                and exist_description != module.params.get("description")
-            )
-            or (
-                module.params.get("source_zone")
-                and exist_source_zone != module.params.get("source_zone")
-            )
-            or (
-                module.params.get("action")
-                and exist_action != module.params.get("action")
-            )
-            or (
-                new_source_list
-                and module.params.get("update_action") == "add"
-                and eval_list(new_source_list, exist_source_list, "negative")
-            )
-            or (
-                new_dest_list
-                and module.params.get("update_action") == "add"
-                and eval_list(new_dest_list, exist_dest_list, "negative")
-            )
-            or (
-                new_service_list
-                and module.params.get("update_action") == "add"
-                and eval_list(new_service_list, exist_service_list, "negative")
-            )
-            or (
-                new_source_list
-                and module.params.get("update_action") == "remove"
-                and eval_list(new_source_list, exist_source_list, "positive")
-            )
-            or (
-                new_dest_list
-                and module.params.get("update_action") == "remove"
-                and eval_list(new_dest_list, exist_dest_list, "positive")
-            )
-            or (
-                new_service_list
-                and module.params.get("update_action") == "remove"
-                and eval_list(new_service_list, exist_service_list, "positive")
-            )
-            or (
-                new_source_list
-                and module.params.get("update_action") == "replace"
-                and new_source_list != exist_source_list
-            )
-            or (
-                new_dest_list
-                and module.params.get("update_action") == "replace"
-                and new_dest_list != exist_dest_list
-            )
-            or (
-                new_service_list
-                and module.params.get("update_action") == "replace"
-                and new_service_list != exist_service_list
-            )
-        ):
-            api_response = update_acl_rule(connection, module, result)
+        exist_rule = exist_check["api_response"]["Response"]["LocalServiceACL"]
+        if eval_changed(module.params, exist_rule):
+            api_response = submit_acl_rule(connection, module, result, acl_entity(module.params, exist_rule), "update")
             if (
                 api_response["Response"]["LocalServiceACL"]["Status"]["#text"]
                 == "Configuration applied successfully."
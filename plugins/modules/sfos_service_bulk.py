@@ -0,0 +1,440 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_service_bulk
+
+short_description: Sync Services and Service Groups in bulk (System > Hosts and services)
+
+version_added: "2.6.0"
+
+description:
+    - Creates or updates Services and Service Groups on Sophos Firewall to match a desired set, for example
+      when importing the services exported from another firewall.
+    - Existing Services and Service Groups are retrieved with one request each. Only the objects which are missing
+      or differ are sent, several objects per request. Services are sent before the Service Groups which use them.
+    - Ports are compared as ranges, so C(80) and C(80:80) are the same port, and the entries in I(service_list)
+      are compared regardless of their order.
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    services:
+        description:
+            - Desired Services.
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+            name:
+                description: Name of the Service.
+                type: str
+                required: true
+            type:
+                description: Type of service object.
+                type: str
+                choices: [tcporudp, ip, icmp, icmpv6]
+                required: true
+            service_list:
+                description:
+                    - Ports or protocols included in the Service.
+                type: list
+                elements: dict
+                required: true
+                suboptions:
+                    src_port:
+                        description:
+                            - Source TCP or UDP port or range, for example C(1024:65535). A range may also be
+                              written with a dash, for example C(1024-65535).
+                        type: str
+                        default: 1:65535
+                    dst_port:
+                        description:
+                            - Destination TCP or UDP port or range.
+                        type: str
+                    protocol:
+                        description:
+                            - TCP, UDP, or IP protocol number
+                        type: str
+                    icmp_type:
+                        description:
+                            - ICMP type.
+                        type: str
+                    icmp_code:
+                        description:
+                            - ICMP code.
+                        type: str
+    servicegroups:
+        description:
+            - Desired Service Groups.
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+            name:
+                description: Name of the Service Group.
+                type: str
+                required: true
+            description:
+                description: Description of the Service Group. The existing description is kept when omitted.
+                type: str
+            service_list:
+                description: Services in the Service Group, replacing the existing members.
+                type: list
+                elements: str
+                required: true
+    batch_size:
+        description:
+            - Maximum number of objects sent in a single request.
+        type: int
+        default: 100
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Sync web services and group
+  sophos.sophos_firewall.sfos_service_bulk:
+    services:
+      - name: WEB_ALT
+        type: tcporudp
+        service_list:
+          - protocol: tcp
+            dst_port: 8080
+          - protocol: tcp
+            dst_port: 8443:8443
+      - name: GRE_TUNNEL
+        type: ip
+        service_list:
+          - protocol: GRE
+    servicegroups:
+      - name: WEB_SERVICES
+        description: Web services
+        service_list:
+          - HTTP
+          - HTTPS
+          - WEB_ALT
+
+- name: Import services exported from another firewall
+  sophos.sophos_firewall.sfos_service_bulk:
+    services: "{{ lookup('ansible.builtin.file', 'services.json') | from_json }}"
+    batch_size: 200
+"""
+
+RETURN = r"""
+api_response:
+    description: Number of Services and Service Groups created, updated, unchanged and failed.
+    returned: always
+    type: dict
+created:
+    description: Names of the objects created, keyed by XML tag.
+    returned: always
+    type: dict
+updated:
+    description: Names of the objects updated, keyed by XML tag.
+    returned: always
+    type: dict
+failed_objects:
+    description: Objects which could not be created or updated, with the reason.
+    returned: when an object could not be created or updated
+    type: list
+    elements: dict
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import (
+    apply_changes,
+    ensure_list,
+    get_existing,
+    report_changes,
+)
+from collections import Counter
+import re
+
+XML_TAGS = ["Services", "ServiceGroup"]
+
+SERVICE_TYPES = {"tcporudp": "TCPorUDP", "ip": "IP", "icmp": "ICMP", "icmpv6": "ICMPv6"}
+
+PORT_RANGE = re.compile(r"^\s*(\d+)\s*(?:[:-]\s*(\d+)\s*)?$")
+
+
+def port_range(port):
+    """Convert a port or port range to a tuple of the first and last port.
+
+    Args:
+        port (str): Port, or range in the format first:last or first-last
+
+    Returns:
+        tuple: First and last port
+
+    Raises:
+        ValueError: The port is not a valid port or range
+    """
+    match = PORT_RANGE.match(str(port))
+    if not match:
+        raise ValueError("Invalid port: {0}".format(port))
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    if first > last:
+        first, last = last, first
+    if first < 1 or last > 65535:
+        raise ValueError("Invalid port: {0}".format(port))
+    return first, last
+
+
+def port_string(ports):
+    """Format a port range tuple in the format used by the API."""
+    first, last = ports
+    return str(first) if first == last else "{0}:{1}".format(first, last)
+
+
+def desired_details(service):
+    """Convert the service_list of a desired Service into a set of canonical entries.
+
+    Args:
+        service (dict): Desired Service
+
+    Returns:
+        frozenset: Canonical service entries
+    """
+    svc_type = SERVICE_TYPES[service["type"]]
+    details = set()
+    for entry in service["service_list"]:
+        if svc_type == "TCPorUDP":
+            if not entry.get("protocol") or not entry.get("dst_port"):
+                raise ValueError("protocol and dst_port are required for tcporudp services")
+            details.add((entry["protocol"].upper(), port_range(entry.get("src_port") or "1:65535"),
+                         port_range(entry["dst_port"])))
+        elif svc_type == "IP":
+            if not entry.get("protocol"):
+                raise ValueError("protocol is required for ip services")
+            details.add((entry["protocol"].upper(),))
+        else:
+            if not entry.get("icmp_type") or not entry.get("icmp_code"):
+                raise ValueError("icmp_type and icmp_code are required for icmp services")
+            details.add((entry["icmp_type"].strip(), entry["icmp_code"].strip()))
+    return frozenset(details)
+
+
+def existing_details(entity):
+    """Convert the ServiceDetails of an existing Service into a set of canonical entries.
+
+    Args:
+        entity (dict): Existing Service
+
+    Returns:
+        frozenset: Canonical service entries, or None if an entry cannot be interpreted
+    """
+    details = set()
+    for detail in ensure_list((entity.get("ServiceDetails") or {}).get("ServiceDetail")):
+        try:
+            if "DestinationPort" in detail:
+                details.add((str(detail.get("Protocol", "")).upper(), port_range(detail.get("SourcePort") or "1:65535"),
+                             port_range(detail["DestinationPort"])))
+            elif "ProtocolName" in detail:
+                details.add((str(detail["ProtocolName"]).upper(),))
+            elif "ICMPv6Type" in detail:
+                details.add((detail["ICMPv6Type"], detail.get("ICMPv6Code")))
+            elif "ICMPType" in detail:
+                details.add((detail["ICMPType"], detail.get("ICMPCode")))
+        except ValueError:
+            return None
+    return frozenset(details)
+
+
+def service_entity(name, svc_type, details):
+    """Build a Services entity from canonical service entries.
+
+    Args:
+        name (str): Service name
+        svc_type (str): Service type in API format
+        details (frozenset): Canonical service entries
+
+    Returns:
+        dict: Services entity
+    """
+    service_details = []
+    for detail in sorted(details):
+        if svc_type == "TCPorUDP":
+            protocol, src_ports, dst_ports = detail
+            service_details.append({
+                "SourcePort": port_string(src_ports),
+                "DestinationPort": port_string(dst_ports),
+                "Protocol": protocol,
+            })
+        elif svc_type == "IP":
+            service_details.append({"ProtocolName": detail[0]})
+        elif svc_type == "ICMP":
+            service_details.append({"ICMPType": detail[0], "ICMPCode": detail[1]})
+        else:
+            service_details.append({"ICMPv6Type": detail[0], "ICMPv6Code": detail[1]})
+
+    return {"Services": {"Name": name, "Type": svc_type, "ServiceDetails": {"ServiceDetail": service_details}}}
+
+
+def servicegroup_entity(group, exist_group):
+    """Build a ServiceGroup entity from a desired Service Group.
+
+    Args:
+        group (dict): Desired Service Group
+        exist_group (dict): Existing Service Group, or None
+
+    Returns:
+        dict: ServiceGroup entity
+    """
+    description = group.get("description")
+    if description is None:
+        description = (exist_group or {}).get("Description")
+    return {"ServiceGroup": {
+        "Name": group["name"],
+        "Description": description or "",
+        "ServiceList": {"Service": sorted(set(group["service_list"]))},
+    }}
+
+
+def plan_changes(module, result, existing):
+    """Compare the desired objects with the existing objects.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        existing (dict): Existing objects keyed by name, for each XML tag
+
+    Returns:
+        list: Tuples of XML tag, operation and the list of (name, entity) pairs, in the order they should be sent
+    """
+    service_add, service_update = [], []
+    for service in module.params.get("services"):
+        svc_type = SERVICE_TYPES[service["type"]]
+        try:
+            details = desired_details(service)
+        except ValueError as error:
+            module.fail_json(msg="Service {0}: {1}".format(service["name"], error), **result)
+
+        exist_service = existing["Services"].get(service["name"])
+        if exist_service is None:
+            service_add.append((service["name"], service_entity(service["name"], svc_type, details)))
+        elif exist_service.get("Type") != svc_type or existing_details(exist_service) != details:
+            service_update.append((service["name"], service_entity(service["name"], svc_type, details)))
+
+    group_add, group_update = [], []
+    for group in module.params.get("servicegroups"):
+        exist_group = existing["ServiceGroup"].get(group["name"])
+        if exist_group is None:
+            group_add.append((group["name"], servicegroup_entity(group, None)))
+            continue
+        exist_members = set(ensure_list((exist_group.get("ServiceList") or {}).get("Service")))
+        description = group.get("description")
+        if set(group["service_list"]) != exist_members or (
+                description is not None and description != (exist_group.get("Description") or "")):
+            group_update.append((group["name"], servicegroup_entity(group, exist_group)))
+
+    return [
+        ("Services", "add", service_add),
+        ("Services", "update", service_update),
+        ("ServiceGroup", "add", group_add),
+        ("ServiceGroup", "update", group_update),
+    ]
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "services": {
+            "type": "list",
+            "elements": "dict",
+            "default": [],
+            "options": {
+                "name": {"type": "str", "required": True},
+                "type": {"type": "str", "choices": ["tcporudp", "ip", "icmp", "icmpv6"], "required": True},
+                "service_list": {
+                    "type": "list",
+                    "elements": "dict",
+                    "required": True,
+                    "options": {
+                        "protocol": {"type": "str"},
+                        "src_port": {"type": "str", "default": "1:65535"},
+                        "dst_port": {"type": "str"},
+                        "icmp_type": {"type": "str"},
+                        "icmp_code": {"type": "str"},
+                    },
+                },
+            },
+        },
+        "servicegroups": {
+            "type": "list",
+            "elements": "dict",
+            "default": [],
+            "options": {
+                "name": {"type": "str", "required": True},
+                "description": {"type": "str"},
+                "service_list": {"type": "list", "elements": "str", "required": True},
+            },
+        },
+        "batch_size": {"type": "int", "default": 100},
+    }
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    batch_size = module.params.get("batch_size")
+    if batch_size < 1:
+        module.fail_json(msg="batch_size must be at least 1", **result)
+
+    for option in ("services", "servicegroups"):
+        name_count = Counter(entry["name"] for entry in module.params.get(option))
+        duplicates = sorted(name for name, count in name_count.items() if count > 1)
+        if duplicates:
+            module.fail_json(msg="Duplicate names in {0}: {1}".format(option, ", ".join(duplicates)), **result)
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError as e:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    existing = get_existing(connection, module, result, XML_TAGS)
+    changes = plan_changes(module, result, existing)
+    summary = apply_changes(connection, module, result, XML_TAGS, changes, batch_size)
+
+    unchanged = {"Services": len(module.params.get("services")),
+                 "ServiceGroup": len(module.params.get("servicegroups"))}
+    for xml_tag, operation, items in changes:
+        unchanged[xml_tag] -= len(items)
+    report_changes(module, result, XML_TAGS, summary, unchanged, outcomes=("created", "updated"))
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
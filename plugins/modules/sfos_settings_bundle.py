@@ -0,0 +1,693 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_settings_bundle
+
+short_description: Manage several global settings (ATP, IPS, malware protection, DNS, time, notification) in one task
+
+version_added: "2.6.0"
+
+description:
+    - Manage the global settings otherwise managed by M(sophos.sophos_firewall.sfos_atp), M(sophos.sophos_firewall.sfos_ips),
+      M(sophos.sophos_firewall.sfos_malware_protection), M(sophos.sophos_firewall.sfos_dns), M(sophos.sophos_firewall.sfos_time)
+      and M(sophos.sophos_firewall.sfos_notification_target) on Sophos Firewall from a single task.
+    - The settings for every group specified are retrieved with one request. Each group is compared against the
+      existing settings, and only the groups which differ are sent, in one request.
+    - Settings which are not specified are left unchanged.
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    atp:
+        description: Active Threat Protection settings (Protect > Active threat response > Sophos X-Ops threat feeds).
+        type: dict
+        required: false
+        suboptions:
+            enabled:
+                description: Enable (true) or disable (false) threat feeds
+                type: bool
+                required: false
+            inspect_content:
+                description: Configure inspection of only untrusted or both trusted and untrusted content
+                type: str
+                choices: ["all", "untrusted"]
+            log_policy:
+                description: Configure logging policy. Required when I(enabled=true).
+                type: str
+                choices: ["Log Only", "Log and Drop"]
+    ips:
+        description: Intrusion prevention settings (Protect > Intrusion prevention).
+        type: dict
+        required: false
+        suboptions:
+            enabled:
+                description: Enable (true) or disable (false) IPS protection
+                type: bool
+                required: false
+    malware_protection:
+        description: Malware protection settings (Configure > System services > Malware protection).
+        type: dict
+        required: false
+        suboptions:
+            antivirus_engine:
+                description: Set the primary Antivirus engine
+                type: str
+                choices: ["Sophos", "Avira"]
+                required: false
+    dns:
+        description: DNS settings (Configure > Network > DNS).
+        type: dict
+        required: false
+        suboptions:
+            ipv4_settings:
+                description: IPv4 DNS settings
+                type: dict
+                required: false
+                suboptions:
+                    dns_source:
+                        description: Source for obtaining DNS servers. The DNS servers are only set when this is C(Static).
+                        type: str
+                        choices: ["DHCP", "PPPoE", "Static"]
+                        required: false
+                    dns1:
+                        description: First IPv4 DNS server
+                        type: str
+                        required: false
+                    dns2:
+                        description: Second IPv4 DNS server
+                        type: str
+                        required: false
+                    dns3:
+                        description: Third IPv4 DNS server
+                        type: str
+                        required: false
+            ipv6_settings:
+                description: IPv6 DNS settings
+                type: dict
+                required: false
+                suboptions:
+                    dns_source:
+                        description: Source for obtaining DNS servers. The DNS servers are only set when this is C(Static).
+                        type: str
+                        choices: ["DHCP", "PPPoE", "Static"]
+                        required: false
+                    dns1:
+                        description: First IPv6 DNS server
+                        type: str
+                        required: false
+                    dns2:
+                        description: Second IPv6 DNS server
+                        type: str
+                        required: false
+                    dns3:
+                        description: Third IPv6 DNS server
+                        type: str
+                        required: false
+            dnsquery_config:
+                description: DNS query configuration
+                type: str
+                choices: ["ChooseServerBasedOnIncomingRequestsRecordType",
+                  "ChooseIPv6DNSServerOverIPv4",
+                  "ChooseIPv4DNSServerOverIPv6",
+                  "ChooseIPv6IfRequestOriginatorAddressIsIPv6",
+                  "ElseIPv4"]
+                required: false
+    time:
+        description: Time settings (Administration > Time).
+        type: dict
+        required: false
+        suboptions:
+            timezone:
+                description:
+                  - "Timezone setting. WARNING: WILL CAUSE DEVICE REBOOT!"
+                type: str
+                required: false
+            date:
+                description: Date settings
+                type: dict
+                required: false
+                suboptions:
+                    year:
+                        description: Year
+                        type: int
+                        required: false
+                    month:
+                        description: Month
+                        type: int
+                        required: false
+                    day:
+                        description: Day
+                        type: int
+                        required: false
+            time:
+                description: Time settings
+                type: dict
+                required: false
+                suboptions:
+                    hour:
+                        description: Hour
+                        type: int
+                        required: false
+                    minute:
+                        description: Minute
+                        type: int
+                        required: false
+                    second:
+                        description: Second
+                        type: int
+                        required: false
+    notification:
+        description:
+          - Notification settings (Administration > Notification settings).
+          - The password cannot be read back from the firewall, so the notification settings are always sent when
+            I(password) is specified.
+        type: dict
+        required: false
+        suboptions:
+            mail_server:
+                description: Mail server IP address or hostname
+                type: str
+                required: false
+            port:
+                description: Mail server port
+                type: int
+                required: false
+            authentication_required:
+                description: Enable or disable authentication
+                type: bool
+                required: false
+            oauth2_provider:
+                description: OAuth2 provider for authentication
+                type: str
+                required: false
+                choices: ['Gmail', 'Microsoft365']
+            username:
+                description: Username for mail server authentication
+                type: str
+                required: false
+            password:
+                description: Password for mail server authentication
+                type: str
+                required: false
+            subject:
+                description: Subject for mail notifications
+                type: str
+                required: false
+            mail_body:
+                description: Mail content/body for notifications
+                type: str
+                required: false
+            sender_address:
+                description: Sender email address
+                type: str
+                required: false
+            recipient:
+                description: Recipient email address
+                type: str
+                required: false
+            connection_security:
+                description: Connection security type
+                type: str
+                required: false
+                choices: ['None', 'SSLTLS', 'STARTTLS']
+            certificate:
+                description: Certificate for secure connections
+                type: str
+                required: false
+            management_interface:
+                description: Management interface for notifications
+                type: str
+                required: false
+            ip_family:
+                description: IP family for connections
+                type: str
+                required: false
+                choices: ['IPv4', 'IPv6']
+    state:
+        description:
+            - Use C(query) to retrieve or C(updated) to modify
+            - With C(query), the settings for every group are retrieved when no group is specified.
+        choices: [updated, query]
+        type: str
+        required: true
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Apply baseline global settings
+  sophos.sophos_firewall.sfos_settings_bundle:
+    atp:
+      enabled: true
+      inspect_content: all
+      log_policy: Log and Drop
+    ips:
+      enabled: true
+    malware_protection:
+      antivirus_engine: Sophos
+    dns:
+      ipv4_settings:
+        dns_source: Static
+        dns1: 4.2.2.1
+        dns2: 4.2.2.2
+    notification:
+      mail_server: smtp.example.com
+      port: 587
+      sender_address: firewall@example.com
+      recipient: admin@example.com
+    state: updated
+  vars:
+    ansible_command_timeout: 90
+
+- name: Query all global settings
+  sophos.sophos_firewall.sfos_settings_bundle:
+    state: query
+"""
+
+RETURN = r"""
+api_response:
+    description: Serialized object containing the API response.
+    type: dict
+    returned: always
+updated:
+    description: XML tags of the settings which were changed, or which would be changed in check mode.
+    type: list
+    elements: str
+    returned: always
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+
+import copy
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+
+
+# Settings groups as (option, XML tag, ((option path, XML path), ...))
+SETTINGS = (
+    ("atp", "ATP", (
+        (("enabled",), ("ThreatProtectionStatus",)),
+        (("inspect_content",), ("InspectContent",)),
+        (("log_policy",), ("Policy",)),
+    )),
+    ("ips", "IPSSwitch", (
+        (("enabled",), ("Status",)),
+    )),
+    ("malware_protection", "MalwareProtection", (
+        (("antivirus_engine",), ("PrimaryAntiVirusEngine",)),
+    )),
+    ("dns", "DNS", (
+        (("ipv4_settings", "dns_source"), ("IPv4Settings", "ObtainDNSFrom")),
+        (("ipv4_settings", "dns1"), ("IPv4Settings", "DNSIPList", "DNS1")),
+        (("ipv4_settings", "dns2"), ("IPv4Settings", "DNSIPList", "DNS2")),
+        (("ipv4_settings", "dns3"), ("IPv4Settings", "DNSIPList", "DNS3")),
+        (("ipv6_settings", "dns_source"), ("IPv6Settings", "ObtainDNSFrom")),
+        (("ipv6_settings", "dns1"), ("IPv6Settings", "DNSIPList", "DNS1")),
+        (("ipv6_settings", "dns2"), ("IPv6Settings", "DNSIPList", "DNS2")),
+        (("ipv6_settings", "dns3"), ("IPv6Settings", "DNSIPList", "DNS3")),
+        (("dnsquery_config",), ("DNSQueryConfiguration",)),
+    )),
+    ("time", "Time", (
+        (("timezone",), ("TimeZone",)),
+        (("date", "year"), ("SetDateTime", "Date", "Year")),
+        (("date", "month"), ("SetDateTime", "Date", "Month")),
+        (("date", "day"), ("SetDateTime", "Date", "Day")),
+        (("time", "hour"), ("SetDateTime", "Time", "HH")),
+        (("time", "minute"), ("SetDateTime", "Time", "MM")),
+        (("time", "second"), ("SetDateTime", "Time", "SS")),
+    )),
+    ("notification", "Notification", (
+        (("mail_server",), ("MailServer",)),
+        (("port",), ("Port",)),
+        (("authentication_required",), ("AuthenticationRequired",)),
+        (("oauth2_provider",), ("Oauth2Provider",)),
+        (("username",), ("Username",)),
+        (("password",), ("Password",)),
+        (("subject",), ("Subject",)),
+        (("mail_body",), ("MailBody",)),
+        (("sender_address",), ("SenderAddress",)),
+        (("recipient",), ("Recepient",)),  # Note: API uses "Recepient" (typo in API)
+        (("connection_security",), ("ConnectionSecurity",)),
+        (("certificate",), ("Certificate",)),
+        (("management_interface",), ("ManagementInterface",)),
+        (("ip_family",), ("IPFamily",)),
+    )),
+)
+
+# Options which cannot be read back from the firewall, and are always sent when specified
+WRITE_ONLY = ("password",)
+
+# DNS servers are only set when the DNS source is Static
+DNS_SERVERS = ("dns1", "dns2", "dns3")
+
+
+def get_settings(connection, module, result, xml_tags):
+    """Get several global settings from Sophos Firewall in one request
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        xml_tags (list): XML tags of the settings to retrieve
+
+    Returns:
+        dict: Results of lookup
+    """
+    try:
+        resp = connection.submit_template("get_settings_bundle", {"xml_tags": xml_tags}, set_operation=None,
+                                          trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    missing = [xml_tag for xml_tag in xml_tags if not isinstance(resp["response"]["Response"].get(xml_tag), dict)]
+    if missing:
+        module.fail_json(msg="Settings were not returned by the firewall: {0}".format(", ".join(missing)),
+                         api_response=resp["response"])
+
+    return {"exists": True, "api_response": resp["response"]}
+
+
+def lookup(source, path):
+    """Return the value at a path of keys in nested dictionaries, or None if any key is missing.
+
+    Args:
+        source (dict): Dictionary to search
+        path (tuple): Keys to follow
+
+    Returns:
+        The value found, or None
+    """
+    for key in path:
+        if not isinstance(source, dict):
+            return None
+        source = source.get(key)
+    return source
+
+
+def to_xml(value):
+    """Convert a module parameter to the string used in the XML API."""
+    if isinstance(value, bool):
+        return "Enable" if value else "Disable"
+    return str(value)
+
+
+def requested_value(group_params, option_path):
+    """Return the XML value requested for one setting, or None if it is not to be changed.
+
+    Args:
+        group_params (dict): Parameters of one settings group
+        option_path (tuple): Path of the option within the group
+
+    Returns:
+        str: Requested value, or None
+    """
+    if option_path[-1] in DNS_SERVERS and lookup(group_params, option_path[:-1] + ("dns_source",)) != "Static":
+        return None
+    value = lookup(group_params, option_path)
+    if value is None:
+        return None
+    return to_xml(value)
+
+
+def setting_changes(group_params, fields, exist_entity):
+    """Compare the requested settings of one group against the existing settings.
+
+    Args:
+        group_params (dict): Parameters of one settings group
+        fields (tuple): (option path, XML path) rows of the group
+        exist_entity (dict): Existing settings from the firewall
+
+    Returns:
+        list: (XML path, value) of each setting which differs
+    """
+    changes = []
+    for option_path, xml_path in fields:
+        value = requested_value(group_params, option_path)
+        if value is None:
+            continue
+        if option_path[-1] in WRITE_ONLY or value != lookup(exist_entity, xml_path):
+            changes.append((xml_path, value))
+    return changes
+
+
+def settings_entity(xml_tag, exist_entity, changes):
+    """Build the update for one settings tag from the existing settings and the changed values.
+
+    Args:
+        xml_tag (str): XML tag of the settings
+        exist_entity (dict): Existing settings from the firewall
+        changes (list): (XML path, value) of each setting to change
+
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    entity = copy.deepcopy(exist_entity)
+    for xml_path, value in changes:
+        target = entity
+        for key in xml_path[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[xml_path[-1]] = value
+    return {xml_tag: entity}
+
+
+def plan_settings(params, api_response):
+    """Build the updates for every requested settings group which differs from the firewall.
+
+    Args:
+        params (dict): Module parameters
+        api_response (dict): Response from the call to get_settings()
+
+    Returns:
+        list: Entities to update
+    """
+    entities = []
+    for option, xml_tag, fields in SETTINGS:
+        if params.get(option) is None:
+            continue
+        exist_entity = api_response["Response"][xml_tag]
+        changes = setting_changes(params[option], fields, exist_entity)
+        if changes:
+            entities.append(settings_entity(xml_tag, exist_entity, changes))
+    return entities
+
+
+def update_settings(connection, module, result, entities):
+    """Update several global settings on Sophos Firewall in one request
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        entities (list): Entities to update
+
+    Returns:
+        dict: API response
+    """
+    try:
+        resp = connection.submit_entities(entities, set_operation="update", timeout=90,
+                                          trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    return resp["response"]
+
+
+def main():
+    """Code executed at run time."""
+    dns_family_options = {
+        "dns_source": {"type": "str", "required": False, "choices": ["DHCP", "PPPoE", "Static"]},
+        "dns1": {"type": "str", "required": False},
+        "dns2": {"type": "str", "required": False},
+        "dns3": {"type": "str", "required": False},
+    }
+    argument_spec = {
+        "atp": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "enabled": {"type": "bool", "required": False},
+                "inspect_content": {"type": "str", "choices": ["all", "untrusted"]},
+                "log_policy": {"type": "str", "choices": ["Log Only", "Log and Drop"]},
+            },
+            "required_if": [("enabled", True, ["log_policy"])],
+        },
+        "ips": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "enabled": {"type": "bool", "required": False},
+            },
+        },
+        "malware_protection": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "antivirus_engine": {"type": "str", "required": False, "choices": ["Sophos", "Avira"]},
+            },
+        },
+        "dns": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "ipv4_settings": {"type": "dict", "required": False, "options": dns_family_options},
+                "ipv6_settings": {"type": "dict", "required": False, "options": dns_family_options},
+                "dnsquery_config": {
+                    "type": "str",
+                    "required": False,
+                    "choices": [
+                        "ChooseServerBasedOnIncomingRequestsRecordType",
+                        "ChooseIPv6DNSServerOverIPv4",
+                        "ChooseIPv4DNSServerOverIPv6",
+                        "ChooseIPv6IfRequestOriginatorAddressIsIPv6",
+                        "ElseIPv4",
+                    ],
+                },
+            },
+        },
+        "time": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "timezone": {"type": "str", "required": False},
+                "date": {
+                    "type": "dict",
+                    "required": False,
+                    "options": {
+                        "year": {"type": "int", "required": False},
+                        "month": {"type": "int", "required": False},
+                        "day": {"type": "int", "required": False},
+                    },
+                },
+                "time": {
+                    "type": "dict",
+                    "required": False,
+                    "options": {
+                        "hour": {"type": "int", "required": False},
+                        "minute": {"type": "int", "required": False},
+                        "second": {"type": "int", "required": False},
+                    },
+                },
+            },
+        },
+        "notification": {
+            "type": "dict",
+            "required": False,
+            "options": {
+                "mail_server": {"type": "str", "required": False},
+                "port": {"type": "int", "required": False},
+                "authentication_required": {"type": "bool", "required": False},
+                "oauth2_provider": {"type": "str", "required": False, "choices": ["Gmail", "Microsoft365"]},
+                "username": {"type": "str", "required": False},
+                "password": {"type": "str", "required": False, "no_log": True},
+                "subject": {"type": "str", "required": False},
+                "mail_body": {"type": "str", "required": False},
+                "sender_address": {"type": "str", "required": False},
+                "recipient": {"type": "str", "required": False},
+                "connection_security": {"type": "str", "required": False, "choices": ["None", "SSLTLS", "STARTTLS"]},
+                "certificate": {"type": "str", "required": False},
+                "management_interface": {"type": "str", "required": False},
+                "ip_family": {"type": "str", "required": False, "choices": ["IPv4", "IPv6"]},
+            },
+        },
+        "state": {"type": "str", "required": True, "choices": ["updated", "query"]},
+    }
+
+    required_if = [
+        ("state", "updated", [option for option, xml_tag, fields in SETTINGS], True),
+    ]
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_if=required_if,
+        supports_check_mode=True,
+    )
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": False, "updated": []}
+
+    state = module.params.get("state")
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    xml_tags = [xml_tag for option, xml_tag, fields in SETTINGS if module.params.get(option) is not None]
+    if not xml_tags:
+        xml_tags = [xml_tag for option, xml_tag, fields in SETTINGS]
+
+    exist_settings = get_settings(connection, module, result, xml_tags)
+    result["api_response"] = exist_settings["api_response"]
+
+    if state == "query":
+        module.exit_json(**result)
+
+    entities = plan_settings(module.params, exist_settings["api_response"])
+
+    if module.check_mode:
+        result["check_mode"] = True
+        result["updated"] = [list(entity)[0] for entity in entities]
+        result["changed"] = bool(entities)
+        module.exit_json(**result)
+
+    elif state == "updated":
+        if entities:
+            api_response = update_settings(connection, module, result, entities)
+
+            result["api_response"] = api_response
+            for entity in entities:
+                xml_tag = list(entity)[0]
+                if (
+                    api_response["Response"][xml_tag]["Status"]["#text"]
+                    == "Configuration applied successfully."
+                ):
+                    result["updated"].append(xml_tag)
+            result["changed"] = bool(result["updated"])
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
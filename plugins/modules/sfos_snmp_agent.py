@@ -74,11 +74,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -96,6 +91,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_snmp_agent(connection, module, result):
@@ -160,16 +156,16 @@ def update_snmp_agent(connection, module, result, api_version):
         update_params["ContactPerson"] = module.params.get("contact_person")
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={
-                "xml_tag": "SNMPAgentConfiguration", 
-                "update_params": update_params,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("update", module_args={
+            "xml_tag": "SNMPAgentConfiguration", 
+            "update_params": update_params,
+            }, trace=module._verbosity >= 3
+        )
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
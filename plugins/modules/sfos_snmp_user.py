@@ -119,11 +119,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -141,6 +136,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import get_api_version, record_trace
 
 
 def get_snmp_user(connection, module, result):
@@ -238,16 +234,15 @@ def create_snmp_user(connection, module, result, api_version):
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("submit_xml", module_args={
+            "template_data": payload,
+            "template_vars": template_vars}, trace=module._verbosity >= 3
+        )
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -326,15 +321,15 @@ def update_snmp_user(connection, exist_settings, module, result, api_version):
     if module.params.get("authentication_password"):
         update_params["AuthenticationPassword"] = module.params.get("authentication_password")
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={"xml_tag": "SNMPv3User",
-                                 "update_params": update_params,
-                                 "name": module.params.get("name"),
-                                 "lookup_key": "Username",
-                                 "debug": True})
+        resp = connection.invoke_sdk("update", module_args={"xml_tag": "SNMPv3User",
+                             "update_params": update_params,
+                             "name": module.params.get("name"),
+                             "lookup_key": "Username"}, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -424,6 +419,7 @@ def remove_snmp_user(connection, module, result):
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
@@ -502,12 +498,6 @@ def main():
     exist_settings = get_snmp_user(connection, module, result)
     result["api_response"] = exist_settings["api_response"]
 
-    if exist_settings["exists"]:
-        api_version = exist_settings["api_response"]["Response"]["@APIVersion"]
-    else:
-        resp = connection.invoke_sdk("login")
-        api_version = resp["response"]["Response"]["@APIVersion"]
-
     if state == "query":
         module.exit_json(**result)
 
@@ -515,6 +505,8 @@ def main():
         result["check_mode"] = True
         module.exit_json(**result)
 
+    api_version = get_api_version(connection, module, result, exist_settings["api_response"])
+
     if state == "present" and not exist_settings["exists"]:
         api_response = create_snmp_user(connection, module, result, api_version=api_version)
         if (
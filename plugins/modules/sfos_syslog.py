@@ -21,10 +21,12 @@ extends_documentation_fragment:
   - sophos.sophos_firewall.fragments.base
 
 options:
-    name: 
-        description: Name of syslog server configuration
+    name:
+        description:
+            - Name of syslog server configuration
+            - Required unless I(servers) is used.
         type: str
-        required: true
+        required: false
     address:
         description: IP address or hostname of syslog server
         type: str
@@ -365,10 +367,31 @@ options:
                         type: str
                         required: false
                         choices: ["Enable", "Disable"]
+    servers:
+        description:
+            - Manage several syslog servers in one task, instead of the single server given by I(name).
+            - Each entry accepts the same options as the module, except I(state), which applies to all the entries.
+            - All syslog servers are retrieved with one request. With C(state=present), servers which do not exist
+              are created and servers whose settings differ are updated. With C(state=updated), servers whose settings
+              differ are updated. With C(state=absent), the servers are removed.
+            - The creates, updates and removals are sent together in a single request.
+            - C(query) is not supported with this option.
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
+    purge:
+        description:
+            - Remove syslog servers which are not listed in I(servers).
+            - Only used with I(servers) and C(state=present) or C(state=updated).
+        type: bool
+        required: false
+        default: false
+        version_added: "2.6.0"
     state:
         description:
-            - Use C(query) to retrieve or C(updated) to modify
-        choices: [updated, query]
+            - Use C(query) to retrieve, C(present) to create, C(absent) to remove, or C(updated) to modify
+        choices: [present, absent, updated, query]
         type: str
         required: true
 
@@ -408,6 +431,25 @@ EXAMPLES = r"""
     state: present
 
 
+- name: Manage all syslog servers, removing any others
+  sophos.sophos_firewall.sfos_syslog:
+    servers:
+      - name: Collector1
+        address: 10.10.1.100
+        facility: DAEMON
+        severity: Information
+        format: Standard syslog
+      - name: Collector2
+        address: 10.10.2.100
+        facility: LOCAL7
+        severity: Information
+        format: Standard syslog
+        log_settings:
+          events:
+            admin: Disable
+    purge: true
+    state: present
+
 - name: Query syslog server
   sophos.sophos_firewall.sfos_syslog:
     name: TestSyslog
@@ -425,12 +467,23 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
+created:
+    description: Syslog servers created when using I(servers).
+    type: list
+    elements: str
+    returned: when I(servers) is used
+updated:
+    description: Syslog servers updated when using I(servers).
+    type: list
+    elements: str
+    returned: when I(servers) is used
+removed:
+    description: Syslog servers removed when using I(servers).
+    type: list
+    elements: str
+    returned: when I(servers) is used
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
 
 try:
     from sophosfirewall_python.firewallapi import (
@@ -449,99 +502,188 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import get_api_version, record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list, failed_objects
+
+
+
+# Syslog server settings as (option, XML element) pairs, in the order of the SyslogServers element
+SERVER_SCHEMA = (
+    ("address", "ServerAddress"),
+    ("udp_port", "Port"),
+    ("secure_connection", "EnableSecureConnection"),
+    ("facility", "Facility"),
+    ("severity", "SeverityLevel"),
+    ("format", "Format"),
+)
+
+# Log settings as (log_settings suboption, XML element, settings) entries, in the order of the LogSettings element
+LOG_SETTINGS_SCHEMA = (
+    ("security_policy", "SecurityPolicy", (
+        ("policy_rules", "PolicyRules"),
+        ("invalid_traffic", "InvalidTraffic"),
+        ("local_acls", "LocalACLs"),
+        ("dos_attack", "DoSAttack"),
+        ("dropped_icmpredirect", "DroppedICMPRedirectedPacket"),
+        ("dropped_sourceroute", "DroppedSourceRoutedPacket"),
+        ("dropped_fragment", "DroppedFragmentedTraffic"),
+        ("mac_filtering", "MACFiltering"),
+        ("ipmacpair_filtering", "IP-MACPairFiltering"),
+        ("ipspoof_prevention", "IPSpoofPrevention"),
+        ("ssl_vpntunnel", "SSLVPNTunnel"),
+        ("protected_application_server", "ProtectedApplicationServer"),
+        ("heartbeat", "Heartbeat"),
+        ("icmp_errormessage", "ICMPErrorMessage"),
+        ("bridge_acls", "BridgeACLs"),
+    )),
+    ("ips", "IPS", (
+        ("anomaly", "Anomaly"),
+        ("signatures", "Signatures"),
+    )),
+    ("anti_virus", "AntiVirus", (
+        ("http", "HTTP"),
+        ("ftp", "FTP"),
+        ("smtp", "SMTP"),
+        ("pop3", "POP3"),
+        ("imap", "IMAP"),
+        ("https", "HTTPS"),
+        ("smtps", "SMTPS"),
+        ("pops", "POPS"),
+        ("imaps", "IMAPS"),
+    )),
+    ("anti_spam", "AntiSpam", (
+        ("smtp", "SMTP"),
+        ("pop3", "POP3"),
+        ("imap", "IMAP"),
+        ("smtps", "SMTPS"),
+        ("pops", "POPS"),
+        ("imaps", "IMAPS"),
+    )),
+    ("content_filtering", "ContentFiltering", (
+        ("web_filter", "WebFilter"),
+        ("application_filter", "ApplicationFilter"),
+        ("web_content_policy", "WebContentPolicy"),
+        ("ssl_tls", "SSLTLS"),
+    )),
+    ("events", "Events", (
+        ("admin", "AdminEvents"),
+        ("authentication", "AuthenticationEvents"),
+        ("system", "SystemEvents"),
+    )),
+    ("web_server_protection", "WebServerProtection", (
+        ("waf_events", "WAFEvents"),
+    )),
+    ("atp", "ATP", (
+        ("atp_events", "ATPEvents"),
+    )),
+    ("wireless", "Wireless", (
+        ("access_points_ssid", "AccessPoints_SSID"),
+    )),
+    ("heartbeat", "Heartbeat", (
+        ("endpoint_status", "EndpointStatus"),
+    )),
+    ("system_health", "SystemHealth", (
+        ("usage", "Usage"),
+    )),
+    ("zeroday_protection", "ZeroDayProtection", (
+        ("zeroday_protection_events", "ZeroDayProtectionEvents"),
+    )),
+    ("sdwan", "SDWAN", (
+        ("profile", "Profile"),
+        ("sla", "SLA"),
+        ("route", "Route"),
+    )),
+)
+
+# Log settings no longer present from the given firewall major version
+REMOVED_IN = {("log_settings", "atp", "atp_events"): 22}
+
+# Option values which differ from the values used in the XML API
+VALUE_MAP = {
+    "format": {"Device standard": "DeviceStandardFormat", "Standard syslog": "3"},
+}
+
+
+def compile_schema():
+    """Flatten the syslog schema into lookup rows.
 
+    Returns:
+        tuple: (option path, XML path, major version the setting was removed in) for each setting,
+            in the order of the SyslogServers element
+    """
+    fields = [((option,), (element,), None) for option, element in SERVER_SCHEMA]
+    for group, group_element, settings in LOG_SETTINGS_SCHEMA:
+        for option, element in settings:
+            option_path = ("log_settings", group, option)
+            fields.append((option_path, ("LogSettings", group_element, element), REMOVED_IN.get(option_path)))
+    return tuple(fields)
+
+
+FIELDS = compile_schema()
+
+
+def lookup(source, path):
+    """Return the value at a path of keys in nested dictionaries.
+
+    Args:
+        source (dict): Nested dictionaries
+        path (tuple): Keys to follow
+
+    Returns:
+        Value at the path, or None if any key is missing
+    """
+    for key in path:
+        if not isinstance(source, dict):
+            return None
+        source = source.get(key)
+    return source
+
+
+def to_xml(option, value):
+    """Convert a module option value to the value used in the XML API.
+
+    Args:
+        option (str): Option name
+        value: Option value
+
+    Returns:
+        str: XML value, or None if the option is not set
+    """
+    if value is None:
+        return None
+    if option in VALUE_MAP:
+        return VALUE_MAP[option][value]
+    return str(value)
+
+
+def api_major_version(api_version):
+    """Return the firewall major version from the API version, for example 22 for 2200.1.
+
+    Args:
+        api_version (str): API version, for example 2200.1
+
+    Returns:
+        int: Major version
+    """
+    return int(api_version[:2])
 
-payload = """
-    <SyslogServers>
-        <Name>{{ name }}</Name>
-        <ServerAddress>{{ address }}</ServerAddress>
-        <Port>{{ udp_port }}</Port>
-        <EnableSecureConnection>{{ secure_connection }}</EnableSecureConnection>
-        <Facility>{{ facility }}</Facility>
-        <SeverityLevel>{{ severity }}</SeverityLevel>
-        <Format>{{ format }}</Format>
-    <LogSettings>
-        <SecurityPolicy>
-        <PolicyRules>{{ policy_rules }}</PolicyRules>
-        <InvalidTraffic>{{ invalid_traffic }}</InvalidTraffic>
-        <LocalACLs>{{ local_acls }}</LocalACLs>
-        <DoSAttack>{{ dos_attack }}</DoSAttack>
-        <DroppedICMPRedirectedPacket>{{ dropped_icmpredirect }}</DroppedICMPRedirectedPacket>
-        <DroppedSourceRoutedPacket>{{ dropped_sourceroute }}</DroppedSourceRoutedPacket>
-        <DroppedFragmentedTraffic>{{ dropped_fragment }}</DroppedFragmentedTraffic>
-        <MACFiltering>{{ mac_filtering }}</MACFiltering>
-        <IP-MACPairFiltering>{{ ipmacpair_filtering }}</IP-MACPairFiltering>
-        <IPSpoofPrevention>{{ ipspoof_prevention }}</IPSpoofPrevention>
-        <SSLVPNTunnel>{{ ssl_vpntunnel }}</SSLVPNTunnel>
-        <ProtectedApplicationServer>{{ protected_application_server }}</ProtectedApplicationServer>
-        <Heartbeat>{{ heartbeat }}</Heartbeat>
-        <ICMPErrorMessage>{{ icmp_errormessage }}</ICMPErrorMessage>
-        <BridgeACLs>{{ bridge_acls }}</BridgeACLs>
-    </SecurityPolicy>
-    <IPS>
-        <Anomaly>{{ anomaly }}</Anomaly>
-        <Signatures>{{ signatures }}</Signatures>
-    </IPS>
-    <AntiVirus>
-        <HTTP>{{ av_http }}</HTTP>
-        <FTP>{{ av_ftp }}</FTP>
-        <SMTP>{{ av_smtp }}</SMTP>
-        <POP3>{{ av_pop3 }}</POP3>
-        <IMAP>{{ av_imap }}</IMAP>
-        <HTTPS>{{ av_https }}</HTTPS>
-        <SMTPS>{{ av_smtps }}</SMTPS>
-        <POPS>{{ av_pops }}</POPS>
-        <IMAPS>{{ av_imaps }}</IMAPS>
-    </AntiVirus>
-    <AntiSpam>
-        <SMTP>{{ as_smtp }}</SMTP>
-        <POP3>{{ as_pop3 }}</POP3>
-        <IMAP>{{ as_imap }}</IMAP>
-        <SMTPS>{{ as_smtps }}</SMTPS>
-        <POPS>{{ as_pops }}</POPS>
-        <IMAPS>{{ as_imaps }}</IMAPS>
-    </AntiSpam>
-    <ContentFiltering>
-        <WebFilter>{{ web_filter }}</WebFilter>
-        <ApplicationFilter>{{ application_filter }}</ApplicationFilter>
-        <WebContentPolicy>{{ web_content_policy }}</WebContentPolicy>
-        <SSLTLS>{{ ssl_tls }}</SSLTLS>
-    </ContentFiltering>
-    <Events>
-        <AdminEvents>{{ admin }}</AdminEvents>
-        <AuthenticationEvents>{{ authentication }}</AuthenticationEvents>
-        <SystemEvents>{{ system }}</SystemEvents>
-    </Events>
-    <WebServerProtection>
-        <WAFEvents>{{ waf_events }}</WAFEvents>
-    </WebServerProtection>
-    <ATP>
-        <ATPEvents>{{ atp_events }}</ATPEvents>
-    </ATP>
-    <Wireless>
-        <AccessPoints_SSID>{{ access_points_ssid }}</AccessPoints_SSID>
-    </Wireless>
-    <Heartbeat>
-        <EndpointStatus>{{ heartbeat }}</EndpointStatus>
-    </Heartbeat>
-    <SystemHealth>
-        <Usage>{{ usage }}</Usage>
-    </SystemHealth>
-    <ZeroDayProtection>
-        <ZeroDayProtectionEvents>{{ zeroday_protection_events }}</ZeroDayProtectionEvents>
-    </ZeroDayProtection>
-    <SDWAN>
-        <Profile>{{ profile }}</Profile>
-        <SLA>{{ sla }}</SLA>
-        <Route>{{ route }}</Route>
-    </SDWAN>
-    </LogSettings>
-</SyslogServers>
-"""
 
-def get_with_default(d, key, default):
-    value = d.get(key)
-    return default if value is None else value
+def find_server(api_response, name):
+    """Return the syslog server with the given name from a SyslogServers response.
+
+    Args:
+        api_response (dict): API response containing SyslogServers
+        name (str): Syslog server name
+
+    Returns:
+        dict: Syslog server, or None if it is not in the response
+    """
+    servers = api_response["Response"].get("SyslogServers")
+    for server in servers if isinstance(servers, list) else [servers]:
+        if isinstance(server, dict) and server.get("Name") == name:
+            return server
+    return None
+
 
 def get_syslog(connection, module, result):
     """Get current syslog server settings from Sophos Firewall
@@ -558,446 +700,226 @@ def get_syslog(connection, module, result):
         resp = connection.invoke_sdk("get_tag_with_filter", module_args={"xml_tag": "SyslogServers", "key": "Name", "value": module.params.get("name")})
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
-    
+
     if resp["success"] and not resp["exists"]:
         return {"exists": False, "api_response": resp["response"]}
 
     if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))    
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
-    if isinstance(resp["response"]["Response"]["SyslogServers"], dict):
-        return {"exists": False, "api_response": resp["response"]}
-    if isinstance(resp["response"]["Response"]["SyslogServers"], list):
-        for syslog_server in resp["response"]["Response"]["SyslogServers"]:
-            if syslog_server["Name"] == module.params.get("name"):
-                return {"exists": True, "api_response": resp["response"]}
+    return {"exists": find_server(resp["response"], module.params.get("name")) is not None,
+            "api_response": resp["response"]}
 
-    return {"exists": True, "api_response": resp["response"]}
 
+def server_entity(params, exist_server, api_major):
+    """Build a SyslogServers entity from the schema.
 
-def create_syslog(connection, module, result):
-    """Create an Syslog server configuration on Sophos Firewall
+    Settings which are not given keep their existing value, or when creating the server,
+    log settings use default_logging.
 
     Args:
-        connection (Connection): Ansible Connection object
-        module (AnsibleModule): AnsibleModule object
-        result (dict): Result output to be sent to the console
+        params (dict): Module arguments for the syslog server
+        exist_server (dict): Existing syslog server, or None when it is being created
+        api_major (int): Firewall major version
 
     Returns:
-        dict: API response
+        dict: SyslogServers entity
     """
+    entity = {"Name": params.get("name")}
+    for option_path, xml_path, removed_in in FIELDS:
+        if removed_in and api_major >= removed_in:
+            continue
+        value = to_xml(option_path[-1], lookup(params, option_path))
+        if value is None and exist_server is not None:
+            value = lookup(exist_server, xml_path)
+        elif value is None and option_path[0] == "log_settings":
+            value = params.get("default_logging")
+        parent = entity
+        for element in xml_path[:-1]:
+            parent = parent.setdefault(element, {})
+        parent[xml_path[-1]] = value
+    return {"SyslogServers": entity}
+
+
+def eval_changed(params, exist_server, api_major):
+    """Evaluate the provided arguments against the existing syslog server.
 
-    syslog_format = "3" if module.params.get("format") == "Standard syslog" else "DeviceStandardFormat"
-
-    default_logging = module.params.get("default_logging")
-    log_settings = get_with_default(module.params, "log_settings", {})
-
-    security_policy = get_with_default(log_settings, "security_policy", {})
-    ips = get_with_default(log_settings, "ips", {})
-    anti_virus = get_with_default(log_settings, "anti_virus", {})
-    anti_spam = get_with_default(log_settings, "anti_spam", {})
-    content_filtering = get_with_default(log_settings, "content_filtering", {})
-    events = get_with_default(log_settings, "events", {})
-    web_server_protection = get_with_default(log_settings, "web_server_protection", {})
-    atp = get_with_default(log_settings, "atp", {})
-    wireless = get_with_default(log_settings, "wireless", {})
-    heartbeat = get_with_default(log_settings, "heartbeat", {})
-    system_health = get_with_default(log_settings, "system_health", {})
-    zeroday_protection = get_with_default(log_settings, "zeroday_protection", {})
-    sdwan = get_with_default(log_settings, "sdwan", {})
-
-
-    template_vars = {
-        "name": module.params.get("name"),
-        "address": module.params.get("address"),
-        "udp_port": module.params.get("udp_port"),
-        "secure_connection": module.params.get("secure_connection"),
-        "facility": module.params.get("facility"),
-        "severity": module.params.get("severity"),
-        "format": syslog_format,
-        "policy_rules": get_with_default(security_policy, "policy_rules", default_logging),
-        "invalid_traffic": get_with_default(security_policy, "invalid_traffic", default_logging),
-        "local_acls": get_with_default(security_policy, "local_acls", default_logging),
-        "dos_attack": get_with_default(security_policy, "dos_attack", default_logging),
-        "dropped_icmpredirect": get_with_default(security_policy, "dropped_icmpredirect", default_logging),
-        "dropped_sourceroute": get_with_default(security_policy, "dropped_sourceroute", default_logging),
-        "dropped_fragment": get_with_default(security_policy, "dropped_fragment", default_logging),
-        "mac_filtering": get_with_default(security_policy, "mac_filtering", default_logging),
-        "ipmacpair_filtering": get_with_default(security_policy, "ipmacpair_filtering", default_logging),
-        "ipspoof_prevention": get_with_default(security_policy, "ipspoof_prevention", default_logging),
-        "ssl_vpntunnel": get_with_default(security_policy, "ssl_vpntunnel", default_logging),
-        "protected_application_server": get_with_default(security_policy, "protected_application_server", default_logging),
-        "heartbeat": get_with_default(security_policy, "heartbeat", default_logging),
-        "icmp_errormessage": get_with_default(security_policy, "icmp_errormessage", default_logging),
-        "bridge_acls": get_with_default(security_policy, "bridge_acls", default_logging),
-        "anomaly": get_with_default(ips, "anomaly", default_logging),
-        "signatures": get_with_default(ips, "signatures", default_logging),
-        "av_http": get_with_default(anti_virus, "http", default_logging),
-        "av_ftp": get_with_default(anti_virus, "ftp", default_logging),
-        "av_smtp": get_with_default(anti_virus, "smtp", default_logging),
-        "av_pop3": get_with_default(anti_virus, "pop3", default_logging),
-        "av_imap": get_with_default(anti_virus, "imap", default_logging),
-        "av_https": get_with_default(anti_virus, "https", default_logging),
-        "av_smtps": get_with_default(anti_virus, "smtps", default_logging),
-        "av_pops": get_with_default(anti_virus, "pops", default_logging),
-        "av_imaps": get_with_default(anti_virus, "imaps", default_logging),
-        "as_smtp": get_with_default(anti_spam, "smtp", default_logging),
-        "as_pop3": get_with_default(anti_spam, "pop3", default_logging),
-        "as_imap": get_with_default(anti_spam, "imap", default_logging),
-        "as_smtps": get_with_default(anti_spam, "smtps", default_logging),
-        "as_pops": get_with_default(anti_spam, "pops", default_logging),
-        "as_imaps": get_with_default(anti_spam, "imaps", default_logging),
-        "web_filter": get_with_default(content_filtering, "web_filter", default_logging),
-        "application_filter": get_with_default(content_filtering, "application_filter", default_logging),
-        "web_content_policy": get_with_default(content_filtering, "web_content_policy", default_logging),
-        "ssl_tls": get_with_default(content_filtering, "ssl_tls", default_logging),
-        "admin": get_with_default(events, "admin", default_logging),
-        "authentication": get_with_default(events, "authentication", default_logging),
-        "system": get_with_default(events, "system", default_logging),
-        "waf_events": get_with_default(web_server_protection, "waf_events", default_logging),
-        "atp_events": get_with_default(atp, "atp_events", default_logging),
-        "access_points_ssid": get_with_default(wireless, "access_points_ssid", default_logging),
-        "endpoint_status": get_with_default(heartbeat, "endpoint_status", default_logging),
-        "usage": get_with_default(system_health, "usage", default_logging),
-        "zeroday_protection_events": get_with_default(zeroday_protection, "zeroday_protection_events", default_logging),
-        "profile": get_with_default(sdwan, "profile", default_logging),
-        "sla": get_with_default(sdwan, "sla", default_logging),
-        "route": get_with_default(sdwan, "route", default_logging)
-    }
-
-    try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
-    except Exception as error:
-        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+    Args:
+        params (dict): Module arguments for the syslog server
+        exist_server (dict): Existing syslog server
+        api_major (int): Firewall major version
 
-    if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+    Returns:
+        bool: Return true if any settings are different, otherwise return false
+    """
+    for option_path, xml_path, removed_in in FIELDS:
+        if removed_in and api_major >= removed_in:
+            continue
+        value = to_xml(option_path[-1], lookup(params, option_path))
+        if value is not None and value != lookup(exist_server, xml_path):
+            return True
+    return False
 
-    return resp["response"]
 
-def update_syslog(connection, exist_settings, module, result):
-    """Update admin settings on Sophos Firewall
+def submit_syslog(connection, module, result, entities, set_operation):
+    """Send one or more syslog servers to Sophos Firewall in a single request.
 
     Args:
         connection (Connection): Ansible Connection object
-        exist_settings (dict): Existing settings for the syslog server
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entities (list): SyslogServers entities
+        set_operation (str): add or update
 
     Returns:
         dict: API response
     """
-    api_version = exist_settings["api_response"]["Response"]["@APIVersion"]
-    if isinstance(exist_settings["api_response"]["Response"]["SyslogServers"], dict):
-        exist_settings = exist_settings["api_response"]["Response"]["SyslogServers"]
-    if isinstance(exist_settings["api_response"]["Response"]["SyslogServers"], list):
-        for syslog_server in exist_settings["api_response"]["Response"]["SyslogServers"]:
-            if syslog_server["Name"] == module.params.get("name"):
-                exist_settings = syslog_server
-
-    log_settings = get_with_default(module.params, "log_settings", {})
-
-    security_policy = get_with_default(log_settings,"security_policy", {})
-    ips = get_with_default(log_settings,"ips", {})
-    anti_virus = get_with_default(log_settings,"anti_virus", {})
-    anti_spam = get_with_default(log_settings,"anti_spam", {})
-    content_filtering = get_with_default(log_settings,"content_filtering", {})
-    events = get_with_default(log_settings,"events", {})
-    web_server_protection = get_with_default(log_settings,"web_server_protection", {})
-    atp = get_with_default(log_settings,"atp", {})
-    wireless = get_with_default(log_settings,"wireless", {})
-    heartbeat = get_with_default(log_settings,"heartbeat", {})
-    system_health = get_with_default(log_settings,"system_health", {})
-    zeroday_protection = get_with_default(log_settings,"zeroday_protection", {})
-    sdwan = get_with_default(log_settings,"sdwan", {})
-
-    if module.params.get("format"):
-        syslog_format = "3" if module.params.get("format") == "Standard syslog" else "DeviceStandardFormat"
-    else:
-        syslog_format = exist_settings["Format"]
-
-    template_vars = {
-        "name": module.params.get("name"),
-        "address": get_with_default(module.params,"address", exist_settings["ServerAddress"]),
-        "udp_port": get_with_default(module.params, "udp_port", exist_settings["Port"]),
-        "secure_connection": get_with_default(module.params, "secure_connection", exist_settings["EnableSecureConnection"]),
-        "facility": get_with_default(module.params, "facility", exist_settings["Facility"]),
-        "severity": get_with_default(module.params,"severity", exist_settings["SeverityLevel"]),
-        "format": syslog_format,
-        "policy_rules": get_with_default(security_policy, "policy_rules", exist_settings["LogSettings"]["SecurityPolicy"]["PolicyRules"]),
-        "invalid_traffic": get_with_default(security_policy, "invalid_traffic", exist_settings["LogSettings"]["SecurityPolicy"]["InvalidTraffic"]),
-        "local_acls": get_with_default(security_policy, "local_acls", exist_settings["LogSettings"]["SecurityPolicy"]["LocalACLs"]),
-        "dos_attack": get_with_default(security_policy, "dos_attack", exist_settings["LogSettings"]["SecurityPolicy"]["DoSAttack"]),
-        "dropped_icmpredirect": get_with_default(security_policy, "dropped_icmpredirect", exist_settings["LogSettings"]["SecurityPolicy"]["DroppedICMPRedirectedPacket"]),
-        "dropped_sourceroute": get_with_default(security_policy, "dropped_sourceroute", exist_settings["LogSettings"]["SecurityPolicy"]["DroppedSourceRoutedPacket"]),
-        "dropped_fragment": get_with_default(security_policy, "dropped_fragment", exist_settings["LogSettings"]["SecurityPolicy"]["DroppedFragmentedTraffic"]),
-        "mac_filtering": get_with_default(security_policy, "mac_filtering", exist_settings["LogSettings"]["SecurityPolicy"]["MACFiltering"]),
-        "ipmacpair_filtering": get_with_default(security_policy, "ipmacpair_filtering", exist_settings["LogSettings"]["SecurityPolicy"]["IP-MACPairFiltering"]),
-        "ipspoof_prevention": get_with_default(security_policy, "ipspoof_prevention", exist_settings["LogSettings"]["SecurityPolicy"]["IPSpoofPrevention"]),
-        "ssl_vpntunnel": get_with_default(security_policy, "ssl_vpntunnel", exist_settings["LogSettings"]["SecurityPolicy"]["SSLVPNTunnel"]),
-        "protected_application_server": get_with_default(security_policy, "protected_application_server", exist_settings["LogSettings"]["SecurityPolicy"]["ProtectedApplicationServer"]),
-        "heartbeat": get_with_default(security_policy, "heartbeat", exist_settings["LogSettings"]["SecurityPolicy"]["Heartbeat"]),
-        "icmp_errormessage": get_with_default(security_policy, "icmp_errormessage", exist_settings["LogSettings"]["SecurityPolicy"]["ICMPErrorMessage"]),
-        "bridge_acls": get_with_default(security_policy, "bridge_acls", exist_settings["LogSettings"]["SecurityPolicy"]["BridgeACLs"]),
-        "anomaly": get_with_default(ips, "anomaly", exist_settings["LogSettings"]["IPS"]["Anomaly"]),
-        "signatures": get_with_default(ips, "signatures", exist_settings["LogSettings"]["IPS"]["Signatures"]),
-        "av_http": get_with_default(anti_virus, "http", exist_settings["LogSettings"]["AntiVirus"]["HTTP"]),
-        "av_ftp": get_with_default(anti_virus, "ftp", exist_settings["LogSettings"]["AntiVirus"]["FTP"]),
-        "av_smtp": get_with_default(anti_virus, "smtp", exist_settings["LogSettings"]["AntiVirus"]["SMTP"]),
-        "av_pop3": get_with_default(anti_virus, "pop3", exist_settings["LogSettings"]["AntiVirus"]["POP3"]),
-        "av_imap": get_with_default(anti_virus, "imap", exist_settings["LogSettings"]["AntiVirus"]["IMAP"]),
-        "av_https": get_with_default(anti_virus, "https", exist_settings["LogSettings"]["AntiVirus"]["HTTPS"]),
-        "av_smtps": get_with_default(anti_virus, "smtps", exist_settings["LogSettings"]["AntiVirus"]["SMTPS"]),
-        "av_pops": get_with_default(anti_virus, "pops", exist_settings["LogSettings"]["AntiVirus"]["POPS"]),
-        "av_imaps": get_with_default(anti_virus, "imaps", exist_settings["LogSettings"]["AntiVirus"]["IMAPS"]),
-        "as_pop3": get_with_default(anti_spam, "pop3", exist_settings["LogSettings"]["AntiSpam"]["POP3"]),
-        "as_imap": get_with_default(anti_spam, "imap", exist_settings["LogSettings"]["AntiSpam"]["IMAP"]),
-        "as_smtp": get_with_default(anti_spam, "smtp", exist_settings["LogSettings"]["AntiSpam"]["SMTP"]),
-        "as_smtps": get_with_default(anti_spam, "smtps", exist_settings["LogSettings"]["AntiSpam"]["SMTPS"]),
-        "as_pops": get_with_default(anti_spam, "pops", exist_settings["LogSettings"]["AntiSpam"]["POPS"]),
-        "as_imaps": get_with_default(anti_spam, "imaps", exist_settings["LogSettings"]["AntiSpam"]["IMAPS"]),
-        "web_filter": get_with_default(content_filtering, "web_filter", exist_settings["LogSettings"]["ContentFiltering"]["WebFilter"]),
-        "application_filter": get_with_default(content_filtering, "application_filter", exist_settings["LogSettings"]["ContentFiltering"]["ApplicationFilter"]),
-        "web_content_policy": get_with_default(content_filtering, "web_content_policy", exist_settings["LogSettings"]["ContentFiltering"]["WebContentPolicy"]),
-        "ssl_tls": get_with_default(content_filtering, "ssl_tls", exist_settings["LogSettings"]["ContentFiltering"]["SSLTLS"]),
-        "admin": get_with_default(events, "admin", exist_settings["LogSettings"]["Events"]["AdminEvents"]),
-        "authentication": get_with_default(events, "authentication", exist_settings["LogSettings"]["Events"]["AuthenticationEvents"]),
-        "system": get_with_default(events, "system", exist_settings["LogSettings"]["Events"]["SystemEvents"]),
-        "waf_events": get_with_default(web_server_protection, "waf_events", exist_settings["LogSettings"]["WebServerProtection"]["WAFEvents"]),
-        "atp_events": get_with_default(atp, "atp_events", exist_settings["LogSettings"]["ATP"]["ATPEvents"]) if int(api_version[:2]) < 22 else None,
-        "access_points_ssid": get_with_default(wireless, "access_points_ssid", exist_settings["LogSettings"]["Wireless"]["AccessPoints_SSID"]),
-        "endpoint_status": get_with_default(heartbeat, "endpoint_status", exist_settings["LogSettings"]["Heartbeat"]["EndpointStatus"]),
-        "usage": get_with_default(system_health, "usage", exist_settings["LogSettings"]["SystemHealth"]["Usage"]),
-        "zeroday_protection_events": get_with_default(zeroday_protection, "zeroday_protection_events", exist_settings["LogSettings"]["ZeroDayProtection"]["ZeroDayProtectionEvents"]),
-        "profile": get_with_default(sdwan, "profile", exist_settings["LogSettings"]["SDWAN"]["Profile"]),
-        "sla": get_with_default(sdwan, "sla", exist_settings["LogSettings"]["SDWAN"]["SLA"]),
-        "route": get_with_default(sdwan, "route", exist_settings["LogSettings"]["SDWAN"]["Route"])
-    }
-
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "set_operation": "update",
-                "debug": True
-                }
-            )
+        resp = connection.submit_entities(entities, set_operation=set_operation, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
 
-def eval_changed(module, exist_settings):
-    """Evaluate the provided arguments against existing settings.
+def server_spec():
+    """Build the argument spec of the options describing one syslog server.
+
+    Returns:
+        dict: Options of a syslog server, used at the top level and in each entry of servers
+    """
+    return {
+        "name": {"type": "str", "required": False},
+        "address": {"type": "str", "required": False},
+        "udp_port": {"type": "int", "required": False, "default": 514},
+        "secure_connection": {"type": "str", "required": False, "default": "Disable", "choices": ["Enable", "Disable"]},
+        "facility": {"type": "str", "required": False, "choices": ["DAEMON", "LOCAL0", "LOCAL1", "LOCAL2", "LOCAL3", "LOCAL4", "LOCAL5", "LOCAL6", "LOCAL7", "KERNEL", "USER"]},
+        "severity": {"type": "str", "required": False, "choices": ["Emergency", "Alert", "Critical", "Error", "Warning", "Notification", "Information", "Debug"]},
+        "format": {"type": "str", "required": False, "choices": ["Device standard", "Standard syslog"]},
+        "default_logging": {"type": "str", "required": False, "choices": ["Enable", "Disable"], "default": "Enable"},
+        "log_settings": {"type": "dict", "required": False, "options": log_settings_spec()},
+    }
+
+
+def log_settings_spec():
+    """Build the argument spec of the log_settings option from the schema.
+
+    Returns:
+        dict: Suboptions of log_settings
+    """
+    return {
+        group: {"type": "dict", "required": False, "options": {
+            option: {"type": "str", "choices": ["Enable", "Disable"]} for option, element in settings
+        }}
+        for group, group_element, settings in LOG_SETTINGS_SCHEMA
+    }
+
+
+def get_all_syslog(connection, module, result):
+    """Get all syslog servers from Sophos Firewall with a single request.
 
     Args:
+        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
-        exist_settings (dict): Response from the call to get_admin_settings()
+        result (dict): Result output to be sent to the console
 
     Returns:
-        bool: Return true if any settings are different, otherwise return false
+        tuple: Existing syslog servers keyed by name, and the API version, or None if there are no syslog servers
     """
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "SyslogServers"},
+                                     trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
-    if isinstance(exist_settings["api_response"]["Response"]["SyslogServers"], dict):
-        exist_settings = exist_settings["api_response"]["Response"]["SyslogServers"]
-    if isinstance(exist_settings["api_response"]["Response"]["SyslogServers"], list):
-        for syslog_server in exist_settings["api_response"]["Response"]["SyslogServers"]:
-            if syslog_server["Name"] == module.params.get("name"):
-                exist_settings = syslog_server
+    record_trace(result, resp)
 
-    if module.params.get("address") and not module.params.get("address") == exist_settings["ServerAddress"]:
-        return True
-    
-    if module.params.get("port") and not str(module.params.get("udp_port")) == exist_settings["Port"]:
-        return True
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
 
-    if module.params.get("secure_connection") and not module.params.get("secure_connection") == exist_settings["EnableSecureConnection"]:
-        return True
+    if not resp["exists"]:
+        return {}, None
 
-    if module.params.get("facility") and not module.params.get("facility") == exist_settings["Facility"]:
-        return True
+    servers = {server["Name"]: server for server in ensure_list(resp["response"]["Response"].get("SyslogServers"))
+               if isinstance(server, dict) and "Name" in server}
+    return servers, resp["response"]["Response"].get("@APIVersion")
 
-    if module.params.get("severity") and not module.params.get("severity") == exist_settings["SeverityLevel"]:
-        return True
 
-    if module.params.get("format"):
-        fmt = module.params.get("format")
-        expected_format = "3" if fmt == "Standard syslog" else "DeviceStandardFormat"
-        if not expected_format == exist_settings["Format"]:
-            return True
+def manage_servers(connection, module, result):
+    """Create, update and remove the syslog servers given in the servers argument.
 
-    log_settings = module.params.get("log_settings", {})
-        
-    if log_settings.get("security_policy"):
-        security_policy = log_settings.get("security_policy", {})
-        policy_rules = security_policy.get("policy_rules")
-        invalid_traffic = security_policy.get("invalid_traffic")
-        local_acls = security_policy.get("local_acls")
-        dos_attack = security_policy.get("dos_attack")
-        dropped_icmpredirect = security_policy.get("dropped_icmpredirect")
-        dropped_sourceroute = security_policy.get("dropped_sourceroute")
-        dropped_fragment = security_policy.get("dropped_fragment")
-        mac_filtering = security_policy.get("mac_filtering")
-        ipmacpair_filtering = security_policy.get("ipmacpair_filtering")
-        ipspoof_prevention = security_policy.get("ipspoof_prevention")
-        ssl_vpntunnel = security_policy.get("ssl_vpntunnel")
-        protected_application_server = security_policy.get("protected_application_server")
-        heartbeat = security_policy.get("heartbeat")
-        icmp_errormessage = security_policy.get("icmp_errormessage")
-        bridge_acls = security_policy.get("bridge_acls")
-        
-        if (policy_rules and not policy_rules == exist_settings["LogSettings"]["SecurityPolicy"]["PolicyRules"] or
-            invalid_traffic and not invalid_traffic == exist_settings["LogSettings"]["SecurityPolicy"]["InvalidTraffic"] or 
-            local_acls and not local_acls == exist_settings["LogSettings"]["SecurityPolicy"]["InvalidTraffic"] or
-            dos_attack and not dos_attack == exist_settings["LogSettings"]["SecurityPolicy"]["DoSAttack"] or
-            dropped_icmpredirect and not dropped_icmpredirect == exist_settings["LogSettings"]["SecurityPolicy"]["DroppedICMPRedirectedPacket"] or
-            dropped_sourceroute and not dropped_sourceroute == exist_settings["LogSettings"]["SecurityPolicy"]["DroppedSourceRoutedPacket"] or
-            dropped_fragment and not dropped_fragment == exist_settings["LogSettings"]["SecurityPolicy"]["DroppedFragmentedTraffic"] or
-            mac_filtering and not mac_filtering == exist_settings["LogSettings"]["SecurityPolicy"]["MACFiltering"] or
-            ipmacpair_filtering and not ipmacpair_filtering == exist_settings["LogSettings"]["SecurityPolicy"]["IP-MACPairFiltering"] or
-            ipspoof_prevention and not ipspoof_prevention == exist_settings["LogSettings"]["SecurityPolicy"].get("IP-IPSpoofPrevention") or
-            ipspoof_prevention and not ipspoof_prevention == exist_settings["LogSettings"]["SecurityPolicy"].get("IPSpoofPrevention") or
-            ssl_vpntunnel and not ssl_vpntunnel == exist_settings["LogSettings"]["SecurityPolicy"]["SSLVPNTunnel"] or
-            protected_application_server and not protected_application_server == exist_settings["LogSettings"]["SecurityPolicy"]["ProtectedApplicationServer"] or
-            heartbeat and not heartbeat == exist_settings["LogSettings"]["SecurityPolicy"]["Heartbeat"] or
-            icmp_errormessage and not icmp_errormessage == exist_settings["LogSettings"]["SecurityPolicy"]["ICMPErrorMessage"] or
-            bridge_acls and not bridge_acls == exist_settings["LogSettings"]["SecurityPolicy"]["BridgeACLs"]
-            ):
-            return True
-    
-    if log_settings.get("ips"):
-        ips = log_settings.get("ips")
-        anomaly = ips.get("anomaly")
-        signatures = ips.get("signatures")
-        if (anomaly and not anomaly == exist_settings["LogSettings"]["IPS"]["Anomaly"] or
-            signatures and not signatures == exist_settings["LogSettings"]["IPS"]["Signatures"]
-        ):
-            return True
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    state = module.params.get("state")
+    exist_servers, api_version = get_all_syslog(connection, module, result)
+    api_major = api_major_version(api_version or get_api_version(connection, module, result))
+
+    declared = set()
+    creates, updates, removes = [], [], []
+    for params in module.params.get("servers"):
+        name = params["name"]
+        if name in declared:
+            module.fail_json(msg="Syslog server {0} is listed more than once".format(name), **result)
+        declared.add(name)
+        exist_server = exist_servers.get(name)
+
+        if state == "absent":
+            if exist_server is not None:
+                removes.append(name)
+        elif exist_server is None and state == "present":
+            missing = [option for option in ("address", "facility", "severity", "format") if params.get(option) is None]
+            if missing:
+                module.fail_json(msg="Syslog server {0} does not exist and is missing {1}".format(
+                    name, ", ".join(missing)), **result)
+            creates.append((name, server_entity(params, None, api_major)))
+        elif exist_server is None:
+            module.fail_json(msg="Attempting to update non-existing resource: {0}".format(name), **result)
+        elif eval_changed(params, exist_server, api_major):
+            updates.append((name, server_entity(params, exist_server, api_major)))
+
+    if module.params.get("purge") and state != "absent":
+        removes.extend(name for name in exist_servers if name not in declared)
+
+    result["created"] = [name for name, entity in creates]
+    result["updated"] = [name for name, entity in updates]
+    result["removed"] = removes
+    result["changed"] = bool(creates or updates or removes)
 
-    if log_settings.get("anti_virus"):
-        anti_virus = log_settings.get("anti_virus")
-        http = anti_virus.get("http")
-        ftp = anti_virus.get("ftp")
-        smtp = anti_virus.get("smtp")
-        pop3 = anti_virus.get("pop3")
-        imap = anti_virus.get("imap")
-        https = anti_virus.get("https")
-        smtps = anti_virus.get("smtps")
-        pops = anti_virus.get("pops")
-        imaps = anti_virus.get("imaps")
-        if (http and not http == exist_settings["LogSettings"]["AntiVirus"]["HTTP"] or
-            ftp and not ftp == exist_settings["LogSettings"]["AntiVirus"]["FTP"] or
-            smtp and not smtp == exist_settings["LogSettings"]["AntiVirus"]["SMTP"] or
-            pop3 and not pop3 == exist_settings["LogSettings"]["AntiVirus"]["POP3"] or
-            imap and not imap == exist_settings["LogSettings"]["AntiVirus"]["IMAP"] or
-            https and not https == exist_settings["LogSettings"]["AntiVirus"]["HTTPS"] or
-            pops and not pops == exist_settings["LogSettings"]["AntiVirus"]["POPS"] or
-            smtps and not smtps == exist_settings["LogSettings"]["AntiVirus"]["SMTPS"] or
-            imaps and not imaps == exist_settings["LogSettings"]["AntiVirus"]["IMAPS"]
-        ):
-            return True
-    
-    if log_settings.get("anti_spam"):
-        anti_spam = log_settings.get("anti_spam")
-        pop3 = anti_spam.get("pop3")
-        imap = anti_spam.get("imap")
-        smtp = anti_spam.get("smtp")
-        smtps = anti_spam.get("smtps")
-        pops = anti_spam.get("pops")
-        imaps = anti_spam.get("imaps")
-        if (pop3 and not pop3 == exist_settings["LogSettings"]["AntiSpam"]["POP3"] or
-            imap and not imap == exist_settings["LogSettings"]["AntiSpam"]["IMAP"] or
-            smtp and not smtp == exist_settings["LogSettings"]["AntiSpam"]["SMTP"] or
-            smtps and not smtps == exist_settings["LogSettings"]["AntiSpam"]["SMTPS"] or
-            pops and not pops == exist_settings["LogSettings"]["AntiSpam"]["POPS"] or
-            imaps and not imaps == exist_settings["LogSettings"]["AntiSpam"]["IMAPS"]
-            ):
-            return True
-        
-
-    if log_settings.get("content_filtering"):
-        content_filtering = log_settings.get("content_filtering")
-        web_filter = content_filtering.get("web_filter")
-        application_filter = content_filtering.get("application_filter")
-        web_content_policy = content_filtering.get("web_content_policy")
-        ssl_tls = content_filtering.get("ssl_tls")
-        if (web_filter and not web_filter == exist_settings["LogSettings"]["ContentFiltering"]["WebFilter"] or
-            application_filter and not application_filter == exist_settings["LogSettings"]["ContentFiltering"]["ApplicationFilter"] or
-            web_content_policy and not web_content_policy == exist_settings["LogSettings"]["ContentFiltering"]["WebContentPolicy"] or
-            ssl_tls and not ssl_tls == exist_settings["LogSettings"]["ContentFiltering"]["SSLTLS"]
-        ):
-            return True
+    if module.check_mode:
+        result["check_mode"] = True
+        return
 
-    if log_settings.get("events"):
-        events = log_settings.get("events")
-        admin = events.get("admin")
-        authentication = events.get("authentication")
-        system = events.get("system")
-        if (admin and not admin == exist_settings["LogSettings"]["Events"]["AdminEvents"] or
-            authentication and not authentication == exist_settings["LogSettings"]["Events"]["AuthenticationEvents"] or
-            system and not system == exist_settings["LogSettings"]["Events"]["SystemEvents"]
-        ):
-            return True
+    if not result["changed"]:
+        return
 
-    if log_settings.get("web_server_protection"):
-        web_server_protection = log_settings.get("web_server_protection")
-        waf_events = web_server_protection.get("waf_events")
-        if waf_events and not waf_events == exist_settings["LogSettings"]["WebServerProtection"]["WAFEvents"]:
-            return True
+    try:
+        resp = connection.submit_changes("SyslogServers",
+                                         add=[entity for name, entity in creates],
+                                         update=[entity for name, entity in updates],
+                                         remove=removes,
+                                         trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
-    if log_settings.get("atp"):
-        atp = log_settings.get("atp")
-        atp_events = atp.get("atp_events")
-        if atp_events and not atp_events == exist_settings["LogSettings"]["ATP"]["ATPEvents"]:
-            return True
-    
-    if log_settings.get("wireless"):
-        wireless = log_settings.get("wireless")
-        access_points_ssid = wireless.get("access_points_ssid")
-        if access_points_ssid and not access_points_ssid == exist_settings["LogSettings"]["Wireless"]["AccessPoints_SSID"]:
-            return True
-    
-    if log_settings.get("heartbeat"):
-        heartbeat = log_settings.get("heartbeat")
-        endpoint_status = heartbeat.get("endpoint_status")
-        if endpoint_status and not endpoint_status == exist_settings["LogSettings"]["Heartbeat"]["EndpointStatus"]:
-            return True
-    
-    if log_settings.get("system_health"):
-        system_health = log_settings.get("system_health")
-        usage = system_health.get("usage")
-        if usage and not usage == exist_settings["LogSettings"]["SystemHealth"]["Usage"]:
-            return True
-        
-    if log_settings.get("zeroday_protection"):
-        zeroday_protection = log_settings.get("zeroday_protection")
-        zeroday_protection_events = zeroday_protection.get("zeroday_protection_events")
-        if zeroday_protection_events and not zeroday_protection_events == exist_settings["LogSettings"]["ZeroDayProtection"]["ZeroDayProtectionEvents"]:
-            return True
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"] = resp["response"]
+    failed = failed_objects(resp["response"], "SyslogServers",
+                            result["created"] + result["updated"] + result["removed"])
+    if failed:
+        module.fail_json(msg="An error occurred: {0}".format(failed), **result)
 
-    if log_settings.get("sdwan"):
-        sdwan = log_settings.get("sdwan")
-        profile = sdwan.get("profile")
-        sla = sdwan.get("sla")
-        route = sdwan.get("route")
-        if (profile and not profile == exist_settings["LogSettings"]["SDWAN"]["Profile"] or
-            sla and not sla == exist_settings["LogSettings"]["SDWAN"]["SLA"] or
-            route and not route == exist_settings["LogSettings"]["SDWAN"]["Route"]
-        ):
-            return True
-    
-    return False
 
 def remove_syslog(connection, module, result):
     """Remove a Syslog server from Sophos Firewall.
@@ -1020,128 +942,23 @@ def remove_syslog(connection, module, result):
 
     return resp["response"]
 
+
 def main():
     """Code executed at run time."""
-    argument_spec = {
+    argument_spec = server_spec()
+    argument_spec.update({
         "enabled": {"type": "bool", "required": False},
-        "name": {"type": "str", "required": True},
-        "address": {"type": "str", "required": False},
-        "udp_port": {"type": "int", "required": False, "default": 514},
-        "secure_connection": {"type": "str", "required": False, "default": "Disable", "choices": ["Enable", "Disable"]},
-        "facility": {"type": "str", "required": False, "choices": ["DAEMON", "LOCAL0", "LOCAL1", "LOCAL2", "LOCAL3", "LOCAL4", "LOCAL5", "LOCAL6", "LOCAL7", "KERNEL", "USER"]},
-        "severity": {"type": "str", "required": False, "choices": ["Emergency", "Alert", "Critical", "Error", "Warning", "Notification", "Information", "Debug"]},
-        "format": {"type": "str", "required": False, "choices": ["Device standard", "Standard syslog"]},
-        "default_logging": {"type": "str", "required": False, "choices": ["Enable", "Disable"], "default": "Enable"},
-        "log_settings": {"type": "dict", "required": False, "options": {
-            "security_policy": {"type": "dict", "required": False, "options": {
-                    "policy_rules": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "invalid_traffic": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "local_acls": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "dos_attack": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "dropped_icmpredirect": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "dropped_sourceroute": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "dropped_fragment": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "mac_filtering": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "ipmacpair_filtering": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "ipspoof_prevention": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "ssl_vpntunnel": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "protected_application_server": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "heartbeat": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "icmp_errormessage": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "bridge_acls": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "ips": {"type": "dict", "required": False, "default": {}, "options": {
-                    "anomaly": {"type": "str", "choices": ["Enable", "Disable"]},
-                    "signatures": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "anti_virus": {"type": "dict", "required": False, "default": {}, "options": {
-                "http": {"type": "str", "choices": ["Enable", "Disable"]},
-                "ftp": {"type": "str", "choices": ["Enable", "Disable"]},
-                "smtp": {"type": "str", "choices": ["Enable", "Disable"]},
-                "pop3": {"type": "str", "choices": ["Enable", "Disable"]},
-                "imap": {"type": "str", "choices": ["Enable", "Disable"]},
-                "https": {"type": "str", "choices": ["Enable", "Disable"]},
-                "smtps": {"type": "str", "choices": ["Enable", "Disable"]},
-                "pops": {"type": "str", "choices": ["Enable", "Disable"]},
-                "imaps": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "anti_spam": {"type": "dict", "required": False, "default": {}, "options": {
-                "pop3": {"type": "str", "choices": ["Enable", "Disable"]},
-                "imap": {"type": "str", "choices": ["Enable", "Disable"]},
-                "smtp": {"type": "str", "choices": ["Enable", "Disable"]},
-                "smtps": {"type": "str", "choices": ["Enable", "Disable"]},
-                "pops": {"type": "str", "choices": ["Enable", "Disable"]},
-                "imaps": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "content_filtering": {"type": "dict", "required": False, "default": {}, "options": {
-                "web_filter": {"type": "str", "choices": ["Enable", "Disable"]},
-                "application_filter": {"type": "str", "choices": ["Enable", "Disable"]},
-                "web_content_policy": {"type": "str", "choices": ["Enable", "Disable"]},
-                "ssl_tls": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "events": {"type": "dict", "required": False, "default": {}, "options": {
-                "admin": {"type": "str", "choices": ["Enable", "Disable"]},
-                "authentication": {"type": "str", "choices": ["Enable", "Disable"]},
-                "system": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "web_server_protection": {"type": "dict", "required": False, "default": {}, "options": {
-                "waf_events": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "atp": {"type": "dict", "required": False, "default": {}, "options": {
-                "atp_events": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "wireless": {"type": "dict", "required": False, "default": {}, "options": {
-                "access_points_ssid": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "heartbeat": {"type": "dict", "required": False, "default": {}, "options": {
-                "endpoint_status": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "system_health": {"type": "dict", "required": False, "default": {}, "options": {
-                "usage": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "zeroday_protection": {"type": "dict", "required": False, "default": {}, "options": {
-                "zeroday_protection_events": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                },
-            "sdwan": {"type": "dict", "required": False, "default": {}, "options": {
-                "profile": {"type": "str", "choices": ["Enable", "Disable"]},
-                "sla": {"type": "str", "choices": ["Enable", "Disable"]},
-                "route": {"type": "str", "choices": ["Enable", "Disable"]}
-                    }
-                }
-            }
-        },
+        "servers": {"type": "list", "elements": "dict", "required": False,
+                    "options": dict(server_spec(), name={"type": "str", "required": True})},
+        "purge": {"type": "bool", "required": False, "default": False},
         "state": {"type": "str", "required": True, "choices": ["present", "absent", "updated", "query"]}
-    }
-    
-
-    required_if = [
-        (
-            "state",
-            "present",
-            [
-                "address",
-                "facility",
-                "severity",
-                "format"
-            ],
-            False,
-        ),
-    ]
+    })
 
     module = AnsibleModule(
-        argument_spec=argument_spec, required_if=required_if, supports_check_mode=True
+        argument_spec=argument_spec,
+        required_one_of=[("name", "servers")],
+        mutually_exclusive=[("name", "servers")],
+        supports_check_mode=True,
     )
 
     if not PREREQ_MET["result"]:
@@ -1159,6 +976,17 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if state == "present" and module.params.get("servers") is None:
+        missing = [option for option in ("address", "facility", "severity", "format") if module.params.get(option) is None]
+        if missing:
+            module.fail_json(msg="state is present but all of the following are missing: {0}".format(", ".join(missing)))
+
+    if module.params.get("servers") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with servers", **result)
+        manage_servers(connection, module, result)
+        module.exit_json(**result)
+
     exist_settings = get_syslog(connection, module, result)
     result["api_response"] = exist_settings["api_response"]
 
@@ -1170,7 +998,9 @@ def main():
         module.exit_json(**result)
 
     if state == "present" and not exist_settings["exists"]:
-        api_response = create_syslog(connection, module, result)
+        api_major = api_major_version(get_api_version(connection, module, result))
+        api_response = submit_syslog(connection, module, result,
+                                     [server_entity(module.params, None, api_major)], "add")
         if (
             api_response["Response"]["SyslogServers"]["Status"]["#text"]
             == "Configuration applied successfully."
@@ -1194,8 +1024,11 @@ def main():
         result["changed"] = False
 
     elif state == "updated" and exist_settings["exists"]:
-        if eval_changed(module, exist_settings):
-            api_response = update_syslog(connection, exist_settings, module, result)
+        api_major = api_major_version(exist_settings["api_response"]["Response"]["@APIVersion"])
+        exist_server = find_server(exist_settings["api_response"], module.params.get("name"))
+        if eval_changed(module.params, exist_server, api_major):
+            api_response = submit_syslog(connection, module, result,
+                                         [server_entity(module.params, exist_server, api_major)], "update")
 
             if api_response:
                 result["api_response"] = api_response
@@ -137,6 +137,15 @@ options:
             - Login restriction for appliance.
         type: str
         default: AnyNode
+    password_update:
+        description:
+            - C(always) writes I(user_password) each time an existing user is updated with I(state=updated).
+            - C(on_create) only sets the password when the user is created, so the password is not written again on every run.
+            - The password is sent in the same request as the other changes to the user.
+        type: str
+        choices: ["always", "on_create"]
+        default: always
+        version_added: "2.6.0"
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(absent) to remove, or C(updated) to modify
@@ -168,11 +177,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewall,
@@ -190,6 +194,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
 
 
 def get_user(connection, module, result):
@@ -256,11 +262,12 @@ def create_user(connection, module, result):
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("create_user", module_args={"debug": True, **user_params})
+        resp = connection.invoke_sdk("create_user", module_args=user_params, trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -289,22 +296,20 @@ def remove_user(connection, module, result):
     return resp["response"]
 
 
-def update_user(connection, module, result):
-    """Update an existing user on Sophos Firewall
+def update_params(module, exist_user):
+    """Build the user settings to update from the module arguments, keyed by API element.
 
     Args:
-        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
-        result (dict): Result output to be sent to the console
+        exist_user (dict): Existing User from the call to get_user()
 
     Returns:
-        dict: API response
+        dict: User settings, excluding the password
     """
     user_params = {
         "Username": module.params.get("user"),
         "Name": module.params.get("name"),
         "Description": module.params.get("description"),
-        "Password": module.params.get("user_password"),
         "UserType": module.params.get("user_type"),
         "Profile": module.params.get("profile"),
         "Group": module.params.get("group"),
@@ -328,30 +333,70 @@ def update_user(connection, module, result):
             "appliance_login_restriction"
         ),
     }
+    # Appliance access settings only apply to administrators
+    if (module.params.get("user_type") or exist_user.get("UserType")) != "Administrator":
+        for key in ("Profile", "ScheduleForApplianceAccess", "LoginRestrictionForAppliance"):
+            user_params.pop(key)
+
     # Remove any keys with null values
-    user_params = {key: value for key, value in user_params.items() if value}
+    return {key: value for key, value in user_params.items() if value}
+
+
+def write_password(module):
+    """Return true if the password of an existing user should be written."""
+    return bool(module.params.get("user_password")) and module.params.get("password_update") == "always"
+
+
+def eval_changed(module, exist_user):
+    """Evaluate the provided arguments against the existing user.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        exist_user (dict): Existing User from the call to get_user()
+
+    Returns:
+        bool: Return true if any settings are different or the password is written, otherwise return false
+    """
+    for key, value in update_params(module, exist_user).items():
+        if key == "EmailList":
+            exist_emails = ensure_list((exist_user.get("EmailList") or {}).get("EmailID"))
+            if value["EmailID"] not in exist_emails:
+                return True
+        elif str(value) != str(exist_user.get(key) or ""):
+            return True
+
+    return write_password(module)
+
+
+def update_user(connection, module, result, exist_user):
+    """Update an existing user on Sophos Firewall
+
+    The changed settings and, if it is written, the password are sent in a single request.
+    The encrypted password returned by get_user() is sent back unchanged otherwise, and dropped
+    when the password is written so that the firewall applies the new password.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        exist_user (dict): Existing User from the call to get_user()
+
+    Returns:
+        dict: API response
+    """
+    user = dict(exist_user)
+    user.update(update_params(module, exist_user))
+    if write_password(module):
+        user.pop("PasswordHash", None)
+        user["Password"] = module.params.get("user_password")
 
     try:
-        if module.params.get("user_password"):
-            with contextlib.redirect_stdout(output_buffer):
-                resp = connection.invoke_sdk("update_user_password", module_args={
-                    "username": module.params.get("user"),
-                    "new_password": module.params.get("user_password"),
-                    "debug": True,
-                    }
-                )
-                
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={
-                "xml_tag": "User",
-                "update_params": user_params,
-                "name": module.params.get("name"),
-                "debug": True,
-                }
-            )
+        resp = connection.submit_entities([{"User": user}], set_operation="update", trace=module._verbosity >= 3)
     except Exception as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -399,6 +444,7 @@ def main():
         "surfingquota_policy": {"type": "str", "default": "Unlimited Internet Access"},
         "applianceaccess_schedule": {"type": "str", "default": "All The Time"},
         "appliance_login_restriction": {"type": "str", "default": "AnyNode"},
+        "password_update": {"type": "str", "choices": ["always", "on_create"], "default": "always", "no_log": False},
         "state": {
             "type": "str",
             "required": True,
@@ -467,9 +513,9 @@ def main():
         result["changed"] = False
 
     elif state == "updated" and exist_check["exists"]:
-        api_response = update_user(connection, module, result)
-
-        if api_response:
+        exist_user = exist_check["api_response"]["Response"]["User"]
+        if eval_changed(module, exist_user):
+            api_response = update_user(connection, module, result, exist_user)
             if (
                 api_response["Response"]["User"]["Status"]["#text"]
                 == "Configuration applied successfully."
@@ -0,0 +1,566 @@
+#!/usr/bin/python
+
+# Copyright 2024 Sophos Ltd.  All rights reserved.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: sfos_user_bulk
+
+short_description: Provision Users in bulk from a CSV or LDIF file (Configure > Authentication > Users)
+
+version_added: "2.6.0"
+
+description:
+    - Creates or updates Users (Configure > Authentication > Users) on Sophos Firewall from a CSV or LDIF file.
+    - The file is read one record at a time, so large directories can be imported without loading the whole file.
+    - All existing users are retrieved with a single request. Only the users that are missing or differ from the
+      file are sent, several users per request.
+    - Passwords are only written for new users, unless a password change is requested for the user or the password
+      differs from the one last written by this module. See I(password_update).
+
+extends_documentation_fragment:
+  - sophos.sophos_firewall.fragments.base
+
+options:
+    src:
+        description:
+            - Path to the CSV or LDIF file on the Ansible controller.
+            - CSV files must have a header row. Columns are named after the options of M(sophos.sophos_firewall.sfos_user),
+              for example C(user), C(name), C(user_password), C(user_type), C(group) and C(email).
+            - LDIF attributes C(uid), C(cn) or C(displayName), C(mail), C(description) and C(userPassword) are mapped
+              to C(user), C(name), C(email), C(description) and C(user_password). Other attributes named after the
+              options of M(sophos.sophos_firewall.sfos_user) are used as is.
+            - A C(update_password) column or attribute set to C(true) or C(yes) requests a password change for that user.
+        type: path
+        required: true
+    format:
+        description:
+            - Format of the file. C(auto) selects C(ldif) for files with the C(.ldif) extension and C(csv) otherwise.
+        type: str
+        choices: ["auto", "csv", "ldif"]
+        default: auto
+    defaults:
+        description:
+            - Values used for the users in the file which do not set them, for example C(group) or C(user_type).
+            - Keys are the names of the options of M(sophos.sophos_firewall.sfos_user).
+        type: dict
+        default: {}
+    batch_size:
+        description:
+            - Maximum number of users sent in a single request.
+        type: int
+        default: 100
+    password_update:
+        description:
+            - C(on_create) only writes the password of new users, and of users with a password change requested in the file.
+            - C(changed) also writes the password when it differs from the one recorded in I(password_state).
+              Users without a recorded password have their password written once.
+            - C(always) writes the password of every user with a password in the file.
+        type: str
+        choices: ["on_create", "changed", "always"]
+        default: on_create
+    password_state:
+        description:
+            - Path to a file on the Ansible controller where a salted hash of each password written by this module is
+              recorded. The passwords stored on the firewall are encrypted, so they cannot be compared directly.
+            - Required when I(password_update=changed).
+        type: path
+        required: false
+
+author:
+    - Matt Mullen (@mamullen13316)
+"""
+
+EXAMPLES = r"""
+- name: Provision users from a CSV file
+  sophos.sophos_firewall.sfos_user_bulk:
+    src: files/users.csv
+    defaults:
+      user_type: User
+      group: Open Group
+
+- name: Provision users from an LDIF export, updating passwords that were changed in the directory
+  sophos.sophos_firewall.sfos_user_bulk:
+    src: files/users.ldif
+    defaults:
+      user_type: User
+      group: Open Group
+    password_update: changed
+    password_state: "{{ playbook_dir }}/state/user_passwords.json"
+"""
+
+RETURN = r"""
+api_response:
+    description: Number of users created, updated, unchanged and failed.
+    returned: always
+    type: dict
+created:
+    description: Users created.
+    returned: always
+    type: list
+    elements: str
+updated:
+    description: Users updated.
+    returned: always
+    type: list
+    elements: str
+passwords_updated:
+    description: Existing users whose password was written.
+    returned: always
+    type: list
+    elements: str
+failed_users:
+    description: Users which could not be created or updated, with the reason.
+    returned: when a user could not be created or updated
+    type: list
+    elements: dict
+"""
+
+try:
+    from sophosfirewall_python.firewallapi import (
+        SophosFirewall,
+        SophosFirewallZeroRecords,
+        SophosFirewallAuthFailure,
+        SophosFirewallAPIError,
+    )
+    from requests.exceptions import RequestException
+
+    PREREQ_MET = {"result": True}
+except ImportError as errMsg:
+    PREREQ_MET = {"result": False, "missing_module": errMsg.name}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import (
+    OUTCOMES,
+    ensure_list,
+    send_batch,
+)
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.secret_state import (
+    load_state,
+    save_state,
+    secret_hash,
+    secret_matches,
+)
+import base64
+import binascii
+import csv
+import os
+
+# Module options and the API element each one is sent as, in the order the elements
+# appear in the User entity.
+USER_FIELDS = [
+    ("user", "Username"),
+    ("name", "Name"),
+    ("description", "Description"),
+    ("user_password", "Password"),
+    ("user_type", "UserType"),
+    ("profile", "Profile"),
+    ("group", "Group"),
+    ("email", "EmailList"),
+    ("access_time_policy", "AccessTimePolicy"),
+    ("sslvpn_policy", "SSLVPNPolicy"),
+    ("clientless_policy", "ClientlessPolicy"),
+    ("l2tp", "L2TP"),
+    ("pptp", "PPTP"),
+    ("cisco", "CISCO"),
+    ("quarantine_digest", "QuarantineDigest"),
+    ("mac_binding", "MACBinding"),
+    ("login_restriction", "LoginRestriction"),
+    ("isencryptcert", "IsEncryptCert"),
+    ("simultaneous_logins", "SimultaneousLoginsGlobal"),
+    ("surfingquota_policy", "SurfingQuotaPolicy"),
+    ("applianceaccess_schedule", "ScheduleForApplianceAccess"),
+    ("appliance_login_restriction", "LoginRestrictionForAppliance"),
+]
+USER_OPTIONS = set(option for option, api_key in USER_FIELDS)
+
+# Values used for new users when neither the file nor the defaults option sets them,
+# the same as the defaults of the sfos_user module.
+CREATE_DEFAULTS = {
+    "access_time_policy": "Allowed all the time",
+    "sslvpn_policy": "No Policy Applied",
+    "clientless_policy": "No Policy Applied",
+    "l2tp": "Disable",
+    "pptp": "Disable",
+    "cisco": "Disable",
+    "quarantine_digest": "Disable",
+    "mac_binding": "Disable",
+    "login_restriction": "UserGroupNode",
+    "isencryptcert": "Disable",
+    "simultaneous_logins": "Disable",
+    "surfingquota_policy": "Unlimited Internet Access",
+    "applianceaccess_schedule": "All The Time",
+    "appliance_login_restriction": "AnyNode",
+}
+ADMIN_ONLY_OPTIONS = {"profile", "applianceaccess_schedule", "appliance_login_restriction"}
+CREATE_REQUIRED = ["user_password", "user_type", "group", "email"]
+
+LDIF_ATTRIBUTES = {
+    "uid": "user",
+    "cn": "name",
+    "displayname": "name",
+    "mail": "email",
+    "description": "description",
+    "userpassword": "user_password",
+}
+
+TRUE_VALUES = {"true", "yes", "y", "1", "on"}
+
+
+def read_csv(file_obj):
+    """Yield the rows of a CSV file as dictionaries, skipping empty cells.
+
+    Args:
+        file_obj (file): Open CSV file
+
+    Yields:
+        dict: Row values keyed by column name
+    """
+    for row in csv.DictReader(file_obj):
+        yield dict((key.strip(), val.strip()) for key, val in row.items() if key and val and val.strip())
+
+
+def decode_ldif_value(attribute, separator, value):
+    """Decode the value of an LDIF attribute, which is base64 encoded when separated by a double colon."""
+    if separator == "::":
+        try:
+            return base64.b64decode(value.strip()).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError) as error:
+            raise ValueError("Invalid base64 value for attribute {0}: {1}".format(attribute, error))
+    return value.strip()
+
+
+def read_ldif(file_obj):
+    """Yield the entries of an LDIF file as dictionaries of module options.
+
+    Only the first value of multi-valued attributes is used.
+
+    Args:
+        file_obj (file): Open LDIF file
+
+    Yields:
+        dict: Entry values keyed by module option
+    """
+    entry = {}
+    lines = []
+
+    def parse_attribute(line):
+        attribute, colon, value = line.partition(":")
+        separator = ":"
+        if value.startswith(":"):
+            separator, value = "::", value[1:]
+        elif value.startswith("<"):
+            # Values referenced by URL are not supported
+            return
+        attribute = attribute.strip().lower().split(";")[0]
+        option = LDIF_ATTRIBUTES.get(attribute, attribute)
+        if option in USER_OPTIONS or option == "update_password":
+            entry.setdefault(option, decode_ldif_value(attribute, separator, value))
+
+    for raw_line in file_obj:
+        line = raw_line.rstrip("\r\n")
+        if line.startswith(" ") and lines:
+            # Continuation of the previous line
+            lines[-1] += line[1:]
+            continue
+        if lines:
+            parse_attribute(lines.pop())
+        if not line.strip():
+            if entry:
+                yield entry
+            entry = {}
+        elif not line.startswith("#"):
+            lines.append(line)
+
+    if lines:
+        parse_attribute(lines.pop())
+    if entry:
+        yield entry
+
+
+def read_users(module):
+    """Open the source file and yield its records.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+
+    Yields:
+        dict: User values keyed by module option
+    """
+    src = module.params.get("src")
+    file_format = module.params.get("format")
+    if file_format == "auto":
+        file_format = "ldif" if src.lower().endswith(".ldif") else "csv"
+
+    reader = read_ldif if file_format == "ldif" else read_csv
+    with open(src, "r", newline="" if file_format == "csv" else None) as file_obj:
+        for record in reader(file_obj):
+            yield record
+
+
+def get_users(connection, module, result):
+    """Retrieve all existing users with a single request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: User entity keyed by username
+    """
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "User"}, trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json(msg="An unexpected error occurred: {0}".format(error), **result)
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="Unable to retrieve users: {0}".format(resp["response"]), **result)
+    if not resp["exists"]:
+        return {}
+
+    return dict((user["Username"], user) for user in ensure_list(resp["response"]["Response"].get("User"))
+                if isinstance(user, dict) and "Username" in user)
+
+
+def api_value(option, value):
+    """Convert the value of a module option to the value of its API element."""
+    if option == "email":
+        return {"EmailID": value}
+    return value
+
+
+def differs(option, value, existing):
+    """Check whether the value of an option differs from the existing user."""
+    api_key = dict(USER_FIELDS)[option]
+    if option == "email":
+        return value not in ensure_list((existing.get("EmailList") or {}).get("EmailID"))
+    return str(value) != str(existing.get(api_key) or "")
+
+
+def user_entity(params):
+    """Build a new User entity with the elements in the expected order.
+
+    Args:
+        params (dict): User values keyed by module option
+
+    Returns:
+        dict: User entity
+    """
+    values = dict(CREATE_DEFAULTS)
+    values.update(params)
+    entity = {}
+    for option, api_key in USER_FIELDS:
+        if option in ADMIN_ONLY_OPTIONS and values.get("user_type") != "Administrator":
+            continue
+        if option in values:
+            entity[api_key] = api_value(option, values[option])
+    return {"User": entity}
+
+
+def updated_entity(existing, params, write_password):
+    """Merge the changed values into an existing User entity.
+
+    The encrypted password returned by the firewall is sent back unchanged unless
+    the password is being written, in which case it is dropped so that the new password applies.
+
+    Args:
+        existing (dict): Existing User entity
+        params (dict): User values keyed by module option
+        write_password (bool): Send the password from the file
+
+    Returns:
+        dict: User entity
+    """
+    entity = dict(existing)
+    if write_password:
+        entity.pop("PasswordHash", None)
+    for option, api_key in USER_FIELDS:
+        if option == "user_password" and not write_password:
+            continue
+        if option in params:
+            entity[api_key] = api_value(option, params[option])
+    return {"User": entity}
+
+
+def needs_password(module, params, password_state):
+    """Decide whether the password of an existing user is written.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        params (dict): User values keyed by module option
+        password_state (dict): Recorded password hashes keyed by username
+
+    Returns:
+        bool: True if the password is written
+    """
+    if not params.get("user_password"):
+        return False
+    if str(params.get("update_password", "")).lower() in TRUE_VALUES:
+        return True
+    mode = module.params.get("password_update")
+    if mode == "always":
+        return True
+    if mode == "changed":
+        recorded = password_state.get(params["user"])
+        return recorded is None or not secret_matches(params["user_password"], recorded)
+    return False
+
+
+def provision_users(connection, module, result):
+    """Create and update the users in the source file.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
+    Returns:
+        dict: Names of the users created and updated keyed by XML tag, the users which failed,
+            and the passwords to record
+    """
+    existing_users = get_users(connection, module, result)
+    password_state = load_state(module, "password_state", "users")
+    defaults = module.params.get("defaults") or {}
+    batch_size = module.params.get("batch_size")
+
+    summary = {"passwords_updated": [], "unchanged": 0, "failed": []}
+    for outcome in OUTCOMES.values():
+        summary[outcome] = {"User": []}
+    pending = {"add": [], "update": []}
+    passwords = {}
+    seen = set()
+
+    try:
+        for record in read_users(module):
+            params = dict(defaults)
+            params.update(record)
+            username = params.get("user")
+            if not username:
+                summary["failed"].append({"name": None, "msg": "Record without a user: {0}".format(
+                    sorted(key for key in record if key != "user_password"))})
+                continue
+            if username in seen:
+                summary["failed"].append({"name": username, "msg": "Duplicate user in source file"})
+                continue
+            seen.add(username)
+
+            existing = existing_users.get(username)
+            if existing is None:
+                missing = [option for option in CREATE_REQUIRED if not params.get(option)]
+                if missing:
+                    summary["failed"].append({"name": username,
+                                              "msg": "Missing values for new user: {0}".format(", ".join(missing))})
+                    continue
+                params.setdefault("name", username)
+                pending["add"].append((username, user_entity(params)))
+                passwords[username] = params["user_password"]
+            else:
+                write_password = needs_password(module, params, password_state)
+                changed = [option for option in USER_OPTIONS - {"user", "user_password"}
+                           if option in params and differs(option, params[option], existing)]
+                if not changed and not write_password:
+                    summary["unchanged"] += 1
+                    continue
+                pending["update"].append((username, updated_entity(existing, params, write_password)))
+                if write_password:
+                    passwords[username] = params["user_password"]
+                    summary["passwords_updated"].append(username)
+
+            for operation, batch in pending.items():
+                if len(batch) >= batch_size:
+                    send_batch(connection, module, result, "User", operation, batch, summary)
+                    del batch[:]
+    except (IOError, OSError, ValueError, csv.Error) as error:
+        module.fail_json(msg="Unable to read {0}: {1}".format(module.params.get("src"), error), **result)
+
+    for operation, batch in pending.items():
+        if batch:
+            send_batch(connection, module, result, "User", operation, batch, summary)
+
+    applied = set(summary["created"]["User"] + summary["updated"]["User"])
+    summary["passwords_updated"] = [username for username in summary["passwords_updated"] if username in applied]
+    summary["passwords"] = dict((username, password) for username, password in passwords.items()
+                                if username in applied)
+    return summary
+
+
+def main():
+    """Code executed at run time."""
+    argument_spec = {
+        "src": {"type": "path", "required": True},
+        "format": {"type": "str", "choices": ["auto", "csv", "ldif"], "default": "auto"},
+        "defaults": {"type": "dict", "default": {}},
+        "batch_size": {"type": "int", "default": 100},
+        "password_update": {"type": "str", "choices": ["on_create", "changed", "always"], "default": "on_create"},
+        "password_state": {"type": "path", "required": False, "no_log": False},
+    }
+
+    required_if = [
+        ("password_update", "changed", ["password_state"]),
+    ]
+
+    module = AnsibleModule(argument_spec=argument_spec, required_if=required_if, supports_check_mode=True)
+
+    if not PREREQ_MET["result"]:
+        module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
+
+    result = {"changed": False, "check_mode": module.check_mode}
+
+    if module.params.get("batch_size") < 1:
+        module.fail_json(msg="batch_size must be at least 1", **result)
+
+    unknown = sorted(set(module.params.get("defaults") or {}) - USER_OPTIONS)
+    if unknown:
+        module.fail_json(msg="Invalid keys in defaults: {0}".format(", ".join(unknown)), **result)
+
+    if not os.path.isfile(module.params.get("src")):
+        module.fail_json(msg="Source file not found: {0}".format(module.params.get("src")), **result)
+
+    try:
+        connection = Connection(module._socket_path)
+    except AssertionError as e:
+        module.fail_json(msg="Connection error: Ensure you are targeting a remote host and not using 'delegate_to: localhost'.")
+
+    if not hasattr(connection, "httpapi"):
+        module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
+
+    summary = provision_users(connection, module, result)
+
+    if module.params.get("password_state") and summary["passwords"] and not module.check_mode:
+        password_state = load_state(module, "password_state", "users")
+        for username, password in summary["passwords"].items():
+            password_state[username] = secret_hash(password, os.urandom(16))
+        save_state(module, "password_state", "users", password_state)
+
+    created = summary["created"]["User"]
+    updated = summary["updated"]["User"]
+    result["created"] = created
+    result["updated"] = updated
+    result["passwords_updated"] = summary["passwords_updated"]
+    result["api_response"] = {
+        "created": len(created),
+        "updated": len(updated),
+        "unchanged": summary["unchanged"],
+        "failed": len(summary["failed"]),
+    }
+    result["changed"] = bool(created or updated)
+
+    if summary["failed"]:
+        result["failed_users"] = summary["failed"]
+        module.fail_json(msg="{0} user(s) could not be provisioned".format(len(summary["failed"])), **result)
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,18 +44,49 @@ options:
         type: str
         required: false
     domain_url:
-        description: 
+        description:
             - Domains or URLs included in the category.
             - For External configuration, URLs must start with 'http://' or 'ftp://' (https:// is not supported).
             - For Local configuration, domain names should be provided without protocol.
         type: list
         elements: str
         required: false
+    domain_url_file:
+        description:
+            - Path to a file on the Ansible controller containing domains or URLs, one per line.
+            - Blank lines and lines starting with C(#) are ignored. The entries are combined with I(domain_url).
+        type: path
+        required: false
+        version_added: "2.6.0"
     keyword:
         description: Keywords included in the category.
         type: list
         elements: str
         required: false
+    keyword_file:
+        description:
+            - Path to a file on the Ansible controller containing keywords, one per line.
+            - Blank lines and lines starting with C(#) are ignored. The entries are combined with I(keyword).
+        type: path
+        required: false
+        version_added: "2.6.0"
+    list_action:
+        description:
+            - Indicate whether adding to, removing from, or replacing the domain and keyword lists
+              when using C(state=updated). Default is add.
+        choices: ["add", "remove", "replace"]
+        type: str
+        required: false
+        default: add
+        version_added: "2.6.0"
+    max_entries:
+        description:
+            - Maximum number of domains, URLs or keywords allowed in the category.
+            - The limit accepted by the firewall depends on the firmware. When a resulting list is longer,
+              the module fails without changing the category.
+        type: int
+        required: false
+        version_added: "2.6.0"
     configurecategory:
         description: Content type configuration.
         type: str
@@ -64,6 +95,8 @@ options:
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(updated) to modify, or C(absent) to remove
+            - Updates are only sent when the settings differ from the existing category.
+              Domains, URLs and keywords are compared regardless of their order.
         choices: [present, updated, query, absent]
         type: str
         required: true
@@ -111,6 +144,15 @@ EXAMPLES = r"""
     description: "Updated description"
     state: updated
 
+- name: Replace the domains of a Web Category with a blocklist file
+  sophos.sophos_firewall.sfos_web_category:
+    name: "Blocklist"
+    classification: "Objectionable"
+    domain_url_file: files/blocklist.txt
+    list_action: replace
+    max_entries: 5000
+    state: updated
+
 - name: Remove Web Category
   sophos.sophos_firewall.sfos_web_category:
     name: "Custom Category"
@@ -124,11 +166,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAuthFailure,
@@ -144,6 +181,14 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
+
+# Order of the elements in a WebFilterCategory, as returned by the firewall
+CATEGORY_ELEMENTS = ("Name", "Classification", "QoSPolicy", "ConfigureCategory", "DomainList", "KeywordList",
+                     "URLList", "Description", "OverrideDefaultDeniedMessage", "DefaultDeniedMessage")
+
+EXTERNAL_PROTOCOLS = ("http://", "ftp://")
 
 
 def get_web_category(connection, module, result):
@@ -172,315 +217,336 @@ def get_web_category(connection, module, result):
 
     return {"exists": True, "api_response": resp["response"]}
 
-def create_web_category(connection, module, result):
-    """Create a Web Category on Sophos Firewall
+
+def read_entries(path):
+    """Read entries from a file, one per line, skipping blank lines and comments.
+
+    Args:
+        path (str): Path to the file
+
+    Yields:
+        str: Entries in the file
+    """
+    with open(path, encoding="utf-8") as entry_file:
+        for line in entry_file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def requested_entries(module, result, list_option, file_option):
+    """Combine the entries given in a list option and a file option.
 
     Args:
-        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        list_option (str): Name of the list option
+        file_option (str): Name of the file option
 
     Returns:
-        dict: API response
+        generator: Entries, or None if neither option is used
     """
-    payload = """
-        <WebFilterCategory>
-          <Name>{{ name }}</Name>
-          {% if classification %}
-          <Classification>{{ classification }}</Classification>
-          {% endif %}
-          <QoSPolicy>{{ qospolicy }}</QoSPolicy>
-          <ConfigureCategory>{{ configurecategory }}</ConfigureCategory>
-          {% if configurecategory == 'Local' %}
-          {% if domain_url %}
-          <DomainList>
-            {% for domain in domain_url %}
-            <Domain>{{ domain }}</Domain>
-            {% endfor %}
-          </DomainList>
-          {% endif %}
-          {% if keyword %}
-          <KeywordList>
-            {% for kw in keyword %}
-            <Keyword>{{ kw }}</Keyword>
-            {% endfor %}
-          </KeywordList>
-          {% endif %}
-          {% elif configurecategory == 'External' %}
-          {% if domain_url %}
-          <URLList>
-            {% for url in domain_url %}
-            <URL>{{ url }}</URL>
-            {% endfor %}
-          </URLList>
-          {% endif %}
-          {% endif %}
-          {% if description %}
-          <Description>{{ description }}</Description>
-          {% endif %}
-          {% if defaultdeniedmessage %}
-          <OverrideDefaultDeniedMessage>Enable</OverrideDefaultDeniedMessage>
-          <DefaultDeniedMessage>{{ defaultdeniedmessage }}</DefaultDeniedMessage>
-          {% else %}
-          <OverrideDefaultDeniedMessage>Disable</OverrideDefaultDeniedMessage>
-          <DefaultDeniedMessage>Default</DefaultDeniedMessage>
-          {% endif %}
-        </WebFilterCategory>
-    """
-    template_vars = {
-        "name": module.params.get("name"),
-        "classification": module.params.get("classification"),
-        "qospolicy": module.params.get("qospolicy"),
-        "configurecategory": module.params.get("configurecategory"),
-        "domain_url": module.params.get("domain_url"),
-        "keyword": module.params.get("keyword"),
-        "description": module.params.get("description"),
-        "defaultdeniedmessage": module.params.get("defaultdeniedmessage")
-    }
+    entries = module.params.get(list_option)
+    path = module.params.get(file_option)
+    if entries is None and path is None:
+        return None
 
-    try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "timeout": 90,
-                "debug": True
-                }
-            )
-    except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
-        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+    def combined():
+        for entry in entries or []:
+            yield entry
+        if path is not None:
+            try:
+                for entry in read_entries(path):
+                    yield entry
+            except (OSError, UnicodeDecodeError) as error:
+                module.fail_json(msg="Unable to read {0} {1}: {2}".format(file_option, path, error), **result)
 
-    if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+    return combined()
 
-    return resp["response"]
 
-def update_web_category(connection, exist_settings, module, result):
-    """Update Web Category configuration on Sophos Firewall
+def normalize_entries(module, result, entries, kind):
+    """Validate, normalize and de-duplicate entries in a single pass.
+
+    Whitespace is removed and Local domains are lowercased. For External configuration, URLs
+    must start with http:// or ftp://.
 
     Args:
-        connection (Connection): Ansible Connection object
-        exist_settings (dict): API response containing existing Web Category
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entries (iterable): Entries from requested_entries(), or None
+        kind (str): domain or keyword
 
     Returns:
-        dict: API response
+        list: Unique entries in the order given, or None if no entries were requested
     """
-    update_params = {}
-    existing_category = exist_settings["Response"]["WebFilterCategory"]
-    
-    update_params["Name"] = module.params.get("name")
+    if entries is None:
+        return None
+
+    external = kind == "domain" and module.params.get("configurecategory") == "External"
+    lowercase = kind == "domain" and not external
+    seen = set()
+    normalized = []
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        if lowercase:
+            entry = entry.lower()
+        if external and not entry.startswith(EXTERNAL_PROTOCOLS):
+            if entry.startswith("https://"):
+                module.fail_json(
+                    msg=f"URL '{entry}' uses https:// which is not supported. External URLs must use http:// or ftp:// protocol.",
+                    **result
+                )
+            module.fail_json(
+                msg=f"URL '{entry}' does not have a valid protocol. External URLs must use http:// or ftp:// protocol.",
+                **result
+            )
+        if entry not in seen:
+            seen.add(entry)
+            normalized.append(entry)
+    return normalized
 
-    if module.params.get("classification"):
-        update_params["Classification"] = module.params.get("classification")
 
-    if module.params.get("qospolicy"):
-        update_params["QoSPolicy"] = module.params.get("qospolicy")
+def list_keys(configurecategory):
+    """Return the list and entry element names holding the domains of a category.
 
-    if module.params.get("configurecategory"):
-        update_params["ConfigureCategory"] = module.params.get("configurecategory")
+    Args:
+        configurecategory (str): Content type configuration
 
-    if module.params.get("description"):
-        update_params["Description"] = module.params.get("description")
+    Returns:
+        tuple: List element and entry element
+    """
+    if configurecategory == "External":
+        return "URLList", "URL"
+    return "DomainList", "Domain"
 
-    if module.params.get("defaultdeniedmessage"):
-        update_params["OverrideDefaultDeniedMessage"] = "Enable"
-        update_params["DefaultDeniedMessage"] = module.params.get("defaultdeniedmessage")
-    else:
-        update_params["OverrideDefaultDeniedMessage"] = "Disable"
-        update_params["DefaultDeniedMessage"] = "Default"
-
-    # Handle domain/URL configuration based on category type
-    if module.params.get("configurecategory") == "Local":
-        if module.params.get("domain_url"):
-            # For Local configuration, domains go in DomainList
-            existing_domains = []
-            if "DomainList" in existing_category and existing_category["DomainList"]:
-                domain_list = existing_category["DomainList"]
-                if isinstance(domain_list, dict) and "Domain" in domain_list:
-                    if isinstance(domain_list["Domain"], list):
-                        existing_domains = domain_list["Domain"]
-                    else:
-                        existing_domains = [domain_list["Domain"]]
-            
-            # Merge existing and new domains
-            all_domains = list(set(existing_domains + module.params.get("domain_url")))
-            update_params["DomainList"] = []
-            for domain in all_domains:
-                update_params["DomainList"].append({"Domain": domain})
-        
-        if module.params.get("keyword"):
-            existing_keywords = []
-            if "KeywordList" in existing_category and existing_category["KeywordList"]:
-                keyword_list = existing_category["KeywordList"]
-                if isinstance(keyword_list, dict) and "Keyword" in keyword_list:
-                    if isinstance(keyword_list["Keyword"], list):
-                        existing_keywords = keyword_list["Keyword"]
-                    else:
-                        existing_keywords = [keyword_list["Keyword"]]
-            
-            # Merge existing and new keywords
-            all_keywords = list(set(existing_keywords + module.params.get("keyword")))
-            update_params["KeywordList"] = []
-            for kw in all_keywords:
-                update_params["KeywordList"].append({"Keyword": kw})
-    
-    elif module.params.get("configurecategory") == "External":
-        if module.params.get("domain_url"):
-            # For External configuration, URLs go in URLList
-            existing_urls = []
-            if "URLList" in existing_category and existing_category["URLList"]:
-                url_list = existing_category["URLList"]
-                if isinstance(url_list, dict) and "URL" in url_list:
-                    if isinstance(url_list["URL"], list):
-                        existing_urls = url_list["URL"]
-                    else:
-                        existing_urls = [url_list["URL"]]
-            
-            # Merge existing and new URLs
-            all_urls = list(set(existing_urls + module.params.get("domain_url")))
-            update_params["URLList"] = []
-            for url in all_urls:
-                update_params["URLList"].append({"URL": url})
 
-    try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={"xml_tag": "WebFilterCategory",
-                                 "update_params": update_params,
-                                 "name": module.params.get("name"),
-                                 "lookup_key": "Name",
-                                 "timeout": 90,
-                                 "debug": True})
-    except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
-        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+def existing_entries(category, list_key, entry_key, lowercase=False):
+    """Return the entries of a list element in an existing category.
 
-    if not resp["success"]:
-        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+    Args:
+        category (dict): Existing WebFilterCategory
+        list_key (str): List element, for example DomainList
+        entry_key (str): Entry element, for example Domain
+        lowercase (bool): Lowercase the entries
+
+    Returns:
+        list: Entries in the list
+    """
+    entries = ensure_list((category.get(list_key) or {}).get(entry_key))
+    if lowercase:
+        return [entry.lower() for entry in entries]
+    return list(entries)
 
-    return resp["response"]
 
-def eval_changed(module, exist_settings):
-    """Evaluate the provided arguments against existing settings.
+def apply_action(existing, requested, action):
+    """Apply an add, remove or replace action to a list of entries.
 
     Args:
-        module (AnsibleModule): AnsibleModule object
-        exist_settings (dict): Response from the call to get_web_category()
+        existing (list): Existing entries
+        requested (list): Entries given to the module, or None to keep the existing entries
+        action (str): add, remove or replace
 
     Returns:
-        bool: Return true if any settings are different, otherwise return false
+        list: Resulting entries
     """
-    exist_settings = exist_settings["api_response"]["Response"]["WebFilterCategory"]
+    if requested is None:
+        return list(existing)
+    if action == "replace":
+        return list(requested)
+    if action == "remove":
+        removed = set(requested)
+        return [entry for entry in existing if entry not in removed]
+    present = set(existing)
+    return list(existing) + [entry for entry in requested if entry not in present]
 
-    if (module.params.get("classification") and not module.params.get("classification") == exist_settings.get("Classification") or
-        module.params.get("qospolicy") and not module.params.get("qospolicy") == exist_settings.get("QoSPolicy") or
-        module.params.get("configurecategory") and not module.params.get("configurecategory") == exist_settings.get("ConfigureCategory") or
-        module.params.get("description") and not module.params.get("description") == exist_settings.get("Description")
-        ):
-        return True
 
-    # Check for changes in defaultdeniedmessage
+def desired_settings(module, exist_category):
+    """Work out the settings of the category, after applying the module arguments.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        exist_category (dict): Existing WebFilterCategory, or an empty dict when it is being created
+
+    Returns:
+        dict: Setting values keyed by element name
+    """
+    settings = {
+        "Classification": module.params.get("classification") or exist_category.get("Classification"),
+        "QoSPolicy": module.params.get("qospolicy"),
+        "ConfigureCategory": module.params.get("configurecategory"),
+        "Description": module.params.get("description") or exist_category.get("Description"),
+    }
     if module.params.get("defaultdeniedmessage"):
-        if (exist_settings.get("OverrideDefaultDeniedMessage") != "Enable" or
-            exist_settings.get("DefaultDeniedMessage") != module.params.get("defaultdeniedmessage")):
+        settings["OverrideDefaultDeniedMessage"] = "Enable"
+        settings["DefaultDeniedMessage"] = module.params.get("defaultdeniedmessage")
+    else:
+        settings["OverrideDefaultDeniedMessage"] = "Disable"
+        settings["DefaultDeniedMessage"] = exist_category.get("DefaultDeniedMessage") \
+            if exist_category.get("OverrideDefaultDeniedMessage") == "Disable" else "Default"
+    return settings
+
+
+def eval_changed(settings, lists, exist_category, list_map):
+    """Evaluate the desired settings and lists of a category against the existing category.
+
+    Args:
+        settings (dict): Settings returned by desired_settings()
+        lists (dict): Desired entries keyed by list name
+        exist_category (dict): Existing WebFilterCategory
+        list_map (dict): List element and entry element keyed by list name
+
+    Returns:
+        bool: Return true if any settings are different, otherwise return false
+    """
+    for key, value in settings.items():
+        if value is not None and value != exist_category.get(key):
             return True
-    elif exist_settings.get("OverrideDefaultDeniedMessage") == "Enable":
-        return True
-
-    # Check domain/URL lists based on configuration type
-    if module.params.get("configurecategory") == "Local" and module.params.get("domain_url"):
-        existing_domains = []
-        if "DomainList" in exist_settings and exist_settings["DomainList"]:
-            domain_list = exist_settings["DomainList"]
-            if isinstance(domain_list, dict) and "Domain" in domain_list:
-                if isinstance(domain_list["Domain"], list):
-                    existing_domains = domain_list["Domain"]
-                else:
-                    existing_domains = [domain_list["Domain"]]
-        
-        if set(module.params.get("domain_url")) != set(existing_domains):
+    for key, entries in lists.items():
+        list_key, entry_key = list_map[key]
+        if set(entries) != set(existing_entries(exist_category, list_key, entry_key, lowercase=key == "domain")):
             return True
+    return False
 
-    if module.params.get("configurecategory") == "Local" and module.params.get("keyword"):
-        existing_keywords = []
-        if "KeywordList" in exist_settings and exist_settings["KeywordList"]:
-            keyword_list = exist_settings["KeywordList"]
-            if isinstance(keyword_list, dict) and "Keyword" in keyword_list:
-                if isinstance(keyword_list["Keyword"], list):
-                    existing_keywords = keyword_list["Keyword"]
-                else:
-                    existing_keywords = [keyword_list["Keyword"]]
-        
-        if set(module.params.get("keyword")) != set(existing_keywords):
-            return True
 
-    if module.params.get("configurecategory") == "External" and module.params.get("domain_url"):
-        existing_urls = []
-        if "URLList" in exist_settings and exist_settings["URLList"]:
-            url_list = exist_settings["URLList"]
-            if isinstance(url_list, dict) and "URL" in url_list:
-                if isinstance(url_list["URL"], list):
-                    existing_urls = url_list["URL"]
-                else:
-                    existing_urls = [url_list["URL"]]
-        
-        if set(module.params.get("domain_url")) != set(existing_urls):
-            return True
+def category_entity(name, settings, lists, list_map, exist_category):
+    """Build a WebFilterCategory entity.
 
-    return False
+    Args:
+        name (str): Category name
+        settings (dict): Settings returned by desired_settings()
+        lists (dict): Entries keyed by list name
+        list_map (dict): List element and entry element keyed by list name
+        exist_category (dict): Existing WebFilterCategory, or None when it is being created
 
-def remove_web_category(connection, module, result):
-    """Remove a Web Category from Sophos Firewall.
+    Returns:
+        dict: WebFilterCategory entity
+    """
+    values = {"Name": name}
+    values.update({key: value for key, value in settings.items() if value is not None})
+    for key, entries in lists.items():
+        list_key, entry_key = list_map[key]
+        if entries:
+            values[list_key] = {entry_key: entries}
+        elif exist_category and exist_category.get(list_key):
+            values[list_key] = None
+
+    entity = {key: values[key] for key in CATEGORY_ELEMENTS if key in values}
+    for key, value in (exist_category or {}).items():
+        if key not in entity and key not in CATEGORY_ELEMENTS and not key.startswith("@"):
+            entity[key] = value
+    return {"WebFilterCategory": entity}
+
+
+def plan_category(module, result, exist_category):
+    """Work out whether the category needs to be added or updated.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+        exist_category (dict): Existing WebFilterCategory, or None when it does not exist
+
+    Returns:
+        dict: Entities to add and update
+    """
+    name = module.params.get("name")
+    configurecategory = module.params.get("configurecategory")
+    action = module.params.get("list_action") if module.params.get("state") == "updated" else "replace"
+
+    list_map = {"domain": list_keys(configurecategory)}
+    requested = {"domain": normalize_entries(module, result, requested_entries(module, result, "domain_url",
+                                                                                "domain_url_file"), "domain")}
+    if configurecategory == "Local":
+        list_map["keyword"] = ("KeywordList", "Keyword")
+        requested["keyword"] = normalize_entries(module, result, requested_entries(module, result, "keyword",
+                                                                                    "keyword_file"), "keyword")
+
+    max_entries = module.params.get("max_entries")
+    lists = {}
+    for key, (list_key, entry_key) in list_map.items():
+        current = existing_entries(exist_category or {}, list_key, entry_key, lowercase=key == "domain")
+        lists[key] = apply_action(current, requested[key], action)
+        if max_entries and len(lists[key]) > max_entries:
+            module.fail_json(msg="The {0} list of {1} would hold {2} entries, more than max_entries ({3})".format(
+                key, name, len(lists[key]), max_entries), **result)
+
+    settings = desired_settings(module, exist_category or {})
+    plan = {"add": [], "update": []}
+    if exist_category is None:
+        plan["add"].append(category_entity(name, settings, lists, list_map, None))
+    elif eval_changed(settings, lists, exist_category, list_map):
+        plan["update"].append(category_entity(name, settings, lists, list_map, exist_category))
+    return plan
+
+
+def submit_categories(connection, module, result, entities, set_operation):
+    """Send one or more Web Categories to Sophos Firewall in a single request.
 
     Args:
         connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
+        entities (list): WebFilterCategory entities
+        set_operation (str): add or update
 
     Returns:
         dict: API response
     """
     try:
-        resp = connection.invoke_sdk("remove", module_args={"xml_tag": "WebFilterCategory", "name": module.params.get("name")})
+        resp = connection.submit_entities(entities, set_operation=set_operation, timeout=90,
+                                          trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
     return resp["response"]
 
-def validate_domain_urls(module, result):
-    """Validate domain URLs for External configuration.
-    
-    For External configuration, URLs must contain http:// or ftp:// prefix and should not use https://.
-    
+
+def apply_plan(connection, module, result, plan):
+    """Send the changes worked out by plan_category() to Sophos Firewall.
+
     Args:
+        connection (Connection): Ansible Connection object
         module (AnsibleModule): AnsibleModule object
         result (dict): Result output to be sent to the console
-        
+        plan (dict): Plan returned by plan_category()
+    """
+    for set_operation in ("update", "add"):
+        if plan[set_operation]:
+            api_response = submit_categories(connection, module, result, plan[set_operation], set_operation)
+            result["api_response"] = api_response
+            for status in ensure_list(api_response["Response"].get("WebFilterCategory")):
+                text = status.get("Status", {}).get("#text", "")
+                if "Configuration applied successfully" in text or "Unable to get status message" in text:
+                    result["changed"] = True
+
+
+def remove_web_category(connection, module, result):
+    """Remove a Web Category from Sophos Firewall.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+
     Returns:
-        bool: True if validation passes, False otherwise
+        dict: API response
     """
-    if (module.params.get("configurecategory") == "External" and 
-        module.params.get("domain_url")):
-        
-        allowed_protocols = ["http://", "ftp://"]
-        
-        for url in module.params.get("domain_url"):
-            if not any(url.startswith(protocol) for protocol in allowed_protocols):
-                if url.startswith("https://"):
-                    module.fail_json(
-                        msg=f"URL '{url}' uses https:// which is not supported. External URLs must use http:// or ftp:// protocol.",
-                        **result
-                    )
-                else:
-                    module.fail_json(
-                        msg=f"URL '{url}' does not have a valid protocol. External URLs must use http:// or ftp:// protocol.",
-                        **result
-                    )
-    
-    return True
+    try:
+        resp = connection.invoke_sdk("remove", module_args={"xml_tag": "WebFilterCategory", "name": module.params.get("name")})
+    except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
+
+    return resp["response"]
+
 
 def main():
     """Code executed at run time."""
@@ -491,7 +557,11 @@ def main():
         "description": {"type": "str", "required": False},
         "defaultdeniedmessage": {"type": "str", "required": False},
         "domain_url": {"type": "list", "elements": "str", "required": False},
+        "domain_url_file": {"type": "path", "required": False},
         "keyword": {"type": "list", "elements": "str", "required": False},
+        "keyword_file": {"type": "path", "required": False},
+        "list_action": {"type": "str", "choices": ["add", "remove", "replace"], "required": False, "default": "add"},
+        "max_entries": {"type": "int", "required": False},
         "configurecategory": {"type": "str", "choices": ["0", "Local", "External"], "required": False, "default": "Local"},
         "state": {"type": "str", "required": True, "choices": ["present", "updated", "query", "absent"]},
     }
@@ -533,10 +603,9 @@ def main():
         module.fail_json(msg=missing_required_lib(PREREQ_MET["missing_module"]))
 
     result = {"changed": False, "check_mode": False}
-    
-    # Validate domain_url entries for External configuration
-    if module.params.get("state") in ["present", "updated"]:
-        validate_domain_urls(module, result)
+
+    if module.params.get("max_entries") is not None and module.params.get("max_entries") < 1:
+        module.fail_json(msg="max_entries must be at least 1", **result)
 
     state = module.params.get("state")
 
@@ -554,18 +623,25 @@ def main():
     if state == "query":
         module.exit_json(**result)
 
+    if state == "updated" and not exist_settings["exists"]:
+        module.fail_json(exist_settings["api_response"], **result)
+
+    plan = None
+    if (state == "present" and not exist_settings["exists"]) or state == "updated":
+        exist_category = exist_settings["api_response"]["Response"]["WebFilterCategory"] \
+            if exist_settings["exists"] else None
+        plan = plan_category(module, result, exist_category)
+
     if module.check_mode:
         result["check_mode"] = True
+        if plan:
+            result["changed"] = bool(plan["add"] or plan["update"])
+        elif state == "absent":
+            result["changed"] = exist_settings["exists"]
         module.exit_json(**result)
 
-    if state == "present" and not exist_settings["exists"]:
-        api_response = create_web_category(connection, module, result)
-
-        if (
-            "Configuration applied successfully" in api_response["Response"]["WebFilterCategory"]["Status"]["#text"]
-        ) or ("Unable to get status message" in api_response["Response"]["WebFilterCategory"]["Status"]["#text"]):
-            result["changed"] = True
-            result["api_response"] = api_response
+    if plan:
+        apply_plan(connection, module, result, plan)
 
     elif state == "present" and exist_settings["exists"]:
         result["changed"] = False
@@ -581,21 +657,6 @@ def main():
     elif state == "absent" and not exist_settings["exists"]:
         result["changed"] = False
 
-    elif state == "updated" and exist_settings["exists"]:
-        if eval_changed(module, exist_settings):
-            api_response = update_web_category(connection, exist_settings["api_response"], module, result)
-
-            if api_response:
-                result["api_response"] = api_response
-                if (
-                    "Configuration applied successfully" in api_response["Response"]["WebFilterCategory"]["Status"]["#text"]
-                ):
-                    result["changed"] = True
-    
-    elif state == "updated" and not exist_settings["exists"]:
-        result["changed"] = False
-        module.fail_json(exist_settings["api_response"], **result)
-
     module.exit_json(**result)
 
 
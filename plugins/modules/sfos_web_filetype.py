@@ -107,11 +107,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAuthFailure,
@@ -127,6 +122,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_web_filetype(connection, module, result):
@@ -198,16 +194,15 @@ def create_web_filetype(connection, module, result):
     }
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("submit_xml", module_args={
-                "template_data": payload,
-                "template_vars": template_vars,
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("submit_xml", module_args={
+            "template_data": payload,
+            "template_vars": template_vars}, trace=module._verbosity >= 3
+        )
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -268,15 +263,15 @@ def update_web_filetype(connection, exist_settings, module, result):
             update_params["MIMEHeaderList"].append({"MIMEHeader": mime})
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={"xml_tag": "FileType",
-                                 "update_params": update_params,
-                                 "name": module.params.get("name"),
-                                 "lookup_key": "Name",
-                                 "debug": True})
+        resp = connection.invoke_sdk("update", module_args={"xml_tag": "FileType",
+                             "update_params": update_params,
+                             "name": module.params.get("name"),
+                             "lookup_key": "Name"}, trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -399,6 +394,7 @@ def validate_description(module, result):
     
     return True
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
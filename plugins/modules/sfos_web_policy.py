@@ -300,11 +300,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAuthFailure,
@@ -320,6 +315,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list
 
 
 def bool_to_str(value):
@@ -339,6 +336,112 @@ def bool_to_str(value):
         return None
 
 
+def api_value(value):
+    """Convert a module parameter to the string representation returned by the API.
+
+    Args:
+        value (bool, int, str or None): Parameter value
+
+    Returns:
+        str or None: Value as returned by the API
+    """
+    if isinstance(value, bool):
+        return bool_to_str(value)
+    if isinstance(value, int):
+        return str(value)
+    return value
+
+
+# Category applied by the firewall to a rule saved without categories
+DEFAULT_CATEGORY = ("WebCategory", "All web traffic")
+
+
+def canonical_rule(rule):
+    """Convert a rule from the rules argument into a comparable tuple.
+
+    Categories and users are sorted since their order has no effect on the rule.
+
+    Args:
+        rule (dict): Rule from the module parameters
+
+    Returns:
+        tuple: Canonical representation of the rule
+    """
+    categories = tuple(sorted((category["type"], category["id"]) for category in rule.get("categories") or []))
+    return (
+        categories or (DEFAULT_CATEGORY,),
+        rule.get("http_action"),
+        rule.get("https_action"),
+        bool_to_str(rule.get("follow_http_action")),
+        rule.get("schedule"),
+        bool_to_str(rule.get("policy_rule_enabled")),
+        bool_to_str(rule.get("ccl_rule_enabled")),
+        tuple(sorted(rule.get("user_list") or [])),
+    )
+
+
+def canonical_existing_rule(rule):
+    """Convert a rule from the RuleList of an existing policy into a comparable tuple.
+
+    Args:
+        rule (dict): Rule from the API response
+
+    Returns:
+        tuple: Canonical representation of the rule, in the same format as canonical_rule()
+    """
+    category_list = rule.get("CategoryList") or {}
+    categories = tuple(sorted(
+        (category.get("type"), category.get("ID")) for category in ensure_list(category_list.get("Category"))
+    ))
+    user_list = rule.get("UserList") or {}
+    return (
+        categories or (DEFAULT_CATEGORY,),
+        rule.get("HTTPAction"),
+        rule.get("HTTPSAction"),
+        rule.get("FollowHTTPAction"),
+        rule.get("Schedule"),
+        rule.get("PolicyRuleEnabled"),
+        rule.get("CCLRuleEnabled"),
+        tuple(sorted(ensure_list(user_list.get("User")))),
+    )
+
+
+def eval_rules(module, exist_policy):
+    """Determine which rules need to be sent to the firewall.
+
+    With rule_action C(replace), the rule order matters and the complete list is returned if it
+    differs from the existing RuleList. With C(add), only the rules not already in the policy are returned.
+
+    Args:
+        module (AnsibleModule): AnsibleModule object
+        exist_policy (dict): Existing WebFilterPolicy from the API response
+
+    Returns:
+        list: Rules to send, or an empty list if the rules already match
+    """
+    rules = module.params.get("rules")
+    if rules is None:
+        return []
+
+    rule_list = exist_policy.get("RuleList") or {}
+    existing = [canonical_existing_rule(rule) for rule in ensure_list(rule_list.get("Rule"))]
+
+    if module.params.get("rule_action") == "replace":
+        if [canonical_rule(rule) for rule in rules] == existing:
+            return []
+        return rules
+
+    missing = []
+    for rule in rules:
+        key = canonical_rule(rule)
+        if key in existing:
+            # Each existing rule can only satisfy one requested rule
+            existing.remove(key)
+        else:
+            missing.append(rule)
+    return missing
+
+
 def get_web_policy(connection, module, result):
     """Get Web Filter Policy from Sophos Firewall
 
@@ -440,11 +543,12 @@ def create_web_policy(connection, module, result):
         create_args["rules"] = processed_rules
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("create_webfilterpolicy", module_args=create_args)
+        resp = connection.invoke_sdk("create_webfilterpolicy", module_args=create_args, trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -525,10 +629,13 @@ def update_web_policy(connection, exist_settings, module, result):
     if module.params.get("description") is not None:
         update_args["description"] = module.params.get("description")
     
-    if module.params.get("rules") is not None:
+    # Only rules which differ from the policy are sent. With rule_action 'add' these are appended
+    # to the existing rules, with 'replace' the complete list is sent when anything in it changed.
+    changed_rules = eval_rules(module, existing_policy)
+    if changed_rules:
         # Convert boolean values in rules to string format
         processed_rules = []
-        for rule in module.params.get("rules"):
+        for rule in changed_rules:
             processed_rule = rule.copy()
             if "follow_http_action" in processed_rule:
                 processed_rule["follow_http_action"] = bool_to_str(processed_rule["follow_http_action"])
@@ -544,11 +651,12 @@ def update_web_policy(connection, exist_settings, module, result):
             update_args["rule_action"] = module.params.get("rule_action")
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update_webfilterpolicy", module_args=update_args)
+        resp = connection.invoke_sdk("update_webfilterpolicy", module_args=update_args, trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -567,11 +675,13 @@ def remove_web_policy(connection, module, result):
         dict: API response
     """
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("remove", module_args={"xml_tag": "WebFilterPolicy", "name": module.params.get("name")})
+        resp = connection.invoke_sdk("remove", module_args={"xml_tag": "WebFilterPolicy", "name": module.params.get("name")},
+                                     trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -595,7 +705,7 @@ def eval_changed(module, exist_settings):
         return True
     
     if (module.params.get("download_file_size_restriction") is not None and 
-        module.params.get("download_file_size_restriction") != exist_policy.get("DownloadFileSizeRestriction")):
+        api_value(module.params.get("download_file_size_restriction")) != exist_policy.get("DownloadFileSizeRestriction")):
         return True
     
     if (module.params.get("enable_reporting") and 
@@ -607,7 +717,7 @@ def eval_changed(module, exist_settings):
         return True
     
     if (module.params.get("quota_limit") is not None and 
-        module.params.get("quota_limit") != exist_policy.get("QuotaLimit")):
+        api_value(module.params.get("quota_limit")) != exist_policy.get("QuotaLimit")):
         return True
 
     # Check other optional parameters
@@ -619,7 +729,7 @@ def eval_changed(module, exist_settings):
         ("youtube_filter_enabled", "YoutubeFilterEnabled"),
         ("enforce_safe_search", "EnforceSafeSearch"),
         ("enforce_image_licensing", "EnforceImageLicensing"),
-        ("xff_enabled", "XffEnabled"),
+        ("xff_enabled", "XFFEnabled"),
         ("office_365_tenants_list", "Office365TenantsList"),
         ("office_365_directory_id", "Office365DirectoryId"),
         ("office_365_enabled", "Office365Enabled")
@@ -627,15 +737,11 @@ def eval_changed(module, exist_settings):
     
     for param_name, api_key in optional_params:
         if (module.params.get(param_name) is not None and 
-            module.params.get(param_name) != exist_policy.get(api_key)):
+            api_value(module.params.get(param_name)) != exist_policy.get(api_key)):
             return True
     
-    # Check rules if provided
-    if module.params.get("rules") is not None:
-        # Always consider rules changed if they are provided since rule_action
-        # determines whether to 'add' or 'replace' rules
-        # In a more sophisticated implementation, you could compare the actual rule structures
-        # and consider the rule_action parameter
+    # Check rules if provided, taking rule_action and the rule order into account
+    if eval_rules(module, exist_policy):
         return True
 
     return False
@@ -117,11 +117,6 @@ api_response:
     returned: always
 
 """
-import io
-import contextlib
-
-output_buffer = io.StringIO()
-
 try:
     from sophosfirewall_python.firewallapi import (
         SophosFirewallAuthFailure,
@@ -137,6 +132,7 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
 
 
 def get_web_useractivity(connection, module, result):
@@ -178,17 +174,16 @@ def create_web_useractivity(connection, module, result):
         dict: API response
     """
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("create_useractivity", module_args={
-                "name": module.params.get("name"),
-                "description": module.params.get("description"),
-                "category_list": module.params.get("category_list"),
-                "debug": True
-                }
-            )
+        resp = connection.invoke_sdk("create_useractivity", module_args={
+            "name": module.params.get("name"),
+            "description": module.params.get("description"),
+            "category_list": module.params.get("category_list")}, trace=module._verbosity >= 3
+        )
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -256,15 +251,15 @@ def update_web_useractivity(connection, exist_settings, module, result):
             )
 
     try:
-        with contextlib.redirect_stdout(output_buffer):
-            resp = connection.invoke_sdk("update", module_args={"xml_tag": "UserActivity",
-                                 "update_params": update_params,
-                                 "name": module.params.get("name"),
-                                 "lookup_key": "Name",
-                                 "debug": True})
+        resp = connection.invoke_sdk("update", module_args={"xml_tag": "UserActivity",
+                             "update_params": update_params,
+                             "name": module.params.get("name"),
+                             "lookup_key": "Name"}, trace=module._verbosity >= 3)
     except (SophosFirewallAuthFailure, SophosFirewallAPIError, RequestException) as error:
         module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
+    record_trace(result, resp)
+
     if not resp["success"]:
         module.fail_json(msg="An error occurred: {0}".format(resp["response"]))
 
@@ -384,6 +379,7 @@ def validate_category_list(module, result):
     
     return True
 
+
 def main():
     """Code executed at run time."""
     argument_spec = {
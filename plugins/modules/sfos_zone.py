@@ -22,8 +22,10 @@ extends_documentation_fragment:
 
 options:
     name:
-        description: Name of the zone to create, update, or delete
-        required: true
+        description:
+          - Name of the zone to create, update, or delete
+          - One of I(name) or I(zones) is required.
+        required: false
         type: str
     zone_type:
         description: Type of zone to create (LAN/DMZ)
@@ -148,6 +150,146 @@ options:
         choices: ["Enable", "Disable"]
         type: str
         required: false
+    zones:
+        description:
+            - Manage several zones with a single task, instead of the zone given by I(name).
+            - All zones are retrieved with one request, and the zones to create, update or remove are sent
+              in one request. Only the zones whose description or access settings differ are sent.
+            - With I(state=present), missing zones are created and existing zones are updated.
+              With I(state=updated), every zone must already exist. With I(state=absent), the listed zones are removed.
+            - I(state=query) is not supported with I(zones).
+        type: list
+        elements: dict
+        required: false
+        version_added: "2.6.0"
+        suboptions:
+            name:
+                description: Name of the zone.
+                type: str
+                required: true
+            zone_type:
+                description: Type of zone to create (LAN/DMZ)
+                choices: ["LAN", "DMZ"]
+                type: str
+                required: false
+            description:
+                description: Description for the zone
+                type: str
+                required: false
+            https:
+                description:
+                    - Enable/Disable HTTPS administrative service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            ssh:
+                description:
+                    - Enable/Disable SSH administrative service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            client_authen:
+                description:
+                    - Enable/Disable client authentication service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            captive_portal:
+                description:
+                    - Enable/Disable captive portal
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            ad_sso:
+                description:
+                    - Enable/Disable SSO with Active Directory
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            radius_sso:
+                description:
+                    - Enable/Disable SSO with Radius
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            chromebook_sso:
+                description:
+                    - Enable/Disable Chromebook SSO
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            dns:
+                description:
+                    - Enable/Disable DNS network service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            ping:
+                description:
+                    - Enable/Disable Ping network service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            ipsec:
+                description:
+                    - Enable/Disable IPSec VPN service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            red:
+                description:
+                    - Enable/Disable RED service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            sslvpn:
+                description:
+                    - Enable/Disable SSLVPN service
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            vpn_portal:
+                description:
+                    - Enable/Disable VPN Portal
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            web_proxy:
+                description:
+                    - Enable/Disable Web Proxy
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            wireless_protection:
+                description:
+                    - Enable/Disable Wireless Protection
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            user_portal:
+                description:
+                    - Enable/Disable user portal
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            dynamic_routing:
+                description:
+                    - Enable/Disable Dynamic Routing
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            smtp_relay:
+                description:
+                    - Enable/Disable SMTP Relay
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
+            snmp:
+                description:
+                    - Enable/Disable SNMP
+                choices: ["Enable", "Disable"]
+                type: str
+                required: false
     state:
         description:
             - Use C(query) to retrieve, C(present) to create, C(absent) to remove, or C(updated) to modify
@@ -184,6 +326,18 @@ EXAMPLES = r"""
     name: TESTZONE
     state: absent
   delegate_to: localhost
+
+- name: Update Access Settings of Several Zones
+  sophos.sophos_firewall.sfos_zone:
+    zones:
+      - name: LAN
+        https: Enable
+        ssh: Enable
+        ping: Enable
+      - name: DMZ
+        ssh: Disable
+        ping: Enable
+    state: updated
 """
 
 RETURN = r"""
@@ -191,7 +345,21 @@ api_response:
     description: Serialized object containing the API response.
     type: dict
     returned: always
-
+created:
+    description: Names of the zones created.
+    type: list
+    elements: str
+    returned: when I(zones) is specified
+updated:
+    description: Names of the zones updated.
+    type: list
+    elements: str
+    returned: when I(zones) is specified
+removed:
+    description: Names of the zones removed.
+    type: list
+    elements: str
+    returned: when I(zones) is specified
 """
 
 try:
@@ -211,6 +379,8 @@ except ImportError as errMsg:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.connection import Connection
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.sfos import record_trace
+from ansible_collections.sophos.sophos_firewall.plugins.module_utils.bulk import ensure_list, failed_objects
 
 
 def get_zone(connection, module, result):
@@ -355,143 +525,213 @@ def update_zone(connection, module, result):
 
     return resp["response"]
 
+# Service arguments, and the ApplianceAccess group and XML key holding each service
+ZONE_SERVICES = (
+    ("https", "AdminServices", "HTTPS"),
+    ("ssh", "AdminServices", "SSH"),
+    ("client_authen", "AuthenticationServices", "ClientAuthentication"),
+    ("captive_portal", "AuthenticationServices", "CaptivePortal"),
+    ("ad_sso", "AuthenticationServices", "ADSSO"),
+    ("radius_sso", "AuthenticationServices", "RadiusSSO"),
+    ("chromebook_sso", "AuthenticationServices", "ChromebookSSO"),
+    ("dns", "NetworkServices", "DNS"),
+    ("ping", "NetworkServices", "Ping"),
+    ("ipsec", "VPNServices", "IPsec"),
+    ("red", "VPNServices", "RED"),
+    ("sslvpn", "VPNServices", "SSLVPN"),
+    ("vpn_portal", "VPNServices", "VPNPortal"),
+    ("web_proxy", "OtherServices", "WebProxy"),
+    ("wireless_protection", "OtherServices", "WirelessProtection"),
+    ("user_portal", "OtherServices", "UserPortal"),
+    ("dynamic_routing", "OtherServices", "DynamicRouting"),
+    ("smtp_relay", "OtherServices", "SMTPRelay"),
+    ("snmp", "OtherServices", "SNMP"),
+)
+
+ZONE_GROUPS = ("AdminServices", "AuthenticationServices", "NetworkServices", "VPNServices", "OtherServices")
+
+
+def service_index(exist_zone):
+    """Index the access settings of a zone by group and service.
+
+    Args:
+        exist_zone (dict): Zone returned by the firewall
+
+    Returns:
+        dict: Setting of each service, keyed by (group, key). Services the firewall omits are disabled.
+    """
+    index = {}
+    appliance_access = exist_zone.get("ApplianceAccess")
+    if not isinstance(appliance_access, dict):
+        return index
+    for group, services in appliance_access.items():
+        if isinstance(services, dict):
+            for key, value in services.items():
+                if value:
+                    index[(group, key)] = value
+    return index
+
+
+def zone_changed(params, exist_zone, index=None):
+    """Evaluate the provided arguments against an existing zone.
+
+    Args:
+        params (dict): Module arguments, or one item of the zones argument
+        exist_zone (dict): Zone returned by the firewall
+        index (dict): Access settings of the zone from service_index(), built from exist_zone when omitted
+
+    Returns:
+        bool: Return true if any settings are different, otherwise return false
+    """
+    description = params.get("description")
+    if description and not exist_zone.get("Description") == description:
+        return True
+
+    if index is None:
+        index = service_index(exist_zone)
+    for option, group, key in ZONE_SERVICES:
+        value = params.get(option)
+        if value is not None and index.get((group, key), "Disable") != value:
+            return True
+    return False
+
+
 def eval_changed(module, exist_settings):
     """Evaluate the provided arguments against existing settings.
 
     Args:
         module (AnsibleModule): AnsibleModule object
-        exist_settings (dict): Response from the call to get_admin_settings()
+        exist_settings (dict): Response from the call to get_zone()
 
     Returns:
         bool: Return true if any settings are different, otherwise return false
     """
-    exist_settings = exist_settings["Response"]["Zone"]
+    return zone_changed(module.params, exist_settings["Response"]["Zone"])
 
-    description = module.params.get("description")
-    if description and not exist_settings["Description"] == description:
-        return True
 
-    settings = [
-        {"key": "HTTPS", "value": module.params.get("https"), "group": "AdminServices"},
-        {"key": "SSH", "value": module.params.get("ssh"), "group": "AdminServices"},
-        {
-            "key": "ClientAuthentication",
-            "value": module.params.get("client_authen"),
-            "group": "AuthenticationServices",
-        },
-        {
-            "key": "CaptivePortal",
-            "value": module.params.get("captive_portal"),
-            "group": "AuthenticationServices",
-        },
-        {
-            "key": "ADSSO",
-            "value": module.params.get("ad_sso"),
-            "group": "AuthenticationServices",
-        },
-        {
-            "key": "RadiusSSO",
-            "value": module.params.get("radius_sso"),
-            "group": "AuthenticationServices",
-        },
-        {
-            "key": "ChromebookSSO",
-            "value": module.params.get("chromebook_sso"),
-            "group": "AuthenticationServices",
-        },
-        {"key": "DNS", "value": module.params.get("dns"), "group": "NetworkServices"},
-        {"key": "Ping", "value": module.params.get("ping"), "group": "NetworkServices"},
-        {"key": "IPsec", "value": module.params.get("ipsec"), "group": "VPNServices"},
-        {"key": "RED", "value": module.params.get("red"), "group": "VPNServices"},
-        {"key": "SSLVPN", "value": module.params.get("sslvpn"), "group": "VPNServices"},
-        {
-            "key": "VPNPortal",
-            "value": module.params.get("vpn_portal"),
-            "group": "VPNServices",
-        },
-        {
-            "key": "WebProxy",
-            "value": module.params.get("web_proxy"),
-            "group": "OtherServices",
-        },
-        {
-            "key": "WirelessProtection",
-            "value": module.params.get("wireless_protection"),
-            "group": "OtherServices",
-        },
-        {
-            "key": "UserPortal",
-            "value": module.params.get("user_portal"),
-            "group": "OtherServices",
-        },
-        {
-            "key": "DynamicRouting",
-            "value": module.params.get("dynamic_routing"),
-            "group": "OtherServices",
-        },
-        {
-            "key": "SMTPRelay",
-            "value": module.params.get("smtp_relay"),
-            "group": "OtherServices",
-        },
-        {"key": "SNMP", "value": module.params.get("snmp"), "group": "OtherServices"},
-    ]
-    result_list = []
-    for params in settings:
-        result = eval_settings(exist_settings, **params)
-        if result:
-            result_list.append(True)
+def zone_entity(params, exist_zone=None, index=None):
+    """Build a Zone entity from the module arguments, keeping the existing settings of omitted arguments.
 
-    if True in result_list:
-        return True
+    Args:
+        params (dict): One item of the zones argument
+        exist_zone (dict): Zone returned by the firewall, or None when creating the zone
+        index (dict): Access settings of the existing zone from service_index()
 
-    return False
+    Returns:
+        dict: Entity in the format accepted by submit_entities()
+    """
+    exist_zone = exist_zone or {}
+    index = index or {}
+    appliance_access = dict((group, {}) for group in ZONE_GROUPS)
+    for option, group, key in ZONE_SERVICES:
+        value = params.get(option) or index.get((group, key))
+        if value:
+            appliance_access[group][key] = value
+
+    return {"Zone": {
+        "Name": params["name"],
+        "Type": exist_zone.get("Type") or params.get("zone_type"),
+        "Description": params.get("description") or exist_zone.get("Description"),
+        "ApplianceAccess": dict((group, services or None) for group, services in appliance_access.items()),
+    }}
 
 
-def eval_settings(exist_settings, key, value, group):
-    """Evaluates current settings vs. the configured argument
+def get_all_zones(connection, module, result):
+    """Get all zones from Sophos Firewall with a single request.
 
     Args:
-        exist_settings (dict): The API response from the get_zone() method
-        key (str): The XML key that contains the value in the current settings
-        value (str): The value of the argument passed into Ansible in the task
-        group (str): The XML container for the key (AdminServices, NetworkServices, etc.)
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
 
     Returns:
-        bool: Returns True if the current setting differs from the value in the Ansible task
+        dict: Existing zones keyed by name
     """
-    if value == "Enable":
-        if exist_settings.get("ApplianceAccess", {}):
-            if exist_settings["ApplianceAccess"].get(group, {}):
-                if exist_settings["ApplianceAccess"][group].get(key, {}):
-                    if not exist_settings["ApplianceAccess"][group][key] == value:
-                        return True
-                else:
-                    return True
-            else:
-                return True
-        else:
-            return True
+    try:
+        resp = connection.invoke_sdk("get_tag", module_args={"xml_tag": "Zone"},
+                                     trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
 
-    if value == "Disable":
-        if exist_settings.get("ApplianceAccess", {}):
-            if exist_settings["ApplianceAccess"].get(group, {}):
-                if exist_settings["ApplianceAccess"][group].get(key, {}):
-                    if not exist_settings["ApplianceAccess"][group][key] == value:
-                        return True
-                else:
-                    return False
-            else:
-                return False
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    if not resp["exists"]:
+        return {}
+
+    return dict((zone["Name"], zone) for zone in ensure_list(resp["response"]["Response"].get("Zone"))
+                if isinstance(zone, dict) and "Name" in zone)
+
+
+def manage_zones(connection, module, result):
+    """Create, update and remove the zones given in the zones argument with one request.
+
+    Args:
+        connection (Connection): Ansible Connection object
+        module (AnsibleModule): AnsibleModule object
+        result (dict): Result output to be sent to the console
+    """
+    state = module.params.get("state")
+    exist_zones = get_all_zones(connection, module, result)
+
+    declared = set()
+    adds, updates, removes = [], [], []
+    for params in module.params.get("zones"):
+        name = params["name"]
+        if name in declared:
+            module.fail_json(msg="Zone {0} is listed more than once".format(name), **result)
+        declared.add(name)
+        exist_zone = exist_zones.get(name)
+
+        if state == "absent":
+            if exist_zone is not None:
+                removes.append(name)
+        elif exist_zone is None and state == "updated":
+            module.fail_json(msg="Attempting to update non-existing resource: {0}".format(name), **result)
+        elif exist_zone is None:
+            if not params.get("zone_type"):
+                module.fail_json(msg="zone_type is required to create zone {0}".format(name), **result)
+            adds.append(zone_entity(params))
         else:
-            return False
-    return False
+            index = service_index(exist_zone)
+            if zone_changed(params, exist_zone, index):
+                updates.append(zone_entity(params, exist_zone, index))
+
+    result["created"] = [entity["Zone"]["Name"] for entity in adds]
+    result["updated"] = [entity["Zone"]["Name"] for entity in updates]
+    result["removed"] = removes
+    result["changed"] = bool(adds or updates or removes)
+
+    if module.check_mode:
+        result["check_mode"] = True
+        return
+
+    if not result["changed"]:
+        return
+
+    try:
+        resp = connection.submit_changes("Zone", add=adds, update=updates, remove=removes,
+                                         trace=module._verbosity >= 3)
+    except Exception as error:
+        module.fail_json("An unexpected error occurred: {0}".format(error), **result)
+
+    record_trace(result, resp)
+
+    if not resp["success"]:
+        module.fail_json(msg="An error occurred: {0}".format(resp["response"]), **result)
+
+    result["api_response"] = resp["response"]
+    failed = failed_objects(resp["response"], "Zone", result["created"] + result["updated"] + removes)
+    if failed:
+        module.fail_json(msg="An error occurred: {0}".format(failed), **result)
 
 
 def main():
     """Code executed at run time."""
     argument_spec = {
-        "name": {"required": True},
+        "name": {"required": False},
         "zone_type": {"choices": ["LAN", "DMZ"], "required": False},
         "description": {"type": "str", "required": False},
         "https": {"type": "str", "choices": ["Enable", "Disable"]},
@@ -513,6 +753,35 @@ def main():
         "dynamic_routing": {"type": "str", "choices": ["Enable", "Disable"]},
         "smtp_relay": {"type": "str", "choices": ["Enable", "Disable"]},
         "snmp": {"type": "str", "choices": ["Enable", "Disable"]},
+        "zones": {
+            "type": "list",
+            "elements": "dict",
+            "required": False,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "zone_type": {"choices": ["LAN", "DMZ"], "required": False},
+                "description": {"type": "str", "required": False},
+                "https": {"type": "str", "choices": ["Enable", "Disable"]},
+                "ssh": {"type": "str", "choices": ["Enable", "Disable"]},
+                "client_authen": {"type": "str", "choices": ["Enable", "Disable"]},
+                "captive_portal": {"type": "str", "choices": ["Enable", "Disable"]},
+                "ad_sso": {"type": "str", "choices": ["Enable", "Disable"]},
+                "radius_sso": {"type": "str", "choices": ["Enable", "Disable"]},
+                "chromebook_sso": {"type": "str", "choices": ["Enable", "Disable"]},
+                "dns": {"type": "str", "choices": ["Enable", "Disable"]},
+                "ping": {"type": "str", "choices": ["Enable", "Disable"]},
+                "ipsec": {"type": "str", "choices": ["Enable", "Disable"]},
+                "red": {"type": "str", "choices": ["Enable", "Disable"]},
+                "sslvpn": {"type": "str", "choices": ["Enable", "Disable"]},
+                "vpn_portal": {"type": "str", "choices": ["Enable", "Disable"]},
+                "web_proxy": {"type": "str", "choices": ["Enable", "Disable"]},
+                "wireless_protection": {"type": "str", "choices": ["Enable", "Disable"]},
+                "user_portal": {"type": "str", "choices": ["Enable", "Disable"]},
+                "dynamic_routing": {"type": "str", "choices": ["Enable", "Disable"]},
+                "smtp_relay": {"type": "str", "choices": ["Enable", "Disable"]},
+                "snmp": {"type": "str", "choices": ["Enable", "Disable"]},
+            },
+        },
         "state": {
             "required": True,
             "choices": ["present", "absent", "updated", "query"],
@@ -526,6 +795,8 @@ def main():
     module = AnsibleModule(
         argument_spec=argument_spec,
         required_if=required_if,
+        required_one_of=[("name", "zones")],
+        mutually_exclusive=[("name", "zones")],
         supports_check_mode=True,
     )
 
@@ -544,6 +815,12 @@ def main():
     if not hasattr(connection, "httpapi"):
         module.fail_json(msg="HTTPAPI plugin is not initialized. Ensure the connection is set to 'httpapi'.")
 
+    if module.params.get("zones") is not None:
+        if state == "query":
+            module.fail_json(msg="state=query is not supported with zones", **result)
+        manage_zones(connection, module, result)
+        module.exit_json(**result)
+
     exist_check = get_zone(connection, module, result)
     result["api_response"] = exist_check["api_response"]
 